@@ -1,14 +1,32 @@
+import json
 import logging
 import datetime
+from dataclasses import asdict
+from typing import Dict, List, Literal, Optional, Tuple, Union
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from pydantic import BaseModel
-from infrastructure.persistence.database import init_db, get_db
-from infrastructure.persistence.repositories import ProjectRepository
-from infrastructure.persistence.models import ComponentMetric
+from pydantic import BaseModel, Field
+from infrastructure.persistence.database import init_db, get_db, SessionLocal
+from infrastructure.persistence.repositories import (
+    ProjectRepository, ExperimentRepository, AnalysisRunRepository,
+    METRIC_COLUMNS, METRIC_SORT_FIELDS, encode_cursor, decode_cursor
+)
+from infrastructure.file_scanner import ScanOptions, DEFAULT_MAX_FILE_SIZE_KB
 from application.services.analysis_service import AnalysisService
+from application.services.experiment_service import ExperimentService, DEFAULT_EXPERIMENT_SEED
+from application.services.what_if_service import WhatIfService
+from application.services.dependency_service import DependencyService
+from application.services.method_service import MethodService
+from domain.services.metric_calculator import (
+    BetweennessConfig, DEFAULT_BETWEENNESS_EPSILON, DEFAULT_BETWEENNESS_DELTA, DEFAULT_BETWEENNESS_SEED,
+    DEFAULT_TIMEOUT_SECONDS, LinkAnalysisConfig
+)
+from domain.services.what_if import DEFAULT_CHANGE_LIMIT
+from domain.services.communities import CommunityConfig
+from domain.algorithms.community import DEFAULT_RESOLUTION, DEFAULT_MAX_ROUNDS
+from domain.algorithms.link_analysis import DEFAULT_TOL, DEFAULT_MAX_ITER, DEFAULT_DAMPING, DEFAULT_KATZ_BETA
 
 # Configure structured logging
 logging.basicConfig(
@@ -44,9 +62,64 @@ def health_check(db: Session = Depends(get_db)):
         logger.error(f"Database connection failed during health check: {e}")
         raise HTTPException(status_code=500, detail="Database connection failed")
 
+class ScanOptionsRequest(BaseModel):
+    skip_vendor: bool = True
+    include_tests: bool = False
+    max_file_size_kb: Optional[int] = Field(DEFAULT_MAX_FILE_SIZE_KB, ge=1)
+    exclude: List[str] = Field(default_factory=list, description=".gitignore-style patterns")
+    respect_gitignore: bool = True
+    threads: int = Field(1, ge=1, description="Concurrent directory listing (slow volumes)")
+
+class BetweennessRequest(BaseModel):
+    mode: Literal["auto", "exact", "approximate", "skip"] = "auto"
+    samples: Optional[int] = Field(None, ge=1, description="Pivot budget; overrides epsilon")
+    epsilon: float = Field(DEFAULT_BETWEENNESS_EPSILON, gt=0, lt=1, description="Target max additive error")
+    delta: float = Field(DEFAULT_BETWEENNESS_DELTA, gt=0, lt=1, description="Allowed failure probability")
+    seed: int = DEFAULT_BETWEENNESS_SEED
+
+class LinkAnalysisRequest(BaseModel):
+    tol: float = Field(DEFAULT_TOL, gt=0, description="Convergence tolerance (per node, L1)")
+    max_iter: int = Field(DEFAULT_MAX_ITER, ge=1, description="Power iterations before giving up")
+    damping: float = Field(DEFAULT_DAMPING, gt=0, lt=1, description="PageRank damping factor")
+    katz_alpha: Optional[float] = Field(None, gt=0, description="Katz attenuation; default always converges")
+    katz_beta: float = DEFAULT_KATZ_BETA
+    seed: Optional[int] = Field(None, description="Starting vector seed; uniform start when omitted")
+
+class CommunityRequest(BaseModel):
+    enabled: bool = True
+    method: Literal["louvain", "label_propagation"] = "louvain"
+    seed: int = 0
+    resolution: float = Field(DEFAULT_RESOLUTION, gt=0, description="Louvain: higher gives smaller communities")
+    max_rounds: int = Field(DEFAULT_MAX_ROUNDS, ge=1, description="Label propagation rounds")
+    respect_scc: bool = Field(True, description="Never split a dependency cycle across communities")
+
 class AnalyzeRequest(BaseModel):
     project_path: str
     project_name: str = "default_project"
+    workers: int = Field(1, ge=1, description="Parser worker processes")
+    use_cache: bool = Field(True, description="Reuse unchanged files' parse results")
+    streaming: bool = Field(False, description="Stream parse results into the graph")
+    graph_backend: Literal["networkx", "csr"] = Field("networkx", description="In-memory graph representation")
+    export_json: bool = Field(False, description="Also write graph_{run_id}.json")
+    options: ScanOptionsRequest = Field(default_factory=ScanOptionsRequest)
+    betweenness: BetweennessRequest = Field(default_factory=BetweennessRequest)
+    metric_workers: int = Field(1, ge=1, description="Betweenness/closeness worker processes")
+    metric_timeout: int = Field(DEFAULT_TIMEOUT_SECONDS, ge=1, description="Seconds for the whole metric stage")
+    metric_budgets: Dict[
+        Literal["degree", "betweenness", "closeness", "scc", "reachability", "pagerank", "hits", "katz"], float
+    ] = Field(
+        default_factory=dict, description="Seconds per metric family; unfinished families are saved as -1"
+    )
+    metric_profile: Literal["quick", "full"] = Field(
+        "full", description="quick: degrees, SCCs and blast radius only"
+    )
+    baseline_run_id: Optional[int] = Field(
+        None, description="Update this earlier run's metrics incrementally instead of recomputing"
+    )
+    verify_incremental: bool = Field(False, description="Check an incremental update against a full recompute")
+    link_analysis: LinkAnalysisRequest = Field(default_factory=LinkAnalysisRequest)
+    use_metric_cache: bool = Field(True, description="Reuse metrics of an earlier run with an identical graph")
+    communities: CommunityRequest = Field(default_factory=CommunityRequest)
 
 @app.post("/analyze")
 def analyze_project(req: AnalyzeRequest, db: Session = Depends(get_db)):
@@ -55,31 +128,279 @@ def analyze_project(req: AnalyzeRequest, db: Session = Depends(get_db)):
         project = project_repo.get_or_create(req.project_name)
         
         service = AnalysisService(db)
-        result = service.run_analysis(project.id, req.project_path)
+        result = service.run_analysis(
+            project.id,
+            req.project_path,
+            workers=req.workers,
+            use_cache=req.use_cache,
+            streaming=req.streaming,
+            scan_options=ScanOptions(**req.options.model_dump()),
+            graph_backend=req.graph_backend,
+            export_json=req.export_json,
+            betweenness=BetweennessConfig(**req.betweenness.model_dump()),
+            metric_workers=req.metric_workers,
+            metric_timeout=req.metric_timeout,
+            metric_budgets=req.metric_budgets,
+            metric_profile=req.metric_profile,
+            baseline_run_id=req.baseline_run_id,
+            verify_incremental=req.verify_incremental,
+            link_analysis=LinkAnalysisConfig(**req.link_analysis.model_dump()),
+            use_metric_cache=req.use_metric_cache,
+            communities=CommunityConfig(**req.communities.model_dump(exclude={"enabled"})),
+            community_detection=req.communities.enabled
+        )
         return result
     except Exception as e:
         logger.error(f"Analysis failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# /metrics/{run_id} field name -> component_metrics column
+METRIC_FIELDS = {"name": "component_name", "type": "component_type", **{c: c for c in METRIC_COLUMNS}}
+DEFAULT_METRIC_FIELDS = (
+    "name", "type", "in_degree", "out_degree", "betweenness", "scc_size", "blast_radius",
+    "pagerank", "hub_score", "authority_score", "katz"
+)
+
 @app.get("/metrics/{run_id}")
-def get_metrics(run_id: int, db: Session = Depends(get_db)):
+def get_metrics(
+    run_id: int,
+    sort_by: str = Query("name", description="name or a metric, e.g. blast_radius for top-k"),
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(500, ge=1, le=10_000),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    component_type: Optional[str] = Query(None, alias="type", description="e.g. class"),
+    name_prefix: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return; name is always included"),
+    db: Session = Depends(get_db)
+):
+    """One page of a run's component metrics, sorted and filtered in the
+    database. Follow `next_cursor` (null on the last page) for the next one;
+    sorting by a metric leaves out components without a value for it."""
+    requested = [f.strip() for f in fields.split(",") if f.strip()] if fields else list(DEFAULT_METRIC_FIELDS)
+    unknown = [f for f in requested if f not in METRIC_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {unknown}")
+    if sort_by not in METRIC_FIELDS or METRIC_FIELDS[sort_by] not in METRIC_SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Cannot sort by {sort_by}")
     try:
-        metrics = db.query(ComponentMetric).filter(ComponentMetric.run_id == run_id).all()
-        components = []
-        for m in metrics:
-            components.append({
-                "name": m.component_name,
-                "type": m.component_type,
-                "in_degree": m.in_degree,
-                "out_degree": m.out_degree,
-                "betweenness": m.betweenness,
-                "scc_size": m.scc_size,
-                "blast_radius": m.blast_radius
-            })
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    columns = [METRIC_FIELDS[f] for f in requested if f != "name"]
+
+    try:
+        repo = AnalysisRunRepository(db)
+        run = repo.get(run_id)
+        rows, next_key = repo.page_component_metrics(
+            run_id, columns, sort_by=METRIC_FIELDS[sort_by], descending=order == "desc",
+            limit=limit, after=after, component_type=component_type, name_prefix=name_prefix
+        )
+        names = {column: field for field, column in METRIC_FIELDS.items()}
+        components = [{names[column]: value for column, value in row.items()} for row in rows]
         return {
             "run_id": run_id,
-            "components": components
+            "betweenness": {
+                "mode": run.betweenness_mode if run else None,
+                "samples": run.betweenness_samples if run else None,
+                "seed": run.betweenness_seed if run else None
+            },
+            "metric_profile": run.metric_profile if run else None,
+            "incomplete_metrics": (
+                run.incomplete_metrics.split(",") if run and run.incomplete_metrics else []
+            ),
+            "stale_metrics": run.stale_metrics.split(",") if run and run.stale_metrics else [],
+            "baseline_run_id": run.baseline_run_id if run else None,
+            "metrics_run_id": run.metrics_run_id if run else None,
+            "sort_by": sort_by,
+            "order": order,
+            "components": components,
+            "next_cursor": encode_cursor(next_key) if next_key is not None else None
         }
     except Exception as e:
         logger.error(f"Failed to fetch metrics for run {run_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/communities/{run_id}")
+def get_communities(
+    run_id: int,
+    sort_by: Literal["community_id", "size", "cohesion", "external_weight"] = "community_id",
+    include_members: bool = False,
+    db: Session = Depends(get_db)
+):
+    """A run's communities with internal/external edge weight and cohesion
+    (internal share of the community's edge weight)."""
+    repo = AnalysisRunRepository(db)
+    run = repo.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    communities = []
+    for c in repo.load_communities(run_id):
+        total = c.internal_weight + c.external_weight
+        communities.append({
+            "community_id": c.community_id,
+            "size": c.size,
+            "internal_weight": c.internal_weight,
+            "external_weight": c.external_weight,
+            "cohesion": c.internal_weight / total if total else 0.0
+        })
+    if sort_by != "community_id":
+        # Most cohesive / largest / most coupled first
+        communities.sort(key=lambda c: (-c[sort_by], c["community_id"]))
+    if include_members:
+        members: Dict[int, List[str]] = {}
+        for name, community_id in sorted(repo.community_members(run_id).items()):
+            members.setdefault(community_id, []).append(name)
+        for c in communities:
+            c["members"] = members.get(c["community_id"], [])
+    return {
+        "run_id": run_id,
+        "method": run.community_method,
+        "seed": run.community_seed,
+        "modularity": run.community_modularity,
+        "communities": communities
+    }
+
+class ExperimentRequest(BaseModel):
+    run_id: int
+    kind: Literal["weight_sensitivity", "edge_perturbation", "node_removal"]
+    trials: int = Field(100, ge=1, le=100_000)
+    seed: int = DEFAULT_EXPERIMENT_SEED
+    workers: int = Field(1, ge=1, description="Trial worker processes")
+    params: Dict[str, Union[int, float]] = Field(
+        default_factory=dict,
+        description="weight_sensitivity: jitter, top_k; edge_perturbation: edge_fraction; "
+                    "node_removal: removal_count"
+    )
+
+def _execute_experiment(experiment_id: int):
+    # Runs after the response is sent, so it needs its own session
+    db = SessionLocal()
+    try:
+        ExperimentService(db).execute(experiment_id)
+    except Exception as e:
+        logger.error(f"Experiment {experiment_id} failed: {e}")
+    finally:
+        db.close()
+
+@app.post("/experiments")
+def start_experiment(req: ExperimentRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    try:
+        experiment = ExperimentService(db).create(
+            req.run_id, req.kind, req.trials,
+            seed=req.seed, workers=req.workers, params=req.params
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    background_tasks.add_task(_execute_experiment, experiment.id)
+    return {"experiment_id": experiment.id, "status": experiment.status}
+
+@app.get("/experiments/{experiment_id}")
+def get_experiment(
+    experiment_id: int,
+    cursor: int = Query(0, ge=0, description="Last trial row id already received"),
+    limit: int = Query(1000, ge=1, le=10_000),
+    db: Session = Depends(get_db)
+):
+    """Progress, summary (once completed) and trials stored since `cursor`."""
+    repo = ExperimentRepository(db)
+    experiment = repo.get(experiment_id)
+    if experiment is None:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+    trials = repo.trials(experiment_id, cursor=cursor, limit=limit)
+    return {
+        "experiment_id": experiment.id,
+        "run_id": experiment.run_id,
+        "kind": experiment.kind,
+        "status": experiment.status,
+        "trials": experiment.trials,
+        "completed_trials": experiment.completed_trials,
+        "seed": experiment.seed,
+        "params": json.loads(experiment.params),
+        "summary": json.loads(experiment.summary) if experiment.summary else None,
+        "error_message": experiment.error_message,
+        "cursor": trials[-1][0] if trials else cursor,
+        "results": [{"trial_index": i, **result} for _, i, result in trials]
+    }
+
+class WhatIfRequest(BaseModel):
+    remove_nodes: List[str] = Field(default_factory=list)
+    remove_edges: List[Tuple[str, str]] = Field(default_factory=list, description="(source, target) pairs")
+    limit: int = Field(DEFAULT_CHANGE_LIMIT, ge=0, le=10_000, description="Blast radius changes to return")
+
+@app.post("/runs/{run_id}/what-if")
+def what_if(run_id: int, req: WhatIfRequest, db: Session = Depends(get_db)):
+    """Largest SCC and blast radius changes if the given nodes/edges were removed.
+
+    The first query for a run loads its graph; later ones reuse it in memory."""
+    try:
+        impact = WhatIfService(db).remove(run_id, req.remove_nodes, req.remove_edges, limit=req.limit)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"run_id": run_id, **asdict(impact)}
+
+def _dependency_queries(run_id: int, db: Session):
+    try:
+        return DependencyService(db).queries(run_id)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/runs/{run_id}/reachability")
+def check_reachability(run_id: int, source: str, target: str, db: Session = Depends(get_db)):
+    """Whether `source` depends on `target`, directly or transitively."""
+    queries = _dependency_queries(run_id, db)
+    try:
+        return {"source": source, "target": target, "reachable": queries.depends_on(source, target)}
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+
+@app.get("/runs/{run_id}/path")
+def dependency_path(run_id: int, source: str, target: str, db: Session = Depends(get_db)):
+    """Shortest dependency path from `source` to `target` (null if none)."""
+    queries = _dependency_queries(run_id, db)
+    try:
+        path = queries.shortest_path(source, target)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    return {"source": source, "target": target, "path": path, "hops": len(path) - 1 if path else None}
+
+@app.get("/runs/{run_id}/neighbourhood")
+def k_hop_neighbourhood(
+    run_id: int,
+    component: str,
+    hops: int = Query(1, ge=1, le=50),
+    direction: Literal["dependents", "dependencies"] = "dependents",
+    limit: int = Query(1000, ge=1, le=100_000),
+    db: Session = Depends(get_db)
+):
+    """Components within `hops` edges that depend on `component` (dependents)
+    or that it depends on (dependencies), nearest first."""
+    queries = _dependency_queries(run_id, db)
+    try:
+        found = queries.within_hops(component, hops, direction, limit=limit)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    return {
+        "component": component,
+        "direction": direction,
+        "hops": hops,
+        "components": [{"name": name, "distance": distance} for name, distance in found]
+    }
+
+@app.get("/runs/{run_id}/methods")
+def method_level_metrics(
+    run_id: int,
+    component: Optional[str] = None,
+    sort_by: str = "pagerank",
+    limit: int = Query(50, ge=1, le=10_000),
+    db: Session = Depends(get_db)
+):
+    """Method-level call metrics: for `component`, its class roll-up and its
+    methods; without one, the run's top methods by `sort_by`."""
+    try:
+        return MethodService(db).summary(run_id, component, sort_by=sort_by, limit=limit)
+    except LookupError as e:  # includes KeyError for an unknown component
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
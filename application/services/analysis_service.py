@@ -1,76 +1,356 @@
+import logging
 import traceback
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
-from infrastructure.persistence.repositories import AnalysisRunRepository
-from infrastructure.parser_bridge import ParserBridge, FileScanner
-from domain.models.graph_model import GraphModel
+from infrastructure.persistence.repositories import AnalysisRunRepository, ParseCacheRepository
+from infrastructure.parser_bridge import ParserBridge, to_batches
+from infrastructure.file_scanner import FileScanner, ScanOptions
+from infrastructure.parse_cache import IncrementalParser
+from infrastructure.memory_probe import StageMemoryProbe
+from infrastructure.metric_cache import MetricCache, CachedMetrics
+from domain.models.graph_model import GraphModel, BACKEND_NETWORKX
 from domain.models.edge import EdgeType
-from domain.services.metric_calculator import MetricCalculator
+from domain.services.metric_calculator import (
+    MetricCalculator, BetweennessConfig, LinkAnalysisConfig, DEFAULT_TIMEOUT_SECONDS, METRIC_PROFILES,
+    PROFILE_FULL
+)
+from domain.services.incremental_metrics import IncrementalMetricEngine, GraphDelta
+from domain.services.graph_projection import GraphProjector
+from domain.services.graph_fingerprint import graph_fingerprint, metric_cache_key
+from domain.services.communities import CommunityConfig, detect_communities
+from domain.services.dependency_queries import DependencyQueries
+
+logger = logging.getLogger(__name__)
+
+# Edge types metrics are computed on. Excludes DB-write edges etc. to keep
+# centrality semantically correct.
+STRUCTURAL_EDGES = [
+    EdgeType.METHOD_CALL,
+    EdgeType.INSTANTIATION,
+    EdgeType.INHERITS,
+    EdgeType.IMPLEMENTS,
+]
 
 class AnalysisService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, metric_cache: Optional[MetricCache] = None):
         self.db = db
         self.repo = AnalysisRunRepository(db)
         self.parser = ParserBridge()
+        self.cached_parser = IncrementalParser(self.parser, ParseCacheRepository(db))
+        self.metric_cache = metric_cache or MetricCache()
+
+    def run_analysis(
+        self,
+        project_id: int,
+        project_path: str,
+        workers: int = 1,
+        use_cache: bool = True,
+        streaming: bool = False,
+        scan_options: Optional[ScanOptions] = None,
+        graph_backend: str = BACKEND_NETWORKX,
+        export_json: bool = False,
+        betweenness: Optional[BetweennessConfig] = None,
+        metric_workers: int = 1,
+        metric_timeout: int = DEFAULT_TIMEOUT_SECONDS,
+        metric_budgets: Optional[Dict[str, float]] = None,
+        metric_profile: str = PROFILE_FULL,
+        baseline_run_id: Optional[int] = None,
+        verify_incremental: bool = False,
+        link_analysis: Optional[LinkAnalysisConfig] = None,
+        use_metric_cache: bool = True,
+        communities: Optional[CommunityConfig] = None,
+        community_detection: bool = True,
+        reachability_index: bool = True
+    ) -> dict:
+        """Scan, parse, build the graph, compute metrics and persist a run.
+
+        Args:
+            project_id: Owning project.
+            project_path: Root of the PHP codebase to analyze.
+            workers: Parser processes. 1 parses serially; >1 uses a process
+                     pool. Both paths yield identical graphs.
+            use_cache: Reuse per-file parse results from earlier runs of this
+                       project; only changed/added files are re-parsed.
+            streaming: Feed each file's parse results into the graph as soon as
+                       they are produced instead of materializing all nodes and
+                       edges first. Bounds peak memory on large trees.
+            scan_options: File discovery filters (vendor/tests/size/excludes);
+                          defaults to ScanOptions.for_analysis().
+            graph_backend: "networkx" or "csr". "csr" holds the graph in compact
+                           integer-indexed arrays; a NetworkX view is built only
+                           where the metric stage needs one.
+            export_json: Also write the deterministic node-link JSON
+                         (graph_{run_id}.json) next to the binary artifact.
+            betweenness: Exact vs sampled betweenness, pivot budget / error
+                         bound and seed; defaults to BetweennessConfig() (exact
+                         up to MAX_NODES_FOR_BETWEENNESS nodes, sampled above).
+            metric_workers: Processes for betweenness and closeness. >1 splits
+                            BFS sources across a pool over shared graph arrays;
+                            1 runs the same kernels in-process, so values are
+                            identical for any count.
+            metric_timeout: Seconds for the whole metric stage.
+            metric_budgets: Optional seconds per metric family ("degree",
+                            "betweenness", "closeness", "scc", "reachability",
+                            "pagerank", "hits", "katz").
+                            Families that run out (or are still running at
+                            metric_timeout) are saved as -1 and listed in the
+                            run's `incomplete_metrics`; the run still completes.
+            metric_profile: "full" or "quick". "quick" computes degrees, SCCs
+                            and blast radius only (linear time); the other
+                            metric columns are left NULL.
+            baseline_run_id: A completed earlier run with the same metric
+                             profile. Its graph and metrics are updated for the
+                             difference to this graph instead of recomputing
+                             (see IncrementalMetricEngine); betweenness and
+                             closeness are then carried over and recorded as
+                             stale. Ignored if the baseline is unusable.
+            verify_incremental: Check an incremental update against a full
+                                recompute; the run fails on any difference.
+            link_analysis: Tolerance, iteration cap, damping / Katz alpha and
+                           seed for PageRank, HITS and Katz; defaults to
+                           LinkAnalysisConfig(). A family that does not
+                           converge is saved as -1 and listed as incomplete.
+            use_metric_cache: Look the projected graph's fingerprint (plus the
+                              metric settings) up in the metric cache. On a
+                              hit nothing is computed and the run references
+                              the earlier run's metric rows (`metrics_run_id`)
+                              instead of writing its own. Complete, freshly
+                              computed results are added to the cache.
+            communities: Method (Louvain or label propagation), seed, resolution
+                         and SCC handling for community detection; defaults
+                         to CommunityConfig() (seeded Louvain, SCCs kept whole).
+            community_detection: Partition the projected graph into
+                                 communities and store the assignment
+                                 with each community's internal and
+                                 external edge weight.
+            reachability_index: Build the projected graph's 2-hop reachability
+                                index and save it with the run; it backs the
+                                dependency path endpoints.
+
+        The returned dict includes `peak_rss_kb`, the peak RSS of each stage.
+        """
+        if metric_profile not in METRIC_PROFILES:
+            raise ValueError(f"Unknown metric profile: {metric_profile}")
 
-    def run_analysis(self, project_id: int, project_path: str) -> dict:
         # Create "running" tracking record
         run = self.repo.create(project_id=project_id)
         
         try:
+            probe = StageMemoryProbe()
+
             # 1. File ingestion — no hardcoded file limit
-            files = FileScanner.scan(project_path)
-            
-            # 2. Parse into typed AST representation (Phase A+B upgrade)
-            nodes, edges = self.parser.parse_files(files, root_path=project_path)
-            
-            # 3. Build the fully-qualified dependency graph
-            graph = GraphModel()
-            for node in nodes:
-                graph.add_node(node)
-            for edge in edges:
-                graph.add_edge(edge)
-                
+            with probe.stage("scan"):
+                scanned = {
+                    f.path: f for f in FileScanner.scan_entries(
+                        project_path, options=scan_options or ScanOptions.for_analysis()
+                    )
+                }
+                files = list(scanned)
+                file_sizes = {path: f.size for path, f in scanned.items()}
+
+            graph = GraphModel(backend=graph_backend)
+            if streaming:
+                # 2+3. Each file's rows go straight into the graph and are
+                #      dropped; edges to not-yet-seen nodes wait in a buffer.
+                with probe.stage("parse_and_build"):
+                    if use_cache:
+                        parsed = self.cached_parser.iter_extract(
+                            project_id, files, root_path=project_path,
+                            workers=workers, scanned=scanned
+                        )
+                    else:
+                        parsed = self.parser.iter_extract(
+                            files, root_path=project_path, workers=workers
+                        )
+                    for path, node_rows, edge_rows in parsed:
+                        node_batch, edge_batch = to_batches([(path, node_rows, edge_rows)])
+                        graph.add_nodes_bulk(*node_batch)
+                        graph.stream_edges_bulk(*edge_batch)
+                    graph.resolve_pending_edges()
+            else:
+                # 2. Parse into columnar node/edge batches (Phase A+B upgrade)
+                with probe.stage("parse"):
+                    if use_cache:
+                        node_batch, edge_batch = self.cached_parser.parse_columnar(
+                            project_id, files, root_path=project_path,
+                            workers=workers, scanned=scanned
+                        )
+                    else:
+                        node_batch, edge_batch = self.parser.parse_columnar(
+                            files, root_path=project_path,
+                            workers=workers, file_sizes=file_sizes
+                        )
+
+                # 3. Build the fully-qualified dependency graph
+                with probe.stage("build_graph"):
+                    graph.add_nodes_bulk(*node_batch)
+                    graph.add_edges_bulk(*edge_batch)
+                    del node_batch, edge_batch
+
             total_files = len(files)
             total_classes = graph.get_class_count()
             total_edges = graph.get_edge_count()
             
             # 4. Calculate Phase 2 Structural Metrics on STRUCTURAL edge projection
-            #    Excludes DB-write edges etc. to keep centrality semantically correct.
-            STRUCTURAL_EDGES = [
-                EdgeType.METHOD_CALL,
-                EdgeType.INSTANTIATION,
-                EdgeType.INHERITS,
-                EdgeType.IMPLEMENTS,
-            ]
-            projected = MetricCalculator.project(
-                graph.graph, edge_types=STRUCTURAL_EDGES
-            )
-            calculator = MetricCalculator(projected)
-            metrics_matrix = calculator.calculate_all_metrics()
-
-            # 5. Persist structural metrics in batch (include component type from graph)
-            node_types = {
-                n: data.get('type', 'class')
-                for n, data in graph.graph.nodes(data=True)
-            }
-            self.repo.save_component_metrics(run.id, metrics_matrix, node_types)
-            
-            # 6. Save Graph JSON locally
-            graph_data = graph.to_json_dict()
-            self.repo.serialize_graph(run.id, graph_data)
-            
-            # 7. Persist minimal run metadata
-            self.repo.update_metrics(run.id, total_files, total_classes, total_edges)
-            self.repo.mark_completed(run.id)
+            # Projections share the run's graph data and are cached per run
+            projector = GraphProjector(graph.graph)
+            projected = projector.project(edge_types=STRUCTURAL_EDGES)
+            with probe.stage("metrics"):
+                baseline = cached = None
+                fingerprint = cache_key = None
+                if use_metric_cache:
+                    fingerprint = graph_fingerprint(projected)
+                    cache_key = metric_cache_key(
+                        fingerprint, METRIC_PROFILES[metric_profile],
+                        betweenness=betweenness or BetweennessConfig(),
+                        link_analysis=link_analysis or LinkAnalysisConfig()
+                    )
+                    cached = self._cached_metrics(cache_key)
+                if cached is None and baseline_run_id is not None:
+                    baseline = self._load_baseline(baseline_run_id, metric_profile, STRUCTURAL_EDGES)
+                if cached is not None:
+                    metrics_matrix = cached.metrics
+                    incomplete, stale = [], []
+                    betweenness_info = cached.betweenness_info
+                elif baseline is not None:
+                    base_run, base_graph, base_metrics = baseline
+                    engine = IncrementalMetricEngine(
+                        verify=verify_incremental,
+                        calculator_options={
+                            "betweenness": betweenness, "workers": metric_workers,
+                            "link_analysis": link_analysis
+                        },
+                        timeout=metric_timeout, budgets=metric_budgets
+                    )
+                    update = engine.apply(
+                        base_graph, base_metrics,
+                        GraphDelta.between(base_graph, projected), in_place=True
+                    )
+                    metrics_matrix = update.metrics
+                    incomplete, stale = update.incomplete_metrics, update.stale_metrics
+                    betweenness_info = update.betweenness_info or {
+                        "mode": base_run.betweenness_mode,
+                        "samples": base_run.betweenness_samples,
+                        "seed": base_run.betweenness_seed
+                    }
+                else:
+                    calculator = MetricCalculator(
+                        projected, betweenness=betweenness, workers=metric_workers,
+                        link_analysis=link_analysis
+                    )
+                    metrics_matrix = calculator.calculate(
+                        METRIC_PROFILES[metric_profile],
+                        timeout=metric_timeout, budgets=metric_budgets
+                    )
+                    incomplete, stale = calculator.incomplete_metrics, []
+                    betweenness_info = calculator.betweenness_info
+            partition = None
+            if community_detection:
+                with probe.stage("communities"):
+                    partition = detect_communities(projected, communities or CommunityConfig())
+
+            with probe.stage("persist"):
+                try:
+                    # 5. Save the graph locally: binary artifact, JSON on request
+                    self.repo.save_graph_artifact(run.id, graph.csr)
+                    if reachability_index:
+                        self.repo.save_reachability_index(run.id, DependencyQueries(projected).index)
+                    if export_json:
+                        graph_data = graph.to_json_dict()
+                        self.repo.serialize_graph(run.id, graph_data)
+
+                    # 6. Every database write of the run in one transaction, so
+                    #    the write lock is held only here and a failure leaves no
+                    #    partial rows behind
+                    node_types = {
+                        n: data.get('type', 'class')
+                        for n, data in graph.graph.nodes(data=True)
+                    }
+                    with self.repo.transaction():
+                        if use_cache:
+                            self.repo.update_cache_stats(
+                                run.id, self.cached_parser.hits, self.cached_parser.misses
+                            )
+                        if betweenness_info:
+                            self.repo.update_betweenness_info(run.id, **betweenness_info)
+                        self.repo.update_metric_status(
+                            run.id, metric_profile, incomplete, stale,
+                            baseline_run_id=baseline_run_id if baseline is not None else None
+                        )
+                        if cache_key is not None:
+                            self.repo.update_metric_source(
+                                run.id, fingerprint, cache_key,
+                                metrics_run_id=cached.run_id if cached is not None else None
+                            )
+                        if cached is None:
+                            self.repo.save_component_metrics(run.id, metrics_matrix, node_types)
+                        if partition is not None:
+                            self.repo.save_communities(run.id, partition)
+                        self.repo.update_metrics(run.id, total_files, total_classes, total_edges)
+                        self.repo.mark_completed(run.id)
+                except Exception:
+                    # Files are written first so a completed run always has them;
+                    # a run whose rows were rolled back must not keep any either
+                    self.repo.delete_run_files(run.id)
+                    raise
+
+            if cache_key is not None and cached is None and not incomplete and not stale:
+                self._store_metrics(cache_key, CachedMetrics(
+                    run.id, metrics_matrix, metric_profile, betweenness_info or {}
+                ))
             
             return {
                 "run_id": run.id,
                 "files": total_files,
                 "classes": total_classes,
-                "edges": total_edges
+                "edges": total_edges,
+                "betweenness": betweenness_info,
+                "metric_profile": metric_profile,
+                "incomplete_metrics": incomplete,
+                "stale_metrics": stale,
+                "incremental_from": baseline_run_id if baseline is not None else None,
+                "metrics_run_id": cached.run_id if cached is not None else None,
+                "communities": len(partition.communities) if partition is not None else None,
+                "modularity": partition.modularity if partition is not None else None,
+                "peak_rss_kb": probe.peaks_kb
             }
             
         except Exception as e:
             error_msg = str(e) + "\n" + traceback.format_exc()
             self.repo.mark_failed(run.id, error_msg)
             raise e
+
+    def _cached_metrics(self, cache_key: str) -> Optional[CachedMetrics]:
+        """The cache entry for `cache_key` if the run it points to is a
+        completed run of this database that holds its own rows for that key."""
+        entry = self.metric_cache.get(cache_key)
+        if entry is None:
+            return None
+        source = self.repo.get(entry.run_id)
+        if (source is None or source.status != "completed"
+                or source.metric_cache_key != cache_key or source.metrics_run_id is not None):
+            return None
+        return entry
+
+    def _store_metrics(self, cache_key: str, entry: CachedMetrics):
+        # The run is already persisted; a cache that cannot be written only
+        # costs the next run a recompute
+        try:
+            self.metric_cache.put(cache_key, entry)
+        except OSError as e:
+            logger.warning(f"Metric cache write to {self.metric_cache.directory} failed: {e}")
+
+    def _load_baseline(self, run_id: int, metric_profile: str, edge_types: List[EdgeType]):
+        """(run, projected graph, metrics) of a completed run with the same
+        metric profile and a saved graph artifact, else None."""
+        base = self.repo.get(run_id)
+        if base is None or base.status != "completed" or base.metric_profile != metric_profile:
+            return None
+        csr = self.repo.load_graph_artifact(run_id)
+        if csr is None:
+            return None
+        graph = MetricCalculator.project(csr.to_networkx(), edge_types=edge_types)
+        metrics = self.repo.load_component_metrics(run_id, METRIC_PROFILES[metric_profile])
+        for row in metrics.values():
+            row['total_degree'] = row['in_degree'] + row['out_degree']  # not stored
+        return base, graph, metrics
@@ -0,0 +1,41 @@
+from sqlalchemy.orm import Session
+from infrastructure.persistence.repositories import AnalysisRunRepository
+from domain.services.graph_projection import GraphProjector
+from domain.services.dependency_queries import DependencyQueries
+from application.services.analysis_service import STRUCTURAL_EDGES
+from application.services.run_cache import RunCache
+
+DEFAULT_MAX_LOADED = 4
+
+
+class DependencyService:
+    """DependencyQueries per run, loaded once and kept for later requests.
+
+    The run's saved reachability index is used when present; runs analysed
+    without one get it built and saved on first use. As in WhatIfService,
+    the least recently used runs are dropped beyond `max_loaded`.
+    """
+
+    _loaded: "RunCache[DependencyQueries]" = RunCache()
+
+    def __init__(self, db: Session, max_loaded: int = DEFAULT_MAX_LOADED):
+        self.runs = AnalysisRunRepository(db)
+        self.max_loaded = max_loaded
+
+    def queries(self, run_id: int) -> DependencyQueries:
+        return self._loaded.get(run_id, self._load, self.max_loaded)
+
+    def _load(self, run_id: int) -> DependencyQueries:
+        run = self.runs.get(run_id)
+        if run is None or run.status != "completed":
+            raise LookupError(f"Run {run_id} is not a completed analysis run")
+        csr = self.runs.load_graph_artifact(run_id)
+        if csr is None:
+            raise LookupError(f"Run {run_id} has no saved graph artifact")
+        graph = GraphProjector(csr.to_networkx()).project(edge_types=STRUCTURAL_EDGES)
+        index = self.runs.load_reachability_index(run_id)
+        if index is not None and index.n == graph.number_of_nodes():
+            return DependencyQueries(graph, index)
+        queries = DependencyQueries(graph)
+        self.runs.save_reachability_index(run_id, queries.index)
+        return queries
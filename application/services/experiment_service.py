@@ -0,0 +1,75 @@
+import json
+import traceback
+from typing import Any, Dict, Optional
+from sqlalchemy.orm import Session
+from infrastructure.persistence.models import Experiment
+from infrastructure.persistence.repositories import AnalysisRunRepository, ExperimentRepository
+from domain.services.graph_projection import GraphProjector
+from domain.services.experiments import (
+    ExperimentContext, ExperimentRunner, experiment_params, summarize, CONTEXT_METRICS
+)
+from application.services.analysis_service import STRUCTURAL_EDGES
+
+DEFAULT_EXPERIMENT_SEED = 42
+
+
+class ExperimentService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.runs = AnalysisRunRepository(db)
+        self.repo = ExperimentRepository(db)
+
+    def create(
+        self,
+        run_id: int,
+        kind: str,
+        trials: int,
+        seed: int = DEFAULT_EXPERIMENT_SEED,
+        workers: int = 1,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Experiment:
+        """Validates the request and records a 'running' experiment; call
+        execute() (directly or from a background task) to run it."""
+        params = experiment_params(kind, params)
+        if trials < 1:
+            raise ValueError("trials must be >= 1")
+        run = self.runs.get(run_id)
+        if run is None or run.status != "completed":
+            raise ValueError(f"Run {run_id} is not a completed analysis run")
+        return self.repo.create(run_id, kind, trials, seed, max(1, workers), params)
+
+    def execute(self, experiment_id: int) -> Experiment:
+        """Runs every trial, storing each batch as soon as it finishes, then
+        the summary. The experiment is marked failed on any error."""
+        experiment = self.repo.get(experiment_id)
+        try:
+            context = self._context(experiment.run_id)
+            runner = ExperimentRunner(context, workers=experiment.workers)
+            results = []
+            for batch in runner.run(
+                experiment.kind, experiment.trials, experiment.seed, self._params(experiment)
+            ):
+                self.repo.add_trials(experiment.id, batch)
+                results.extend(batch)
+            results.sort(key=lambda item: item[0])
+            return self.repo.mark_completed(experiment.id, summarize([r for _, r in results]))
+        except Exception as e:
+            self.db.rollback()
+            self.repo.mark_failed(experiment.id, str(e) + "\n" + traceback.format_exc())
+            raise
+
+    def run_experiment(self, run_id: int, kind: str, trials: int, **options) -> Experiment:
+        """create() and execute() in one call."""
+        return self.execute(self.create(run_id, kind, trials, **options).id)
+
+    def _context(self, run_id: int) -> ExperimentContext:
+        csr = self.runs.load_graph_artifact(run_id)
+        if csr is None:
+            raise ValueError(f"Run {run_id} has no saved graph artifact")
+        graph = GraphProjector(csr.to_networkx()).project(edge_types=STRUCTURAL_EDGES)
+        metrics = self.runs.load_component_metrics(run_id, CONTEXT_METRICS)
+        return ExperimentContext.build(graph, metrics)
+
+    @staticmethod
+    def _params(experiment: Experiment) -> Dict[str, Any]:
+        return json.loads(experiment.params)
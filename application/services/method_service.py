@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+import numpy as np
+from sqlalchemy.orm import Session
+from infrastructure.persistence.repositories import AnalysisRunRepository
+from domain.models.method_graph import MethodGraph
+from domain.services.method_metrics import (
+    METHOD_METRICS, calculate_method_metrics, roll_up_metrics, method_rows
+)
+from application.services.run_cache import RunCache
+
+DEFAULT_MAX_LOADED = 4
+
+
+@dataclass
+class MethodLevel:
+    graph: MethodGraph
+    metrics: Dict[str, np.ndarray]  # per method slot
+    classes: Dict[str, np.ndarray]  # rolled up, per class node
+
+
+class MethodService:
+    """Method-level metrics per run, computed from the saved graph artifact
+    on first request and kept for later ones (least recently used runs are
+    dropped beyond `max_loaded`, as in DependencyService)."""
+
+    _loaded: "RunCache[MethodLevel]" = RunCache()
+
+    def __init__(self, db: Session, max_loaded: int = DEFAULT_MAX_LOADED):
+        self.runs = AnalysisRunRepository(db)
+        self.max_loaded = max_loaded
+
+    def method_level(self, run_id: int) -> MethodLevel:
+        return self._loaded.get(run_id, self._load, self.max_loaded)
+
+    def _load(self, run_id: int) -> MethodLevel:
+        run = self.runs.get(run_id)
+        if run is None or run.status != "completed":
+            raise LookupError(f"Run {run_id} is not a completed analysis run")
+        csr = self.runs.load_graph_artifact(run_id)
+        if csr is None:
+            raise LookupError(f"Run {run_id} has no saved graph artifact")
+        graph = MethodGraph(csr)
+        metrics = calculate_method_metrics(graph)
+        return MethodLevel(graph, metrics, roll_up_metrics(graph, metrics))
+
+    def summary(self, run_id: int, component: Optional[str] = None, sort_by: str = "pagerank", limit: int = 50) -> dict:
+        """Method-level figures for one class (its roll-up and its methods),
+        or for the whole run (totals and the top `limit` methods by `sort_by`)."""
+        if sort_by not in METHOD_METRICS:
+            raise ValueError(f"Unknown method metric: {sort_by}")
+        level = self.method_level(run_id)
+        graph = level.graph
+        adj = graph.adjacency()
+        result = {
+            "run_id": run_id,
+            "methods": graph.num_methods,
+            "call_edges": len(adj.sources),
+            "unresolved_calls": graph.unresolved_calls,
+        }
+        if component is None:
+            values = level.metrics[sort_by]
+            top = np.lexsort((np.arange(graph.num_methods), -values))[:limit]
+            rows = method_rows(graph, level.metrics, top.tolist())
+            for row, slot in zip(rows, top.tolist()):
+                row["class"] = graph.csr.id_of(int(graph.owner[slot]))
+            return {**result, "top_methods": rows}
+
+        i = graph.csr.index_of(component)
+        if i is None:
+            raise KeyError(f"Unknown component: {component}")
+        slots = graph.methods_of(i)
+        rows = method_rows(graph, level.metrics, slots)
+        rows.sort(key=lambda row: -row[sort_by])
+        return {
+            **result,
+            "component": component,
+            "roll_up": {
+                name: float(values[i]) if name == "method_pagerank" else int(values[i])
+                for name, values in level.classes.items()
+            },
+            "method_metrics": rows[:limit],
+        }
@@ -0,0 +1,41 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class RunCache(Generic[T]):
+    """Per-run objects built on first use and kept for later requests.
+
+    Services hold one as a class attribute, so it is shared by all their
+    instances (one is created per request). Building happens outside the
+    lock, so other runs keep answering meanwhile; the least recently used
+    runs are dropped beyond `max_entries`.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[int, T]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, run_id: int, build: Callable[[int], T], max_entries: int) -> T:
+        with self._lock:
+            value = self._entries.get(run_id)
+            if value is not None:
+                self._entries.move_to_end(run_id)
+                return value
+        value = build(run_id)
+        with self._lock:
+            self._entries[run_id] = value
+            self._entries.move_to_end(run_id)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def evict(self, run_id: int) -> None:
+        with self._lock:
+            self._entries.pop(run_id, None)
+
+    def __contains__(self, run_id: int) -> bool:
+        with self._lock:
+            return run_id in self._entries
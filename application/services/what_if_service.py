@@ -0,0 +1,50 @@
+from typing import Any, Iterable, Sequence
+from sqlalchemy.orm import Session
+from infrastructure.persistence.repositories import AnalysisRunRepository
+from domain.services.graph_projection import GraphProjector
+from domain.services.what_if import WhatIfSession, RemovalImpact, DEFAULT_CHANGE_LIMIT
+from application.services.analysis_service import STRUCTURAL_EDGES
+from application.services.run_cache import RunCache
+
+DEFAULT_MAX_SESSIONS = 4
+
+
+class WhatIfService:
+    """Answers removal queries from WhatIfSessions kept hot per run.
+
+    A run's graph artifact never changes, so its session is built on the
+    first query and reused by every later one. Sessions are shared by all
+    service instances (one is created per request) and the least recently
+    used one is dropped beyond `max_sessions`.
+    """
+
+    _sessions: "RunCache[WhatIfSession]" = RunCache()
+
+    def __init__(self, db: Session, max_sessions: int = DEFAULT_MAX_SESSIONS):
+        self.runs = AnalysisRunRepository(db)
+        self.max_sessions = max_sessions
+
+    def session(self, run_id: int) -> WhatIfSession:
+        return self._sessions.get(run_id, self._build, self.max_sessions)
+
+    def remove(
+        self,
+        run_id: int,
+        nodes: Iterable[Any] = (),
+        edges: Iterable[Sequence[Any]] = (),
+        limit: int = DEFAULT_CHANGE_LIMIT
+    ) -> RemovalImpact:
+        return self.session(run_id).remove(nodes, edges, limit=limit)
+
+    @classmethod
+    def evict(cls, run_id: int) -> None:
+        cls._sessions.evict(run_id)
+
+    def _build(self, run_id: int) -> WhatIfSession:
+        run = self.runs.get(run_id)
+        if run is None or run.status != "completed":
+            raise LookupError(f"Run {run_id} is not a completed analysis run")
+        csr = self.runs.load_graph_artifact(run_id)
+        if csr is None:
+            raise LookupError(f"Run {run_id} has no saved graph artifact")
+        return WhatIfSession(GraphProjector(csr.to_networkx()).project(edge_types=STRUCTURAL_EDGES))
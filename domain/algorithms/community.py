@@ -0,0 +1,211 @@
+"""Modularity-based communities (Louvain) and label propagation.
+
+Both work on the undirected view of a weighted directed graph: an edge
+u -> v of weight w and v -> u of weight w' become one link of weight
+w + w'. Nodes are integers 0..n-1 and the input is a SparseAdjacency, so
+the edge list is shared with the link-analysis metrics.
+
+- louvain: local moving + aggregation. Local moving uses the queue of
+  Leiden's fast variant: every node is visited once in seeded random order
+  and afterwards only neighbours of nodes that moved are revisited, so a
+  level costs O(edges) in practice instead of repeated full sweeps.
+- label_propagation: weighted asynchronous label propagation, one seeded
+  random visiting order per round, ties kept on the current label (else
+  the smallest), until a round changes nothing.
+
+Both accept `initial`, a partition whose groups must not be split (e.g.
+SCCs): the graph is contracted to one node per group first and the result
+is expanded back. Labels are renumbered 0..k-1 in order of each community's
+first node, so the same graph, parameters and seed always give identical
+output.
+"""
+from collections import deque
+from typing import Optional, Sequence, Tuple
+import numpy as np
+from domain.algorithms.link_analysis import SparseAdjacency
+
+DEFAULT_RESOLUTION = 1.0
+DEFAULT_MAX_LEVELS = 32
+DEFAULT_MAX_ROUNDS = 100
+
+
+class UndirectedWeights:
+    """Symmetric weighted CSR without the diagonal, plus per-node self-loop weight.
+
+    `strength[u]` is the weighted degree, counting self loops twice, and
+    `total` the sum of all link weights (half the strength sum).
+    """
+
+    def __init__(self, n: int, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray):
+        self.n = n
+        loop = sources == targets
+        self.loops = np.bincount(sources[loop], weights=weights[loop], minlength=n)
+        u, v, w = sources[~loop], targets[~loop], weights[~loop]
+        # Both directions, duplicates summed
+        keys = np.concatenate([u * n + v, v * n + u])
+        keys, inverse = np.unique(keys, return_inverse=True)
+        self.weights = np.bincount(inverse, weights=np.concatenate([w, w]), minlength=len(keys))
+        rows = keys // n
+        self.targets = keys % n
+        self.offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=self.offsets[1:])
+        self.strength = np.bincount(rows, weights=self.weights, minlength=n) + 2 * self.loops
+        self.total = float(self.strength.sum()) / 2
+
+    @classmethod
+    def from_adjacency(cls, adj: SparseAdjacency) -> "UndirectedWeights":
+        return cls(adj.n, adj.sources, adj.targets, adj.weights)
+
+    def contract(self, labels: np.ndarray, k: int) -> "UndirectedWeights":
+        """One node per label 0..k-1; links inside a group become its self loop."""
+        rows = np.repeat(np.arange(self.n, dtype=np.int64), np.diff(self.offsets))
+        cu, cv = labels[rows], labels[self.targets]
+        inside = cu == cv
+        # Each link is stored in both directions: keep one for the new loops
+        loops = np.bincount(labels, weights=self.loops, minlength=k)
+        loops += np.bincount(cu[inside], weights=self.weights[inside], minlength=k) / 2
+        outside = ~inside & (cu < cv)
+        sources = np.concatenate([np.arange(k, dtype=np.int64), cu[outside]])
+        targets = np.concatenate([np.arange(k, dtype=np.int64), cv[outside]])
+        return UndirectedWeights(k, sources, targets, np.concatenate([loops, self.weights[outside]]))
+
+
+def canonical(labels: np.ndarray) -> Tuple[np.ndarray, int]:
+    """Labels renumbered 0..k-1 by first occurrence, and k."""
+    _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    rank = np.empty(len(first), dtype=np.int64)
+    rank[np.argsort(first, kind='stable')] = np.arange(len(first))
+    return rank[inverse], len(first)
+
+
+def modularity(graph: UndirectedWeights, labels: np.ndarray, resolution: float = DEFAULT_RESOLUTION) -> float:
+    """Q = Σ_c [ in_c / m - γ (tot_c / 2m)² ] of a partition of `graph`."""
+    if graph.total == 0:
+        return 0.0
+    labels, k = canonical(labels)
+    inside = graph.contract(labels, k).loops
+    tot = np.bincount(labels, weights=graph.strength, minlength=k)
+    m = graph.total
+    return float((inside / m - resolution * (tot / (2 * m)) ** 2).sum())
+
+
+def _local_moving(graph: UndirectedWeights, resolution: float, rng: np.random.Generator) -> Tuple[np.ndarray, bool]:
+    """Moves single nodes between communities while modularity improves.
+
+    Returns (community per node, whether any node moved)."""
+    n = graph.n
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    weights = graph.weights.tolist()
+    strength = graph.strength.tolist()
+    scale = resolution / (2 * graph.total)
+    comm = list(range(n))
+    tot = list(strength)
+    queue = deque(rng.permutation(n).tolist())
+    queued = [True] * n
+    moved = False
+    while queue:
+        u = queue.popleft()
+        queued[u] = False
+        cu, ku = comm[u], strength[u]
+        links = {cu: 0.0}
+        for i in range(offsets[u], offsets[u + 1]):
+            c = comm[targets[i]]
+            links[c] = links.get(c, 0.0) + weights[i]
+        tot[cu] -= ku
+        best, best_gain = cu, links[cu] - tot[cu] * ku * scale
+        for c, w in links.items():
+            gain = w - tot[c] * ku * scale
+            if gain > best_gain:
+                best, best_gain = c, gain
+        tot[best] += ku
+        if best != cu:
+            comm[u] = best
+            moved = True
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if not queued[v] and comm[v] != best:
+                    queued[v] = True
+                    queue.append(v)
+    return np.asarray(comm, dtype=np.int64), moved
+
+
+def _contracted(graph: UndirectedWeights, initial: Optional[Sequence[int]]) -> Tuple[UndirectedWeights, np.ndarray]:
+    """(graph to partition, node -> position in it)."""
+    if initial is None:
+        return graph, np.arange(graph.n, dtype=np.int64)
+    groups, k = canonical(np.asarray(initial, dtype=np.int64))
+    return graph.contract(groups, k), groups
+
+
+def louvain(
+    adj: SparseAdjacency,
+    resolution: float = DEFAULT_RESOLUTION,
+    seed: int = 0,
+    initial: Optional[Sequence[int]] = None,
+    max_levels: int = DEFAULT_MAX_LEVELS
+) -> np.ndarray:
+    """Community per node (0..k-1), maximizing modularity at `resolution`."""
+    if adj.n == 0:
+        return np.zeros(0, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    graph, node_of = _contracted(UndirectedWeights.from_adjacency(adj), initial)
+    if graph.total == 0:
+        return canonical(node_of)[0]
+    for _ in range(max_levels):
+        comm, moved = _local_moving(graph, resolution, rng)
+        if not moved:
+            break
+        comm, k = canonical(comm)
+        node_of = comm[node_of]
+        graph = graph.contract(comm, k)
+    return canonical(node_of)[0]
+
+
+def label_propagation(
+    adj: SparseAdjacency,
+    seed: int = 0,
+    initial: Optional[Sequence[int]] = None,
+    max_rounds: int = DEFAULT_MAX_ROUNDS
+) -> np.ndarray:
+    """Community per node (0..k-1) by weighted label propagation."""
+    if adj.n == 0:
+        return np.zeros(0, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    graph, node_of = _contracted(UndirectedWeights.from_adjacency(adj), initial)
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    weights = graph.weights.tolist()
+    label = list(range(graph.n))
+    for _ in range(max_rounds):
+        changed = False
+        for u in rng.permutation(graph.n).tolist():
+            if offsets[u] == offsets[u + 1]:
+                continue
+            votes = {}
+            for i in range(offsets[u], offsets[u + 1]):
+                lv = label[targets[i]]
+                votes[lv] = votes.get(lv, 0.0) + weights[i]
+            top = max(votes.values())
+            if votes.get(label[u]) == top:
+                continue
+            label[u] = min(lv for lv, w in votes.items() if w == top)
+            changed = True
+        if not changed:
+            break
+    return canonical(np.asarray(label, dtype=np.int64)[node_of])[0]
+
+
+def community_weights(adj: SparseAdjacency, labels: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(size, internal weight, external weight) per community 0..k-1.
+
+    Internal weight sums the directed edges with both ends in the community,
+    external weight those with exactly one (incoming and outgoing).
+    """
+    size = np.bincount(labels, minlength=k)
+    cu, cv = labels[adj.sources], labels[adj.targets]
+    inside = cu == cv
+    internal = np.bincount(cu[inside], weights=adj.weights[inside], minlength=k)
+    external = (np.bincount(cu[~inside], weights=adj.weights[~inside], minlength=k)
+                + np.bincount(cv[~inside], weights=adj.weights[~inside], minlength=k))
+    return size, internal, external
@@ -0,0 +1,149 @@
+"""Whole-graph reachability via the condensation DAG.
+
+Nodes are dense integers `0..n-1` and the graph is given as successor
+lists (`succ[u]` = targets of u), so the same code serves NetworkX graphs
+(after indexing) and CSRGraph rows.
+
+Descendant sets are Python ints used as bitsets. Every strongly connected
+component owns a contiguous run of bits (one per member), and the
+components are swept in reverse topological order: a component's set is
+its own bits OR the sets of its successor components. All members of a
+component share that one set, and a set is released as soon as every
+component that reads it has been swept.
+
+Both functions accept an optional `check` callable, invoked periodically,
+that aborts the computation by raising.
+"""
+from array import array
+from typing import Callable, List, Optional, Sequence, Tuple
+
+# Tarjan steps between `check` calls (power of two minus one, used as a mask)
+CHECK_MASK = 0xFFF
+
+
+def strongly_connected_components(
+    succ: Sequence[Sequence[int]],
+    check: Optional[Callable[[], None]] = None
+) -> Tuple[array, int]:
+    """Iterative Tarjan.
+
+    Returns:
+        (comp_of, n_comp): component index per node, and the number of
+        components. Components are numbered in reverse topological order
+        (a component's successors always have smaller numbers).
+    """
+    n = len(succ)
+    index = array('i', [-1]) * n
+    low = array('i', [0]) * n
+    on_stack = bytearray(n)
+    comp_of = array('i', [-1]) * n
+    stack: List[int] = []
+    counter = 0
+    n_comp = 0
+    steps = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        # Explicit DFS stack of (node, next successor position)
+        work = [(root, 0)]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        while work:
+            steps += 1
+            if check is not None and not steps & CHECK_MASK:
+                check()
+            v, pos = work[-1]
+            targets = succ[v]
+            if pos < len(targets):
+                work[-1] = (v, pos + 1)
+                w = targets[pos]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append((w, 0))
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[v] < low[parent]:
+                    low[parent] = low[v]
+            if low[v] == index[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = 0
+                    comp_of[w] = n_comp
+                    if w == v:
+                        break
+                n_comp += 1
+
+    return comp_of, n_comp
+
+
+def descendant_counts(
+    succ: Sequence[Sequence[int]],
+    comp_of: Sequence[int],
+    n_comp: int,
+    check: Optional[Callable[[], None]] = None
+) -> List[int]:
+    """Number of nodes reachable from each node, excluding the node itself.
+
+    Args:
+        succ: Successor lists over nodes 0..n-1.
+        comp_of: SCC index per node, in [0, n_comp). Any numbering works.
+        n_comp: Number of components.
+        check: Called once per swept component; raise from it to abort.
+    """
+    n = len(succ)
+    size = [0] * n_comp
+    for c in comp_of:
+        size[c] += 1
+
+    # Condensation edges, deduplicated, in both directions
+    comp_succ: List[set] = [set() for _ in range(n_comp)]
+    for u in range(n):
+        cu = comp_of[u]
+        for v in succ[u]:
+            cv = comp_of[v]
+            if cv != cu:
+                comp_succ[cu].add(cv)
+    comp_pred: List[List[int]] = [[] for _ in range(n_comp)]
+    for c in range(n_comp):
+        for d in comp_succ[c]:
+            comp_pred[d].append(c)
+
+    # Reverse topological sweep (Kahn from the sinks). Bits are handed out
+    # in sweep order, so a set only spans bits of already-swept components.
+    out_left = [len(s) for s in comp_succ]
+    readers_left = [len(p) for p in comp_pred]
+    ready = [c for c in range(n_comp) if out_left[c] == 0]
+    reach = {}
+    count = [0] * n_comp
+    next_bit = 0
+    while ready:
+        if check is not None:
+            check()
+        c = ready.pop()
+        bits = ((1 << size[c]) - 1) << next_bit
+        next_bit += size[c]
+        for d in comp_succ[c]:
+            bits |= reach[d]
+            readers_left[d] -= 1
+            if readers_left[d] == 0:
+                del reach[d]  # every predecessor has read it
+        count[c] = bits.bit_count()
+        if readers_left[c]:
+            reach[c] = bits
+        for p in comp_pred[c]:
+            out_left[p] -= 1
+            if out_left[p] == 0:
+                ready.append(p)
+
+    return [count[comp_of[u]] - 1 for u in range(n)]
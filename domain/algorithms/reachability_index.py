@@ -0,0 +1,147 @@
+"""2-hop reachability labels on the condensation DAG.
+
+Every strongly connected component c gets two small label sets of
+"landmark" components: L_out(c), landmarks c reaches, and L_in(c),
+landmarks that reach c. They are built so that for any components a, b
+
+    a reaches b  <=>  L_out(a) ∩ L_in(b) ≠ ∅
+
+(pruned landmark labeling, Yano et al. 2013). Landmarks are taken in
+decreasing (in-degree + 1) · (out-degree + 1) order. Each one runs a
+forward and a backward BFS that stops wherever the labels already answer
+the query, so hubs cover most pairs and later searches stay short.
+
+Labels are stored as landmark ranks in CSR arrays (`out_offsets` /
+`out_labels`, `in_offsets` / `in_labels`), sorted within each component,
+together with `comp_of`. A query is two array lookups and an intersection
+of two short sorted runs. Tarjan's numbering adds a free negative test:
+a component only reaches components with smaller numbers.
+"""
+from array import array
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence
+from domain.algorithms.reachability import strongly_connected_components
+
+# Landmarks between `check` calls
+CHECK_EVERY = 256
+
+_INDEX_CODE = 'i'
+_OFFSET_CODE = 'q'
+
+# Array attributes, in the order they are persisted
+ARRAYS = ("comp_of", "out_offsets", "out_labels", "in_offsets", "in_labels")
+
+
+class ReachabilityIndex:
+    """Reachability between nodes 0..n-1 of the graph it was built from."""
+
+    def __init__(
+        self,
+        comp_of: Sequence[int],
+        out_offsets: Sequence[int],
+        out_labels: Sequence[int],
+        in_offsets: Sequence[int],
+        in_labels: Sequence[int]
+    ):
+        self.comp_of = comp_of
+        self.out_offsets = out_offsets
+        self.out_labels = out_labels
+        self.in_offsets = in_offsets
+        self.in_labels = in_labels
+
+    @property
+    def n(self) -> int:
+        return len(self.comp_of)
+
+    @property
+    def n_comp(self) -> int:
+        return len(self.out_offsets) - 1
+
+    @property
+    def label_entries(self) -> int:
+        return len(self.out_labels) + len(self.in_labels)
+
+    def arrays(self) -> Dict[str, array]:
+        return {name: getattr(self, name) for name in ARRAYS}
+
+    def reaches(self, u: int, v: int) -> bool:
+        """Whether a directed path leads from u to v (always true for u == v)."""
+        cu, cv = self.comp_of[u], self.comp_of[v]
+        if cu == cv:
+            return True
+        if cv > cu:
+            return False
+        out = self.out_labels[self.out_offsets[cu]:self.out_offsets[cu + 1]]
+        into = self.in_labels[self.in_offsets[cv]:self.in_offsets[cv + 1]]
+        # Both runs are sorted: merge until a common landmark turns up
+        i = j = 0
+        while i < len(out) and j < len(into):
+            a, b = out[i], into[j]
+            if a == b:
+                return True
+            if a < b:
+                i += 1
+            else:
+                j += 1
+        return False
+
+    @classmethod
+    def build(
+        cls,
+        succ: Sequence[Sequence[int]],
+        check: Optional[Callable[[], None]] = None
+    ) -> "ReachabilityIndex":
+        """Index over successor lists `succ` (nodes 0..n-1)."""
+        comp_of, n_comp = strongly_connected_components(succ, check)
+        comp_succ: List[set] = [set() for _ in range(n_comp)]
+        for u, targets in enumerate(succ):
+            cu = comp_of[u]
+            for v in targets:
+                cv = comp_of[v]
+                if cv != cu:
+                    comp_succ[cu].add(cv)
+        down = [list(s) for s in comp_succ]
+        up: List[List[int]] = [[] for _ in range(n_comp)]
+        for c, targets in enumerate(down):
+            for d in targets:
+                up[d].append(c)
+
+        order = sorted(range(n_comp), key=lambda c: (-(len(up[c]) + 1) * (len(down[c]) + 1), c))
+        # Landmarks are added in rank order, so every label list stays sorted
+        out_sets: List[List[int]] = [[] for _ in range(n_comp)]
+        in_sets: List[List[int]] = [[] for _ in range(n_comp)]
+        for rank, root in enumerate(order):
+            if check is not None and not rank % CHECK_EVERY:
+                check()
+            # Forward: root reaches w; skip w if some earlier landmark
+            # already proves it (it is then in L_out(root) and L_in(w))
+            root_out = set(out_sets[root])
+            _pruned_bfs(root, rank, down, in_sets, root_out)
+            root_in = set(in_sets[root])
+            _pruned_bfs(root, rank, up, out_sets, root_in)
+
+        return cls(comp_of, *_csr(out_sets), *_csr(in_sets))
+
+
+def _pruned_bfs(root: int, rank: int, adj: List[List[int]], labels: List[List[int]], covered: set) -> None:
+    """Appends `rank` to labels[w] for every w found from root whose pair is not covered yet."""
+    seen = {root}
+    queue = deque([root])
+    while queue:
+        w = queue.popleft()
+        if covered and not covered.isdisjoint(labels[w]):
+            continue
+        labels[w].append(rank)
+        for x in adj[w]:
+            if x not in seen:
+                seen.add(x)
+                queue.append(x)
+
+
+def _csr(rows: List[List[int]]):
+    offsets = array(_OFFSET_CODE, [0])
+    values = array(_INDEX_CODE)
+    for row in rows:
+        values.extend(row)
+        offsets.append(len(values))
+    return offsets, values
@@ -0,0 +1,413 @@
+"""Compact, integer-indexed graph core.
+
+Node IDs are interned to dense integers (insertion order) and adjacency is
+stored as compressed sparse rows over typed `array` buffers: forward
+(successors) and reverse (predecessors), each with parallel edge-kind and
+weight columns. Strings (IDs, names, file paths, method names) live once in
+a shared string table; node attributes are integer columns into it. Each
+node's method calls, (calling method, target class ID, called method), are
+kept as three more string columns; MethodGraph resolves them on demand.
+
+Pure standard library, so it can back GraphModel without adding weight to
+the NetworkX path; `to_networkx()` materializes a DiGraph on demand.
+"""
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from domain.models.edge import EdgeType
+from domain.models.node import NodeType
+
+# Stable small-integer codes for edge kinds and node types
+EDGE_KINDS: List[str] = [et.value for et in EdgeType]
+EDGE_KIND_CODE: Dict[str, int] = {k: i for i, k in enumerate(EDGE_KINDS)}
+NODE_TYPES: List[str] = [nt.value for nt in NodeType]
+NODE_TYPE_CODE: Dict[str, int] = {t: i for i, t in enumerate(NODE_TYPES)}
+
+NO_STRING = -1  # string-table index meaning "absent" (e.g. no file_path)
+
+# Array typecodes: node and string indices, CSR offsets, codes, weights
+INDEX_CODE = 'i'
+OFFSET_CODE = 'q'
+CODE_CODE = 'B'
+WEIGHT_CODE = 'I'
+
+
+class StringTable:
+    """Append-only interned strings: each distinct string is stored once."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            self._index[value] = idx
+            self.strings.append(value)
+        return idx
+
+    def get(self, idx: int) -> Optional[str]:
+        return None if idx == NO_STRING else self.strings[idx]
+
+    def find(self, value: str) -> Optional[int]:
+        return self._index.get(value)
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+class CSRGraph:
+    """Immutable directed graph in CSR form. Build via CSRGraphBuilder or from_networkx().
+
+    Node `i`'s successors are `fwd_targets[fwd_offsets[i]:fwd_offsets[i+1]]`,
+    with `fwd_kinds` / `fwd_weights` aligned to `fwd_targets`. The reverse
+    rows hold predecessors plus `rev_edge`, the position of the same edge in
+    the forward arrays (kinds/weights are stored only once).
+    """
+
+    def __init__(
+        self,
+        strings: StringTable,
+        node_id: array,
+        node_name: array,
+        node_type: array,
+        node_file: array,
+        method_offsets: array,
+        method_names: array,
+        fwd_offsets: array,
+        fwd_targets: array,
+        fwd_kinds: array,
+        fwd_weights: array,
+        call_offsets: Optional[array] = None,
+        call_from: Optional[array] = None,
+        call_class: Optional[array] = None,
+        call_method: Optional[array] = None
+    ):
+        self.strings = strings
+        self.node_id = node_id
+        self.node_name = node_name
+        self.node_type = node_type
+        self.node_file = node_file
+        self.method_offsets = method_offsets
+        self.method_names = method_names
+        self.fwd_offsets = fwd_offsets
+        self.fwd_targets = fwd_targets
+        self.fwd_kinds = fwd_kinds
+        self.fwd_weights = fwd_weights
+        # Per-node method calls (string indices), rows like the methods'
+        if call_offsets is None:
+            call_offsets = array(OFFSET_CODE, [0]) * (len(node_id) + 1)
+        self.call_offsets = call_offsets
+        self.call_from = call_from if call_from is not None else array(INDEX_CODE)
+        self.call_class = call_class if call_class is not None else array(INDEX_CODE)
+        self.call_method = call_method if call_method is not None else array(INDEX_CODE)
+        self._index: Optional[Dict[int, int]] = None  # id string index -> node, built on first lookup
+        self._build_reverse()
+
+    def _build_reverse(self):
+        n = self.num_nodes
+        counts = array(OFFSET_CODE, [0]) * (n + 1)
+        for t in self.fwd_targets:
+            counts[t + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        self.rev_offsets = counts
+        self.rev_sources = array(INDEX_CODE, [0]) * len(self.fwd_targets)
+        self.rev_edge = array(OFFSET_CODE, [0]) * len(self.fwd_targets)
+        cursor = counts[:n]
+        offsets = self.fwd_offsets
+        targets = self.fwd_targets
+        for u in range(n):
+            for pos in range(offsets[u], offsets[u + 1]):
+                t = targets[pos]
+                slot = cursor[t]
+                self.rev_sources[slot] = u
+                self.rev_edge[slot] = pos
+                cursor[t] = slot + 1
+
+    # ── Size ─────────────────────────────────────────────────────────────
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_id)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.fwd_targets)
+
+    # ── Node lookup ──────────────────────────────────────────────────────
+
+    def index_of(self, node_id: str) -> Optional[int]:
+        if self._index is None:
+            self._index = {sid: i for i, sid in enumerate(self.node_id)}
+        sid = self.strings.find(node_id)
+        return None if sid is None else self._index.get(sid)
+
+    def id_of(self, i: int) -> str:
+        return self.strings.strings[self.node_id[i]]
+
+    def node_ids(self) -> List[str]:
+        table = self.strings.strings
+        return [table[sid] for sid in self.node_id]
+
+    def type_of(self, i: int) -> str:
+        return NODE_TYPES[self.node_type[i]]
+
+    def node_attrs(self, i: int) -> Dict[str, Any]:
+        """Attributes as GraphModel stores them on NetworkX nodes."""
+        table = self.strings.strings
+        return {
+            'name': table[self.node_name[i]],
+            'type': NODE_TYPES[self.node_type[i]],
+            'file_path': self.strings.get(self.node_file[i]),
+            'methods': [
+                table[m] for m in
+                self.method_names[self.method_offsets[i]:self.method_offsets[i + 1]]
+            ],
+            'calls': self.calls_of(i),
+        }
+
+    def calls_of(self, i: int) -> List[Tuple[str, str, str]]:
+        """(calling method, target class ID, called method) for node i's method calls."""
+        table = self.strings.strings
+        return [
+            (table[self.call_from[c]], table[self.call_class[c]], table[self.call_method[c]])
+            for c in range(self.call_offsets[i], self.call_offsets[i + 1])
+        ]
+
+    # ── Adjacency ────────────────────────────────────────────────────────
+
+    def successors(self, i: int) -> Sequence[int]:
+        return self.fwd_targets[self.fwd_offsets[i]:self.fwd_offsets[i + 1]]
+
+    def predecessors(self, i: int) -> Sequence[int]:
+        return self.rev_sources[self.rev_offsets[i]:self.rev_offsets[i + 1]]
+
+    def out_degree(self, i: int) -> int:
+        return self.fwd_offsets[i + 1] - self.fwd_offsets[i]
+
+    def in_degree(self, i: int) -> int:
+        return self.rev_offsets[i + 1] - self.rev_offsets[i]
+
+    def edges(self) -> Iterator[Tuple[int, int, str, int]]:
+        """Yield (source, target, kind, weight) in forward CSR order."""
+        offsets = self.fwd_offsets
+        for u in range(self.num_nodes):
+            for pos in range(offsets[u], offsets[u + 1]):
+                yield u, self.fwd_targets[pos], EDGE_KINDS[self.fwd_kinds[pos]], self.fwd_weights[pos]
+
+    # ── Interop ──────────────────────────────────────────────────────────
+
+    def to_networkx(self):
+        """Materialize an equivalent networkx.DiGraph (same node/edge attributes)."""
+        import networkx as nx
+        g = nx.DiGraph()
+        ids = self.node_ids()
+        g.add_nodes_from((ids[i], self.node_attrs(i)) for i in range(self.num_nodes))
+        g.add_edges_from(
+            (ids[u], ids[v], {'type': kind, 'weight': weight})
+            for u, v, kind, weight in self.edges()
+        )
+        return g
+
+    @classmethod
+    def from_networkx(cls, graph) -> 'CSRGraph':
+        """Build from a DiGraph, preserving node order and per-node successor order."""
+        builder = CSRGraphBuilder()
+        for n, data in graph.nodes(data=True):
+            builder.add_node(
+                n,
+                name=data.get('name', n),
+                node_type=data.get('type', NodeType.CLASS.value),
+                file_path=data.get('file_path'),
+                methods=data.get('methods') or (),
+                calls=data.get('calls') or ()
+            )
+        for u, v, data in graph.edges(data=True):
+            builder.add_edge(u, v, data.get('type', EdgeType.UNKNOWN.value), data.get('weight', 1))
+        return builder.build()
+
+    def to_builder(self) -> 'CSRGraphBuilder':
+        """A builder pre-loaded with this graph's nodes and merged edges, for further growth."""
+        builder = CSRGraphBuilder()
+        builder.strings = self.strings
+        builder._node_pos = {sid: i for i, sid in enumerate(self.node_id)}
+        builder.node_id = array(INDEX_CODE, self.node_id)
+        builder.node_name = array(INDEX_CODE, self.node_name)
+        builder.node_type = array(CODE_CODE, self.node_type)
+        builder.node_file = array(INDEX_CODE, self.node_file)
+        builder.method_offsets = array(OFFSET_CODE, self.method_offsets)
+        builder.method_names = array(INDEX_CODE, self.method_names)
+        builder.call_offsets = array(OFFSET_CODE, self.call_offsets)
+        builder.call_from = array(INDEX_CODE, self.call_from)
+        builder.call_class = array(INDEX_CODE, self.call_class)
+        builder.call_method = array(INDEX_CODE, self.call_method)
+        for u in range(self.num_nodes):
+            count = self.fwd_offsets[u + 1] - self.fwd_offsets[u]
+            builder.edge_src.extend(array(INDEX_CODE, [self.node_id[u]]) * count)
+        builder.edge_dst = array(INDEX_CODE, (self.node_id[t] for t in self.fwd_targets))
+        builder.edge_kind = array(CODE_CODE, self.fwd_kinds)
+        builder.edge_weight = array(WEIGHT_CODE, self.fwd_weights)
+        return builder
+
+    def to_json_dict(self) -> dict:
+        """Deterministic node-link dict, identical to GraphModel.to_json_dict on NetworkX."""
+        ids = self.node_ids()
+        nodes = [{**self.node_attrs(i), 'id': ids[i]} for i in range(self.num_nodes)]
+        links = [
+            {'type': kind, 'weight': weight, 'source': ids[u], 'target': ids[v]}
+            for u, v, kind, weight in self.edges()
+        ]
+        return {
+            'directed': True,
+            'multigraph': False,
+            'graph': {},
+            'nodes': sorted(nodes, key=lambda k: k['id']),
+            'links': sorted(links, key=lambda k: (k['source'], k['target'])),
+        }
+
+
+class CSRGraphBuilder:
+    """Accumulates nodes and edges, then freezes them into a CSRGraph.
+
+    Same rules as GraphModel: the first definition of a node wins,
+    self-loops are rejected, edges whose endpoints never appear as nodes
+    are dropped at build time, and duplicate (source, target) edges keep
+    the first edge's kind while their weights are summed. Edges may arrive
+    before their endpoints; resolution happens in `build()`.
+    """
+
+    def __init__(self):
+        self.strings = StringTable()
+        self._node_pos: Dict[int, int] = {}  # id string index -> node position
+        self.node_id = array(INDEX_CODE)
+        self.node_name = array(INDEX_CODE)
+        self.node_type = array(CODE_CODE)
+        self.node_file = array(INDEX_CODE)
+        self.method_offsets = array(OFFSET_CODE, [0])
+        self.method_names = array(INDEX_CODE)
+        self.call_offsets = array(OFFSET_CODE, [0])
+        self.call_from = array(INDEX_CODE)
+        self.call_class = array(INDEX_CODE)
+        self.call_method = array(INDEX_CODE)
+        # Staged edges as parallel columns of string indices / codes
+        self.edge_src = array(INDEX_CODE)
+        self.edge_dst = array(INDEX_CODE)
+        self.edge_kind = array(CODE_CODE)
+        self.edge_weight = array(WEIGHT_CODE)
+        # Distinct (source, target) pairs dropped by the last build()
+        self.unresolved = 0
+
+    def has_node(self, node_id: str) -> bool:
+        sid = self.strings.find(node_id)
+        return sid is not None and sid in self._node_pos
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_id)
+
+    def add_node(
+        self,
+        node_id: str,
+        name: str,
+        node_type: str,
+        file_path: Optional[str] = None,
+        methods: Iterable[str] = (),
+        calls: Iterable[Tuple[str, str, str]] = ()
+    ):
+        sid = self.strings.intern(node_id)
+        if sid in self._node_pos:
+            return
+        self._node_pos[sid] = len(self.node_id)
+        self.node_id.append(sid)
+        self.node_name.append(self.strings.intern(name))
+        self.node_type.append(NODE_TYPE_CODE.get(node_type, NODE_TYPE_CODE[NodeType.UNKNOWN.value]))
+        self.node_file.append(self.strings.intern(file_path))
+        for method in methods:
+            self.method_names.append(self.strings.intern(method))
+        self.method_offsets.append(len(self.method_names))
+        intern = self.strings.intern
+        for caller, target, method in calls:
+            self.call_from.append(intern(caller))
+            self.call_class.append(intern(target))
+            self.call_method.append(intern(method))
+        self.call_offsets.append(len(self.call_from))
+
+    def add_edge(self, source_id: str, target_id: str, kind: str, weight: int = 1):
+        if source_id == target_id:
+            return  # Reject self-loops
+        self.edge_src.append(self.strings.intern(source_id))
+        self.edge_dst.append(self.strings.intern(target_id))
+        self.edge_kind.append(EDGE_KIND_CODE.get(kind, EDGE_KIND_CODE[EdgeType.UNKNOWN.value]))
+        self.edge_weight.append(weight)
+
+    def build(self) -> CSRGraph:
+        n = len(self.node_id)
+        pos = self._node_pos
+
+        # Merge duplicates; per source, targets keep first-occurrence order
+        merged: Dict[int, int] = {}  # u * n + v -> pair slot
+        dropped = set()
+        pair_src = array(INDEX_CODE)
+        pair_dst = array(INDEX_CODE)
+        pair_kind = array(CODE_CODE)
+        pair_weight = array(WEIGHT_CODE)
+        for src, dst, kind, weight in zip(self.edge_src, self.edge_dst, self.edge_kind, self.edge_weight):
+            u = pos.get(src)
+            v = pos.get(dst)
+            if u is None or v is None:
+                dropped.add((src, dst))  # endpoint never defined
+                continue
+            key = u * n + v
+            slot = merged.get(key)
+            if slot is None:
+                merged[key] = len(pair_src)
+                pair_src.append(u)
+                pair_dst.append(v)
+                pair_kind.append(kind)
+                pair_weight.append(weight)
+            else:
+                pair_weight[slot] += weight
+        self.unresolved = len(dropped)
+        del merged, dropped
+
+        # Counting sort by source (stable → keeps first-occurrence order)
+        offsets = array(OFFSET_CODE, [0]) * (n + 1)
+        for u in pair_src:
+            offsets[u + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        m = len(pair_src)
+        targets = array(INDEX_CODE, [0]) * m
+        kinds = array(CODE_CODE, [0]) * m
+        weights = array(WEIGHT_CODE, [0]) * m
+        cursor = offsets[:n]
+        for slot in range(m):
+            u = pair_src[slot]
+            at = cursor[u]
+            targets[at] = pair_dst[slot]
+            kinds[at] = pair_kind[slot]
+            weights[at] = pair_weight[slot]
+            cursor[u] = at + 1
+
+        # Node columns are copied so the builder can keep accepting nodes;
+        # the string table is append-only and safe to share.
+        return CSRGraph(
+            strings=self.strings,
+            node_id=array(INDEX_CODE, self.node_id),
+            node_name=array(INDEX_CODE, self.node_name),
+            node_type=array(CODE_CODE, self.node_type),
+            node_file=array(INDEX_CODE, self.node_file),
+            method_offsets=array(OFFSET_CODE, self.method_offsets),
+            method_names=array(INDEX_CODE, self.method_names),
+            fwd_offsets=offsets,
+            fwd_targets=targets,
+            fwd_kinds=kinds,
+            fwd_weights=weights,
+            call_offsets=array(OFFSET_CODE, self.call_offsets),
+            call_from=array(INDEX_CODE, self.call_from),
+            call_class=array(INDEX_CODE, self.call_class),
+            call_method=array(INDEX_CODE, self.call_method)
+        )
@@ -1,51 +1,327 @@
 import networkx as nx
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 from domain.models.node import Node, NodeType
 from domain.models.edge import Edge, EdgeType
+from domain.models.csr_graph import CSRGraph, CSRGraphBuilder, NODE_TYPE_CODE
+from domain.models.method_graph import MethodGraph
+
+BACKEND_NETWORKX = "networkx"
+BACKEND_CSR = "csr"
+
+
+class NodeBatch(NamedTuple):
+    """Columnar nodes for `GraphModel.add_nodes_bulk`: parallel sequences, one entry per node."""
+    ids: Sequence[str]
+    names: Sequence[str]
+    types: Sequence[str]  # NodeType values
+    file_paths: Sequence[Optional[str]]
+    methods: Sequence[List[str]]
+    calls: Sequence[List[Tuple[str, str, str]]] = ()  # (caller, target class ID, method) per node
+
+
+class EdgeBatch(NamedTuple):
+    """Columnar edges for `GraphModel.add_edges_bulk`: parallel sequences, one entry per edge."""
+    sources: Sequence[str]
+    targets: Sequence[str]
+    kinds: Sequence[str]  # EdgeType values
+
 
 class GraphModel:
-    def __init__(self):
-        self.graph = nx.DiGraph()
+    def __init__(self, backend: str = BACKEND_NETWORKX):
+        """
+        Args:
+            backend: "networkx" (mutable DiGraph, the default) or "csr" (compact
+                     integer-indexed arrays, see CSRGraph). With "csr", edges are
+                     resolved when the graph is first read, `csr` gives the compact
+                     form and `graph` a NetworkX DiGraph materialized on demand.
+        """
+        if backend not in (BACKEND_NETWORKX, BACKEND_CSR):
+            raise ValueError(f"Unknown graph backend: {backend}")
+        self.backend = backend
+        self._nx: Optional[nx.DiGraph] = nx.DiGraph() if backend == BACKEND_NETWORKX else None
+        self._builder: Optional[CSRGraphBuilder] = CSRGraphBuilder() if backend == BACKEND_CSR else None
+        self._csr: Optional[CSRGraph] = None
+        # Streaming ingest: (source, target) -> [first edge type, count] for
+        # edges that arrived before one of their endpoints.
+        self._pending_edges: Dict[Tuple[str, str], List] = {}
+        self._methods: Optional[MethodGraph] = None
+
+    @property
+    def graph(self) -> nx.DiGraph:
+        """The NetworkX DiGraph. For the CSR backend this is a materialized, cached copy."""
+        if self._nx is None:
+            self._nx = self.csr.to_networkx()
+        return self._nx
+
+    @property
+    def csr(self) -> CSRGraph:
+        """The compact CSR form. For the NetworkX backend this is a converted copy,
+        kept until the graph is next changed through this model."""
+        if self._csr is None:
+            if self.backend == BACKEND_NETWORKX:
+                self._csr = CSRGraph.from_networkx(self._nx)
+            else:
+                self._csr = self._builder.build()
+                self._builder = None
+        return self._csr
+
+    def method_graph(self) -> MethodGraph:
+        """Method-level view over the CSR form (see MethodGraph); nothing is
+        resolved until it is used. Kept while the graph is unchanged."""
+        csr = self.csr
+        if self._methods is None or self._methods.csr is not csr:
+            self._methods = MethodGraph(csr)
+        return self._methods
+
+    def _csr_builder(self) -> CSRGraphBuilder:
+        """Builder for CSR-backend mutations, thawing a frozen graph if needed."""
+        if self._builder is None:
+            self._builder = self._csr.to_builder()
+        self._csr = None
+        self._nx = None
+        return self._builder
+
+    def _nx_changed(self):
+        """Drops the CSR copy of a NetworkX-backend graph that is about to change."""
+        self._csr = None
 
     def add_node(self, node: Node):
         """Adds a node to the graph if it doesn't exist."""
-        if not self.graph.has_node(node.id):
-            self.graph.add_node(
-                node.id, 
-                name=node.name, 
+        if self.backend == BACKEND_CSR:
+            self._csr_builder().add_node(
+                node.id,
+                name=node.name,
+                node_type=node.node_type.value,
+                file_path=node.file_path,
+                methods=node.methods,
+                calls=node.calls
+            )
+            return
+
+        if not self._nx.has_node(node.id):
+            self._nx_changed()
+            self._nx.add_node(
+                node.id,
+                name=node.name,
                 type=node.node_type.value,
                 file_path=node.file_path,
-                methods=node.methods
+                methods=node.methods,
+                calls=[tuple(call) for call in node.calls]
             )
 
     def add_edge(self, edge: Edge):
-        """Adds a directed edge between two nodes only if both exist and it is not a self-loop."""
+        """Adds a directed edge between two nodes only if both exist and it is not a self-loop.
+
+        The CSR backend checks endpoints when the graph is next read rather
+        than immediately, like `stream_edge`.
+        """
         if edge.source_id == edge.target_id:
             return  # Reject self-loops
 
-        if self.graph.has_node(edge.source_id) and self.graph.has_node(edge.target_id):
-            if self.graph.has_edge(edge.source_id, edge.target_id):
+        if self.backend == BACKEND_CSR:
+            self._csr_builder().add_edge(edge.source_id, edge.target_id, edge.edge_type.value)
+            return
+
+        if self._nx.has_node(edge.source_id) and self._nx.has_node(edge.target_id):
+            self._nx_changed()
+            if self._nx.has_edge(edge.source_id, edge.target_id):
                 # Increment weight for duplicate calls to formalize frequency
-                self.graph[edge.source_id][edge.target_id]['weight'] += 1
+                self._nx[edge.source_id][edge.target_id]['weight'] += 1
             else:
-                self.graph.add_edge(
-                    edge.source_id, 
-                    edge.target_id, 
+                self._nx.add_edge(
+                    edge.source_id,
+                    edge.target_id,
                     type=edge.edge_type.value,
                     weight=1
                 )
-        
+
+    def stream_edge(self, edge: Edge):
+        """Adds an edge during streaming ingest, buffering it if an endpoint is not known yet.
+
+        Call `resolve_pending_edges()` once all nodes have been added. The
+        resulting edge types and weights are identical to adding every node
+        first and then every edge via `add_edge`.
+        """
+        if edge.source_id == edge.target_id:
+            return  # Reject self-loops
+
+        if self.backend == BACKEND_CSR:
+            # The CSR builder already defers endpoint resolution
+            self.add_edge(edge)
+            return
+
+        key = (edge.source_id, edge.target_id)
+        pending = self._pending_edges.get(key)
+        if pending is not None:
+            # Keep the pair buffered so its first-seen type wins
+            pending[1] += 1
+        elif self._nx.has_node(edge.source_id) and self._nx.has_node(edge.target_id):
+            self.add_edge(edge)
+        else:
+            self._pending_edges[key] = [edge.edge_type.value, 1]
+
+    def resolve_pending_edges(self) -> int:
+        """Adds buffered streaming edges whose endpoints now exist and drops the rest.
+
+        Returns:
+            Number of buffered (source, target) pairs that could not be resolved.
+        """
+        if self.backend == BACKEND_CSR:
+            if self._builder is None:
+                return 0  # already frozen, nothing pending
+            builder = self._builder
+            self._csr = builder.build()
+            self._builder = None
+            return builder.unresolved
+
+        if self._pending_edges:
+            self._nx_changed()
+        unresolved = 0
+        for (source, target), (edge_type, count) in self._pending_edges.items():
+            if not (self._nx.has_node(source) and self._nx.has_node(target)):
+                unresolved += 1
+            elif self._nx.has_edge(source, target):
+                self._nx[source][target]['weight'] += count
+            else:
+                self._nx.add_edge(source, target, type=edge_type, weight=count)
+        self._pending_edges.clear()
+        return unresolved
+
+    def add_nodes_bulk(
+        self,
+        ids: Sequence[str],
+        names: Sequence[str],
+        types: Sequence[str],
+        file_paths: Optional[Sequence[Optional[str]]] = None,
+        methods: Optional[Sequence[List[str]]] = None,
+        calls: Optional[Sequence[List[Tuple[str, str, str]]]] = None
+    ):
+        """Columnar `add_node`: same first-definition-wins rule, no Node objects.
+
+        `types` are NodeType values. Accepts a NodeBatch unpacked (`*batch`).
+        """
+        if file_paths is None:
+            file_paths = [None] * len(ids)
+        if methods is None:
+            methods = [[] for _ in ids]
+        if not calls:
+            calls = [()] * len(ids)
+
+        if self.backend == BACKEND_CSR:
+            add = self._csr_builder().add_node
+            for node_id, name, node_type, file_path, node_methods, node_calls in zip(
+                ids, names, types, file_paths, methods, calls
+            ):
+                add(node_id, name=name, node_type=node_type, file_path=file_path,
+                    methods=node_methods, calls=node_calls)
+            return
+
+        self._nx_changed()
+        known = self._nx.nodes
+        self._nx.add_nodes_from(
+            (node_id, {
+                'name': name, 'type': node_type, 'file_path': file_path, 'methods': node_methods,
+                'calls': [tuple(call) for call in node_calls]
+            })
+            for node_id, name, node_type, file_path, node_methods, node_calls in zip(
+                ids, names, types, file_paths, methods, calls
+            )
+            if node_id not in known
+        )
+
+    def add_edges_bulk(
+        self,
+        sources: Sequence[str],
+        targets: Sequence[str],
+        kinds: Sequence[str],
+        weights: Optional[Iterable[int]] = None
+    ):
+        """Columnar `add_edge`: same rules, without per-edge Edge objects or graph lookups.
+
+        Self-loops are rejected and edges with a missing endpoint dropped.
+        Duplicates, within the batch or against existing edges, keep the first
+        edge's kind and add up their weights (1 each unless `weights` is given).
+        `kinds` are EdgeType values. Accepts an EdgeBatch unpacked (`*batch`).
+        """
+        if weights is None:
+            weights = [1] * len(sources)
+
+        if self.backend == BACKEND_CSR:
+            add = self._csr_builder().add_edge
+            for source, target, kind, weight in zip(sources, targets, kinds, weights):
+                add(source, target, kind, weight)  # self-loops rejected by the builder
+            return
+
+        # Collapse duplicates first so the graph is touched once per pair
+        merged: Dict[Tuple[str, str], List] = {}
+        for source, target, kind, weight in zip(sources, targets, kinds, weights):
+            if source == target:
+                continue
+            pair = merged.get((source, target))
+            if pair is None:
+                merged[(source, target)] = [kind, weight]
+            else:
+                pair[1] += weight
+
+        # Existing pairs only gain weight; new ones go in with one add_edges_from
+        self._nx_changed()
+        graph = self._nx
+        known = graph.nodes
+        new_edges = []
+        for (source, target), (kind, weight) in merged.items():
+            if source not in known or target not in known:
+                continue
+            existing = graph.get_edge_data(source, target)  # the live attribute dict
+            if existing is not None:
+                existing['weight'] += weight
+            else:
+                new_edges.append((source, target, {'type': kind, 'weight': weight}))
+        graph.add_edges_from(new_edges)
+
+    def stream_edges_bulk(self, sources: Sequence[str], targets: Sequence[str], kinds: Sequence[str]):
+        """Columnar `stream_edge`: edges to not-yet-added nodes wait for `resolve_pending_edges()`."""
+        if self.backend == BACKEND_CSR:
+            self.add_edges_bulk(sources, targets, kinds)
+            return
+
+        known = self._nx.nodes
+        pending_edges = self._pending_edges
+        ready_sources, ready_targets, ready_kinds = [], [], []
+        for source, target, kind in zip(sources, targets, kinds):
+            if source == target:
+                continue
+            pending = pending_edges.get((source, target))
+            if pending is not None:
+                # Keep the pair buffered so its first-seen type wins
+                pending[1] += 1
+            elif source in known and target in known:
+                ready_sources.append(source)
+                ready_targets.append(target)
+                ready_kinds.append(kind)
+            else:
+                pending_edges[(source, target)] = [kind, 1]
+        self.add_edges_bulk(ready_sources, ready_targets, ready_kinds)
+
     def get_node_count(self) -> int:
-        return self.graph.number_of_nodes()
-        
+        if self.backend == BACKEND_CSR:
+            return self.csr.num_nodes
+        return self._nx.number_of_nodes()
+
     def get_edge_count(self) -> int:
-        return self.graph.number_of_edges()
+        if self.backend == BACKEND_CSR:
+            return self.csr.num_edges
+        return self._nx.number_of_edges()
 
     def get_class_count(self) -> int:
-        return sum(1 for _, data in self.graph.nodes(data=True) if data.get('type') == NodeType.CLASS.value)
+        if self.backend == BACKEND_CSR:
+            return self.csr.node_type.count(NODE_TYPE_CODE[NodeType.CLASS.value])
+        return sum(1 for _, data in self._nx.nodes(data=True) if data.get('type') == NodeType.CLASS.value)
 
     def to_json_dict(self) -> dict:
         """Serializes the graph to a JSON-compatible dictionary Deterministically."""
-        data = nx.node_link_data(self.graph)
+        if self.backend == BACKEND_CSR:
+            return self.csr.to_json_dict()
+        data = nx.node_link_data(self._nx)
         # Sort nodes and links mathematically to guarantee deterministic JSON output
         data["nodes"] = sorted(data["nodes"], key=lambda k: k["id"])
         data["links"] = sorted(data["links"], key=lambda k: (k["source"], k["target"]))
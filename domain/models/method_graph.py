@@ -0,0 +1,185 @@
+"""Method-level view of a class-level CSRGraph.
+
+The class graph stays the only graph. Its nodes already carry their method
+names (`method_offsets` / `method_names`) and method calls (the `call_*`
+columns), so a MethodGraph numbers methods by their position in
+`method_names` — class i owns slots method_offsets[i]..method_offsets[i+1]
+— and resolves the calls into a weighted edge list over those slots. Only
+numpy arrays are built, on first use; `to_networkx()` materializes the
+method-level DiGraph only when asked for it.
+
+Calls are resolved case-insensitively, as PHP does. A method missing from
+the target class is looked up in its ancestors (inherits, then uses_trait
+edges, breadth first). Calls to classes outside the graph or to methods
+nobody declares are dropped and counted in `unresolved_calls`; recursive
+calls are dropped like self-loops in the class graph.
+
+`roll_up` aggregates per-method values to their classes and
+`roll_up_edges` method calls to class pairs: both are the sparse product
+with the method -> class assignment, done with `numpy.bincount`.
+"""
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from domain.models.csr_graph import CSRGraph, EDGE_KIND_CODE
+from domain.models.edge import EdgeType
+from domain.algorithms.link_analysis import SparseAdjacency
+
+ROLL_UP_SUM = "sum"
+ROLL_UP_MAX = "max"
+ROLL_UP_MEAN = "mean"
+ROLL_UPS = (ROLL_UP_SUM, ROLL_UP_MAX, ROLL_UP_MEAN)
+
+# Edges followed, in this order, when a class does not declare a called method
+_INHERITED_VIA = (EDGE_KIND_CODE[EdgeType.INHERITS.value], EDGE_KIND_CODE[EdgeType.USES_TRAIT.value])
+
+
+class MethodGraph:
+    def __init__(self, csr: CSRGraph):
+        self.csr = csr
+        self.offsets = np.asarray(csr.method_offsets, dtype=np.int64)
+        self.num_methods = int(self.offsets[-1]) if len(self.offsets) else 0
+        # Class index per method slot
+        self.owner = np.repeat(np.arange(csr.num_nodes, dtype=np.int64), np.diff(self.offsets))
+        self._tables: Dict[int, Dict[str, int]] = {}
+        self._adjacency: Optional[SparseAdjacency] = None
+        self._unresolved = 0
+        self._nx = None
+
+    # ── Methods ──────────────────────────────────────────────────────────
+
+    def method_name(self, slot: int) -> str:
+        return self.csr.strings.strings[self.csr.method_names[slot]]
+
+    def method_id(self, slot: int) -> str:
+        """`Class\\ID::method`."""
+        return f"{self.csr.id_of(int(self.owner[slot]))}::{self.method_name(slot)}"
+
+    def methods_of(self, i: int) -> range:
+        """Method slots of class i."""
+        return range(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def _table(self, i: int) -> Dict[str, int]:
+        """Lower-cased method name -> slot for class i; the first declaration wins."""
+        table = self._tables.get(i)
+        if table is None:
+            table = {}
+            for slot in self.methods_of(i):
+                table.setdefault(self.method_name(slot).lower(), slot)
+            self._tables[i] = table
+        return table
+
+    def slot_of(self, i: int, method: str) -> Optional[int]:
+        """Slot of `method` as seen from class i: its own, else the nearest ancestor's."""
+        key = method.lower()
+        csr = self.csr
+        seen = {i}
+        frontier = [i]
+        while frontier:
+            ancestors = []
+            for c in frontier:
+                slot = self._table(c).get(key)
+                if slot is not None:
+                    return slot
+            for kind in _INHERITED_VIA:
+                for c in frontier:
+                    for pos in range(csr.fwd_offsets[c], csr.fwd_offsets[c + 1]):
+                        t = csr.fwd_targets[pos]
+                        if csr.fwd_kinds[pos] == kind and t not in seen:
+                            seen.add(t)
+                            ancestors.append(t)
+            frontier = ancestors
+        return None
+
+    # ── Calls ────────────────────────────────────────────────────────────
+
+    def adjacency(self) -> SparseAdjacency:
+        """Method call edges (weight = call count) over slots 0..num_methods-1."""
+        if self._adjacency is None:
+            self._adjacency = self._resolve()
+        return self._adjacency
+
+    @property
+    def unresolved_calls(self) -> int:
+        self.adjacency()
+        return self._unresolved
+
+    def _resolve(self) -> SparseAdjacency:
+        csr = self.csr
+        table = csr.strings.strings
+        weights: Dict[Tuple[int, int], int] = {}
+        unresolved = 0
+        for i in range(csr.num_nodes):
+            for c in range(csr.call_offsets[i], csr.call_offsets[i + 1]):
+                caller = self._table(i).get(table[csr.call_from[c]].lower())
+                target = csr.index_of(table[csr.call_class[c]])
+                callee = None if target is None else self.slot_of(target, table[csr.call_method[c]])
+                if caller is None or callee is None:
+                    unresolved += 1
+                elif caller != callee:
+                    pair = (caller, callee)
+                    weights[pair] = weights.get(pair, 0) + 1
+        self._unresolved = unresolved
+
+        pairs = sorted(weights)
+        sources = np.fromiter((u for u, _ in pairs), dtype=np.int64, count=len(pairs))
+        targets = np.fromiter((v for _, v in pairs), dtype=np.int64, count=len(pairs))
+        counts = np.fromiter((weights[p] for p in pairs), dtype=np.float64, count=len(pairs))
+        return SparseAdjacency.from_edges(self.num_methods, sources, targets, counts)
+
+    # ── Roll-up ──────────────────────────────────────────────────────────
+
+    def method_counts(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def roll_up(self, values: np.ndarray, how: str = ROLL_UP_SUM) -> np.ndarray:
+        """Per-class aggregate of per-method `values` (0 for classes without methods)."""
+        if how not in ROLL_UPS:
+            raise ValueError(f"Unknown roll-up: {how}")
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) != self.num_methods:
+            raise ValueError(f"Expected {self.num_methods} method values, got {len(values)}")
+        n = self.csr.num_nodes
+        if how == ROLL_UP_MAX:
+            out = np.full(n, -np.inf)
+            np.maximum.at(out, self.owner, values)
+            out[self.method_counts() == 0] = 0.0
+            return out
+        total = np.bincount(self.owner, weights=values, minlength=n)
+        if how == ROLL_UP_MEAN:
+            counts = self.method_counts()
+            return np.divide(total, counts, out=np.zeros(n), where=counts > 0)
+        return total
+
+    def roll_up_edges(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(source class, target class, call count) per class pair with method calls
+        between them, sorted; calls within one class are left out."""
+        adj = self.adjacency()
+        n = self.csr.num_nodes
+        src = self.owner[adj.sources]
+        dst = self.owner[adj.targets]
+        between = src != dst
+        keys = src[between] * n + dst[between]
+        pairs, inverse = np.unique(keys, return_inverse=True)
+        weights = np.bincount(inverse, weights=adj.weights[between], minlength=len(pairs))
+        return pairs // n, pairs % n, weights
+
+    # ── Interop ──────────────────────────────────────────────────────────
+
+    def to_networkx(self):
+        """The method-level DiGraph (node `Class::method`, attributes class and
+        name; edge weight = call count), built on first call and cached."""
+        if self._nx is None:
+            import networkx as nx
+            g = nx.DiGraph()
+            ids: List[str] = [self.method_id(slot) for slot in range(self.num_methods)]
+            g.add_nodes_from(
+                (ids[slot], {'class': self.csr.id_of(int(self.owner[slot])), 'name': self.method_name(slot)})
+                for slot in range(self.num_methods)
+            )
+            adj = self.adjacency()
+            g.add_edges_from(
+                (ids[u], ids[v], {'weight': int(w)})
+                for u, v, w in zip(adj.sources.tolist(), adj.targets.tolist(), adj.weights.tolist())
+            )
+            self._nx = g
+        return self._nx
@@ -1,6 +1,6 @@
 from enum import Enum
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 class NodeType(Enum):
     CLASS = "class"
@@ -36,3 +36,5 @@ class Node(BaseModel):
 
     # Internal representation convenience
     methods: List[str] = []
+    # Method calls made from this class: (calling method, target class ID, called method)
+    calls: List[Tuple[str, str, str]] = []
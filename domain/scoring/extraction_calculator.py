@@ -0,0 +1,69 @@
+"""Extraction suitability E(v) and the core-node guard (spec §4, §5).
+
+    E(v) = α1·(1 - norm(in_degree)) + α2·cohesion_proxy
+         + α3·(1 - norm(blast_radius)) + α4·db_isolation_score
+         + α5·size_factor
+
+cohesion_proxy = 1 / (1 + norm(out_degree)),
+db_isolation_score = 1 - norm(db_table_spread), size_factor = 1 - norm(loc),
+and blast_radius is the reachability ratio (reachable nodes / N). As with
+risk, the factor matrix is built once per ScoringColumns.
+"""
+from dataclasses import dataclass, astuple
+from typing import Optional, Sequence
+import numpy as np
+from domain.scoring.metric_columns import ScoringColumns
+
+# Spec §5: R(v) above this and blast radius above that => core node
+CORE_RISK_THRESHOLD = 0.80
+CORE_BLAST_THRESHOLD = 0.50
+
+
+@dataclass(frozen=True)
+class ExtractionWeights:
+    """α1…α5 of the extraction formula; defaults are the spec §4.7 weights."""
+    a1: float = 0.30  # low incoming coupling
+    a2: float = 0.20  # cohesion
+    a3: float = 0.20  # small blast radius
+    a4: float = 0.20  # DB isolation
+    a5: float = 0.10  # size
+
+
+def extraction_factors(columns: ScoringColumns) -> np.ndarray:
+    """(5, N) matrix of the factors, in α1…α5 order."""
+    return columns.derived('extraction_factors', lambda: np.vstack([
+        1.0 - columns.norm('in_degree'),
+        1.0 / (1.0 + columns.norm('out_degree')),
+        1.0 - columns.norm('reachability_ratio'),
+        1.0 - columns.norm('db_table_spread'),
+        1.0 - columns.norm('loc'),
+    ]))
+
+
+def extraction_scores(columns: ScoringColumns, weights: ExtractionWeights = ExtractionWeights()) -> np.ndarray:
+    """E(v) for every component, in `columns.names` order."""
+    return np.asarray(astuple(weights), dtype=np.float64) @ extraction_factors(columns)
+
+
+def extraction_score_sweep(columns: ScoringColumns, weight_sets: Sequence[ExtractionWeights]) -> np.ndarray:
+    """(S, N) matrix: row s holds E(v) under weight_sets[s]."""
+    matrix = np.array([astuple(w) for w in weight_sets], dtype=np.float64).reshape(-1, 5)
+    return matrix @ extraction_factors(columns)
+
+
+def core_nodes(
+    columns: ScoringColumns,
+    risk: np.ndarray,
+    risk_threshold: float = CORE_RISK_THRESHOLD,
+    blast_threshold: float = CORE_BLAST_THRESHOLD
+) -> np.ndarray:
+    """Mask of "Core Node — Not Recommended for Early Extraction" components."""
+    return (risk > risk_threshold) & (columns.raw('reachability_ratio') > blast_threshold)
+
+
+def extraction_ranking(scores: np.ndarray, exclude: Optional[np.ndarray] = None) -> np.ndarray:
+    """Component indices by descending E(v), ties by position; `exclude`d ones dropped."""
+    order = np.argsort(-np.asarray(scores, dtype=np.float64), kind='stable')
+    if exclude is not None:
+        order = order[~exclude[order]]
+    return order
@@ -0,0 +1,81 @@
+"""Columnar view of per-component metrics for the scoring engines.
+
+Metrics arrive as {component: {metric: value}} (MetricCalculator output or
+rows loaded from a run). ScoringColumns turns them into one float64 array
+per metric, in a fixed component order, and min-max normalizes each column
+once on first use (spec §3.2: norm(x) = (x - min) / (max - min), 0 when
+max == min). Scores for any weight set are then a few vector operations
+over the cached normalized columns.
+
+Values that were not computed (None, or the -1 skip/incomplete sentinel)
+count as 0. Metrics the pipeline does not produce yet (loc,
+cyclomatic_complexity, db_write_count, db_table_spread) can be supplied as
+`extra` columns; absent ones are all zero, which normalizes to 0.
+"""
+from typing import Callable, Dict, Mapping, Optional, Sequence
+import numpy as np
+
+
+def min_max(values: np.ndarray) -> np.ndarray:
+    """Min-max normalize to [0, 1]; a constant column maps to 0."""
+    if values.size == 0:
+        return values.astype(np.float64)
+    low = values.min()
+    span = values.max() - low
+    if span == 0:
+        return np.zeros_like(values, dtype=np.float64)
+    return (values - low) / span
+
+
+class ScoringColumns:
+    """Raw metric columns for N components plus memoized derived columns."""
+
+    def __init__(self, names: Sequence[str], columns: Mapping[str, np.ndarray]):
+        self.names = list(names)
+        self.size = len(self.names)
+        self._raw: Dict[str, np.ndarray] = {}
+        for metric, values in columns.items():
+            values = np.asarray(values, dtype=np.float64)
+            if values.shape != (self.size,):
+                raise ValueError(f"Column {metric} has shape {values.shape}, expected ({self.size},)")
+            self._raw[metric] = values
+        self._derived: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_metrics(
+        cls,
+        metrics: Mapping[str, Mapping[str, Optional[float]]],
+        extra: Optional[Mapping[str, Mapping[str, float]]] = None
+    ) -> 'ScoringColumns':
+        """Components in sorted order, so scores do not depend on input order."""
+        names = sorted(metrics)
+        fields = set()
+        for row in metrics.values():
+            fields.update(row)
+        columns = {}
+        for metric in fields:
+            values = np.array(
+                [metrics[n].get(metric) for n in names], dtype=np.float64
+            )  # None -> nan
+            columns[metric] = values
+        for metric, by_name in (extra or {}).items():
+            columns[metric] = np.array([by_name.get(n, 0.0) for n in names], dtype=np.float64)
+        for metric, values in columns.items():
+            values[~(values >= 0)] = 0.0  # nan and negative sentinels
+        return cls(names, columns)
+
+    def raw(self, metric: str) -> np.ndarray:
+        values = self._raw.get(metric)
+        if values is None:
+            values = self._raw[metric] = np.zeros(self.size, dtype=np.float64)
+        return values
+
+    def norm(self, metric: str) -> np.ndarray:
+        return self.derived(f"norm:{metric}", lambda: min_max(self.raw(metric)))
+
+    def derived(self, key: str, build: Callable[[], np.ndarray]) -> np.ndarray:
+        """Column (or matrix) computed once per key and reused across weight sets."""
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived[key] = build()
+        return value
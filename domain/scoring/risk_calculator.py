@@ -0,0 +1,113 @@
+"""Structural risk R(v) and percentile risk bands (spec §3).
+
+    R(v) = α·norm(weighted_in) + β·norm(weighted_out) + γ·norm(betweenness)
+         + δ·norm(cyclomatic_complexity) + ε·DB_write_factor
+
+with DB_write_factor = min(1, db_write_count / max_db_write_count). The
+five factor columns are stacked once per ScoringColumns into a (5, N)
+matrix; a weight set is then one vector-matrix product, and a sweep over S
+weight sets one (S, 5) @ (5, N) product.
+"""
+import math
+from dataclasses import dataclass, astuple
+from typing import Sequence, Tuple
+import numpy as np
+from domain.scoring.metric_columns import ScoringColumns
+
+# Band codes returned by risk_bands(), and their labels
+BAND_LOW = 0
+BAND_MEDIUM = 1
+BAND_HIGH = 2
+BAND_LABELS = ("low", "medium", "high")
+
+# Spec §3.5: top 20% high, bottom 30% low, the rest medium
+HIGH_FRACTION = 0.20
+LOW_FRACTION = 0.30
+
+
+@dataclass(frozen=True)
+class RiskWeights:
+    """α…ε of the risk formula; defaults are the spec §3.4 starting weights."""
+    alpha: float = 0.30  # incoming coupling
+    beta: float = 0.15  # outgoing dependencies
+    gamma: float = 0.20  # bridge role
+    delta: float = 0.20  # complexity
+    epsilon: float = 0.15  # write risk
+
+
+def db_write_factor(columns: ScoringColumns) -> np.ndarray:
+    def build():
+        writes = columns.raw('db_write_count')
+        top = writes.max() if writes.size else 0.0
+        if top <= 0:
+            return np.zeros_like(writes)
+        return np.minimum(1.0, writes / top)
+    return columns.derived('db_write_factor', build)
+
+
+def risk_factors(columns: ScoringColumns) -> np.ndarray:
+    """(5, N) matrix of the normalized factors, in α…ε order."""
+    return columns.derived('risk_factors', lambda: np.vstack([
+        columns.norm('weighted_in'),
+        columns.norm('weighted_out'),
+        columns.norm('betweenness'),
+        columns.norm('cyclomatic_complexity'),
+        db_write_factor(columns),
+    ]))
+
+
+def risk_scores(columns: ScoringColumns, weights: RiskWeights = RiskWeights()) -> np.ndarray:
+    """R(v) for every component, in `columns.names` order."""
+    return np.asarray(astuple(weights), dtype=np.float64) @ risk_factors(columns)
+
+
+def risk_score_sweep(columns: ScoringColumns, weight_sets: Sequence[RiskWeights]) -> np.ndarray:
+    """(S, N) matrix: row s holds R(v) under weight_sets[s]."""
+    matrix = np.array([astuple(w) for w in weight_sets], dtype=np.float64).reshape(-1, 5)
+    return matrix @ risk_factors(columns)
+
+
+def _top_k(scores: np.ndarray, k: int, eligible: np.ndarray) -> np.ndarray:
+    """Mask of the k highest eligible scores; ties at the cut go to lower indices.
+
+    Uses a partial sort (np.partition) for the cut value, so O(N) rather
+    than a full sort.
+    """
+    chosen = np.zeros(scores.shape, dtype=bool)
+    pool = scores[eligible]
+    if k <= 0 or pool.size == 0:
+        return chosen
+    k = min(k, pool.size)
+    cut = np.partition(pool, pool.size - k)[pool.size - k]
+    above = eligible & (scores > cut)
+    chosen |= above
+    remaining = k - int(above.sum())
+    if remaining > 0:
+        tied = np.flatnonzero(eligible & (scores == cut))[:remaining]
+        chosen[tied] = True
+    return chosen
+
+
+def band_sizes(n: int, high: float = HIGH_FRACTION, low: float = LOW_FRACTION) -> Tuple[int, int, int]:
+    """(low, medium, high) counts for n components; high and low round up."""
+    n_high = min(n, math.ceil(n * high))
+    n_low = min(n - n_high, math.ceil(n * low))
+    return n_low, n - n_high - n_low, n_high
+
+
+def risk_bands(scores: np.ndarray, high: float = HIGH_FRACTION, low: float = LOW_FRACTION) -> np.ndarray:
+    """Percentile band code per component (BAND_LOW/MEDIUM/HIGH).
+
+    Exactly band_sizes(N) components land in each band; equal scores at a
+    band edge are split by position, so the result is deterministic.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    n_low, _, n_high = band_sizes(scores.size, high, low)
+    bands = np.full(scores.shape, BAND_MEDIUM, dtype=np.int8)
+    everyone = np.ones(scores.shape, dtype=bool)
+    top = _top_k(scores, n_high, everyone)
+    bands[top] = BAND_HIGH
+    # Bottom k = top k of the negated scores among the rest
+    bottom = _top_k(-scores, n_low, ~top)
+    bands[bottom] = BAND_LOW
+    return bands
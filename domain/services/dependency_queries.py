@@ -0,0 +1,103 @@
+"""Dependency questions between components of one graph, by name.
+
+An edge u -> v means u depends on v (calls, instantiates or extends it).
+Nodes are indexed in sorted name order, so a ReachabilityIndex built here
+at analysis time lines up with the same graph loaded back later.
+
+- depends_on: one ReachabilityIndex lookup.
+- shortest_path: BFS that only enqueues nodes the index says can still
+  reach the target, so it never wanders into dead branches.
+- within_hops: components at most k edges away, upstream (dependents) or
+  downstream (dependencies).
+"""
+from collections import deque
+from typing import Any, List, Optional, Tuple
+import networkx as nx
+from domain.algorithms.reachability_index import ReachabilityIndex
+
+DIRECTION_DEPENDENTS = "dependents"
+DIRECTION_DEPENDENCIES = "dependencies"
+DIRECTIONS = (DIRECTION_DEPENDENTS, DIRECTION_DEPENDENCIES)
+
+
+class DependencyQueries:
+    def __init__(self, graph: nx.DiGraph, index: Optional[ReachabilityIndex] = None):
+        """
+        Args:
+            graph: The dependency graph (typically a run's projected graph).
+            index: Its index from an earlier build(); built here when omitted.
+        """
+        self.names: List[Any] = sorted(graph.nodes)
+        self.position = {name: i for i, name in enumerate(self.names)}
+        position = self.position
+        self.succ: List[List[int]] = [sorted(position[t] for t in graph.succ[name]) for name in self.names]
+        self.pred: List[List[int]] = [sorted(position[s] for s in graph.pred[name]) for name in self.names]
+        if index is None:
+            index = ReachabilityIndex.build(self.succ)
+        elif index.n != len(self.names):
+            raise ValueError(f"Reachability index covers {index.n} nodes, graph has {len(self.names)}")
+        self.index = index
+
+    def _node(self, name: Any) -> int:
+        i = self.position.get(name)
+        if i is None:
+            raise KeyError(f"Unknown component: {name}")
+        return i
+
+    def depends_on(self, source: Any, target: Any) -> bool:
+        """Whether `source` depends on `target`, directly or transitively."""
+        return self.index.reaches(self._node(source), self._node(target))
+
+    def shortest_path(self, source: Any, target: Any) -> Optional[List[Any]]:
+        """Fewest-edge dependency path from source to target (inclusive), or None."""
+        s, t = self._node(source), self._node(target)
+        reaches = self.index.reaches
+        if not reaches(s, t):
+            return None
+        parent = {s: s}
+        queue = deque([s])
+        while t not in parent:
+            u = queue.popleft()
+            for w in self.succ[u]:
+                if w not in parent and reaches(w, t):
+                    parent[w] = u
+                    queue.append(w)
+        path = [t]
+        while path[-1] != s:
+            path.append(parent[path[-1]])
+        return [self.names[i] for i in reversed(path)]
+
+    def within_hops(
+        self,
+        name: Any,
+        hops: int,
+        direction: str = DIRECTION_DEPENDENTS,
+        limit: Optional[int] = None
+    ) -> List[Tuple[Any, int]]:
+        """(component, distance) for every component 1..hops edges from `name`,
+        by distance then name; at most `limit` of them.
+
+        `direction` "dependents" follows edges backwards (who depends on
+        name), "dependencies" forwards (what name depends on).
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown direction: {direction}")
+        adj = self.pred if direction == DIRECTION_DEPENDENTS else self.succ
+        start = self._node(name)
+        found: List[Tuple[int, int]] = []
+        seen = {start}
+        frontier = [start]
+        for distance in range(1, hops + 1):
+            level = []
+            for u in frontier:
+                for w in adj[u]:
+                    if w not in seen:
+                        seen.add(w)
+                        level.append(w)
+            if not level:
+                break
+            found.extend((w, distance) for w in sorted(level))  # positions follow name order
+            if limit is not None and len(found) >= limit:
+                break
+            frontier = level
+        return [(self.names[w], d) for w, d in found[:limit]]
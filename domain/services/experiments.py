@@ -0,0 +1,357 @@
+"""Seeded Monte Carlo stability studies of the risk ranking (spec §8).
+
+Three experiment kinds, each a series of independent trials:
+
+- weight_sensitivity: every risk weight is scaled by a random factor in
+  [1 - jitter, 1 + jitter]; the trial reports the Spearman correlation of
+  the new R(v) with the baseline and the overlap of the top-k components.
+- edge_perturbation: a random `edge_fraction` of the edges is dropped and
+  the degree factors of R(v) are recomputed; the trial reports Spearman
+  correlation and the mean / max shift of a component's rank. Betweenness
+  is held at its baseline value (recomputing it per trial is O(V·E)).
+- node_removal: `removal_count` random nodes are removed; the trial
+  reports the largest strongly connected component before and after.
+
+Everything a trial needs is precomputed once in an ExperimentContext:
+edge arrays in CSR order, the normalized risk factor matrix and the SCC
+partition. Trials only mask those arrays, so no graph is rebuilt. With
+`workers > 1` the context is sent to each pool process once and trials
+run in fixed-size chunks. Trial `i` draws from its own generator seeded
+with (seed, i), so results do not depend on the worker count or on the
+order chunks finish in.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, astuple
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+import networkx as nx
+import numpy as np
+from domain.algorithms.reachability import strongly_connected_components
+from domain.scoring.metric_columns import ScoringColumns, min_max
+from domain.scoring.risk_calculator import RiskWeights, risk_factors
+
+EXPERIMENT_WEIGHT_SENSITIVITY = "weight_sensitivity"
+EXPERIMENT_EDGE_PERTURBATION = "edge_perturbation"
+EXPERIMENT_NODE_REMOVAL = "node_removal"
+EXPERIMENT_KINDS = (EXPERIMENT_WEIGHT_SENSITIVITY, EXPERIMENT_EDGE_PERTURBATION, EXPERIMENT_NODE_REMOVAL)
+
+# Parameters each kind accepts, with their defaults
+EXPERIMENT_PARAMS = {
+    EXPERIMENT_WEIGHT_SENSITIVITY: {"jitter": 0.10, "top_k": 10},
+    EXPERIMENT_EDGE_PERTURBATION: {"edge_fraction": 0.05},
+    EXPERIMENT_NODE_REMOVAL: {"removal_count": 1},
+}
+
+# Metric columns a context reads from a run
+CONTEXT_METRICS = ('weighted_in', 'weighted_out', 'betweenness')
+
+# Trials per pool task. Fixed, so chunking never depends on the worker count
+TRIALS_PER_TASK = 16
+
+
+def experiment_params(kind: str, params: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """`params` merged over the defaults of `kind`; rejects unknown kinds,
+    unknown keys and out-of-range values."""
+    if kind not in EXPERIMENT_PARAMS:
+        raise ValueError(f"Unknown experiment kind: {kind}")
+    merged = dict(EXPERIMENT_PARAMS[kind])
+    unknown = set(params or {}) - set(merged)
+    if unknown:
+        raise ValueError(f"Unknown parameters for {kind}: {sorted(unknown)}")
+    merged.update(params or {})
+    for key in ("top_k", "removal_count"):
+        if key in merged:
+            merged[key] = int(merged[key])
+    if not 0 <= merged.get("jitter", 0) < 1:
+        raise ValueError("jitter must be in [0, 1)")
+    if not 0 <= merged.get("edge_fraction", 0) <= 1:
+        raise ValueError("edge_fraction must be in [0, 1]")
+    if merged.get("top_k", 1) < 1 or merged.get("removal_count", 1) < 1:
+        raise ValueError("top_k and removal_count must be >= 1")
+    return merged
+
+
+def rank_positions(scores: np.ndarray) -> np.ndarray:
+    """Rank of each component by descending score (0 = highest); ties by position."""
+    order = np.argsort(-scores, kind='stable')
+    ranks = np.empty(scores.size, dtype=np.int64)
+    ranks[order] = np.arange(scores.size)
+    return ranks
+
+
+def _average_ranks(values: np.ndarray) -> np.ndarray:
+    """Ascending ranks with ties sharing their mean rank."""
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    first = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return (first + (counts - 1) / 2.0)[inverse]
+
+
+def spearman(a: np.ndarray, b: np.ndarray) -> float:
+    """Spearman rank correlation (tie-corrected). 1.0 for two identical
+    constant columns, 0.0 if only one is constant."""
+    ra, rb = _average_ranks(a), _average_ranks(b)
+    ra = ra - ra.mean()
+    rb = rb - rb.mean()
+    denom = math.sqrt(float(ra @ ra) * float(rb @ rb))
+    if denom == 0:
+        return 1.0 if np.array_equal(a, b) else 0.0
+    return float(ra @ rb) / denom
+
+
+def _gather(offsets: np.ndarray, targets: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """Concatenated CSR rows of `nodes`."""
+    starts = offsets[nodes]
+    lengths = offsets[nodes + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return targets[:0]
+    shift = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return targets[shift + np.arange(total)]
+
+
+def _reached(offsets: np.ndarray, targets: np.ndarray, start: int, allowed: np.ndarray) -> int:
+    """Nodes reachable from `start` through `allowed` nodes (level-synchronous BFS)."""
+    seen = np.zeros(allowed.size, dtype=bool)
+    seen[start] = True
+    frontier = np.array([start])
+    count = 1
+    while frontier.size:
+        nxt = _gather(offsets, targets, frontier)
+        nxt = np.unique(nxt[allowed[nxt] & ~seen[nxt]])
+        seen[nxt] = True
+        count += nxt.size
+        frontier = nxt
+    return count
+
+
+@dataclass
+class ExperimentContext:
+    """Precomputed, picklable inputs shared by every trial of a run.
+
+    Components are in sorted name order (as in ScoringColumns.from_metrics).
+    """
+    names: List[str]
+    offsets: np.ndarray  # forward CSR
+    targets: np.ndarray
+    sources: np.ndarray  # source of each forward edge
+    weights: np.ndarray
+    rev_offsets: np.ndarray  # reverse CSR
+    rev_targets: np.ndarray
+    factors: np.ndarray  # (5, N) normalized risk factors
+    risk_weights: Tuple[float, ...]
+    baseline: np.ndarray  # baseline R(v)
+    comp_of: np.ndarray  # SCC per component
+    comp_sizes: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        graph: nx.DiGraph,
+        metrics: Mapping[str, Mapping[str, Any]],
+        risk_weights: RiskWeights = RiskWeights()
+    ) -> 'ExperimentContext':
+        """From the analysed (projected) graph and its metrics for CONTEXT_METRICS."""
+        columns = ScoringColumns.from_metrics({n: metrics.get(n, {}) for n in graph.nodes})
+        names = columns.names
+        index = {name: i for i, name in enumerate(names)}
+        n = len(names)
+        succ = [[] for _ in range(n)]
+        weight_rows = [[] for _ in range(n)]
+        for u, row in graph.succ.items():
+            i = index[u]
+            for v, data in row.items():
+                succ[i].append(index[v])
+                weight_rows[i].append(data.get('weight', 1))
+
+        counts = np.fromiter((len(row) for row in succ), dtype=np.int64, count=n)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        m = int(offsets[-1])
+        targets = np.fromiter((t for row in succ for t in row), dtype=np.int64, count=m)
+        weights = np.fromiter((w for row in weight_rows for w in row), dtype=np.float64, count=m)
+        sources = np.repeat(np.arange(n, dtype=np.int64), counts)
+
+        by_target = np.argsort(targets, kind='stable')
+        rev_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(targets, minlength=n), out=rev_offsets[1:])
+        rev_targets = sources[by_target]
+
+        raw, n_comp = strongly_connected_components(succ)
+        comp_of = np.asarray(raw, dtype=np.int64)
+        comp_sizes = np.bincount(comp_of, minlength=n_comp)
+
+        factors = risk_factors(columns)
+        weight_vector = astuple(risk_weights)
+        return cls(
+            names, offsets, targets, sources, weights, rev_offsets, rev_targets,
+            factors, weight_vector, np.asarray(weight_vector) @ factors, comp_of, comp_sizes
+        )
+
+    @property
+    def largest_scc(self) -> int:
+        return int(self.comp_sizes.max()) if self.comp_sizes.size else 0
+
+
+# ── Trials ───────────────────────────────────────────────────────────────
+
+def _weight_trial(ctx: ExperimentContext, rng: np.random.Generator, params: dict) -> dict:
+    base = np.asarray(ctx.risk_weights)
+    jitter = params["jitter"]
+    weights = base * rng.uniform(1 - jitter, 1 + jitter, base.size)
+    scores = weights @ ctx.factors
+    k = min(params["top_k"], scores.size)
+    base_top = set(np.argsort(-ctx.baseline, kind='stable')[:k].tolist())
+    new_top = set(np.argsort(-scores, kind='stable')[:k].tolist())
+    return {
+        "spearman": spearman(ctx.baseline, scores),
+        "top_k_overlap": len(base_top & new_top) / k if k else 1.0,
+        "weights": [round(float(w), 6) for w in weights],
+    }
+
+
+def _edge_trial(ctx: ExperimentContext, rng: np.random.Generator, params: dict) -> dict:
+    n, m = len(ctx.names), ctx.targets.size
+    k = int(round(m * params["edge_fraction"]))
+    weights = ctx.weights.copy()
+    weights[rng.choice(m, size=k, replace=False)] = 0.0
+    factors = ctx.factors.copy()
+    factors[0] = min_max(np.bincount(ctx.targets, weights=weights, minlength=n))
+    factors[1] = min_max(np.bincount(ctx.sources, weights=weights, minlength=n))
+    scores = np.asarray(ctx.risk_weights) @ factors
+    shift = np.abs(rank_positions(scores) - rank_positions(ctx.baseline))
+    return {
+        "removed_edges": k,
+        "spearman": spearman(ctx.baseline, scores),
+        "mean_rank_shift": float(shift.mean()) if n else 0.0,
+        "max_rank_shift": int(shift.max()) if n else 0,
+    }
+
+
+def _split_sizes(ctx: ExperimentContext, comp: int, allowed: np.ndarray) -> List[int]:
+    """SCC sizes of component `comp` restricted to `allowed` nodes."""
+    members = np.flatnonzero(allowed)
+    if members.size <= 1:
+        return [int(members.size)]
+    start = int(members[0])
+    if (_reached(ctx.offsets, ctx.targets, start, allowed) == members.size
+            and _reached(ctx.rev_offsets, ctx.rev_targets, start, allowed) == members.size):
+        return [int(members.size)]  # still strongly connected
+    local = {int(v): i for i, v in enumerate(members)}
+    succ = [
+        [local[t] for t in ctx.targets[ctx.offsets[v]:ctx.offsets[v + 1]].tolist() if t in local]
+        for v in members.tolist()
+    ]
+    raw, n_comp = strongly_connected_components(succ)
+    return np.bincount(np.asarray(raw, dtype=np.int64), minlength=n_comp).tolist()
+
+
+def _removal_trial(ctx: ExperimentContext, rng: np.random.Generator, params: dict) -> dict:
+    n = len(ctx.names)
+    k = min(params["removal_count"], n)
+    removed = rng.choice(n, size=k, replace=False)
+    removed_mask = np.zeros(n, dtype=bool)
+    removed_mask[removed] = True
+    hit = np.unique(ctx.comp_of[removed])
+
+    # Components without a removed node keep their size
+    sizes = ctx.comp_sizes.copy()
+    sizes[hit] = 0
+    after = int(sizes.max()) if sizes.size else 0
+    for comp in hit.tolist():
+        if ctx.comp_sizes[comp] - np.count_nonzero(ctx.comp_of[removed] == comp) <= after:
+            continue  # cannot beat the current largest even if it stays whole
+        allowed = (ctx.comp_of == comp) & ~removed_mask
+        after = max(after, max(_split_sizes(ctx, comp, allowed)))
+
+    before = ctx.largest_scc
+    return {
+        "removed": [ctx.names[i] for i in sorted(removed.tolist())],
+        "largest_scc_before": before,
+        "largest_scc_after": after,
+        "impact": before - after,
+    }
+
+
+_TRIALS = {
+    EXPERIMENT_WEIGHT_SENSITIVITY: _weight_trial,
+    EXPERIMENT_EDGE_PERTURBATION: _edge_trial,
+    EXPERIMENT_NODE_REMOVAL: _removal_trial,
+}
+
+
+def run_trials(ctx: ExperimentContext, kind: str, indices: Sequence[int], seed: int, params: dict) -> List[Tuple[int, dict]]:
+    trial = _TRIALS[kind]
+    return [(i, trial(ctx, np.random.default_rng([seed, i]), params)) for i in indices]
+
+
+# Worker-process state, set by _install()
+_context: Optional[ExperimentContext] = None
+
+
+def _install(ctx: ExperimentContext):
+    global _context
+    _context = ctx
+
+
+def _task(kind: str, indices: List[int], seed: int, params: dict) -> List[Tuple[int, dict]]:
+    return run_trials(_context, kind, indices, seed, params)
+
+
+class ExperimentRunner:
+    """Runs the trials of an experiment, in-process or on a process pool.
+
+    Args:
+        context: Shared precomputed inputs.
+        workers: Processes. 1 runs in-process; results are identical.
+    """
+
+    def __init__(self, context: ExperimentContext, workers: int = 1):
+        self.context = context
+        self.workers = max(1, workers)
+
+    def run(
+        self,
+        kind: str,
+        trials: int,
+        seed: int,
+        params: Optional[Mapping[str, Any]] = None
+    ) -> Iterator[List[Tuple[int, dict]]]:
+        """Yields batches of (trial index, result) as trials finish.
+
+        Batches arrive in completion order; each trial's result depends
+        only on (seed, index).
+        """
+        params = experiment_params(kind, params)
+        chunks = [list(range(i, min(i + TRIALS_PER_TASK, trials))) for i in range(0, trials, TRIALS_PER_TASK)]
+        if self.workers == 1 or len(chunks) < 2:
+            for chunk in chunks:
+                yield run_trials(self.context, kind, chunk, seed, params)
+            return
+        with ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_install, initargs=(self.context,)
+        ) as pool:
+            futures = [pool.submit(_task, kind, chunk, seed, params) for chunk in chunks]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+
+def summarize(results: Sequence[Mapping[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """{field: {mean, std, min, max}} over the numeric fields of trial results."""
+    fields = [
+        name for name, value in (results[0].items() if results else ())
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    ]
+    summary = {}
+    for name in fields:
+        values = np.array([r[name] for r in results], dtype=np.float64)
+        summary[name] = {
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+        }
+    return summary
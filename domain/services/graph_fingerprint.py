@@ -0,0 +1,62 @@
+"""Canonical, order-independent fingerprints of a metric computation.
+
+`graph_fingerprint` hashes the node set (ID and type) and the edge set
+(endpoints, type and weight) after sorting, so two graphs with the same
+content get the same digest however they were built or parsed.
+`metric_cache_key` adds everything else a metric matrix depends on: the
+metrics requested, the calculator settings and METRICS_VERSION.
+
+Node IDs are compared by `str()`; the pipeline only produces string IDs.
+"""
+import hashlib
+import json
+from dataclasses import asdict, is_dataclass
+from typing import Any, Iterable
+import networkx as nx
+from domain.services.metric_calculator import METRICS_VERSION
+
+
+def _update(h, *fields: Any):
+    # Length-prefixed so no choice of IDs can make two records collide
+    for value in fields:
+        text = str(value)
+        h.update(f"{len(text)}:{text}".encode("utf-8"))
+    h.update(b"\n")
+
+
+def graph_fingerprint(graph: nx.DiGraph) -> str:
+    """sha256 hex digest of the graph's nodes and weighted, typed edges."""
+    h = hashlib.sha256()
+    nodes = sorted((str(n), str(data.get('type', ''))) for n, data in graph.nodes.items())
+    _update(h, "nodes", len(nodes))
+    for record in nodes:
+        _update(h, *record)
+    edges = sorted(
+        (str(u), str(v), str(data.get('type', '')), str(data.get('weight', 1)))
+        for u, targets in graph.succ.items()
+        for v, data in targets.items()
+    )
+    _update(h, "edges", len(edges))
+    for record in edges:
+        _update(h, *record)
+    return h.hexdigest()
+
+
+def metric_cache_key(fingerprint: str, metrics: Iterable[str], **options: Any) -> str:
+    """Key for the metric matrix of `metrics` on a graph with `fingerprint`,
+    computed with `options` (dataclass configs or plain JSON values)."""
+    settings = {
+        name: asdict(value) if is_dataclass(value) else value
+        for name, value in options.items()
+    }
+    payload = json.dumps(
+        {
+            "version": METRICS_VERSION,
+            "graph": fingerprint,
+            "metrics": sorted(metrics),
+            "options": settings,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,112 @@
+"""Edge-type indexed projections of a dependency graph.
+
+A GraphProjector indexes the source graph's edges by type once (O(edges))
+and builds each projection from the kept edges only, so a projection costs
+O(nodes + kept edges) instead of copying the whole graph and deleting what
+is not wanted. Projections are built with the public DiGraph API
+(`add_nodes_from` / `add_edges_from`, which give them their own shallow
+copies of the attribute dicts) and cached by their (node_types, edge_types)
+key; a cached projection is handed to every caller asking for that key, so
+it must be treated as read-only. `project_copy` builds an uncached one.
+
+Node order and each node's successor order follow the source graph, which
+keeps seeded computations (sampled betweenness pivots) identical to a
+copy-based projection.
+"""
+import heapq
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+import networkx as nx
+from domain.models.edge import EdgeType
+from domain.models.node import NodeType
+
+ProjectionKey = Tuple[Optional[FrozenSet[str]], Optional[FrozenSet[str]]]
+
+
+def projection_key(
+    node_types: Optional[Iterable[NodeType]] = None,
+    edge_types: Optional[Iterable[EdgeType]] = None
+) -> ProjectionKey:
+    node_values = frozenset(nt.value for nt in node_types) if node_types else None
+    edge_values = frozenset(et.value for et in edge_types) if edge_types else None
+    return node_values, edge_values
+
+
+class GraphProjector:
+    """Cached node-type/edge-type projections of one graph.
+
+    Create one per run (or per graph version); the source graph must not be
+    modified while the projector is in use.
+    """
+
+    def __init__(self, graph: nx.DiGraph):
+        self.graph = graph
+        # edge type -> [(position, u, v, data)] in source iteration order
+        self._edges_by_type: Optional[Dict[Any, List[Tuple[int, Any, Any, dict]]]] = None
+        self._cache: Dict[ProjectionKey, nx.DiGraph] = {}
+
+    def _index(self) -> Dict[Any, List[Tuple[int, Any, Any, dict]]]:
+        if self._edges_by_type is None:
+            index: Dict[Any, List[Tuple[int, Any, Any, dict]]] = {}
+            position = 0
+            for u, targets in self.graph.adj.items():
+                for v, data in targets.items():
+                    index.setdefault(data.get('type'), []).append((position, u, v, data))
+                    position += 1
+            self._edges_by_type = index
+        return self._edges_by_type
+
+    def project(
+        self,
+        node_types: Optional[List[NodeType]] = None,
+        edge_types: Optional[List[EdgeType]] = None
+    ) -> nx.DiGraph:
+        """Subgraph of nodes with one of `node_types` and edges with one of
+        `edge_types` (None or empty keeps all). With no filters this is the
+        source graph itself."""
+        key = projection_key(node_types, edge_types)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        node_values, edge_values = key
+        if node_values is None and edge_values is None:
+            projection = self.graph
+        else:
+            projection = self._build(node_values, edge_values)
+        self._cache[key] = projection
+        return projection
+
+    def project_copy(
+        self,
+        node_types: Optional[List[NodeType]] = None,
+        edge_types: Optional[List[EdgeType]] = None
+    ) -> nx.DiGraph:
+        """Like `project`, but always a new graph (also with no filters),
+        owned by the caller; not cached."""
+        return self._build(*projection_key(node_types, edge_types))
+
+    def _build(self, node_values: Optional[FrozenSet[str]], edge_values: Optional[FrozenSet[str]]) -> nx.DiGraph:
+        source = self.graph
+        sub = nx.DiGraph()
+        sub.graph.update(source.graph)
+        sub.add_nodes_from(
+            (n, attrs) for n, attrs in source.nodes.items()
+            if node_values is None or attrs.get('type') in node_values
+        )
+        kept = list(sub)
+
+        if edge_values is None:
+            adj = source.adj
+            edges = ((u, v, data) for u in kept for v, data in adj[u].items())
+        else:
+            index = self._index()
+            runs = [index[t] for t in edge_values if t in index]
+            edges = ((u, v, data) for _, u, v, data in heapq.merge(*runs))
+
+        nodes = sub.nodes
+        sub.add_edges_from((u, v, data) for u, v, data in edges if u in nodes and v in nodes)
+        return sub
+
+    def clear(self):
+        self._cache.clear()
+        self._edges_by_type = None
@@ -0,0 +1,316 @@
+"""Incremental metric updates for a small edge/node delta.
+
+Given the previous graph, its metrics (as returned by MetricCalculator) and
+a GraphDelta, only the affected region is recomputed:
+
+- degrees: endpoints of changed edges and added nodes
+- SCCs: old components that lost an edge or node are re-split with Tarjan
+  on their induced subgraph; components joined by added edges are found
+  by running Tarjan on (descendants of added-edge targets) ∩ (ancestors of
+  added-edge sources), the only place a new cycle can run
+- reachability: ancestors (old and new) of changed edges' sources, swept
+  over their descendant closure, which gives exact counts
+
+Betweenness, closeness and the link-analysis scores (PageRank, HITS, Katz)
+are global, so previous values are carried over and reported as stale.
+Ratios and SCC ids are renumbered for every node since they depend on the
+node count and on the full component ordering; both are O(n) arithmetic,
+not graph work.
+"""
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import networkx as nx
+from domain.algorithms.reachability import strongly_connected_components, descendant_counts
+from domain.services.metric_calculator import (
+    MetricCalculator, DEFAULT_TIMEOUT_SECONDS, ALL_METRICS, METRIC_FAMILY, METRIC_PROFILES, PROFILE_QUICK,
+    FAMILY_BETWEENNESS, FAMILY_CLOSENESS, FAMILY_PAGERANK, FAMILY_HITS, FAMILY_KATZ, FAMILY_FIELDS, INCOMPLETE
+)
+
+# Above this many changed edges + nodes, relative to the previous edge
+# count, a full recompute is cheaper than tracking the affected region
+DEFAULT_MAX_DELTA_FRACTION = 0.05
+
+# Metrics the engine maintains; the others are carried over as stale
+INCREMENTAL_METRICS = METRIC_PROFILES[PROFILE_QUICK]
+STALE_FAMILIES = (FAMILY_BETWEENNESS, FAMILY_CLOSENESS, FAMILY_PAGERANK, FAMILY_HITS, FAMILY_KATZ)
+
+MODE_INCREMENTAL = "incremental"
+MODE_FULL = "full"
+
+
+@dataclass
+class GraphDelta:
+    """Changes between two graph versions.
+
+    An edge whose attributes (type/weight) changed appears in both
+    `removed_edges` and `added_edges`. Edges incident to removed nodes need
+    not be listed.
+    """
+    added_nodes: Dict[Any, dict] = field(default_factory=dict)
+    removed_nodes: Set[Any] = field(default_factory=set)
+    added_edges: Dict[Tuple[Any, Any], dict] = field(default_factory=dict)
+    removed_edges: Set[Tuple[Any, Any]] = field(default_factory=set)
+
+    @classmethod
+    def between(cls, old: nx.DiGraph, new: nx.DiGraph) -> 'GraphDelta':
+        delta = cls()
+        old_nodes, new_nodes = old.nodes, new.nodes
+        delta.added_nodes = {n: dict(d) for n, d in new_nodes.items() if n not in old_nodes}
+        delta.removed_nodes = {n for n in old_nodes if n not in new_nodes}
+        for u, targets in new.succ.items():
+            old_targets = old.succ.get(u, {})
+            for v, data in targets.items():
+                before = old_targets.get(v)
+                if before != data:
+                    delta.added_edges[(u, v)] = dict(data)
+                    if before is not None:
+                        delta.removed_edges.add((u, v))
+        for u, targets in old.succ.items():
+            if u in delta.removed_nodes:
+                continue
+            new_targets = new.succ[u]
+            for v in targets:
+                if v not in new_targets and v not in delta.removed_nodes:
+                    delta.removed_edges.add((u, v))
+        return delta
+
+    def size(self) -> int:
+        return (len(self.added_nodes) + len(self.removed_nodes)
+                + len(self.added_edges) + len(self.removed_edges))
+
+
+@dataclass
+class IncrementalResult:
+    graph: nx.DiGraph
+    metrics: Dict[Any, dict]
+    mode: str  # MODE_INCREMENTAL or MODE_FULL
+    stale_metrics: List[str] = field(default_factory=list)  # families carried over
+    affected_nodes: int = 0  # nodes whose reachability was recomputed
+    verified: bool = False
+    # From the MetricCalculator of a full recompute; empty otherwise
+    betweenness_info: Dict[str, Any] = field(default_factory=dict)
+    incomplete_metrics: List[str] = field(default_factory=list)
+
+
+def _bfs(adj, starts: Iterable[Any]) -> Set[Any]:
+    """Nodes reachable from `starts` (inclusive) over the adjacency mapping."""
+    seen = set(starts)
+    queue = deque(seen)
+    while queue:
+        for w in adj[queue.popleft()]:
+            if w not in seen:
+                seen.add(w)
+                queue.append(w)
+    return seen
+
+
+def _tarjan_on(graph: nx.DiGraph, members: Iterable[Any]) -> List[List[Any]]:
+    """SCCs of the subgraph induced by `members`."""
+    nodes = list(members)
+    index = {node: i for i, node in enumerate(nodes)}
+    succ = [[index[t] for t in graph.succ[node] if t in index] for node in nodes]
+    comp_of, n_comp = strongly_connected_components(succ)
+    groups: List[List[Any]] = [[] for _ in range(n_comp)]
+    for node, c in zip(nodes, comp_of):
+        groups[c].append(node)
+    return groups
+
+
+def _apply_delta(graph: nx.DiGraph, delta: GraphDelta) -> nx.DiGraph:
+    graph.remove_nodes_from([n for n in delta.removed_nodes if n in graph])
+    graph.remove_edges_from([e for e in delta.removed_edges if graph.has_edge(*e)])
+    for node, attrs in delta.added_nodes.items():
+        graph.add_node(node, **attrs)
+    for (u, v), attrs in delta.added_edges.items():
+        graph.add_edge(u, v, **attrs)
+    return graph
+
+
+class IncrementalMetricEngine:
+    """Updates a previous run's metrics for a GraphDelta.
+
+    Args:
+        max_delta_fraction: Fall back to a full recompute when the delta
+                            has more than this fraction of the previous
+                            edge count (at least one change is always
+                            handled incrementally).
+        verify: After an incremental update, recompute the maintained
+                metrics from scratch and raise RuntimeError on any
+                difference. For CI checks of the engine itself.
+        calculator_options: Keyword arguments for the MetricCalculator used
+                            by full recomputes (betweenness, workers).
+        timeout, budgets: Passed to MetricCalculator.calculate() on full
+                          recomputes.
+    """
+
+    def __init__(
+        self,
+        max_delta_fraction: float = DEFAULT_MAX_DELTA_FRACTION,
+        verify: bool = False,
+        calculator_options: Optional[Dict[str, Any]] = None,
+        timeout: int = DEFAULT_TIMEOUT_SECONDS,
+        budgets: Optional[Dict[str, float]] = None
+    ):
+        self.max_delta_fraction = max_delta_fraction
+        self.verify = verify
+        self.calculator_options = calculator_options or {}
+        self.timeout = timeout
+        self.budgets = budgets
+
+    def apply(
+        self,
+        graph: nx.DiGraph,
+        metrics: Dict[Any, dict],
+        delta: GraphDelta,
+        in_place: bool = False
+    ) -> IncrementalResult:
+        """Returns the updated graph and metrics.
+
+        `graph` is copied before the delta is applied unless `in_place`;
+        `metrics` is never modified.
+        """
+        wanted = [m for m in ALL_METRICS if metrics and m in next(iter(metrics.values()))]
+        limit = max(1, self.max_delta_fraction * graph.number_of_edges())
+        if delta.size() > limit or not self._maintainable(metrics, wanted):
+            new = _apply_delta(graph if in_place else graph.copy(), delta)
+            return self._full(new, wanted or list(ALL_METRICS))
+
+        # Facts about the old graph, gathered before it changes
+        old_nodes = graph.number_of_nodes()
+        removed_edges = {e for e in delta.removed_edges if graph.has_edge(*e)}
+        for node in delta.removed_nodes:
+            if node in graph:
+                removed_edges.update(graph.in_edges(node))
+                removed_edges.update(graph.out_edges(node))
+        old_ancestors = _bfs(graph.pred, {u for u, _ in removed_edges})
+
+        new = _apply_delta(graph if in_place else graph.copy(), delta)
+        result = self._incremental(new, old_nodes, metrics, delta, wanted, removed_edges, old_ancestors)
+        if self.verify:
+            self._verify(result)
+        return result
+
+    @staticmethod
+    def _maintainable(metrics: Dict[Any, dict], wanted: List[str]) -> bool:
+        """Whether the previous run has every maintained metric, complete."""
+        if not set(INCREMENTAL_METRICS) <= set(wanted):
+            return False
+        probes = ('in_degree', 'scc_id', 'blast_radius')  # one per family
+        return all(row[m] not in (None, INCOMPLETE) for row in metrics.values() for m in probes)
+
+    def _full(self, graph: nx.DiGraph, wanted: List[str]) -> IncrementalResult:
+        calculator = MetricCalculator(graph, **self.calculator_options)
+        metrics = calculator.calculate(wanted, timeout=self.timeout, budgets=self.budgets)
+        return IncrementalResult(
+            graph, metrics, MODE_FULL,
+            affected_nodes=graph.number_of_nodes(),
+            betweenness_info=calculator.betweenness_info,
+            incomplete_metrics=calculator.incomplete_metrics
+        )
+
+    def _incremental(self, new, old_nodes, metrics, delta, wanted, removed_edges, old_ancestors) -> IncrementalResult:
+        added_edges = list(delta.added_edges)
+
+        total = max(new.number_of_nodes(), 1)
+        rescale = new.number_of_nodes() != old_nodes
+        out = {node: dict(row) for node, row in metrics.items() if node in new}
+        for node in new.nodes:
+            if node not in out:
+                out[node] = {m: INCOMPLETE for m in wanted}
+
+        # Degrees
+        touched = {n for e in removed_edges for n in e} | {n for e in added_edges for n in e}
+        touched = (touched | set(delta.added_nodes)) & new.nodes
+        for node in touched:
+            row = out[node]
+            row['in_degree'] = new.in_degree(node)
+            row['out_degree'] = new.out_degree(node)
+            row['total_degree'] = row['in_degree'] + row['out_degree']
+            row['weighted_in'] = new.in_degree(node, weight='weight')
+            row['weighted_out'] = new.out_degree(node, weight='weight')
+        for node in (out if rescale else touched):
+            row = out[node]
+            row['fan_in_ratio'] = row['in_degree'] / total
+            row['fan_out_ratio'] = row['out_degree'] / total
+
+        # SCCs: previous partition minus removed nodes, then split and merge
+        piece_of: Dict[Any, int] = {}
+        pieces: Dict[int, List[Any]] = {}
+        for node, row in out.items():
+            if node in metrics:
+                piece_of[node] = row['scc_id']
+        next_piece = max(piece_of.values(), default=-1) + 1
+        for node in new.nodes:
+            if node not in piece_of:
+                piece_of[node] = next_piece
+                next_piece += 1
+        for node, p in piece_of.items():
+            pieces.setdefault(p, []).append(node)
+
+        broken = {metrics[u]['scc_id'] for u, v in removed_edges
+                  if u in metrics and v in metrics and metrics[u]['scc_id'] == metrics[v]['scc_id']}
+        for p in broken:
+            members = pieces.pop(p, [])
+            for group in _tarjan_on(new, members):
+                for node in group:
+                    piece_of[node] = next_piece
+                pieces[next_piece] = group
+                next_piece += 1
+
+        bridges = [(u, v) for u, v in added_edges if piece_of[u] != piece_of[v]]
+        if bridges:
+            region = _bfs(new.succ, {v for _, v in bridges}) & _bfs(new.pred, {u for u, _ in bridges})
+            for group in _tarjan_on(new, region):
+                joined = {piece_of[node] for node in group}
+                if len(joined) < 2:
+                    continue
+                merged = [node for p in joined for node in pieces.pop(p)]
+                for node in merged:
+                    piece_of[node] = next_piece
+                pieces[next_piece] = merged
+                next_piece += 1
+
+        # Same numbering as MetricCalculator: components ordered by smallest member
+        ordered = sorted(pieces.values(), key=min)
+        comp_of: Dict[Any, int] = {}
+        for scc_id, members in enumerate(ordered):
+            size = len(members)
+            for node in members:
+                comp_of[node] = scc_id
+                row = out[node]
+                row['scc_id'] = scc_id
+                row['scc_size'] = size
+                row['scc_density'] = size / total
+
+        # Reachability: whoever could reach a changed edge's source
+        sources = {u for u, _ in removed_edges} | {u for u, _ in added_edges} | set(delta.added_nodes)
+        affected = (old_ancestors & new.nodes) | _bfs(new.pred, sources & new.nodes)
+        closure = list(_bfs(new.succ, affected))
+        index = {node: i for i, node in enumerate(closure)}
+        succ = [[index[t] for t in new.succ[node]] for node in closure]
+        local = {}
+        closure_comp = [local.setdefault(comp_of[node], len(local)) for node in closure]
+        counts = descendant_counts(succ, closure_comp, len(local))
+        for node, count in zip(closure, counts):
+            out[node]['blast_radius'] = count
+        for node in (out if rescale else affected):
+            out[node]['reachability_ratio'] = out[node]['blast_radius'] / total
+
+        stale = [f for f in STALE_FAMILIES if any(m in wanted for m in FAMILY_FIELDS[f])]
+        return IncrementalResult(new, out, MODE_INCREMENTAL, stale, affected_nodes=len(affected))
+
+    def _verify(self, result: IncrementalResult):
+        fields = [m for m in INCREMENTAL_METRICS if METRIC_FAMILY[m] not in STALE_FAMILIES]
+        expected = MetricCalculator(result.graph).calculate(fields)
+        mismatches = [
+            (node, m, result.metrics[node][m], expected[node][m])
+            for node in expected for m in fields
+            if result.metrics[node][m] != expected[node][m]
+        ]
+        if mismatches:
+            raise RuntimeError(
+                f"Incremental metrics diverge from full recompute on {len(mismatches)} values, "
+                f"e.g. {mismatches[:5]}"
+            )
+        result.verified = True
@@ -0,0 +1,66 @@
+"""Metrics on the method-level graph, rolled up to classes.
+
+Method metrics are computed over a MethodGraph's slot arrays (no NetworkX
+graph): call degrees, call-count weighted degrees, PageRank and blast
+radius (methods transitively reachable through calls). Class-level figures
+are then aggregations of the methods each class owns, e.g. the busiest
+method's fan-in or the class's share of method PageRank, which is what
+"this class is central" means once calls are followed method by method.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from domain.models.method_graph import MethodGraph, ROLL_UP_SUM, ROLL_UP_MAX
+from domain.algorithms.link_analysis import pagerank
+from domain.algorithms.reachability import strongly_connected_components, descendant_counts
+
+METHOD_METRICS = ('in_degree', 'out_degree', 'weighted_in', 'weighted_out', 'pagerank', 'blast_radius')
+
+# Class-level metric -> (method metric, aggregation)
+CLASS_ROLL_UPS: Dict[str, Tuple[str, str]] = {
+    'method_weighted_in': ('weighted_in', ROLL_UP_SUM),
+    'method_weighted_out': ('weighted_out', ROLL_UP_SUM),
+    'method_pagerank': ('pagerank', ROLL_UP_SUM),
+    'max_method_in_degree': ('in_degree', ROLL_UP_MAX),
+    'max_method_blast_radius': ('blast_radius', ROLL_UP_MAX),
+}
+
+
+def calculate_method_metrics(
+    graph: MethodGraph,
+    check: Optional[Callable[[], None]] = None
+) -> Dict[str, np.ndarray]:
+    """METHOD_METRICS, each an array over the graph's method slots."""
+    adj = graph.adjacency()
+    n = adj.n
+    succ = adj.successor_lists()
+    comp_of, n_comp = strongly_connected_components(succ, check)
+    return {
+        'in_degree': np.bincount(adj.targets, minlength=n).astype(np.float64),
+        'out_degree': np.diff(adj.offsets).astype(np.float64),
+        'weighted_in': adj.in_strength,
+        'weighted_out': adj.out_strength,
+        'pagerank': pagerank(adj, check=check),
+        'blast_radius': np.asarray(descendant_counts(succ, comp_of, n_comp, check), dtype=np.float64),
+    }
+
+
+def roll_up_metrics(graph: MethodGraph, metrics: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """CLASS_ROLL_UPS plus `method_count`, each an array over the class graph's nodes."""
+    rolled = {'method_count': graph.method_counts().astype(np.float64)}
+    for name, (metric, how) in CLASS_ROLL_UPS.items():
+        rolled[name] = graph.roll_up(metrics[metric], how)
+    return rolled
+
+
+def method_rows(graph: MethodGraph, metrics: Dict[str, np.ndarray], slots) -> List[Dict]:
+    """One {method, <metric>: value} dict per slot, integer metrics as ints."""
+    return [
+        {
+            'method': graph.method_name(slot),
+            **{
+                name: float(values[slot]) if name == 'pagerank' else int(values[slot])
+                for name, values in metrics.items()
+            }
+        }
+        for slot in slots
+    ]
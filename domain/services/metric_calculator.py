@@ -1,18 +1,244 @@
+import math
+import random
+import threading
+import time
 import networkx as nx
-from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from domain.models.edge import EdgeType
 from domain.models.node import NodeType
+from domain.algorithms.reachability import strongly_connected_components, descendant_counts
+from domain.algorithms.centrality import CentralityEngine
+from domain.algorithms.link_analysis import (
+    SparseAdjacency, ConvergenceError, pagerank, hits, katz,
+    DEFAULT_TOL, DEFAULT_MAX_ITER, DEFAULT_DAMPING, DEFAULT_KATZ_BETA
+)
+from domain.services.graph_projection import GraphProjector
+
+# Bump whenever a metric's definition or numerics change: cached metric
+# matrices (see graph_fingerprint.metric_cache_key) are keyed on it
+METRICS_VERSION = "1"
 
 # Performance constraints
 MAX_NODES_FOR_BETWEENNESS = 2000
 DEFAULT_TIMEOUT_SECONDS = 60
+# How long past the timeout a cooperative computation may take to wind down
+# before calculate_all_metrics gives up on it
+CANCEL_GRACE_SECONDS = 1.0
+
+# Metric families, in computation order. Each can have its own time budget;
+# a family that runs out is filled with INCOMPLETE and listed in
+# MetricCalculator.incomplete_metrics.
+FAMILY_DEGREE = "degree"
+FAMILY_BETWEENNESS = "betweenness"
+FAMILY_CLOSENESS = "closeness"
+FAMILY_SCC = "scc"
+FAMILY_REACHABILITY = "reachability"
+FAMILY_PAGERANK = "pagerank"
+FAMILY_HITS = "hits"
+FAMILY_KATZ = "katz"
+METRIC_FAMILIES = (
+    FAMILY_DEGREE, FAMILY_BETWEENNESS, FAMILY_CLOSENESS, FAMILY_SCC, FAMILY_REACHABILITY,
+    FAMILY_PAGERANK, FAMILY_HITS, FAMILY_KATZ
+)
+
+FAMILY_FIELDS = {
+    FAMILY_DEGREE: ('in_degree', 'out_degree', 'total_degree', 'weighted_in',
+                    'weighted_out', 'fan_in_ratio', 'fan_out_ratio'),
+    FAMILY_BETWEENNESS: ('betweenness',),
+    FAMILY_CLOSENESS: ('closeness',),
+    FAMILY_SCC: ('scc_id', 'scc_size', 'scc_density'),
+    FAMILY_REACHABILITY: ('blast_radius', 'reachability_ratio'),
+    FAMILY_PAGERANK: ('pagerank',),
+    FAMILY_HITS: ('hub_score', 'authority_score'),
+    FAMILY_KATZ: ('katz',),
+}
+# Families whose results the family needs: blast radius sweeps the
+# condensation built by the SCC family
+FAMILY_DEPENDS = {FAMILY_REACHABILITY: (FAMILY_SCC,)}
+
+# Every metric, and the family that produces it
+METRIC_FAMILY = {field: family for family, fields in FAMILY_FIELDS.items() for field in fields}
+ALL_METRICS = tuple(METRIC_FAMILY)
+
+# Named metric sets for MetricCalculator.calculate(). "quick" leaves out the
+# per-source BFS families (betweenness, closeness) and the power-iteration
+# families (pagerank, hits, katz), and stays linear in the size of the graph.
+PROFILE_QUICK = "quick"
+PROFILE_FULL = "full"
+METRIC_PROFILES = {
+    PROFILE_QUICK: (
+        FAMILY_FIELDS[FAMILY_DEGREE] + FAMILY_FIELDS[FAMILY_SCC] + FAMILY_FIELDS[FAMILY_REACHABILITY]
+    ),
+    PROFILE_FULL: ALL_METRICS,
+}
+
+# Value stored for every field of a family that did not finish
+INCOMPLETE = -1
+
+# Betweenness modes. "auto" resolves to exact up to MAX_NODES_FOR_BETWEENNESS
+# and to approximate above it; "skip" is the legacy -1.0 sentinel.
+BETWEENNESS_AUTO = "auto"
+BETWEENNESS_EXACT = "exact"
+BETWEENNESS_APPROXIMATE = "approximate"
+BETWEENNESS_SKIP = "skip"
+
+DEFAULT_BETWEENNESS_EPSILON = 0.1
+DEFAULT_BETWEENNESS_DELTA = 0.1
+DEFAULT_BETWEENNESS_SEED = 42
+
+
+@dataclass
+class BetweennessConfig:
+    """How betweenness is computed.
+
+    Attributes:
+        mode: "auto", "exact", "approximate" or "skip".
+        samples: Pivot budget for approximate mode. Takes precedence over
+                 `epsilon` when set.
+        epsilon: Target max additive error of each normalized value...
+        delta: ...holding for all nodes with probability 1 - delta.
+        seed: Pivot sampling seed; same seed and graph give the same values.
+    """
+    mode: str = BETWEENNESS_AUTO
+    samples: Optional[int] = None
+    epsilon: float = DEFAULT_BETWEENNESS_EPSILON
+    delta: float = DEFAULT_BETWEENNESS_DELTA
+    seed: int = DEFAULT_BETWEENNESS_SEED
+
+    def __post_init__(self):
+        if self.mode not in (BETWEENNESS_AUTO, BETWEENNESS_EXACT, BETWEENNESS_APPROXIMATE, BETWEENNESS_SKIP):
+            raise ValueError(f"Unknown betweenness mode: {self.mode}")
+        if self.samples is not None and self.samples < 1:
+            raise ValueError("samples must be >= 1")
+        if not (0 < self.epsilon < 1 and 0 < self.delta < 1):
+            raise ValueError("epsilon and delta must be in (0, 1)")
+
+    def sample_size(self, n: int) -> int:
+        """Pivots needed for this config on an `n`-node graph (at most n).
+
+        Each pivot's contribution to a normalized value lies in [0, 1], so by
+        Hoeffding plus a union bound over all n nodes,
+        k >= ln(2n / delta) / (2 * epsilon^2) pivots bound every error by
+        epsilon with probability 1 - delta.
+        """
+        if self.samples is not None:
+            return max(1, min(self.samples, n))
+        k = math.ceil(math.log(2 * n / self.delta) / (2 * self.epsilon ** 2))
+        return max(1, min(k, n))
+
+
+@dataclass
+class LinkAnalysisConfig:
+    """Power-iteration settings for PageRank, HITS and Katz (see link_analysis).
+
+    Attributes:
+        tol: Stop once an iteration changes the vector by less than n * tol (L1).
+        max_iter: Iterations before the family is given up and reported
+                  incomplete.
+        damping: PageRank damping factor.
+        katz_alpha: Katz attenuation. None picks a value that always
+                    converges (below 1 / spectral radius).
+        katz_beta: Katz baseline score.
+        seed: Starting vector seed for PageRank and HITS; None starts uniform.
+    """
+    tol: float = DEFAULT_TOL
+    max_iter: int = DEFAULT_MAX_ITER
+    damping: float = DEFAULT_DAMPING
+    katz_alpha: Optional[float] = None
+    katz_beta: float = DEFAULT_KATZ_BETA
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        if self.tol <= 0 or self.max_iter < 1:
+            raise ValueError("tol must be > 0 and max_iter >= 1")
+        if not 0 < self.damping < 1:
+            raise ValueError("damping must be in (0, 1)")
+        if self.katz_alpha is not None and self.katz_alpha <= 0:
+            raise ValueError("katz_alpha must be > 0")
+
+
+class MetricCancelled(Exception):
+    """Raised by CancelToken.check() once the budget is spent or cancel() was called."""
+
+
+class CancelToken:
+    """Cooperative cancellation: a shared flag plus an optional monotonic deadline.
+
+    Long-running loops call `check()`; `child()` derives a token with a
+    tighter deadline (a family budget) that still observes the parent flag.
+    """
+
+    def __init__(self, deadline: Optional[float] = None, _event: Optional[threading.Event] = None):
+        self.deadline = deadline
+        self._event = _event or threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or (
+            self.deadline is not None and time.monotonic() >= self.deadline
+        )
+
+    def check(self):
+        if self.cancelled:
+            raise MetricCancelled()
+
+    def child(self, budget: Optional[float] = None) -> 'CancelToken':
+        deadline = self.deadline
+        if budget is not None:
+            own = time.monotonic() + budget
+            deadline = own if deadline is None else min(deadline, own)
+        return CancelToken(deadline, self._event)
 
 
 class MetricCalculator:
-    def __init__(self, graph: nx.DiGraph):
+    def __init__(
+        self,
+        graph: nx.DiGraph,
+        betweenness: Optional[BetweennessConfig] = None,
+        workers: int = 1,
+        link_analysis: Optional[LinkAnalysisConfig] = None
+    ):
+        """
+        Args:
+            graph: Graph to measure.
+            betweenness: See BetweennessConfig.
+            workers: Processes for betweenness and closeness. 1 runs in-process;
+                     >1 runs Brandes/BFS sources on a process pool over
+                     shared CSR arrays (see CentralityEngine). Results are
+                     identical for every worker count and match NetworkX to
+                     floating-point rounding.
+            link_analysis: See LinkAnalysisConfig. PageRank, HITS and Katz
+                           use edge `weight` (call counts); a family that
+                           does not converge is reported incomplete.
+        """
         self.graph = graph
         self.total_nodes = max(graph.number_of_nodes(), 1)
+        self.betweenness_config = betweenness or BetweennessConfig()
+        self.workers = max(1, workers)
+        self.link_analysis_config = link_analysis or LinkAnalysisConfig()
+        # Filled in by _compute: effective mode ("exact", "approximate",
+        # "skip"), pivots used and seed (None unless sampled)
+        self.betweenness_info: Dict[str, Any] = {}
+        # Families that ran out of budget in the last computation
+        self.incomplete_metrics: List[str] = []
+        self._token: Optional[CancelToken] = None
+        self._budgets: Dict[str, float] = {}
+        self._wanted: Optional[Tuple[str, ...]] = None
+        # Memoized per calculator (i.e. per graph): finished families, their
+        # columns {metric: {node: value}}, and shared intermediates
+        self._done: set = set()
+        self._columns: Dict[str, Dict[Any, Any]] = {}
+        self._indexed: Optional[Tuple[List[Any], List[List[int]]]] = None
+        self._comp_of: Optional[List[int]] = None
+        self._adjacency: Optional[SparseAdjacency] = None
+        # Betweenness and closeness share one engine (one pool, one shared
+        # block) per computation; closed when _compute finishes
+        self._engine: Optional[CentralityEngine] = None
 
     # ─────────────────────────────────────────────────────────────────────
     # Phase C: Subgraph Projection
@@ -34,109 +260,269 @@ class MetricCalculator:
                         one of the listed EdgeType values are included.
 
         Returns:
-            A new DiGraph containing only the matching nodes and edges.
+            A new DiGraph containing only the matching nodes and edges, built
+            in O(nodes + kept edges); changing it leaves `graph` untouched.
+            Use a GraphProjector to reuse its edge index and cache several
+            (read-only) projections of one graph.
         """
-        edge_type_values = (
-            {et.value for et in edge_types} if edge_types else None
-        )
-        node_type_values = (
-            {nt.value for nt in node_types} if node_types else None
-        )
-
-        # Filter nodes first
-        if node_type_values:
-            keep_nodes = [
-                n for n, d in graph.nodes(data=True)
-                if d.get('type') in node_type_values
-            ]
-        else:
-            keep_nodes = list(graph.nodes())
-
-        # Build subgraph on kept nodes
-        sub = graph.subgraph(keep_nodes).copy()
-
-        # Filter edges by type if requested
-        if edge_type_values:
-            edges_to_remove = [
-                (u, v) for u, v, d in sub.edges(data=True)
-                if d.get('type') not in edge_type_values
-            ]
-            sub.remove_edges_from(edges_to_remove)
-
-        return sub
+        return GraphProjector(graph).project_copy(node_types, edge_types)
 
     # ─────────────────────────────────────────────────────────────────────
     # Metric Computation
     # ─────────────────────────────────────────────────────────────────────
 
-    def calculate_all_metrics(
+    def plan(self, metrics: Iterable[str]) -> List[str]:
+        """Families still to run for `metrics`, dependencies first.
+
+        Families memoized by an earlier call are left out.
+        """
+        metrics = list(metrics)
+        unknown = set(metrics) - set(METRIC_FAMILY)
+        if unknown:
+            raise ValueError(f"Unknown metrics: {sorted(unknown)}")
+        needed = set()
+        stack = [METRIC_FAMILY[m] for m in metrics]
+        while stack:
+            family = stack.pop()
+            if family in needed or family in self._done:
+                continue
+            needed.add(family)
+            stack.extend(FAMILY_DEPENDS.get(family, ()))
+        return [family for family in METRIC_FAMILIES if family in needed]
+
+    def calculate(
         self,
-        timeout: int = DEFAULT_TIMEOUT_SECONDS
+        metrics: Iterable[str],
+        timeout: int = DEFAULT_TIMEOUT_SECONDS,
+        budgets: Optional[Dict[str, float]] = None
     ) -> Dict[str, dict]:
-        """Runs all mathematical metrics deterministically.
+        """Computes only `metrics` (names from ALL_METRICS, or a METRIC_PROFILES
+        entry) plus what they depend on, and returns {node: {metric: value}}
+        with just those metrics.
+
+        Each family is computed on first request and memoized, so later calls
+        on the same calculator only run what is new.
 
         Args:
-            timeout: Max seconds to allow; raises RuntimeError if exceeded.
+            metrics: Metric names to return.
+            timeout: Max seconds for the whole computation. Families still
+                     running when it passes stop and are reported as
+                     incomplete; RuntimeError is raised only if computation
+                     does not stop within CANCEL_GRACE_SECONDS after that.
+            budgets: Optional max seconds per family (keys from
+                     METRIC_FAMILIES), each measured from the family's start.
+
+        Fields of families that did not finish hold INCOMPLETE (-1); their
+        names are in `self.incomplete_metrics`. Unfinished families are not
+        memoized.
         """
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(self._compute)
-            try:
-                return future.result(timeout=timeout)
-            except FutureTimeoutError:
-                raise RuntimeError(
-                    f"Metric computation exceeded {timeout}s timeout. "
-                    "Graph may be too large. Consider reducing scope."
-                )
+        wanted = tuple(dict.fromkeys(metrics))
+        self.plan(wanted)  # validates names
+        budgets = dict(budgets or {})
+        unknown = set(budgets) - set(METRIC_FAMILIES)
+        if unknown:
+            raise ValueError(f"Unknown metric families: {sorted(unknown)}")
+        self._wanted = wanted
+        self._budgets = budgets
+        self._token = CancelToken(deadline=time.monotonic() + timeout)
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(self._compute)
+        try:
+            return future.result(timeout=timeout + CANCEL_GRACE_SECONDS)
+        except FutureTimeoutError:
+            self._token.cancel()
+            raise RuntimeError(
+                f"Metric computation exceeded {timeout}s timeout. "
+                "Graph may be too large. Consider reducing scope."
+            )
+        finally:
+            executor.shutdown(wait=False)
+            self._token = None
+            self._wanted = None
+
+    def calculate_all_metrics(
+        self,
+        timeout: int = DEFAULT_TIMEOUT_SECONDS,
+        budgets: Optional[Dict[str, float]] = None
+    ) -> Dict[str, dict]:
+        """Runs all mathematical metrics deterministically. See calculate()."""
+        return self.calculate(ALL_METRICS, timeout=timeout, budgets=budgets)
 
     def _compute(self) -> Dict[str, dict]:
-        nodes = list(self.graph.nodes())
-        metrics_store = {n: {} for n in nodes}
+        wanted = self._wanted or ALL_METRICS
+        token = self._token or CancelToken()
+        self.incomplete_metrics = []
+
+        try:
+            for family in self.plan(wanted):
+                try:
+                    if any(dep in self.incomplete_metrics for dep in FAMILY_DEPENDS.get(family, ())):
+                        raise MetricCancelled()
+                    check = token.child(self._budgets.get(family)).check
+                    check()
+                    columns = self._FAMILY_COMPUTE[family](self, check)
+                except (MetricCancelled, ConvergenceError):
+                    self.incomplete_metrics.append(family)
+                    continue
+                self._columns.update(columns)
+                self._done.add(family)
+        finally:
+            if self._engine is not None:
+                self._engine.close()
+                self._engine = None
+
+        columns = [(m, self._columns.get(m, {})) for m in wanted]
+        return {
+            node: {m: values.get(node, INCOMPLETE) for m, values in columns}
+            for node in self.graph.nodes()
+        }
+
+    def _index(self) -> Tuple[List[Any], List[List[int]]]:
+        """(nodes, successor lists over node positions), built once."""
+        if self._indexed is None:
+            nodes = list(self.graph.nodes())
+            index = {node: i for i, node in enumerate(nodes)}
+            succ = [[index[t] for t in self.graph.successors(node)] for node in nodes]
+            self._indexed = (nodes, succ)
+        return self._indexed
 
-        # 1. Degree Metrics
+    def _weighted_adjacency(self) -> SparseAdjacency:
+        """Edge-weighted CSR over `_index()` positions, built once."""
+        if self._adjacency is None:
+            nodes, succ = self._index()
+            weights = [
+                [data.get('weight', 1) for data in self.graph.succ[node].values()]
+                for node in nodes
+            ]
+            self._adjacency = SparseAdjacency(succ, weights)
+        return self._adjacency
+
+    def _centrality(self) -> CentralityEngine:
+        """CentralityEngine over `_index()`, shared by betweenness and closeness."""
+        if self._engine is None:
+            _, succ = self._index()
+            self._engine = CentralityEngine(succ, workers=self.workers)
+        return self._engine
+
+    # 1. Degree Metrics
+    def _degrees(self, check) -> Dict[str, Dict[Any, Any]]:
         in_degrees = dict(self.graph.in_degree())
         out_degrees = dict(self.graph.out_degree())
+        check()
         weighted_in = dict(self.graph.in_degree(weight='weight'))
         weighted_out = dict(self.graph.out_degree(weight='weight'))
+        return {
+            'in_degree': in_degrees,
+            'out_degree': out_degrees,
+            'total_degree': {n: in_degrees[n] + out_degrees[n] for n in in_degrees},
+            'weighted_in': weighted_in,
+            'weighted_out': weighted_out,
+            'fan_in_ratio': {n: d / self.total_nodes for n, d in in_degrees.items()},
+            'fan_out_ratio': {n: d / self.total_nodes for n, d in out_degrees.items()},
+        }
 
-        # 2. Betweenness Centrality — skip if graph is too large
-        if self.graph.number_of_nodes() <= MAX_NODES_FOR_BETWEENNESS:
-            betweenness = nx.betweenness_centrality(
-                self.graph, normalized=True, weight=None
-            )
-        else:
-            betweenness = {n: -1.0 for n in nodes}  # Signal: skipped
-
-        closeness = nx.closeness_centrality(self.graph)
-
-        # 3. SCC Clusters
-        sccs = list(nx.strongly_connected_components(self.graph))
-        scc_map = {}
-        for scc_id, component in enumerate(sorted(sccs, key=lambda s: min(s))):
-            scc_size = len(component)
-            for node in component:
-                scc_map[node] = {"id": scc_id, "size": scc_size}
-
-        # 4. Blast Radius (Reachability via directed DFS)
-        for node in nodes:
-            reachable = len(nx.descendants(self.graph, node))
-            metrics_store[node]['blast_radius'] = reachable
-            metrics_store[node]['reachability_ratio'] = reachable / self.total_nodes
-
-        # 5. Compile the Matrix
-        for node in nodes:
-            metrics_store[node]['in_degree'] = in_degrees.get(node, 0)
-            metrics_store[node]['out_degree'] = out_degrees.get(node, 0)
-            metrics_store[node]['total_degree'] = (
-                in_degrees.get(node, 0) + out_degrees.get(node, 0)
-            )
-            metrics_store[node]['weighted_in'] = weighted_in.get(node, 0)
-            metrics_store[node]['weighted_out'] = weighted_out.get(node, 0)
-            metrics_store[node]['betweenness'] = betweenness.get(node, 0.0)
-            metrics_store[node]['closeness'] = closeness.get(node, 0.0)
-            metrics_store[node]['scc_id'] = scc_map[node]['id']
-            metrics_store[node]['scc_size'] = scc_map[node]['size']
-            metrics_store[node]['fan_in_ratio'] = in_degrees.get(node, 0) / self.total_nodes
-            metrics_store[node]['fan_out_ratio'] = out_degrees.get(node, 0) / self.total_nodes
-            metrics_store[node]['scc_density'] = scc_map[node]['size'] / self.total_nodes
-
-        return metrics_store
+    # 2. Betweenness Centrality — sampled pivots above the size limit
+    def _betweenness_family(self, check) -> Dict[str, Dict[Any, Any]]:
+        nodes, _ = self._index()
+        return {'betweenness': self._betweenness(nodes, self._centrality(), check)}
+
+    # 3. Closeness Centrality
+    def _closeness(self, check) -> Dict[str, Dict[Any, Any]]:
+        nodes, _ = self._index()
+        return {'closeness': dict(zip(nodes, self._centrality().closeness(check)))}
+
+    # 4. SCC Clusters, numbered by their smallest member
+    def _scc(self, check) -> Dict[str, Dict[Any, Any]]:
+        nodes, succ = self._index()
+        raw, n_comp = strongly_connected_components(succ, check)
+        first = [None] * n_comp
+        sizes = [0] * n_comp
+        for node, c in zip(nodes, raw):
+            sizes[c] += 1
+            if first[c] is None or node < first[c]:
+                first[c] = node
+        scc_ids = [0] * n_comp
+        for scc_id, c in enumerate(sorted(range(n_comp), key=lambda c: first[c])):
+            scc_ids[c] = scc_id
+        self._comp_of = [scc_ids[c] for c in raw]
+        return {
+            'scc_id': dict(zip(nodes, self._comp_of)),
+            'scc_size': {node: sizes[c] for node, c in zip(nodes, raw)},
+            'scc_density': {node: sizes[c] / self.total_nodes for node, c in zip(nodes, raw)},
+        }
+
+    # 5. Blast Radius — one sweep over the SCC condensation DAG
+    def _reachability(self, check) -> Dict[str, Dict[Any, Any]]:
+        nodes, succ = self._index()
+        n_comp = max(self._comp_of, default=-1) + 1
+        counts = descendant_counts(succ, self._comp_of, n_comp, check)
+        return {
+            'blast_radius': dict(zip(nodes, counts)),
+            'reachability_ratio': {node: c / self.total_nodes for node, c in zip(nodes, counts)},
+        }
+
+    # 6. PageRank
+    def _pagerank(self, check) -> Dict[str, Dict[Any, Any]]:
+        nodes, _ = self._index()
+        config = self.link_analysis_config
+        values = pagerank(
+            self._weighted_adjacency(), config.damping, config.tol, config.max_iter, config.seed, check
+        )
+        return {'pagerank': dict(zip(nodes, values.tolist()))}
+
+    # 7. HITS hub / authority scores
+    def _hits(self, check) -> Dict[str, Dict[Any, Any]]:
+        nodes, _ = self._index()
+        config = self.link_analysis_config
+        hubs, authorities = hits(
+            self._weighted_adjacency(), config.tol, config.max_iter, config.seed, check
+        )
+        return {
+            'hub_score': dict(zip(nodes, hubs.tolist())),
+            'authority_score': dict(zip(nodes, authorities.tolist())),
+        }
+
+    # 8. Katz Centrality
+    def _katz(self, check) -> Dict[str, Dict[Any, Any]]:
+        nodes, _ = self._index()
+        config = self.link_analysis_config
+        values = katz(
+            self._weighted_adjacency(), config.katz_alpha, config.katz_beta, config.tol, config.max_iter, check
+        )
+        return {'katz': dict(zip(nodes, values.tolist()))}
+
+    _FAMILY_COMPUTE = {
+        FAMILY_DEGREE: _degrees,
+        FAMILY_BETWEENNESS: _betweenness_family,
+        FAMILY_CLOSENESS: _closeness,
+        FAMILY_SCC: _scc,
+        FAMILY_REACHABILITY: _reachability,
+        FAMILY_PAGERANK: _pagerank,
+        FAMILY_HITS: _hits,
+        FAMILY_KATZ: _katz,
+    }
+
+    def _betweenness(self, nodes: List[str], engine: CentralityEngine, check=None) -> Dict[str, float]:
+        """Normalized betweenness per the config; records what was done in `betweenness_info`."""
+        config = self.betweenness_config
+        n = len(nodes)
+        mode = config.mode
+        if mode == BETWEENNESS_AUTO:
+            mode = BETWEENNESS_EXACT if n <= MAX_NODES_FOR_BETWEENNESS else BETWEENNESS_APPROXIMATE
+
+        if mode == BETWEENNESS_SKIP:
+            self.betweenness_info = {"mode": BETWEENNESS_SKIP, "samples": 0, "seed": None}
+            return {node: -1.0 for node in nodes}  # Signal: skipped
+
+        k = config.sample_size(n) if mode == BETWEENNESS_APPROXIMATE and n else n
+        if k >= n:
+            # A budget covering every node is the exact computation
+            self.betweenness_info = {"mode": BETWEENNESS_EXACT, "samples": n, "seed": None}
+            return dict(zip(nodes, engine.betweenness(check=check)))
+
+        self.betweenness_info = {"mode": BETWEENNESS_APPROXIMATE, "samples": k, "seed": config.seed}
+        # Same pivots nx.betweenness_centrality(k=k, seed=seed) draws
+        pivots = random.Random(config.seed).sample(nodes, k)
+        index = {node: i for i, node in enumerate(nodes)}
+        return dict(zip(nodes, engine.betweenness([index[p] for p in pivots], check)))
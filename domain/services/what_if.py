@@ -0,0 +1,244 @@
+"""What-if removal queries against one analysed graph kept in memory.
+
+A WhatIfSession indexes the graph once: integer successor lists, the SCC
+partition (Tarjan), the deduplicated condensation DAG and every node's
+blast radius. A query removes nodes and/or edges *virtually* — the session
+is never modified, so queries are independent and can run concurrently —
+and reports how the largest SCC and blast radii change:
+
+- SCCs: removals can only split components, so Tarjan re-runs only inside
+  components that lost a node or an internal edge.
+- Reachability: only components that could reach a removed node or the
+  source of a removed edge (the ancestors) can lose descendants. Their
+  counts are recomputed by one bitset sweep over the ancestors and the
+  part of the condensation they reach; every other count is reused.
+
+Tarjan numbers components in reverse topological order, so the sweep
+visits components by increasing number (split pieces in their own Tarjan
+order) and needs no separate topological sort.
+"""
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple
+import networkx as nx
+from domain.algorithms.reachability import strongly_connected_components, descendant_counts
+
+DEFAULT_CHANGE_LIMIT = 20
+
+
+@dataclass
+class RemovalImpact:
+    removed_nodes: List[str]
+    removed_edges: List[Tuple[str, str]]
+    largest_scc_before: int
+    largest_scc_after: int
+    # Components that lost members or internal edges: smallest member,
+    # size before, sizes of the SCCs it splits into (largest first)
+    split_components: List[Dict[str, Any]] = field(default_factory=list)
+    ancestor_nodes: int = 0  # nodes whose reachability was recomputed
+    changed_nodes: int = 0  # remaining nodes whose blast radius dropped
+    blast_radius_reduction: int = 0  # sum of those drops
+    # Largest drops first, at most `limit`: {name, before, after}
+    blast_radius_changes: List[Dict[str, Any]] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+
+class WhatIfSession:
+    """Removal queries over `graph` (typically a run's projected graph)."""
+
+    def __init__(self, graph: nx.DiGraph):
+        self.names: List[Any] = list(graph.nodes)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        index = self.index
+        self.succ: List[List[int]] = [[index[t] for t in graph.succ[name]] for name in self.names]
+
+        comp_of, n_comp = strongly_connected_components(self.succ)
+        self.comp_of: List[int] = list(comp_of)
+        self.n_comp = n_comp
+        self.members: List[List[int]] = [[] for _ in range(n_comp)]
+        for v, c in enumerate(self.comp_of):
+            self.members[c].append(v)
+        # Components by size, largest first (ties by number)
+        self.by_size = sorted(range(n_comp), key=lambda c: (-len(self.members[c]), c))
+
+        comp_succ: List[Set[int]] = [set() for _ in range(n_comp)]
+        for u, targets in enumerate(self.succ):
+            cu = self.comp_of[u]
+            for v in targets:
+                cv = self.comp_of[v]
+                if cv != cu:
+                    comp_succ[cu].add(cv)
+        self.comp_succ: List[List[int]] = [sorted(s) for s in comp_succ]
+        self.comp_pred: List[List[int]] = [[] for _ in range(n_comp)]
+        for c, targets in enumerate(self.comp_succ):
+            for d in targets:
+                self.comp_pred[d].append(c)
+
+        self.blast_radius: List[int] = descendant_counts(self.succ, self.comp_of, n_comp)
+
+    @property
+    def largest_scc(self) -> int:
+        return len(self.members[self.by_size[0]]) if self.n_comp else 0
+
+    def _resolve(self, nodes: Iterable[Any], edges: Iterable[Sequence[Any]]) -> Tuple[Set[int], Set[Tuple[int, int]]]:
+        unknown = [n for n in nodes if n not in self.index]
+        if unknown:
+            raise ValueError(f"Unknown nodes: {unknown[:10]}")
+        removed = {self.index[n] for n in nodes}
+        cut = set()
+        for u, v in edges:
+            iu, iv = self.index.get(u), self.index.get(v)
+            if iu is None or iv is None or iv not in self.succ[iu]:
+                raise ValueError(f"No edge {u} -> {v}")
+            if iu not in removed and iv not in removed:
+                cut.add((iu, iv))
+        return removed, cut
+
+    def remove(
+        self,
+        nodes: Iterable[Any] = (),
+        edges: Iterable[Sequence[Any]] = (),
+        limit: int = DEFAULT_CHANGE_LIMIT
+    ) -> RemovalImpact:
+        """Impact of removing `nodes` (with their edges) and the (u, v) `edges`."""
+        start = time.perf_counter()
+        nodes, edges = list(nodes), [tuple(e) for e in edges]
+        removed, cut = self._resolve(nodes, edges)
+        comp_of, succ = self.comp_of, self.succ
+
+        # 1. Re-split the components that lost a member or an internal edge.
+        # Pieces get unit ids from n_comp up; unit_of overrides comp_of.
+        split = sorted({comp_of[r] for r in removed} | {comp_of[u] for u, v in cut if comp_of[u] == comp_of[v]})
+        unit_of: Dict[int, int] = {}
+        unit_members: Dict[int, List[int]] = {}
+        pieces: Dict[int, List[int]] = {}
+        next_unit = self.n_comp
+        for c in split:
+            kept = [v for v in self.members[c] if v not in removed]
+            local = {v: i for i, v in enumerate(kept)}
+            sub = [
+                [local[t] for t in succ[v] if t in local and (v, t) not in cut]
+                for v in kept
+            ]
+            raw, k = strongly_connected_components(sub)
+            ids = list(range(next_unit, next_unit + k))
+            next_unit += k
+            pieces[c] = ids
+            for unit in ids:
+                unit_members[unit] = []
+            for v, p in zip(kept, raw):
+                unit_of[v] = ids[p]
+                unit_members[ids[p]].append(v)
+
+        split_set = set(split)
+        largest_after = max((len(m) for m in unit_members.values()), default=0)
+        for c in self.by_size:
+            if c not in split_set:
+                largest_after = max(largest_after, len(self.members[c]))
+                break
+
+        # 2. Ancestors of every removal point, then everything they reach
+        starts = {comp_of[r] for r in removed} | {comp_of[u] for u, _ in cut}
+        ancestors = _closure(self.comp_pred, starts)
+        region = _closure(self.comp_succ, ancestors)
+
+        # 3. Successor units in the reduced graph. Components with an edge
+        # into a split component or a cut edge of their own are rebuilt
+        # from node-level edges; the rest reuse the condensation.
+        dirty = {p for c in split for p in self.comp_pred[c]} | {comp_of[u] for u, _ in cut}
+
+        def unit(v: int) -> int:
+            return unit_of.get(v, comp_of[v])
+
+        def node_level(members: List[int], own: int) -> List[int]:
+            targets = set()
+            for v in members:
+                for t in succ[v]:
+                    if t not in removed and (v, t) not in cut:
+                        tu = unit(t)
+                        if tu != own:
+                            targets.add(tu)
+            return list(targets)
+
+        order: List[int] = []
+        size: Dict[int, int] = {}
+        unit_succ: Dict[int, List[int]] = {}
+        for c in sorted(region):
+            if c in split_set:
+                for piece in pieces[c]:
+                    order.append(piece)
+                    size[piece] = len(unit_members[piece])
+                    unit_succ[piece] = node_level(unit_members[piece], piece)
+            else:
+                order.append(c)
+                size[c] = len(self.members[c])
+                unit_succ[c] = node_level(self.members[c], c) if c in dirty else self.comp_succ[c]
+
+        readers: Dict[int, int] = dict.fromkeys(order, 0)
+        for u in order:
+            for t in unit_succ[u]:
+                readers[t] += 1
+
+        # 4. Bitset sweep, sinks first (see reachability.descendant_counts)
+        reach: Dict[int, int] = {}
+        count: Dict[int, int] = {}
+        next_bit = 0
+        for u in order:
+            bits = ((1 << size[u]) - 1) << next_bit
+            next_bit += size[u]
+            for t in unit_succ[u]:
+                bits |= reach[t]
+                readers[t] -= 1
+                if not readers[t]:
+                    del reach[t]
+            count[u] = bits.bit_count()
+            if readers[u]:
+                reach[u] = bits
+
+        changes = []
+        ancestor_nodes = 0
+        for c in ancestors:
+            for v in self.members[c]:
+                if v in removed:
+                    continue
+                ancestor_nodes += 1
+                after = count[unit(v)] - 1
+                before = self.blast_radius[v]
+                if after != before:
+                    changes.append((after - before, str(self.names[v]), before, after))
+        changes.sort()
+
+        return RemovalImpact(
+            removed_nodes=[self.names[r] for r in sorted(removed)],
+            removed_edges=[(self.names[u], self.names[v]) for u, v in sorted(cut)],
+            largest_scc_before=self.largest_scc,
+            largest_scc_after=largest_after,
+            split_components=[
+                {
+                    "component": min((self.names[v] for v in self.members[c]), key=str),
+                    "size": len(self.members[c]),
+                    "pieces": sorted((len(unit_members[p]) for p in pieces[c]), reverse=True),
+                }
+                for c in split
+            ],
+            ancestor_nodes=ancestor_nodes,
+            changed_nodes=len(changes),
+            blast_radius_reduction=-sum(diff for diff, *_ in changes),
+            blast_radius_changes=[
+                {"name": name, "before": before, "after": after}
+                for _, name, before, after in changes[:limit]
+            ],
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+        )
+
+
+def _closure(adj: List[List[int]], starts: Iterable[int]) -> Set[int]:
+    seen = set(starts)
+    queue = deque(seen)
+    while queue:
+        for w in adj[queue.popleft()]:
+            if w not in seen:
+                seen.add(w)
+                queue.append(w)
+    return seen
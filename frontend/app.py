@@ -28,11 +28,19 @@ with st.sidebar:
 # Main Content
 st.header("Analyze Workspace")
 project_path = st.text_input("Project Path (inside container)", value="/data")
+metric_profile = st.radio(
+    "Metric Profile", ["full", "quick"], horizontal=True,
+    help="quick: degrees, SCCs and blast radius only (no betweenness/closeness)"
+)
 
 if st.button("Run Minimal Analysis"):
     with st.spinner("Parsing PHP and building minimal graph..."):
         try:
-            payload = {"project_path": project_path, "project_name": "demo_project"}
+            payload = {
+                "project_path": project_path,
+                "project_name": "demo_project",
+                "metric_profile": metric_profile
+            }
             
             # Ensure proper routing depending on FASTAPI_URL setup
             analyze_url = FASTAPI_URL.replace("/health", "") + "/analyze"
@@ -11,32 +11,81 @@ st.markdown("Query the raw structural matrix generated per analysis run for spec
 FASTAPI_URL = os.getenv("FASTAPI_URL", "http://api:8000")
 METRICS_URL = FASTAPI_URL.replace("/health", "") + "/metrics"
 
+# Ensure specific column order for readability
+COLUMNS = ["name", "type", "in_degree", "out_degree", "betweenness", "pagerank", "hub_score",
+           "authority_score", "scc_size", "blast_radius"]
+SORT_KEYS = ["name", "blast_radius", "betweenness", "pagerank", "in_degree", "out_degree",
+             "hub_score", "authority_score", "scc_size"]
+
 run_id = st.number_input("Enter Run ID to Inspect:", min_value=1, step=1)
+col_sort, col_order, col_size = st.columns(3)
+sort_by = col_sort.selectbox("Sort by", SORT_KEYS)
+order = col_order.selectbox("Order", ["desc", "asc"] if sort_by != "name" else ["asc", "desc"])
+page_size = col_size.selectbox("Rows per page", [100, 500, 1000, 5000], index=1)
+col_type, col_prefix = st.columns(2)
+component_type = col_type.selectbox("Component type", ["all", "class", "method"])
+name_prefix = col_prefix.text_input("Name prefix (e.g. App\\Http\\)")
+
+# Sorting, filtering and paging happen in the API; each page is fetched by
+# the cursor the previous one returned
+query = (run_id, sort_by, order, page_size, component_type, name_prefix)
+if st.session_state.get("metrics_query") != query:
+    st.session_state.metrics_query = query
+    st.session_state.metrics_cursors = [None]  # cursor of each page visited so far
+
+col_query, col_prev, col_next = st.columns([2, 1, 1])
+fetch = col_query.button("Query Structural Matrix")
+if col_prev.button("Previous page") and len(st.session_state.metrics_cursors) > 1:
+    st.session_state.metrics_cursors.pop()
+    fetch = True
+if col_next.button("Next page") and st.session_state.get("metrics_next_cursor"):
+    st.session_state.metrics_cursors.append(st.session_state.metrics_next_cursor)
+    fetch = True
 
-if st.button("Query Structural Matrix"):
+if fetch:
     with st.spinner(f"Querying Run {run_id} from SQLite..."):
         try:
-            response = requests.get(f"{METRICS_URL}/{run_id}", timeout=5)
+            params = {
+                "sort_by": sort_by,
+                "order": order,
+                "limit": page_size,
+                "fields": ",".join(COLUMNS),
+            }
+            if st.session_state.metrics_cursors[-1]:
+                params["cursor"] = st.session_state.metrics_cursors[-1]
+            if component_type != "all":
+                params["type"] = component_type
+            if name_prefix:
+                params["name_prefix"] = name_prefix
+            response = requests.get(f"{METRICS_URL}/{run_id}", params=params, timeout=5)
             
             if response.status_code == 200:
                 data = response.json()
                 components = data.get("components", [])
+                st.session_state.metrics_next_cursor = data.get("next_cursor")
                 
                 if not components:
                     st.warning("No components found for this Run ID.")
                 else:
-                    # Convert raw JSON to Pandas DataFrame for native sorting
+                    # Convert raw JSON to Pandas DataFrame (already sorted by the API)
                     df = pd.DataFrame(components)
                     
-                    # Ensure specific column order for readability
-                    cols = ["name", "type", "in_degree", "out_degree", "betweenness", "scc_size", "blast_radius"]
                     # type column may not exist in older runs — fill safely
-                    for c in cols:
+                    for c in COLUMNS:
                         if c not in df.columns:
                             df[c] = "unknown"
-                    df = df[cols]
+                    df = df[COLUMNS]
                     
-                    st.subheader(f"Run {run_id} Results Matrix")
+                    page = len(st.session_state.metrics_cursors)
+                    st.subheader(f"Run {run_id} Results Matrix — page {page}")
+                    if not data.get("next_cursor"):
+                        st.caption("Last page.")
+                    incomplete = data.get("incomplete_metrics", [])
+                    if incomplete:
+                        st.info(
+                            "Ran out of time budget (values shown as -1): "
+                            + ", ".join(incomplete)
+                        )
                     st.dataframe(
                         df, 
                         use_container_width=True,
@@ -46,6 +95,9 @@ if st.button("Query Structural Matrix"):
                             "in_degree": "In-Degree",
                             "out_degree": "Out-Degree",
                             "betweenness": st.column_config.NumberColumn("Betweenness (Hub Rank)", format="%.4f"),
+                            "pagerank": st.column_config.NumberColumn("PageRank", format="%.5f"),
+                            "hub_score": st.column_config.NumberColumn("Hub Score", format="%.5f"),
+                            "authority_score": st.column_config.NumberColumn("Authority Score", format="%.5f"),
                             "scc_size": "SCC Size (Cycle Check)",
                             "blast_radius": "Blast Radius"
                         }
@@ -55,7 +107,7 @@ if st.button("Query Structural Matrix"):
                     # Create JSON download button
                     json_str = json.dumps(data, indent=2)
                     st.download_button(
-                        label="Download Raw JSON",
+                        label="Download Page as JSON",
                         data=json_str,
                         file_name=f"run_{run_id}_metrics.json",
                         mime="application/json"
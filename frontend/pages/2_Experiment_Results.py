@@ -1,29 +1,91 @@
 import streamlit as st
+import requests
+import pandas as pd
+import time
 import os
 
 st.set_page_config(page_title="Strata - Experiment Results", layout="wide")
 st.title("Validation & Experiment Harness")
-st.markdown("This interface will be populated in Phase 3 or later to display experimental sensitivity results.")
+st.markdown("Seeded Monte Carlo studies of how stable the risk ranking is for a completed analysis run.")
 
-st.warning("⚠️ Experiment Engine offline. Awaiting downstream metric sensitivity features.")
+FASTAPI_URL = os.getenv("FASTAPI_URL", "http://api:8000")
+EXPERIMENTS_URL = FASTAPI_URL.replace("/health", "") + "/experiments"
+POLL_SECONDS = 1.0
 
-st.markdown("### Anticipated Experiment Summaries")
-
-col1, col2 = st.columns(2)
+KINDS = {
+    "Weight Sensitivity (±10%)": "weight_sensitivity",
+    "Edge Perturbation (5%)": "edge_perturbation",
+    "Node Removal": "node_removal",
+}
 
+col1, col2, col3, col4 = st.columns(4)
 with col1:
-    st.info("**Weight Sensitivity**")
-    st.metric("Spearman Correlation", "N/A", delta=None)
-
+    run_id = st.number_input("Run ID:", min_value=1, step=1)
 with col2:
-    st.info("**Edge Perturbation (5%)**")
-    st.metric("Avg Rank Shift", "N/A", delta=None)
-    st.metric("Max Rank Shift", "N/A", delta=None)
-
-st.markdown("---")
-st.info("**Node Removal Impact**")
-st.code("""
-Largest SCC Before: N/A
-Largest SCC After: N/A
-Impact Delta: N/A
-""")
+    kind_label = st.selectbox("Experiment", list(KINDS))
+with col3:
+    trials = st.number_input("Trials", min_value=1, max_value=100_000, value=200, step=50)
+with col4:
+    seed = st.number_input("Seed", min_value=0, value=42, step=1)
+workers = st.slider("Worker processes", min_value=1, max_value=16, value=1)
+
+
+def _show_summary(kind: str, summary: dict):
+    if kind == "weight_sensitivity":
+        c1, c2 = st.columns(2)
+        c1.metric("Spearman Correlation (mean)", f"{summary['spearman']['mean']:.4f}")
+        c2.metric("Top-K Overlap (mean)", f"{summary['top_k_overlap']['mean']:.2%}")
+    elif kind == "edge_perturbation":
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Spearman Correlation (mean)", f"{summary['spearman']['mean']:.4f}")
+        c2.metric("Avg Rank Shift", f"{summary['mean_rank_shift']['mean']:.1f}")
+        c3.metric("Max Rank Shift", f"{summary['max_rank_shift']['max']:.0f}")
+    else:
+        before = summary["largest_scc_before"]["mean"]
+        after = summary["largest_scc_after"]["mean"]
+        st.code(
+            f"Largest SCC Before: {before:.0f}\n"
+            f"Largest SCC After:  {after:.1f} (mean), {summary['largest_scc_after']['min']:.0f} (min)\n"
+            f"Impact Delta:       {summary['impact']['mean']:.2f} (mean), {summary['impact']['max']:.0f} (max)"
+        )
+
+
+if st.button("Run Experiment"):
+    kind = KINDS[kind_label]
+    try:
+        response = requests.post(EXPERIMENTS_URL, json={
+            "run_id": int(run_id), "kind": kind, "trials": int(trials),
+            "seed": int(seed), "workers": int(workers)
+        }, timeout=10)
+        if response.status_code != 200:
+            st.error(f"Failed to start: {response.json().get('detail', response.status_code)}")
+            st.stop()
+        experiment_id = response.json()["experiment_id"]
+
+        progress = st.progress(0.0, text=f"Experiment {experiment_id}: starting...")
+        cursor = 0
+        results = []
+        while True:
+            data = requests.get(
+                f"{EXPERIMENTS_URL}/{experiment_id}", params={"cursor": cursor}, timeout=10
+            ).json()
+            results.extend(data["results"])
+            cursor = data["cursor"]
+            done = data["completed_trials"] / data["trials"]
+            progress.progress(done, text=f"Experiment {experiment_id}: {data['completed_trials']}/{data['trials']} trials")
+            if data["status"] != "running" and not data["results"]:
+                break
+            time.sleep(POLL_SECONDS)
+
+        if data["status"] == "failed":
+            st.error(f"Experiment failed: {data['error_message']}")
+        else:
+            st.subheader(f"Experiment {experiment_id} — {kind_label}")
+            _show_summary(kind, data["summary"])
+            df = pd.DataFrame(results).sort_values("trial_index")
+            numeric = [c for c in df.columns if c != "trial_index" and pd.api.types.is_numeric_dtype(df[c])]
+            st.line_chart(df.set_index("trial_index")[numeric])
+            with st.expander("Per-trial results"):
+                st.dataframe(df, use_container_width=True, hide_index=True)
+    except Exception as e:
+        st.error(f"Connection Error: {e}")
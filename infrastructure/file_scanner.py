@@ -0,0 +1,274 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import List, NamedTuple, Optional, Tuple
+
+# Never worth descending into: VCS metadata, IDE state, tool caches
+ALWAYS_SKIPPED_DIRS = frozenset({
+    '.git', '.svn', '.hg', '.bzr', '.idea', '.vscode', '__pycache__',
+    '.cache', '.phpunit.cache', '.sass-cache',
+})
+# Third-party code, skipped when ScanOptions.skip_vendor is set
+VENDOR_DIRS = frozenset({'vendor', 'node_modules', 'bower_components'})
+# Framework-generated PHP (compiled containers, views, route caches)
+GENERATED_DIR_SUFFIXES = ('/var/cache', '/bootstrap/cache', '/storage/framework')
+# Test code, skipped unless ScanOptions.include_tests is set. Directories only
+# match at the scan root: nested ones (src/Spec/, a package's test/) may well
+# be application code.
+TEST_DIRS = frozenset({'test', 'tests', 'spec', 'specs'})
+TEST_FILE_SUFFIXES = ('Test.php', 'TestCase.php')
+# max_file_size_kb of an analysis request that does not set one
+DEFAULT_MAX_FILE_SIZE_KB = 1024
+
+
+class ScannedFile(NamedTuple):
+    """A discovered source file plus the stat data later stages need."""
+    path: str
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+@dataclass
+class ScanOptions:
+    """File discovery options.
+
+    The defaults collect every matching file, as the plain os.walk scanner
+    did; `for_analysis()` gives the API spec's defaults for the `options` of
+    an analysis request.
+
+    Attributes:
+        skip_vendor: Skip vendor/, node_modules/ and bower_components/.
+        include_tests: Include test directories and *Test.php files.
+        max_file_size_kb: Skip files larger than this; None disables the limit.
+        exclude: Extra .gitignore-style patterns, relative to the scan root.
+        respect_gitignore: Apply .gitignore files found during the walk.
+        threads: Directories listed concurrently. >1 helps on network mounts
+                 and other high-latency volumes; output order is unaffected.
+        extensions: File suffixes to collect.
+    """
+    skip_vendor: bool = False
+    include_tests: bool = True
+    max_file_size_kb: Optional[int] = None
+    exclude: List[str] = field(default_factory=list)
+    respect_gitignore: bool = False
+    threads: int = 1
+    extensions: Tuple[str, ...] = ('.php',)
+
+    @classmethod
+    def for_analysis(cls, **overrides) -> "ScanOptions":
+        """Spec defaults: vendor, tests and files over 1 MiB skipped, .gitignore applied."""
+        defaults = dict(
+            skip_vendor=True,
+            include_tests=False,
+            max_file_size_kb=DEFAULT_MAX_FILE_SIZE_KB,
+            respect_gitignore=True
+        )
+        return cls(**{**defaults, **overrides})
+
+
+class IgnoreRules:
+    """A compiled set of .gitignore-style patterns anchored at `base` (POSIX, relative to root).
+
+    Supports `*`, `?`, `[...]`, `**`, leading `/` anchoring, trailing `/`
+    (directories only) and `!` negation. The last matching rule wins.
+    """
+
+    def __init__(self, base: str, lines: List[str]):
+        self.base = base
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []  # (regex, negate, dir_only)
+        for raw in lines:
+            line = raw.rstrip('\n').rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            if dir_only:
+                line = line[:-1]
+            # A leading or inner slash anchors the pattern to `base`
+            anchored = '/' in line
+            line = line.lstrip('/')
+            if not line:
+                continue
+            body = self._translate(line)
+            prefix = '' if anchored else '(?:.*/)?'
+            self.rules.append((re.compile(f'^{prefix}{body}$'), negate, dir_only))
+
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        out = []
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith('**/', i):
+                out.append('(?:.*/)?')
+                i += 3
+            elif pattern.startswith('/**', i) and i + 3 == len(pattern):
+                out.append('/.*')
+                i += 3
+            elif pattern.startswith('**', i):
+                out.append('.*')
+                i += 2
+            elif pattern[i] == '*':
+                out.append('[^/]*')
+                i += 1
+            elif pattern[i] == '?':
+                out.append('[^/]')
+                i += 1
+            elif pattern[i] == '[':
+                end = pattern.find(']', i + 1)
+                if end == -1:
+                    out.append(re.escape(pattern[i]))
+                    i += 1
+                else:
+                    inner = pattern[i + 1:end].replace('\\', '\\\\')
+                    if inner.startswith('!'):
+                        inner = '^' + inner[1:]
+                    out.append(f'[{inner}]')
+                    i = end + 1
+            else:
+                out.append(re.escape(pattern[i]))
+                i += 1
+        return ''.join(out)
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """True = ignored, False = re-included, None = no rule applies."""
+        if self.base:
+            if not rel_path.startswith(self.base + '/'):
+                return None
+            rel_path = rel_path[len(self.base) + 1:]
+        verdict = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                verdict = not negate
+        return verdict
+
+
+def _is_ignored(rules: Tuple[IgnoreRules, ...], rel_path: str, is_dir: bool) -> bool:
+    ignored = False
+    for rule_set in rules:
+        verdict = rule_set.match(rel_path, is_dir)
+        if verdict is not None:
+            ignored = verdict
+    return ignored
+
+
+class FileScanner:
+    @staticmethod
+    def scan(
+        root_path: str,
+        max_files: Optional[int] = None,
+        options: Optional[ScanOptions] = None
+    ) -> List[str]:
+        """Walk `root_path` and collect PHP file paths in sorted order.
+
+        Args:
+            root_path: Directory to scan.
+            max_files: Optional cap on number of files returned.
+                       None means no limit (Phase A+).
+            options: Discovery filters; defaults to ScanOptions(), which
+                     keeps every file with a matching extension.
+        """
+        return [f.path for f in FileScanner.scan_entries(root_path, max_files, options)]
+
+    @staticmethod
+    def scan_entries(
+        root_path: str,
+        max_files: Optional[int] = None,
+        options: Optional[ScanOptions] = None
+    ) -> List[ScannedFile]:
+        """Like `scan`, but returns size, mtime and inode alongside each path.
+
+        Uses `os.scandir`, so directory entries are typed without extra
+        stat calls and pruned directories are never listed. Results are
+        sorted by path once, globally, for deterministic ordering.
+        """
+        opts = options or ScanOptions()
+        # Explicit excludes are checked after any .gitignore, so they always win
+        excludes = (IgnoreRules('', opts.exclude),) if opts.exclude else ()
+
+        found: List[ScannedFile] = []
+        root_task = (root_path, '', ())
+        if opts.threads <= 1:
+            pending = [root_task]
+            while pending:
+                files, subdirs = FileScanner._scan_dir(*pending.pop(), excludes, opts)
+                found.extend(files)
+                pending.extend(subdirs)
+        else:
+            with ThreadPoolExecutor(max_workers=opts.threads) as executor:
+                futures = {executor.submit(FileScanner._scan_dir, *root_task, excludes, opts)}
+                while futures:
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        files, subdirs = future.result()
+                        found.extend(files)
+                        for task in subdirs:
+                            futures.add(executor.submit(FileScanner._scan_dir, *task, excludes, opts))
+
+        found.sort(key=lambda f: f.path)
+        if max_files is not None:
+            return found[:max_files]
+        return found
+
+    @staticmethod
+    def _scan_dir(
+        dir_path: str,
+        rel_dir: str,
+        rules: Tuple[IgnoreRules, ...],
+        excludes: Tuple[IgnoreRules, ...],
+        opts: ScanOptions
+    ) -> Tuple[List[ScannedFile], List[Tuple[str, str, Tuple[IgnoreRules, ...]]]]:
+        """List one directory. Returns (matching files, subdirectory tasks)."""
+        files: List[ScannedFile] = []
+        subdirs = []
+        max_bytes = opts.max_file_size_kb * 1024 if opts.max_file_size_kb is not None else None
+
+        try:
+            entries = list(os.scandir(dir_path))
+        except OSError:
+            return files, subdirs
+
+        if opts.respect_gitignore:
+            for entry in entries:
+                if entry.name == '.gitignore':
+                    try:
+                        with open(entry.path, 'r', encoding='utf-8', errors='ignore') as f:
+                            rules = rules + (IgnoreRules(rel_dir, f.readlines()),)
+                    except OSError:
+                        pass
+                    break
+        checks = rules + excludes
+
+        for entry in entries:
+            name = entry.name
+            rel = f'{rel_dir}/{name}' if rel_dir else name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    lowered = name.lower()
+                    if (
+                        name in ALWAYS_SKIPPED_DIRS
+                        or (opts.skip_vendor and lowered in VENDOR_DIRS)
+                        or (not opts.include_tests and not rel_dir and lowered in TEST_DIRS)
+                        or f'/{rel}'.endswith(GENERATED_DIR_SUFFIXES)
+                        or (checks and _is_ignored(checks, rel, True))
+                    ):
+                        continue
+                    subdirs.append((entry.path, rel, rules))
+                elif name.endswith(opts.extensions) and entry.is_file():
+                    if not opts.include_tests and name.endswith(TEST_FILE_SUFFIXES):
+                        continue
+                    if checks and _is_ignored(checks, rel, False):
+                        continue
+                    st = entry.stat()
+                    if max_bytes is not None and st.st_size > max_bytes:
+                        continue
+                    files.append(ScannedFile(entry.path, st.st_size, st.st_mtime_ns, st.st_ino))
+            except OSError:
+                continue  # vanished or unreadable entry
+
+        return files, subdirs
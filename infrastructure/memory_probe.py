@@ -0,0 +1,94 @@
+import logging
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+_STATUS_PATH = "/proc/self/status"
+_CLEAR_REFS_PATH = "/proc/self/clear_refs"
+
+# Stages being measured in this process, and how many have started so far;
+# used to detect stages of concurrent runs overlapping
+_lock = threading.Lock()
+_active = 0
+_started = 0
+
+
+def _read_vm_hwm_kb() -> Optional[int]:
+    try:
+        with open(_STATUS_PATH, "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of this process in KiB, or None if unavailable."""
+    hwm = _read_vm_hwm_kb()
+    if hwm is not None:
+        return hwm
+    if resource is not None:
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+    return None
+
+
+def _reset_peak() -> bool:
+    """Reset the kernel's RSS high-water mark (Linux >= 4.0). Returns success."""
+    try:
+        with open(_CLEAR_REFS_PATH, "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class StageMemoryProbe:
+    """Records peak RSS per pipeline stage.
+
+    On Linux the high-water mark is reset at the start of each stage, so
+    each value is that stage's own peak. Elsewhere the peak is process-wide
+    and monotonic; a stage then only shows up if it raised the peak.
+
+    RSS and its high-water mark belong to the whole process, and resetting
+    the mark resets it for every thread. Peaks are therefore only valid
+    while one run at a time is measured: concurrent analyses served by the
+    same worker process would read (and reset) each other's peaks. A stage
+    that overlapped a stage of another probe records None instead.
+    """
+
+    def __init__(self):
+        self.peaks_kb: Dict[str, Optional[int]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        global _active, _started
+        with _lock:
+            overlapped = _active > 0
+            _active += 1
+            _started += 1
+            started = _started
+            if not overlapped:
+                _reset_peak()
+        try:
+            yield
+        finally:
+            with _lock:
+                _active -= 1
+                overlapped = overlapped or _started != started
+                self.peaks_kb[name] = None if overlapped else peak_rss_kb()
+            if overlapped:
+                logger.info(f"Stage '{name}' overlapped another analysis; peak RSS not recorded")
+            else:
+                logger.info(f"Stage '{name}' peak RSS: {self.peaks_kb[name]} KiB")
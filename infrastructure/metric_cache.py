@@ -0,0 +1,110 @@
+"""On-disk LRU store of metric matrices, keyed by metric_cache_key().
+
+One gzip-compressed JSON file per key under `directory`. A file's mtime is
+its last use: reads touch it, and after every write the least recently
+used files are deleted until the store fits in `max_bytes`. Writes go to a
+temporary file first and are renamed into place, so concurrent readers
+never see a partial entry.
+
+Entries also record the run whose `component_metrics` rows hold the same
+values, which lets a new run reference those rows instead of copying them.
+"""
+import gzip
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from infrastructure import settings
+
+logger = logging.getLogger(__name__)
+
+METRIC_CACHE_SUBDIR = "metric_cache"  # under settings.DATA_DIR
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+SUFFIX = ".json.gz"
+
+
+@dataclass
+class CachedMetrics:
+    run_id: int  # run whose component_metrics rows hold `metrics`
+    metrics: Dict[str, dict]
+    metric_profile: str
+    betweenness_info: Dict[str, Any] = field(default_factory=dict)
+
+
+class MetricCache:
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or os.path.join(settings.DATA_DIR, METRIC_CACHE_SUBDIR)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key: str) -> Optional[CachedMetrics]:
+        """The entry for `key` (marking it most recently used), or None."""
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            return None  # missing or evicted meanwhile
+        except (OSError, ValueError) as e:
+            logger.warning(f"Metric cache entry {path} is unreadable: {e}")
+            return None
+        return CachedMetrics(**data)
+
+    def put(self, key: str, entry: CachedMetrics) -> str:
+        """Stores `entry` under `key`, then evicts down to max_bytes. Returns the path."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+                f.write(json.dumps(entry.__dict__, separators=(',', ':')).encode("utf-8"))
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        """Deletes least recently used entries until the store fits in max_bytes.
+
+        `keep` (the entry just written) is never deleted. Returns the removed paths.
+        """
+        entries = []
+        for name in os.listdir(self.directory) if os.path.isdir(self.directory) else ():
+            if not name.endswith(SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, path, stat.st_size))
+        total = sum(size for _, _, size in entries)
+        removed = []
+        for _, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed.append(path)
+        return removed
+
+    def size_bytes(self) -> int:
+        if not os.path.isdir(self.directory):
+            return 0
+        return sum(
+            os.path.getsize(os.path.join(self.directory, name))
+            for name in os.listdir(self.directory) if name.endswith(SUFFIX)
+        )
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+from domain.models.node import Node
+from domain.models.edge import Edge
+from domain.models.graph_model import NodeBatch, EdgeBatch
+from infrastructure.parser_bridge import (
+    ParserBridge, PARSER_VERSION, NodeRow, EdgeRow, to_objects, to_batches
+)
+from infrastructure.file_scanner import ScannedFile
+from infrastructure.persistence.models import ParseCacheEntry
+from infrastructure.persistence.repositories import ParseCacheRepository
+
+# Files modified this recently may still change within the same mtime tick;
+# their stat fast-path is disabled so the next run verifies by content hash.
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+# Cached payloads fetched / new entries flushed per block of files
+CACHE_BLOCK_SIZE = 500
+
+
+def _content_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _encode(node_rows: List[NodeRow], edge_rows: List[EdgeRow]) -> str:
+    return json.dumps({"nodes": node_rows, "edges": edge_rows}, separators=(',', ':'))
+
+
+def _decode(payload: str) -> Tuple[List[NodeRow], List[EdgeRow]]:
+    data = json.loads(payload)
+    return data["nodes"], data["edges"]
+
+
+class IncrementalParser:
+    """Content-hash parse cache in front of ParserBridge.
+
+    Each file's extracted nodes/edges are stored per project in `parse_cache`.
+    A file is reused when its size and mtime match the cached entry (fast
+    path) or, failing that, when its sha256 matches. Everything else is
+    re-parsed; entries for files no longer present are dropped.
+
+    After `parse_files` (or once `iter_parse` / `iter_extract` start yielding), `hits` and
+    `misses` hold the counts for that call.
+    """
+
+    def __init__(self, parser: ParserBridge, repo: ParseCacheRepository):
+        self.parser = parser
+        self.repo = repo
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(
+        self,
+        entry: Optional[ParseCacheEntry],
+        path: str,
+        root_path: str,
+        size: int,
+        mtime_ns: int
+    ) -> Tuple[bool, Optional[str]]:
+        """Return (is_hit, content_hash). The hash is None if not computed."""
+        usable = (
+            entry is not None
+            and entry.parser_version == PARSER_VERSION
+            and entry.root_path == root_path
+        )
+        if usable and entry.file_size == size and entry.mtime_ns == mtime_ns:
+            return True, None
+        digest = _content_hash(path)
+        return usable and entry.content_hash == digest, digest
+
+    def parse_files(
+        self,
+        project_id: int,
+        file_paths: List[str],
+        root_path: str = '/data',
+        workers: int = 1,
+        scanned: Optional[Dict[str, ScannedFile]] = None
+    ) -> Tuple[List[Node], List[Edge]]:
+        """Same contract as ParserBridge.parse_files, served from the cache where possible."""
+        nodes: List[Node] = []
+        edges: List[Edge] = []
+        for _, file_nodes, file_edges in self.iter_parse(
+            project_id, file_paths, root_path, workers, scanned
+        ):
+            nodes.extend(file_nodes)
+            edges.extend(file_edges)
+        return nodes, edges
+
+    def parse_columnar(
+        self,
+        project_id: int,
+        file_paths: List[str],
+        root_path: str = '/data',
+        workers: int = 1,
+        scanned: Optional[Dict[str, ScannedFile]] = None
+    ) -> Tuple[NodeBatch, EdgeBatch]:
+        """Same contract as ParserBridge.parse_columnar, served from the cache where possible."""
+        return to_batches(self.iter_extract(project_id, file_paths, root_path, workers, scanned))
+
+    def iter_parse(
+        self,
+        project_id: int,
+        file_paths: List[str],
+        root_path: str = '/data',
+        workers: int = 1,
+        scanned: Optional[Dict[str, ScannedFile]] = None
+    ) -> Iterator[Tuple[str, List[Node], List[Edge]]]:
+        """Same contract as ParserBridge.iter_parse, served from the cache where possible."""
+        for path, node_rows, edge_rows in self.iter_extract(
+            project_id, file_paths, root_path, workers, scanned
+        ):
+            yield (path, *to_objects(node_rows, edge_rows))
+
+    def iter_extract(
+        self,
+        project_id: int,
+        file_paths: List[str],
+        root_path: str = '/data',
+        workers: int = 1,
+        scanned: Optional[Dict[str, ScannedFile]] = None
+    ) -> Iterator[Tuple[str, List[NodeRow], List[EdgeRow]]]:
+        """Same contract as ParserBridge.iter_extract, served from the cache where possible.
+
+        `scanned` (path -> ScannedFile from FileScanner.scan_entries) supplies
+        size and mtime so files need not be stat'ed again. Cache bookkeeping
+        (new entries, deletions) is committed once the generator is exhausted.
+        """
+        self.hits = 0
+        self.misses = 0
+        entries: Dict[str, ParseCacheEntry] = self.repo.load(project_id)
+        now_ns = time.time_ns()
+
+        # Pass 1: classify by stat / hash only; nothing is decoded or parsed yet
+        plan: List[Tuple[str, bool]] = []
+        stale: Dict[str, Tuple[int, int, str]] = {}
+        for path in file_paths:
+            entry = entries.get(path)
+            try:
+                if scanned is not None and path in scanned:
+                    size, mtime_ns = scanned[path].size, scanned[path].mtime_ns
+                else:
+                    st = os.stat(path)
+                    size, mtime_ns = st.st_size, st.st_mtime_ns
+                is_hit, digest = self._lookup(entry, path, root_path, size, mtime_ns)
+            except OSError:
+                continue  # vanished between scan and parse; parser would skip it too
+            if is_hit and digest is not None:
+                # Touched but unchanged: refresh the stat fast-path
+                entry.file_size = size
+                entry.mtime_ns = mtime_ns
+            elif not is_hit:
+                stale[path] = (size, mtime_ns, digest)
+            plan.append((path, is_hit))
+        self.hits = len(plan) - len(stale)
+        self.misses = len(stale)
+
+        # Pass 2: yield in scan order, fetching cached payloads a block at a time
+        parsed = self.parser.iter_extract(list(stale), root_path, workers)
+        staged: List[ParseCacheEntry] = []
+        for start in range(0, len(plan), CACHE_BLOCK_SIZE):
+            block = plan[start:start + CACHE_BLOCK_SIZE]
+            payloads = self.repo.payloads([entries[p].id for p, hit in block if hit])
+            for path, is_hit in block:
+                if is_hit:
+                    yield (path, *_decode(payloads[entries[path].id]))
+                    continue
+                parsed_path, node_rows, edge_rows = next(parsed)
+                size, mtime_ns, digest = stale[parsed_path]
+                racy = now_ns - mtime_ns < RACY_MTIME_WINDOW_NS
+                staged.append(self.repo.upsert(
+                    entries.get(path),
+                    project_id=project_id,
+                    root_path=root_path,
+                    file_path=path,
+                    file_size=size,
+                    mtime_ns=0 if racy else mtime_ns,
+                    content_hash=digest,
+                    parser_version=PARSER_VERSION,
+                    payload=_encode(node_rows, edge_rows)
+                ))
+                yield path, node_rows, edge_rows
+            if staged:
+                self.repo.flush(staged)
+                staged = []
+
+        next(parsed, None)  # let the parser generator shut its pool down
+
+        seen = set(file_paths)
+        self.repo.delete_paths(project_id, [p for p in entries if p not in seen])
+        self.repo.commit()
@@ -1,34 +1,55 @@
+import heapq
 import os
-import re
-from typing import List, Tuple, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 from domain.models.node import Node, NodeType
 from domain.models.edge import Edge, EdgeType
+from domain.models.graph_model import NodeBatch, EdgeBatch
+from infrastructure.php_scanner import scan_php, TypeDecl
 
-# Regex patterns
-_NS_PATTERN = re.compile(r'^\s*namespace\s+([\w\\]+)\s*;', re.MULTILINE)
-_CLASS_PATTERN = re.compile(
-    r'\bclass\s+([A-Za-z0-9_]+)'
-    r'(?:\s+extends\s+([A-Za-z0-9_\\]+))?'
-    r'(?:\s+implements\s+([\w,\s\\]+?))?'
-    r'\s*\{'
-)
-_INTERFACE_PATTERN = re.compile(r'\binterface\s+([A-Za-z0-9_]+)')
-_TRAIT_PATTERN = re.compile(r'\btrait\s+([A-Za-z0-9_]+)')
-_USE_TRAIT_PATTERN = re.compile(r'^\s*use\s+([\w,\s\\]+?);', re.MULTILINE)
-_METHOD_PATTERN = re.compile(r'\bfunction\s+([A-Za-z0-9_]+)')
-_INSTANTIATE_PATTERN = re.compile(r'\bnew\s+([\w\\]+)\s*\(')
-_STATIC_CALL_PATTERN = re.compile(r'\b([\w\\]+)::[\w]+\s*\(')
-
-
-def _qualify(name: str, namespace: Optional[str], file_path: str, root_path: str) -> str:
+# Bump whenever extraction output changes; invalidates the parse cache
+PARSER_VERSION = "3"
+
+# Parallel parsing: chunks handed out per worker process
+CHUNKS_PER_WORKER = 4
+
+# Streaming parse: files per task, and tasks in flight per worker
+STREAM_BATCH_SIZE = 32
+STREAM_TASKS_PER_WORKER = 2
+
+# Plain-tuple extraction output, cheap to pickle and to cache:
+#   NodeRow = (id, name, node_type, namespace, file_path, methods, calls)
+#   EdgeRow = (source_id, target_id, edge_type)
+# where calls are (calling method, target class ID, called method)
+NodeRow = Tuple[str, str, str, Optional[str], str, List[str], List[Tuple[str, str, str]]]
+EdgeRow = Tuple[str, str, str]
+
+
+def _qualify(
+    name: str,
+    namespace: Optional[str],
+    file_path: str,
+    root_path: str,
+    imports: Optional[Dict[str, str]] = None
+) -> str:
     """Build a fully-qualified, collision-resistant node ID.
 
     Priority order:
-      1. If the raw name already contains a backslash it is already qualified.
-      2. If a namespace was declared, use Namespace\\ClassName.
-      3. Fallback: relative_dir/ClassName using the file path relative to root.
+      1. A leading backslash marks a fully-qualified name.
+      2. If the first segment matches a `use` import alias, expand it.
+      3. If the raw name already contains a backslash it is already qualified.
+      4. If a namespace was declared, use Namespace\\ClassName.
+      5. Fallback: relative_dir/ClassName using the file path relative to root.
     """
     name = name.strip()
+    if name.startswith('\\'):
+        return name[1:]
+    if imports:
+        head, sep, rest = name.partition('\\')
+        imported = imports.get(head.lower())
+        if imported:
+            return imported + sep + rest
     if '\\' in name:
         return name  # already fully qualified
     if namespace:
@@ -40,6 +61,150 @@ def _qualify(name: str, namespace: Optional[str], file_path: str, root_path: str
     return rel.replace(os.sep, '\\') + '\\' + name
 
 
+def _resolve_calls(decl: TypeDecl, node_id: str, fq) -> List[Tuple[str, str, str]]:
+    """Resolve each call's target class: self/static to the class itself,
+    parent to its superclass; parent calls without one are dropped."""
+    calls = []
+    for caller, target, method in decl.calls:
+        relative = target.lower()
+        if relative in ('self', 'static'):
+            target_id = node_id
+        elif relative == 'parent':
+            if not decl.extends:
+                continue
+            target_id = fq(decl.extends[0])
+        else:
+            target_id = fq(target)
+        calls.append((caller, target_id, method))
+    return calls
+
+
+def _extract_file(path: str, root_path: str) -> Tuple[List[NodeRow], List[EdgeRow]]:
+    """Parse a single PHP file into node and edge rows.
+
+    Module-level (rather than a method) so it can be shipped to worker
+    processes. All state is per-file, which keeps the result independent of
+    the order or grouping in which files are processed.
+    """
+    nodes: List[NodeRow] = []
+    edges: List[EdgeRow] = []
+
+    if not os.path.exists(path):
+        return nodes, edges
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+
+        # Single tokenizing pass; every reference is attributed to the
+        # declaration body that encloses it.
+        for decl in scan_php(content):
+            if decl.kind != 'class':
+                continue
+
+            def fq(name: str) -> str:
+                return _qualify(name, decl.namespace, path, root_path, decl.imports)
+
+            node_id = fq(decl.name)
+            nodes.append((
+                node_id, decl.name, NodeType.CLASS.value, decl.namespace, path, decl.methods,
+                _resolve_calls(decl, node_id, fq)
+            ))
+
+            typed_refs = (
+                (decl.extends[:1], EdgeType.INHERITS.value),
+                (decl.implements, EdgeType.IMPLEMENTS.value),
+                (decl.traits, EdgeType.USES_TRAIT.value),
+                (decl.instantiations, EdgeType.INSTANTIATION.value),
+                (decl.static_calls, EdgeType.METHOD_CALL.value),
+            )
+            for refs, edge_type in typed_refs:
+                for ref in refs:
+                    tgt_id = fq(ref)
+                    if tgt_id != node_id:
+                        edges.append((node_id, tgt_id, edge_type))
+
+    except Exception:
+        # Individual file errors do not abort the run
+        pass
+
+    return nodes, edges
+
+
+def to_objects(node_rows: List[NodeRow], edge_rows: List[EdgeRow]) -> Tuple[List[Node], List[Edge]]:
+    """Validate rows into Node / Edge models."""
+    nodes = [
+        Node(id=i, name=name, node_type=NodeType(t), namespace=ns, file_path=fp, methods=m, calls=c)
+        for i, name, t, ns, fp, m, c in node_rows
+    ]
+    edges = [
+        Edge(source_id=src, target_id=tgt, edge_type=EdgeType(k))
+        for src, tgt, k in edge_rows
+    ]
+    return nodes, edges
+
+
+def to_batches(
+    parsed: Iterable[Tuple[str, List[NodeRow], List[EdgeRow]]]
+) -> Tuple[NodeBatch, EdgeBatch]:
+    """Transpose per-file rows into the columnar batches GraphModel ingests in bulk."""
+    ids, names, types, paths, methods, calls = [], [], [], [], [], []
+    sources, targets, kinds = [], [], []
+    for _, node_rows, edge_rows in parsed:
+        for node_id, name, node_type, _ns, file_path, node_methods, node_calls in node_rows:
+            ids.append(node_id)
+            names.append(name)
+            types.append(node_type)
+            paths.append(file_path)
+            methods.append(node_methods)
+            calls.append(node_calls)
+        for source, target, kind in edge_rows:
+            sources.append(source)
+            targets.append(target)
+            kinds.append(kind)
+    return NodeBatch(ids, names, types, paths, methods, calls), EdgeBatch(sources, targets, kinds)
+
+
+def _extract_chunk(
+    chunk: List[Tuple[int, str]],
+    root_path: str
+) -> List[Tuple[int, List[NodeRow], List[EdgeRow]]]:
+    """Worker entry point: extract rows for a chunk of (position, path) pairs."""
+    return [(pos, *_extract_file(path, root_path)) for pos, path in chunk]
+
+
+def _balanced_chunks(
+    file_paths: List[str],
+    n_chunks: int,
+    file_sizes: Optional[Dict[str, int]] = None
+) -> List[List[Tuple[int, str]]]:
+    """Split files into `n_chunks` groups of roughly equal total byte size.
+
+    Greedy longest-processing-time assignment: largest files first, each to
+    the currently lightest chunk. Ties are broken by chunk index so the
+    partition is deterministic for a given file list. Sizes come from
+    `file_sizes` (e.g. the scanner's stat data) when given.
+    """
+    sized = []
+    for pos, path in enumerate(file_paths):
+        if file_sizes is not None and path in file_sizes:
+            size = file_sizes[path]
+        else:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = 0
+        sized.append((size, pos, path))
+    sized.sort(key=lambda t: (-t[0], t[1]))
+
+    heap = [(0, i) for i in range(n_chunks)]
+    chunks: List[List[Tuple[int, str]]] = [[] for _ in range(n_chunks)]
+    for size, pos, path in sized:
+        load, idx = heapq.heappop(heap)
+        chunks[idx].append((pos, path))
+        heapq.heappush(heap, (load + size, idx))
+    return [c for c in chunks if c]
+
+
 class ParserBridge:
     """Parses PHP source files into typed Nodes and Edges.
 
@@ -51,122 +216,127 @@ class ParserBridge:
     def parse_files(
         self,
         file_paths: List[str],
-        root_path: str = '/data'
+        root_path: str = '/data',
+        workers: int = 1,
+        file_sizes: Optional[Dict[str, int]] = None
     ) -> Tuple[List[Node], List[Edge]]:
+        """Parse `file_paths` into Nodes and Edges.
+
+        Args:
+            file_paths: PHP files to parse.
+            root_path: Project root, used for namespace-less ID fallback.
+            workers: Number of worker processes. 1 (default) parses serially
+                     in-process; >1 spreads size-balanced chunks over a
+                     process pool. Results are merged back in input order,
+                     so the output is identical to the serial path.
+            file_sizes: Optional known sizes (path -> bytes) used to balance
+                        chunks without re-stat'ing every file.
+        """
         nodes: List[Node] = []
         edges: List[Edge] = []
 
-        for path in file_paths:
-            if not os.path.exists(path):
-                continue
-            try:
-                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-
-                # ── Namespace ──────────────────────────────────────────────
-                ns_match = _NS_PATTERN.search(content)
-                namespace: Optional[str] = ns_match.group(1) if ns_match else None
-
-                def fq(name: str) -> str:
-                    return _qualify(name, namespace, path, root_path)
-
-                methods_found = _METHOD_PATTERN.findall(content)
-
-                # ── Classes ────────────────────────────────────────────────
-                for m in _CLASS_PATTERN.finditer(content):
-                    cls_name = m.group(1)
-                    extends_name = m.group(2)
-                    implements_raw = m.group(3)
-
-                    node_id = fq(cls_name)
-                    node = Node(
-                        id=node_id,
-                        name=cls_name,
-                        namespace=namespace,
-                        node_type=NodeType.CLASS,
-                        file_path=path,
-                        methods=methods_found
-                    )
-                    nodes.append(node)
-
-                    # INHERITS edge
-                    if extends_name:
-                        edges.append(Edge(
-                            source_id=node_id,
-                            target_id=fq(extends_name),
-                            edge_type=EdgeType.INHERITS
-                        ))
-
-                    # IMPLEMENTS edges
-                    if implements_raw:
-                        for iface in re.split(r'[\s,]+', implements_raw.strip()):
-                            iface = iface.strip()
-                            if iface:
-                                edges.append(Edge(
-                                    source_id=node_id,
-                                    target_id=fq(iface),
-                                    edge_type=EdgeType.IMPLEMENTS
-                                ))
-
-                    # INSTANTIATION edges — new ClassName()
-                    for tgt in _INSTANTIATE_PATTERN.findall(content):
-                        tgt_id = fq(tgt)
-                        if tgt_id != node_id:
-                            edges.append(Edge(
-                                source_id=node_id,
-                                target_id=tgt_id,
-                                edge_type=EdgeType.INSTANTIATION
-                            ))
-
-                    # METHOD_CALL edges — ClassName::method()
-                    for tgt in _STATIC_CALL_PATTERN.findall(content):
-                        tgt_id = fq(tgt)
-                        if tgt_id != node_id:
-                            edges.append(Edge(
-                                source_id=node_id,
-                                target_id=tgt_id,
-                                edge_type=EdgeType.METHOD_CALL
-                            ))
-
-                # ── Trait usage — USES_TRAIT edges ─────────────────────────
-                # trait usage inside a class body emits USES_TRAIT edges
-                # We attach them to the last class parsed in the file (simplification)
-                if nodes:
-                    last_node_id = nodes[-1].id
-                    for use_line in _USE_TRAIT_PATTERN.findall(content):
-                        for trait_name in re.split(r'[\s,]+', use_line.strip()):
-                            trait_name = trait_name.strip()
-                            if trait_name:
-                                edges.append(Edge(
-                                    source_id=last_node_id,
-                                    target_id=fq(trait_name),
-                                    edge_type=EdgeType.USES_TRAIT
-                                ))
-
-            except Exception:
-                # Individual file errors do not abort the run
-                pass
+        for _, file_nodes, file_edges in self.parse_each(file_paths, root_path, workers, file_sizes):
+            nodes.extend(file_nodes)
+            edges.extend(file_edges)
 
         return nodes, edges
 
+    def parse_columnar(
+        self,
+        file_paths: List[str],
+        root_path: str = '/data',
+        workers: int = 1,
+        file_sizes: Optional[Dict[str, int]] = None
+    ) -> Tuple[NodeBatch, EdgeBatch]:
+        """Like `parse_files`, but returns columnar batches for GraphModel.add_*_bulk.
 
-class FileScanner:
-    @staticmethod
-    def scan(root_path: str, max_files: Optional[int] = None) -> List[str]:
-        """Walk `root_path` and collect PHP files.
-
-        Args:
-            root_path: Directory to scan.
-            max_files: Optional cap on number of files returned.
-                       None means no limit (Phase A+).
+        No Node / Edge models are built, which skips per-object validation.
         """
-        php_files = []
-        for root, _, files in os.walk(root_path):
-            for file in sorted(files):   # sorted = deterministic ordering
-                if file.endswith('.php'):
-                    php_files.append(os.path.join(root, file))
+        return to_batches(self.extract_each(file_paths, root_path, workers, file_sizes))
 
-        if max_files is not None:
-            return php_files[:max_files]
-        return php_files
+    def parse_each(
+        self,
+        file_paths: List[str],
+        root_path: str,
+        workers: int,
+        file_sizes: Optional[Dict[str, int]] = None
+    ) -> List[Tuple[str, List[Node], List[Edge]]]:
+        """Parse files and return (path, nodes, edges) per file, in input order."""
+        return [
+            (path, *to_objects(node_rows, edge_rows))
+            for path, node_rows, edge_rows in self.extract_each(file_paths, root_path, workers, file_sizes)
+        ]
+
+    def extract_each(
+        self,
+        file_paths: List[str],
+        root_path: str,
+        workers: int,
+        file_sizes: Optional[Dict[str, int]] = None
+    ) -> List[Tuple[str, List[NodeRow], List[EdgeRow]]]:
+        """Row-level `parse_each`: (path, node rows, edge rows) per file, in input order."""
+        if workers <= 1 or len(file_paths) < 2:
+            return [(path, *_extract_file(path, root_path)) for path in file_paths]
+
+        workers = min(workers, len(file_paths))
+        # Several chunks per worker smooths out stragglers
+        chunks = _balanced_chunks(file_paths, workers * CHUNKS_PER_WORKER, file_sizes)
+
+        results: List[Optional[Tuple[List[NodeRow], List[EdgeRow]]]] = [None] * len(file_paths)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_extract_chunk, chunk, root_path) for chunk in chunks]
+            for future in futures:
+                for pos, node_rows, edge_rows in future.result():
+                    results[pos] = (node_rows, edge_rows)
+
+        return [
+            (path, *results[pos])
+            for pos, path in enumerate(file_paths)
+        ]
+
+    def iter_parse(
+        self,
+        file_paths: List[str],
+        root_path: str = '/data',
+        workers: int = 1
+    ) -> Iterator[Tuple[str, List[Node], List[Edge]]]:
+        """Lazily yield (path, nodes, edges) per file, in input order. See `iter_extract`."""
+        for path, node_rows, edge_rows in self.iter_extract(file_paths, root_path, workers):
+            yield (path, *to_objects(node_rows, edge_rows))
+
+    def iter_extract(
+        self,
+        file_paths: List[str],
+        root_path: str = '/data',
+        workers: int = 1
+    ) -> Iterator[Tuple[str, List[NodeRow], List[EdgeRow]]]:
+        """Lazily yield (path, node rows, edge rows) per file, in input order.
+
+        Unlike `extract_each`, only a bounded window of results is alive at
+        any time: with workers > 1, contiguous batches of STREAM_BATCH_SIZE
+        files are submitted and at most STREAM_TASKS_PER_WORKER batches per
+        worker are in flight ahead of the consumer.
+        """
+        if workers <= 1 or len(file_paths) < 2:
+            for path in file_paths:
+                yield (path, *_extract_file(path, root_path))
+            return
 
+        workers = min(workers, len(file_paths))
+        batches = (
+            [(pos, file_paths[pos]) for pos in range(start, min(start + STREAM_BATCH_SIZE, len(file_paths)))]
+            for start in range(0, len(file_paths), STREAM_BATCH_SIZE)
+        )
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = deque()
+            for batch in batches:
+                in_flight.append(executor.submit(_extract_chunk, batch, root_path))
+                if len(in_flight) >= workers * STREAM_TASKS_PER_WORKER:
+                    break
+            while in_flight:
+                results = in_flight.popleft().result()
+                batch = next(batches, None)
+                if batch is not None:
+                    in_flight.append(executor.submit(_extract_chunk, batch, root_path))
+                for pos, node_rows, edge_rows in results:
+                    yield file_paths[pos], node_rows, edge_rows
@@ -1,9 +1,11 @@
 import os
 import logging
-from typing import Generator
-from sqlalchemy import create_engine
+from typing import Generator, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
+from infrastructure.settings import use_local_data_dir
 
 load_dotenv()
 
@@ -12,48 +14,82 @@ load_dotenv()
 db_url = os.getenv("DATABASE_URL", "sqlite:///./data/app.db")
 if db_url.startswith("sqlite:////data/"):
     # If not running in docker but string says /data/, let's fallback to relative for pure local testing
-    if not os.path.exists("/data") and os.path.exists("./data"):
+    if use_local_data_dir:
         db_url = "sqlite:///./data/app.db"
 
+# Tuned SQLite persistence mode, applied to every new connection:
+#   - WAL: readers never block the (single) writer and commits append to the
+#     log instead of rewriting pages in place.
+#   - synchronous NORMAL: with WAL the database stays consistent; a power
+#     loss can only drop the last commits. Set SQLITE_TUNED=0 for SQLite's
+#     defaults (rollback journal, full sync).
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64_000,       # negative = KiB, i.e. 64 MiB page cache
+    "mmap_size": 256 * 2 ** 20,  # memory-map up to 256 MiB of the file
+    "temp_store": "MEMORY",
+    "busy_timeout": 5_000,       # ms to wait for a lock before failing
+}
+sqlite_tuned = os.getenv("SQLITE_TUNED", "1") != "0"
+
+
+def apply_sqlite_pragmas(target: Engine, pragmas: dict = SQLITE_PRAGMAS) -> None:
+    """Run `PRAGMA key = value` for each of `pragmas` on every connection `target` opens."""
+    @event.listens_for(target, "connect")
+    def _set_pragmas(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for key, value in pragmas.items():
+                cursor.execute(f"PRAGMA {key} = {value}")
+        finally:
+            cursor.close()
+
+
 # Engine setup
 engine = create_engine(
     db_url,
     connect_args={"check_same_thread": False} if "sqlite" in db_url else {}
 )
+if "sqlite" in db_url and sqlite_tuned:
+    apply_sqlite_pragmas(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 logger = logging.getLogger(__name__)
 
-def init_db() -> None:
+def init_db(target: Optional[Engine] = None) -> None:
     """
-    Initializes the database, creating all tables defined in Base,
-    and inserts the initial schema version if empty.
+    Initializes the database (`target`, default the app engine), creating
+    all tables defined in Base, inserting the initial schema version if
+    empty, then applying the pending schema migrations.
     """
     # Import models here to ensure they are registered with Base
     from infrastructure.persistence import models 
+    from infrastructure.persistence.migrations import BASELINE_VERSION, upgrade
     from sqlalchemy.exc import SQLAlchemyError
     from datetime import datetime
     import pytz
 
     try:
+        target = target or engine
         # Create tables
-        Base.metadata.create_all(bind=engine)
-        logger.info(f"Database initialized: Tables created if not existed at {db_url}")
+        Base.metadata.create_all(bind=target)
+        logger.info(f"Database initialized: Tables created if not existed at {target.url}")
 
         # Enforce schema version on startup
-        db = SessionLocal()
+        db = SessionLocal(bind=target)
         try:
             version_count = db.query(models.SchemaVersion).count()
             if version_count == 0:
                 initial_version = models.SchemaVersion(
-                    version="0.1",
+                    version=BASELINE_VERSION,
                     applied_at=datetime.utcnow()
                 )
                 db.add(initial_version)
                 db.commit()
-                logger.info("Inserted initial schema_version 0.1")
+                logger.info(f"Inserted initial schema_version {BASELINE_VERSION}")
         except Exception as e:
             db.rollback()
             logger.error(f"Failed to insert schema version: {e}")
@@ -61,6 +97,9 @@ def init_db() -> None:
         finally:
             db.close()
 
+        # Columns and indexes added to existing tables since they were created
+        upgrade(target)
+
     except SQLAlchemyError as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
@@ -0,0 +1,490 @@
+"""Versioned binary graph artifact (`graph_{run_id}.sgraph`).
+
+Layout (all integers little-endian):
+
+    header      magic b"STRGRAPH", version u16, flags u16, nodes u32,
+                edges u64, strings u32, section count u32
+    directory   one entry per section: name (12 bytes), array typecode,
+                item size, element count, block count, block size,
+                file offset of the section's block index
+    per section block index (block count + 1 absolute u64 offsets), then
+                the section's zlib-compressed blocks
+
+Every section is a flat typed array split into fixed-size blocks that are
+compressed independently, so a reader that mmaps the file only inflates
+the blocks covering the elements it asks for.
+
+Nodes are stored sorted by ID and string `i` of the string table is the ID
+of node `i`: lookups are a binary search over the table. Names, file paths
+and method names follow the IDs in first-use order. Adjacency is CSR in
+both directions with targets sorted, so the bytes depend only on the graph,
+not on the order it was parsed in.
+
+Version 2 added the per-node method call sections (`call_*`); version 1
+files are still read, as graphs without calls.
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from domain.models.csr_graph import (
+    CSRGraph, CSRGraphBuilder, EDGE_KINDS, NODE_TYPES, NO_STRING
+)
+
+MAGIC = b"STRGRAPH"
+FORMAT_VERSION = 2
+# Older versions still readable, with the sections they lack left empty
+READABLE_VERSIONS = (1, 2)
+CALL_SECTIONS = ("call_offsets", "call_from", "call_class", "call_method")
+
+# Uncompressed bytes per block (a multiple of every item size)
+BLOCK_SIZE = 64 * 1024
+# Inflated blocks kept per open artifact
+BLOCK_CACHE_SIZE = 64
+COMPRESSION_LEVEL = 6
+
+_HEADER = struct.Struct("<8sHHIQII")
+_SECTION = struct.Struct("<12s1sBQIIQ")
+_OFFSET = struct.Struct("<Q")
+
+# Section name -> array typecode; written in this order
+SECTIONS: Dict[str, str] = {
+    "str_offsets": "Q",  # n_strings + 1 byte offsets into str_data
+    "str_data": "B",     # concatenated UTF-8
+    "node_name": "I",    # string index
+    "node_type": "B",    # NODE_TYPES code
+    "node_file": "i",    # string index, -1 if none
+    "meth_offsets": "Q", # nodes + 1 offsets into meth_names
+    "meth_names": "I",   # string index
+    "call_offsets": "Q", # nodes + 1 offsets into the call_* columns
+    "call_from": "I",    # string index of the calling method
+    "call_class": "I",   # string index of the target class ID
+    "call_method": "I",  # string index of the called method
+    "fwd_offsets": "Q",  # nodes + 1
+    "fwd_targets": "I",
+    "fwd_kinds": "B",    # EDGE_KINDS code
+    "fwd_weights": "I",
+    "rev_offsets": "Q",  # nodes + 1
+    "rev_sources": "I",
+    "rev_edges": "Q",    # position of the same edge in the fwd_* arrays
+}
+
+
+class ArtifactFormatError(ValueError):
+    """The file is not a graph artifact, or one of an unsupported version."""
+
+
+def _to_le_bytes(values: array) -> bytes:
+    if sys.byteorder == "big" and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le_bytes(typecode: str, raw: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(raw)
+    if sys.byteorder == "big" and values.itemsize > 1:
+        values.byteswap()
+    return values
+
+
+def _canonical_arrays(csr: CSRGraph) -> Tuple[int, int, Dict[str, array]]:
+    """Renumber `csr` into artifact order: nodes sorted by ID, targets sorted per row."""
+    n = csr.num_nodes
+    ids = csr.node_ids()
+    order = sorted(range(n), key=ids.__getitem__)
+    new_index = array("I", [0]) * n
+    for new, old in enumerate(order):
+        new_index[old] = new
+
+    # String table: node IDs first (string i == node i), then first use
+    strings: List[str] = [ids[old] for old in order]
+    string_index: Dict[str, int] = {s: i for i, s in enumerate(strings)}
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        idx = string_index.get(value)
+        if idx is None:
+            idx = string_index[value] = len(strings)
+            strings.append(value)
+        return idx
+
+    table = csr.strings.strings
+    node_name = array("I")
+    node_type = array("B")
+    node_file = array("i")
+    meth_offsets = array("Q", [0])
+    meth_names = array("I")
+    call_offsets = array("Q", [0])
+    call_from = array("I")
+    call_class = array("I")
+    call_method = array("I")
+    fwd_offsets = array("Q", [0])
+    fwd_targets = array("I")
+    fwd_kinds = array("B")
+    fwd_weights = array("I")
+    for old in order:
+        node_name.append(intern(table[csr.node_name[old]]))
+        node_type.append(csr.node_type[old])
+        node_file.append(intern(csr.strings.get(csr.node_file[old])))
+        for m in csr.method_names[csr.method_offsets[old]:csr.method_offsets[old + 1]]:
+            meth_names.append(intern(table[m]))
+        meth_offsets.append(len(meth_names))
+        for c in range(csr.call_offsets[old], csr.call_offsets[old + 1]):
+            call_from.append(intern(table[csr.call_from[c]]))
+            call_class.append(intern(table[csr.call_class[c]]))
+            call_method.append(intern(table[csr.call_method[c]]))
+        call_offsets.append(len(call_from))
+
+        start, stop = csr.fwd_offsets[old], csr.fwd_offsets[old + 1]
+        row = sorted(
+            (new_index[csr.fwd_targets[pos]], csr.fwd_kinds[pos], csr.fwd_weights[pos])
+            for pos in range(start, stop)
+        )
+        for target, kind, weight in row:
+            fwd_targets.append(target)
+            fwd_kinds.append(kind)
+            fwd_weights.append(weight)
+        fwd_offsets.append(len(fwd_targets))
+
+    # Reverse rows by counting sort; sources come out ascending
+    m = len(fwd_targets)
+    rev_offsets = array("Q", [0]) * (n + 1)
+    for t in fwd_targets:
+        rev_offsets[t + 1] += 1
+    for i in range(n):
+        rev_offsets[i + 1] += rev_offsets[i]
+    rev_sources = array("I", [0]) * m
+    rev_edges = array("Q", [0]) * m
+    cursor = rev_offsets[:n]
+    for u in range(n):
+        for pos in range(fwd_offsets[u], fwd_offsets[u + 1]):
+            t = fwd_targets[pos]
+            rev_sources[cursor[t]] = u
+            rev_edges[cursor[t]] = pos
+            cursor[t] += 1
+
+    encoded = [s.encode("utf-8") for s in strings]
+    str_offsets = array("Q", [0])
+    for raw in encoded:
+        str_offsets.append(str_offsets[-1] + len(raw))
+    str_data = array("B", b"".join(encoded))
+
+    sections = {
+        "str_offsets": str_offsets, "str_data": str_data,
+        "node_name": node_name, "node_type": node_type, "node_file": node_file,
+        "meth_offsets": meth_offsets, "meth_names": meth_names,
+        "call_offsets": call_offsets, "call_from": call_from,
+        "call_class": call_class, "call_method": call_method,
+        "fwd_offsets": fwd_offsets, "fwd_targets": fwd_targets,
+        "fwd_kinds": fwd_kinds, "fwd_weights": fwd_weights,
+        "rev_offsets": rev_offsets, "rev_sources": rev_sources, "rev_edges": rev_edges,
+    }
+    return n, len(strings), sections
+
+
+def write_artifact(csr: CSRGraph, path: str, block_size: int = BLOCK_SIZE) -> str:
+    """Write `csr` to `path` in the binary artifact format. Returns the path.
+
+    The file is written under a temporary name and moved into place, so
+    readers never observe a partial artifact.
+    """
+    n_nodes, n_strings, sections = _canonical_arrays(csr)
+    n_edges = len(sections["fwd_targets"])
+
+    directory_size = _HEADER.size + _SECTION.size * len(SECTIONS)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(b"\0" * directory_size)  # placeholder, rewritten at the end
+        entries = []
+        for name, typecode in SECTIONS.items():
+            values = sections[name]
+            raw = _to_le_bytes(values)
+            blocks = [
+                zlib.compress(raw[i:i + block_size], COMPRESSION_LEVEL)
+                for i in range(0, len(raw), block_size)
+            ]
+            index_offset = f.tell()
+            offset = index_offset + _OFFSET.size * (len(blocks) + 1)
+            for block in blocks:
+                f.write(_OFFSET.pack(offset))
+                offset += len(block)
+            f.write(_OFFSET.pack(offset))
+            for block in blocks:
+                f.write(block)
+            entries.append(_SECTION.pack(
+                name.encode("ascii"), typecode.encode("ascii"), values.itemsize,
+                len(values), len(blocks), block_size, index_offset
+            ))
+
+        f.seek(0)
+        f.write(_HEADER.pack(
+            MAGIC, FORMAT_VERSION, 0, n_nodes, n_edges, n_strings, len(SECTIONS)
+        ))
+        for entry in entries:
+            f.write(entry)
+    os.replace(tmp_path, path)
+    return path
+
+
+class _Section:
+    __slots__ = ("typecode", "itemsize", "count", "n_blocks", "block_size", "index_offset")
+
+    def __init__(self, typecode, itemsize, count, n_blocks, block_size, index_offset):
+        self.typecode = typecode
+        self.itemsize = itemsize
+        self.count = count
+        self.n_blocks = n_blocks
+        self.block_size = block_size
+        self.index_offset = index_offset
+
+
+class GraphArtifact:
+    """Read-only, lazily decoded view of a binary graph artifact.
+
+    The file is memory-mapped; only the compressed blocks backing the
+    requested elements are inflated (and kept in a small LRU cache), so
+    looking up one node's attributes or neighbourhood touches a handful of
+    blocks regardless of graph size. Use as a context manager or `close()`.
+    """
+
+    def __init__(self, path: str, cache_blocks: int = BLOCK_CACHE_SIZE):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ArtifactFormatError(f"{path}: empty file")
+        self._cache: "OrderedDict[Tuple[str, int], bytes]" = OrderedDict()
+        self._cache_blocks = cache_blocks
+
+        try:
+            magic, version, _flags, n_nodes, n_edges, n_strings, n_sections = \
+                _HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            self.close()
+            raise ArtifactFormatError(f"{path}: truncated header")
+        if magic != MAGIC:
+            self.close()
+            raise ArtifactFormatError(f"{path}: not a graph artifact")
+        if version not in READABLE_VERSIONS:
+            self.close()
+            raise ArtifactFormatError(f"{path}: unsupported artifact version {version}")
+        self.version = version
+        self.num_nodes = n_nodes
+        self.num_edges = n_edges
+        self.num_strings = n_strings
+
+        self._sections: Dict[str, _Section] = {}
+        for i in range(n_sections):
+            name, typecode, itemsize, count, n_blocks, block_size, index_offset = \
+                _SECTION.unpack_from(self._map, _HEADER.size + i * _SECTION.size)
+            self._sections[name.rstrip(b"\0").decode("ascii")] = _Section(
+                typecode.decode("ascii"), itemsize, count, n_blocks, block_size, index_offset
+            )
+        missing = set(SECTIONS) - set(self._sections)
+        if version == 1:
+            missing -= set(CALL_SECTIONS)
+        if missing:
+            self.close()
+            raise ArtifactFormatError(f"{path}: missing sections {sorted(missing)}")
+
+    def __enter__(self) -> "GraphArtifact":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+        self._cache.clear()
+
+    # ── Block access ─────────────────────────────────────────────────────
+
+    def _block(self, name: str, section: _Section, b: int) -> bytes:
+        key = (name, b)
+        data = self._cache.get(key)
+        if data is not None:
+            self._cache.move_to_end(key)
+            return data
+        start, = _OFFSET.unpack_from(self._map, section.index_offset + b * _OFFSET.size)
+        stop, = _OFFSET.unpack_from(self._map, section.index_offset + (b + 1) * _OFFSET.size)
+        data = zlib.decompress(self._map[start:stop])
+        self._cache[key] = data
+        if len(self._cache) > self._cache_blocks:
+            self._cache.popitem(last=False)
+        return data
+
+    def _slice(self, name: str, start: int, stop: int) -> array:
+        """Elements [start, stop) of a section, inflating only the covering blocks."""
+        section = self._sections[name]
+        if stop <= start:
+            return array(section.typecode)
+        lo, hi = start * section.itemsize, stop * section.itemsize
+        size = section.block_size
+        parts = []
+        for b in range(lo // size, (hi - 1) // size + 1):
+            block = self._block(name, section, b)
+            base = b * size
+            parts.append(block[max(lo - base, 0):min(hi - base, len(block))])
+        return _from_le_bytes(section.typecode, b"".join(parts))
+
+    def _item(self, name: str, i: int) -> int:
+        return self._slice(name, i, i + 1)[0]
+
+    def _array(self, name: str) -> array:
+        return self._slice(name, 0, self._sections[name].count)
+
+    # ── Strings and nodes ────────────────────────────────────────────────
+
+    def string(self, idx: int) -> Optional[str]:
+        if idx == NO_STRING:
+            return None
+        start, stop = self._slice("str_offsets", idx, idx + 2)
+        return self._slice("str_data", start, stop).tobytes().decode("utf-8")
+
+    def node_id(self, i: int) -> str:
+        return self.string(i)
+
+    def index_of(self, node_id: str) -> Optional[int]:
+        """Binary search over the sorted node IDs."""
+        lo, hi = 0, self.num_nodes
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.node_id(mid) < node_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.num_nodes and self.node_id(lo) == node_id:
+            return lo
+        return None
+
+    def node_attrs(self, i: int) -> Dict[str, Any]:
+        """Attributes as GraphModel stores them on NetworkX nodes."""
+        start, stop = self._slice("meth_offsets", i, i + 2)
+        return {
+            "name": self.string(self._item("node_name", i)),
+            "type": NODE_TYPES[self._item("node_type", i)],
+            "file_path": self.string(self._item("node_file", i)),
+            "methods": [self.string(m) for m in self._slice("meth_names", start, stop)],
+            "calls": self._calls(i),
+        }
+
+    def _calls(self, i: int) -> List[Tuple[str, str, str]]:
+        if "call_offsets" not in self._sections:
+            return []  # version 1
+        start, stop = self._slice("call_offsets", i, i + 2)
+        return [
+            (self.string(caller), self.string(target), self.string(method))
+            for caller, target, method in zip(
+                self._slice("call_from", start, stop),
+                self._slice("call_class", start, stop),
+                self._slice("call_method", start, stop)
+            )
+        ]
+
+    def attribute(self, node_id: str, name: str) -> Any:
+        """A single attribute ("name", "type", "file_path", "methods" or "calls") of a node, or None."""
+        i = self.index_of(node_id)
+        if i is None:
+            return None
+        if name == "name":
+            return self.string(self._item("node_name", i))
+        if name == "type":
+            return NODE_TYPES[self._item("node_type", i)]
+        if name == "file_path":
+            return self.string(self._item("node_file", i))
+        if name == "methods":
+            start, stop = self._slice("meth_offsets", i, i + 2)
+            return [self.string(m) for m in self._slice("meth_names", start, stop)]
+        if name == "calls":
+            return self._calls(i)
+        raise KeyError(name)
+
+    # ── Adjacency ────────────────────────────────────────────────────────
+
+    def successors(self, i: int) -> List[Tuple[int, str, int]]:
+        """(target index, edge kind, weight) for each outgoing edge of node `i`."""
+        start, stop = self._slice("fwd_offsets", i, i + 2)
+        return list(zip(
+            self._slice("fwd_targets", start, stop),
+            (EDGE_KINDS[k] for k in self._slice("fwd_kinds", start, stop)),
+            self._slice("fwd_weights", start, stop),
+        ))
+
+    def predecessors(self, i: int) -> List[Tuple[int, str, int]]:
+        """(source index, edge kind, weight) for each incoming edge of node `i`."""
+        start, stop = self._slice("rev_offsets", i, i + 2)
+        result = []
+        for source, pos in zip(self._slice("rev_sources", start, stop), self._slice("rev_edges", start, stop)):
+            result.append((source, EDGE_KINDS[self._item("fwd_kinds", pos)], self._item("fwd_weights", pos)))
+        return result
+
+    def neighbourhood(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """A node's attributes plus its incoming and outgoing edges, by ID; None if absent."""
+        i = self.index_of(node_id)
+        if i is None:
+            return None
+        return {
+            "id": node_id,
+            **self.node_attrs(i),
+            "out": [
+                {"target": self.node_id(t), "type": kind, "weight": weight}
+                for t, kind, weight in self.successors(i)
+            ],
+            "in": [
+                {"source": self.node_id(s), "type": kind, "weight": weight}
+                for s, kind, weight in self.predecessors(i)
+            ],
+        }
+
+    # ── Full loads ───────────────────────────────────────────────────────
+
+    def to_csr(self) -> CSRGraph:
+        """Decode the whole artifact into a CSRGraph (nodes in artifact order)."""
+        offsets = self._array("str_offsets")
+        data = self._array("str_data").tobytes()
+        strings = [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+        builder = CSRGraphBuilder()
+        for s in strings:
+            builder.strings.intern(s)
+        node_name, node_type, node_file = (
+            self._array("node_name"), self._array("node_type"), self._array("node_file")
+        )
+        meth_offsets, meth_names = self._array("meth_offsets"), self._array("meth_names")
+        if "call_offsets" in self._sections:
+            call_offsets, call_from, call_class, call_method = (self._array(name) for name in CALL_SECTIONS)
+        else:  # version 1
+            call_offsets = array("Q", [0]) * (self.num_nodes + 1)
+            call_from = call_class = call_method = array("I")
+        for i in range(self.num_nodes):
+            calls = range(call_offsets[i], call_offsets[i + 1])
+            builder.add_node(
+                strings[i],
+                name=strings[node_name[i]],
+                node_type=NODE_TYPES[node_type[i]],
+                file_path=None if node_file[i] == NO_STRING else strings[node_file[i]],
+                methods=[strings[m] for m in meth_names[meth_offsets[i]:meth_offsets[i + 1]]],
+                calls=[(strings[call_from[c]], strings[call_class[c]], strings[call_method[c]]) for c in calls]
+            )
+        fwd_offsets, fwd_targets = self._array("fwd_offsets"), self._array("fwd_targets")
+        fwd_kinds, fwd_weights = self._array("fwd_kinds"), self._array("fwd_weights")
+        for u in range(self.num_nodes):
+            for pos in range(fwd_offsets[u], fwd_offsets[u + 1]):
+                builder.add_edge(strings[u], strings[fwd_targets[pos]], EDGE_KINDS[fwd_kinds[pos]], fwd_weights[pos])
+        return builder.build()
+
+    def to_json_dict(self) -> dict:
+        """The deterministic node-link dict, identical to GraphModel.to_json_dict."""
+        return self.to_csr().to_json_dict()
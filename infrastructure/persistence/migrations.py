@@ -0,0 +1,92 @@
+"""Versioned upgrades for databases created by earlier releases.
+
+`Base.metadata.create_all` only creates missing tables: a column added to a
+model whose table already exists would be missing from older databases.
+Each Migration names the columns (and indexes) its version introduced; the
+column definitions themselves are read from the models. `upgrade` applies,
+in order, every migration not yet recorded in schema_version: it adds the
+columns an existing table lacks with ALTER TABLE ADD COLUMN, then creates
+the indexes with CREATE INDEX IF NOT EXISTS, then records the version. On a
+freshly created database the steps find nothing to do and are only recorded.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Tuple
+from sqlalchemy import inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn, CreateIndex
+from infrastructure.persistence.models import Base, SchemaVersion
+
+logger = logging.getLogger(__name__)
+
+BASELINE_VERSION = "0.1"
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: str
+    columns: Dict[str, Tuple[str, ...]] = field(default_factory=dict)  # table -> new columns
+    indexes: Tuple[str, ...] = ()  # index names, created after the columns
+
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration("0.2", {"analysis_run": ("cache_hits", "cache_misses")}),
+    Migration("0.3", {"analysis_run": ("betweenness_mode", "betweenness_samples", "betweenness_seed")}),
+    Migration("0.4", {"analysis_run": ("incomplete_metrics",)}),
+    Migration("0.5", {"analysis_run": ("metric_profile",)}),
+    Migration("0.6", {"analysis_run": ("stale_metrics", "baseline_run_id")}),
+    Migration("0.7", {"component_metrics": ("pagerank", "hub_score", "authority_score", "katz")}),
+    Migration("0.8", {"analysis_run": ("graph_fingerprint", "metric_cache_key", "metrics_run_id")}),
+    Migration("0.9", {"analysis_run": ("community_method", "community_seed", "community_modularity")}),
+    Migration("0.10", indexes=(
+        "ix_component_metrics_run_name",
+        "ix_component_metrics_run_blast_radius",
+        "ix_component_metrics_run_betweenness",
+        "ix_component_metrics_run_pagerank",
+    )),
+)
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def _column_ddl(conn: Connection, table: str, name: str) -> str:
+    column = Base.metadata.tables[table].c[name]
+    ddl = str(CreateColumn(column).compile(dialect=conn.dialect))
+    for fk in column.foreign_keys:
+        ddl += f" REFERENCES {fk.column.table.name} ({fk.column.name})"
+    return ddl
+
+
+def _add_missing_columns(conn: Connection, migration: Migration) -> None:
+    for table, names in migration.columns.items():
+        existing = {column["name"] for column in inspect(conn).get_columns(table)}
+        for name in names:
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {_column_ddl(conn, table, name)}"))
+                logger.info(f"Schema {migration.version}: added {table}.{name}")
+
+
+def _create_indexes(conn: Connection, migration: Migration) -> None:
+    indexes = {index.name: index for table in Base.metadata.sorted_tables for index in table.indexes}
+    for name in migration.indexes:
+        conn.execute(CreateIndex(indexes[name], if_not_exists=True))
+
+
+def upgrade(engine: Engine) -> List[str]:
+    """Apply the pending MIGRATIONS in order; returns the versions applied."""
+    applied = []
+    with engine.begin() as conn:
+        recorded = set(conn.execute(select(SchemaVersion.version)).scalars())
+        for migration in MIGRATIONS:
+            if migration.version in recorded:
+                continue
+            _add_missing_columns(conn, migration)
+            _create_indexes(conn, migration)
+            conn.execute(
+                SchemaVersion.__table__.insert(),
+                {"version": migration.version, "applied_at": datetime.utcnow()},
+            )
+            applied.append(migration.version)
+    if applied:
+        logger.info(f"Upgraded schema to {SCHEMA_VERSION} (applied {', '.join(applied)})")
+    return applied
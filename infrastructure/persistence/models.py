@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from infrastructure.persistence.database import Base
 
@@ -21,6 +21,21 @@ class AnalysisRun(Base):
     total_classes = Column(Integer, nullable=True)
     total_edges = Column(Integer, nullable=True)
     error_message = Column(String, nullable=True)
+    cache_hits = Column(Integer, nullable=True)  # files served from parse_cache
+    cache_misses = Column(Integer, nullable=True)  # files (re-)parsed this run
+    betweenness_mode = Column(String, nullable=True)  # 'exact', 'approximate' or 'skip'
+    betweenness_samples = Column(Integer, nullable=True)  # pivots used (n when exact)
+    betweenness_seed = Column(Integer, nullable=True)  # pivot sampling seed, if sampled
+    metric_profile = Column(String, nullable=True)  # 'quick' or 'full'
+    incomplete_metrics = Column(String, nullable=True)  # comma-separated families that ran out of budget
+    stale_metrics = Column(String, nullable=True)  # families carried over from the baseline run
+    baseline_run_id = Column(Integer, ForeignKey("analysis_run.id"), nullable=True)  # incremental update source
+    graph_fingerprint = Column(String, nullable=True)  # sha256 of the projected graph
+    metric_cache_key = Column(String, nullable=True)  # fingerprint + metric settings
+    metrics_run_id = Column(Integer, ForeignKey("analysis_run.id"), nullable=True)  # run holding this run's metric rows
+    community_method = Column(String, nullable=True)  # 'louvain' or 'label_propagation'
+    community_seed = Column(Integer, nullable=True)
+    community_modularity = Column(Float, nullable=True)
 
 class SchemaVersion(Base):
     __tablename__ = "schema_version"
@@ -31,6 +46,15 @@ class SchemaVersion(Base):
 
 class ComponentMetric(Base):
     __tablename__ = "component_metrics"
+    # Per-run lookups, name order / prefix filters and top-k sorts; ties
+    # within an index key come back in id (rowid) order, matching the
+    # keyset pagination of AnalysisRunRepository.page_component_metrics
+    __table_args__ = (
+        Index("ix_component_metrics_run_name", "run_id", "component_name"),
+        Index("ix_component_metrics_run_blast_radius", "run_id", "blast_radius"),
+        Index("ix_component_metrics_run_betweenness", "run_id", "betweenness"),
+        Index("ix_component_metrics_run_pagerank", "run_id", "pagerank"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     run_id = Column(Integer, ForeignKey("analysis_run.id"), nullable=False)
@@ -49,4 +73,71 @@ class ComponentMetric(Base):
     fan_out_ratio = Column(Float, default=0.0)
     scc_density = Column(Float, default=0.0)
     reachability_ratio = Column(Float, default=0.0)
+    pagerank = Column(Float, default=0.0)
+    hub_score = Column(Float, default=0.0)
+    authority_score = Column(Float, default=0.0)
+    katz = Column(Float, default=0.0)
     created_at = Column(DateTime, default=func.now(), nullable=False)
+
+class Community(Base):
+    """One community (extraction candidate) of a run's partition."""
+    __tablename__ = "community"
+    __table_args__ = (UniqueConstraint("run_id", "community_id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(Integer, ForeignKey("analysis_run.id"), nullable=False)
+    community_id = Column(Integer, nullable=False)  # 0..k-1 within the run
+    size = Column(Integer, nullable=False)
+    internal_weight = Column(Float, nullable=False)  # edges with both ends inside
+    external_weight = Column(Float, nullable=False)  # edges crossing the boundary
+
+class CommunityMember(Base):
+    __tablename__ = "community_member"
+    __table_args__ = (UniqueConstraint("run_id", "component_name"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(Integer, ForeignKey("analysis_run.id"), nullable=False)
+    component_name = Column(String, nullable=False)
+    community_id = Column(Integer, nullable=False)
+
+class Experiment(Base):
+    """A Monte Carlo stability study over one analysis run."""
+    __tablename__ = "experiment"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(Integer, ForeignKey("analysis_run.id"), nullable=False)
+    kind = Column(String, nullable=False)  # 'weight_sensitivity', 'edge_perturbation' or 'node_removal'
+    status = Column(String, nullable=False)  # 'running', 'completed', 'failed'
+    trials = Column(Integer, nullable=False)  # requested
+    completed_trials = Column(Integer, nullable=False, default=0)
+    seed = Column(Integer, nullable=False)
+    workers = Column(Integer, nullable=False, default=1)
+    params = Column(Text, nullable=False)  # JSON, defaults filled in
+    summary = Column(Text, nullable=True)  # JSON: {field: {mean, std, min, max}}
+    error_message = Column(String, nullable=True)
+    started_at = Column(DateTime, default=func.now(), nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+class ExperimentTrial(Base):
+    __tablename__ = "experiment_trial"
+    __table_args__ = (UniqueConstraint("experiment_id", "trial_index"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    experiment_id = Column(Integer, ForeignKey("experiment.id"), nullable=False)
+    trial_index = Column(Integer, nullable=False)
+    result = Column(Text, nullable=False)  # JSON
+
+class ParseCacheEntry(Base):
+    """Per-file parser output, reused across runs of the same project."""
+    __tablename__ = "parse_cache"
+    __table_args__ = (UniqueConstraint("project_id", "file_path"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    project_id = Column(Integer, ForeignKey("project.id"), nullable=False)
+    root_path = Column(String, nullable=False)
+    file_path = Column(String, nullable=False)
+    file_size = Column(Integer, nullable=False)
+    mtime_ns = Column(Integer, nullable=False)  # 0 = always verify by hash
+    content_hash = Column(String, nullable=False)  # sha256 hex digest
+    parser_version = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)  # JSON: {"nodes": [...], "edges": [...]}
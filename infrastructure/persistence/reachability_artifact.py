@@ -0,0 +1,64 @@
+"""Binary reachability index file (`reach_{run_id}.sreach`).
+
+Layout (all integers little-endian):
+
+    header      magic b"STRREACH", version u16, nodes u32, array count u32
+    per array   name (12 bytes), array typecode, element count u64,
+                compressed length u64, then the zlib-compressed elements
+
+The arrays are ReachabilityIndex.arrays(), read back whole: queries touch
+labels all over the index, so there is nothing to gain from block access
+as in the graph artifact.
+"""
+import os
+import struct
+import zlib
+from domain.algorithms.reachability_index import ReachabilityIndex, ARRAYS
+from infrastructure.persistence.graph_artifact import (
+    ArtifactFormatError, _to_le_bytes, _from_le_bytes, COMPRESSION_LEVEL
+)
+
+MAGIC = b"STRREACH"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sHII")
+_ARRAY = struct.Struct("<12s1sQQ")
+
+
+def write_reachability_index(index: ReachabilityIndex, path: str) -> str:
+    """Writes `index` to `path` (atomically replacing it). Returns the path."""
+    arrays = index.arrays()
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, index.n, len(arrays)))
+        for name, values in arrays.items():
+            data = zlib.compress(_to_le_bytes(values), COMPRESSION_LEVEL)
+            f.write(_ARRAY.pack(name.encode("ascii"), values.typecode.encode("ascii"), len(values), len(data)))
+            f.write(data)
+    os.replace(tmp, path)
+    return path
+
+
+def read_reachability_index(path: str) -> ReachabilityIndex:
+    with open(path, "rb") as f:
+        raw = f.read()
+    if len(raw) < _HEADER.size:
+        raise ArtifactFormatError(f"{path}: truncated reachability index")
+    magic, version, n, count = _HEADER.unpack_from(raw, 0)
+    if magic != MAGIC:
+        raise ArtifactFormatError(f"{path}: not a reachability index")
+    if version != FORMAT_VERSION:
+        raise ArtifactFormatError(f"{path}: unsupported reachability index version {version}")
+    arrays = {}
+    pos = _HEADER.size
+    for _ in range(count):
+        name, typecode, length, size = _ARRAY.unpack_from(raw, pos)
+        pos += _ARRAY.size
+        values = _from_le_bytes(typecode.decode("ascii"), zlib.decompress(raw[pos:pos + size]))
+        pos += size
+        if len(values) != length:
+            raise ArtifactFormatError(f"{path}: corrupt array {name!r}")
+        arrays[name.rstrip(b"\0").decode("ascii")] = values
+    if set(arrays) != set(ARRAYS) or len(arrays["comp_of"]) != n:
+        raise ArtifactFormatError(f"{path}: incomplete reachability index")
+    return ReachabilityIndex(*(arrays[name] for name in ARRAYS))
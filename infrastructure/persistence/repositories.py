@@ -1,8 +1,22 @@
+import base64
 import json
 import os
+import sys
+from contextlib import contextmanager
 from datetime import datetime
-from sqlalchemy.orm import Session
-from infrastructure.persistence.models import Project, AnalysisRun, ComponentMetric
+from sqlalchemy import insert, tuple_
+from sqlalchemy.orm import Session, defer
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from infrastructure.persistence.models import (
+    Project, AnalysisRun, ComponentMetric, ParseCacheEntry, Experiment, ExperimentTrial,
+    Community, CommunityMember
+)
+from infrastructure import settings
+from infrastructure.persistence.graph_artifact import write_artifact, GraphArtifact
+from infrastructure.persistence.reachability_artifact import write_reachability_index, read_reachability_index
+from domain.models.csr_graph import CSRGraph
+from domain.algorithms.reachability_index import ReachabilityIndex
+from domain.services.communities import CommunityPartition
 
 class ProjectRepository:
     def __init__(self, db: Session):
@@ -17,9 +31,103 @@ class ProjectRepository:
             self.db.refresh(project)
         return project
 
+# Rows per executemany batch of the Core bulk inserts
+INSERT_CHUNK_ROWS = 10_000
+
+METRIC_COLUMNS = (
+    'in_degree', 'out_degree', 'weighted_in', 'weighted_out', 'betweenness', 'closeness',
+    'scc_id', 'scc_size', 'blast_radius', 'fan_in_ratio', 'fan_out_ratio', 'scc_density',
+    'reachability_ratio', 'pagerank', 'hub_score', 'authority_score', 'katz'
+)
+
+# Sort keys of page_component_metrics
+METRIC_SORT_FIELDS = ('component_name',) + METRIC_COLUMNS
+
+
+def encode_cursor(key: Tuple[Any, int]) -> str:
+    """Opaque page cursor for a (sort value, row id) keyset position."""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """Inverse of encode_cursor; ValueError for anything it did not produce."""
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if not isinstance(row_id, int) or isinstance(value, (list, dict, bool)) or value is None:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return value, row_id
+
+
+def _prefix_end(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with `prefix`, or
+    None if there is none (the prefix is only U+10FFFF characters)."""
+    stripped = prefix.rstrip(chr(sys.maxunicode))
+    if not stripped:
+        return None
+    end = ord(stripped[-1]) + 1
+    if 0xD800 <= end <= 0xDFFF:
+        end = 0xE000  # lone surrogates cannot be encoded for the database
+    return stripped[:-1] + chr(end)
+
+
+def _insert_rows(db: Session, table, rows: Iterable[dict], chunk_rows: int = INSERT_CHUNK_ROWS) -> int:
+    """executemany INSERT of `rows` through SQLAlchemy Core, `chunk_rows` at a
+    time, so neither ORM objects nor the whole parameter list are held at once.
+    Returns the number of rows inserted."""
+    statement = insert(table)
+    total = 0
+    chunk: List[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_rows:
+            db.execute(statement, chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        db.execute(statement, chunk)
+        total += len(chunk)
+    return total
+
+
 class AnalysisRunRepository:
     def __init__(self, db: Session):
         self.db = db
+        self._transaction_depth = 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Makes every write of this repository inside the block part of one
+        transaction, committed when the block exits and rolled back if it raises.
+
+        Writes are flushed as they happen (later queries see them) but not
+        committed, and run objects are not re-read after each write.
+        """
+        self._transaction_depth += 1
+        try:
+            yield
+        except BaseException:
+            if self._transaction_depth == 1:
+                self.db.rollback()
+            raise
+        else:
+            if self._transaction_depth == 1:
+                self.db.commit()
+        finally:
+            self._transaction_depth -= 1
+
+    def _commit(self, run: Optional[AnalysisRun] = None) -> None:
+        if self._transaction_depth:
+            self.db.flush()
+            return
+        self.db.commit()
+        if run is not None:
+            self.db.refresh(run)
+
+    def _run(self, run_id: int) -> Optional[AnalysisRun]:
+        """The run, from the session's identity map when already loaded."""
+        return self.db.get(AnalysisRun, run_id)
 
     def create(self, project_id: int) -> AnalysisRun:
         run = AnalysisRun(project_id=project_id, status="started")
@@ -28,47 +136,220 @@ class AnalysisRunRepository:
         self.db.refresh(run)
         return run
 
+    def get(self, run_id: int) -> Optional[AnalysisRun]:
+        return self.db.query(AnalysisRun).filter(AnalysisRun.id == run_id).first()
+
     def update_metrics(self, run_id: int, total_files: int, total_classes: int, total_edges: int) -> AnalysisRun:
-        run = self.db.query(AnalysisRun).filter(AnalysisRun.id == run_id).first()
+        run = self._run(run_id)
         if run:
             run.total_files = total_files
             run.total_classes = total_classes
             run.total_edges = total_edges
-            self.db.commit()
-            self.db.refresh(run)
+            self._commit(run)
+        return run
+
+    def update_cache_stats(self, run_id: int, cache_hits: int, cache_misses: int) -> AnalysisRun:
+        run = self._run(run_id)
+        if run:
+            run.cache_hits = cache_hits
+            run.cache_misses = cache_misses
+            self._commit(run)
         return run
 
+    def update_betweenness_info(
+        self,
+        run_id: int,
+        mode: str,
+        samples: Optional[int],
+        seed: Optional[int]
+    ) -> AnalysisRun:
+        run = self._run(run_id)
+        if run:
+            run.betweenness_mode = mode
+            run.betweenness_samples = samples
+            run.betweenness_seed = seed
+            self._commit(run)
+        return run
+
+    def update_metric_status(
+        self,
+        run_id: int,
+        profile: str,
+        incomplete: List[str],
+        stale: Iterable[str] = (),
+        baseline_run_id: Optional[int] = None
+    ) -> AnalysisRun:
+        run = self._run(run_id)
+        if run:
+            run.metric_profile = profile
+            run.incomplete_metrics = ",".join(incomplete) or None
+            run.stale_metrics = ",".join(stale) or None
+            run.baseline_run_id = baseline_run_id
+            self._commit(run)
+        return run
+
+    def update_metric_source(
+        self,
+        run_id: int,
+        fingerprint: str,
+        cache_key: str,
+        metrics_run_id: Optional[int] = None
+    ) -> AnalysisRun:
+        run = self._run(run_id)
+        if run:
+            run.graph_fingerprint = fingerprint
+            run.metric_cache_key = cache_key
+            run.metrics_run_id = metrics_run_id
+            self._commit(run)
+        return run
+
+    def metrics_owner(self, run_id: int) -> int:
+        """ID of the run whose component_metrics rows hold `run_id`'s metrics."""
+        run = self.get(run_id)
+        return run.metrics_run_id if run and run.metrics_run_id else run_id
+
     def mark_completed(self, run_id: int) -> AnalysisRun:
-        run = self.db.query(AnalysisRun).filter(AnalysisRun.id == run_id).first()
+        run = self._run(run_id)
         if run:
             run.status = "completed"
             run.completed_at = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(run)
+            self._commit(run)
         return run
 
     def mark_failed(self, run_id: int, error_message: str) -> AnalysisRun:
-        run = self.db.query(AnalysisRun).filter(AnalysisRun.id == run_id).first()
+        run = self._run(run_id)
         if run:
             run.status = "failed"
             run.completed_at = datetime.utcnow()
             run.error_message = error_message
-            self.db.commit()
-            self.db.refresh(run)
+            self._commit(run)
         return run
 
     def serialize_graph(self, run_id: int, graph_data: dict) -> str:
         """
-        Saves the graph JSON to the local /data directory.
+        Saves the graph JSON to the data directory (settings.DATA_DIR).
         Returns the path saved.
         """
-        data_dir = os.path.abspath("/data")
-        os.makedirs(data_dir, exist_ok=True)
-        filepath = os.path.join(data_dir, f"graph_{run_id}.json")
+        os.makedirs(settings.DATA_DIR, exist_ok=True)
+        filepath = os.path.join(settings.DATA_DIR, f"graph_{run_id}.json")
         with open(filepath, "w", encoding="utf-8") as f:
             json.dump(graph_data, f, indent=2)
         return filepath
 
+    def save_graph_artifact(self, run_id: int, csr: CSRGraph) -> str:
+        """
+        Saves the graph as a compact binary artifact (see graph_artifact.py)
+        to the data directory (settings.DATA_DIR). Returns the path saved.
+        """
+        os.makedirs(settings.DATA_DIR, exist_ok=True)
+        filepath = os.path.join(settings.DATA_DIR, f"graph_{run_id}.sgraph")
+        return write_artifact(csr, filepath)
+
+    def load_graph_artifact(self, run_id: int) -> Optional[CSRGraph]:
+        """Graph saved by save_graph_artifact, or None if the run has none."""
+        filepath = os.path.join(settings.DATA_DIR, f"graph_{run_id}.sgraph")
+        if not os.path.exists(filepath):
+            return None
+        with GraphArtifact(filepath) as artifact:
+            return artifact.to_csr()
+
+    def save_reachability_index(self, run_id: int, index: ReachabilityIndex) -> str:
+        """
+        Saves the run's reachability index (see reachability_artifact.py)
+        next to its graph artifact. Returns the path saved.
+        """
+        os.makedirs(settings.DATA_DIR, exist_ok=True)
+        filepath = os.path.join(settings.DATA_DIR, f"reach_{run_id}.sreach")
+        return write_reachability_index(index, filepath)
+
+    def load_reachability_index(self, run_id: int) -> Optional[ReachabilityIndex]:
+        """Index saved by save_reachability_index, or None if the run has none."""
+        filepath = os.path.join(settings.DATA_DIR, f"reach_{run_id}.sreach")
+        if not os.path.exists(filepath):
+            return None
+        return read_reachability_index(filepath)
+
+    def delete_run_files(self, run_id: int) -> None:
+        """Removes whatever graph JSON, graph artifact and reachability index
+        the run has in the data directory."""
+        for name in (f"graph_{run_id}.json", f"graph_{run_id}.sgraph", f"reach_{run_id}.sreach"):
+            try:
+                os.remove(os.path.join(settings.DATA_DIR, name))
+            except FileNotFoundError:
+                pass
+
+    def load_component_metrics(self, run_id: int, fields: Iterable[str]) -> Dict[str, dict]:
+        """{component_name: {field: value}} for the given metric fields of a run.
+
+        Fields without a column (derived metrics such as total_degree) are
+        skipped. Runs that reuse another run's rows are resolved to it.
+        """
+        fields = [f for f in fields if f in ComponentMetric.__table__.columns]
+        columns = [getattr(ComponentMetric, f) for f in fields]
+        rows = self.db.query(ComponentMetric.component_name, *columns).filter(
+            ComponentMetric.run_id == self.metrics_owner(run_id)
+        )
+        return {row[0]: dict(zip(fields, row[1:])) for row in rows}
+
+    def page_component_metrics(
+        self,
+        run_id: int,
+        fields: Iterable[str],
+        sort_by: str = 'component_name',
+        descending: bool = False,
+        limit: int = 500,
+        after: Optional[Tuple[Any, int]] = None,
+        component_type: Optional[str] = None,
+        name_prefix: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[Tuple[Any, int]]]:
+        """One page of a run's component metrics, in (sort_by, row id) order.
+
+        Keyset pagination: `after` is the key returned with the previous
+        page, so every page is an index range scan however deep it is.
+        Rows without a value for a metric `sort_by` are left out.
+
+        Returns:
+            ({component_name, field: value} per row, key of the next page or
+            None on the last one).
+        """
+        if sort_by not in METRIC_SORT_FIELDS:
+            raise ValueError(f"Cannot sort by {sort_by}")
+        fields = [f for f in fields if f != 'component_name']
+        unknown = set(fields) - set(ComponentMetric.__table__.columns.keys())
+        if unknown:
+            raise ValueError(f"Unknown fields: {sorted(unknown)}")
+
+        sort_column = getattr(ComponentMetric, sort_by)
+        query = self.db.query(
+            ComponentMetric.id, sort_column, ComponentMetric.component_name,
+            *(getattr(ComponentMetric, f) for f in fields)
+        ).filter(ComponentMetric.run_id == self.metrics_owner(run_id))
+        if sort_by != 'component_name':
+            query = query.filter(sort_column.isnot(None))
+        if component_type is not None:
+            query = query.filter(ComponentMetric.component_type == component_type)
+        if name_prefix:
+            # A range rather than LIKE, so the (run_id, component_name) index applies
+            query = query.filter(ComponentMetric.component_name >= name_prefix)
+            end = _prefix_end(name_prefix)
+            if end is not None:
+                query = query.filter(ComponentMetric.component_name < end)
+        key = tuple_(sort_column, ComponentMetric.id)
+        if after is not None:
+            query = query.filter(key < tuple_(*after) if descending else key > tuple_(*after))
+        if descending:
+            query = query.order_by(sort_column.desc(), ComponentMetric.id.desc())
+        else:
+            query = query.order_by(sort_column, ComponentMetric.id)
+
+        rows = query.limit(limit + 1).all()
+        page = [
+            {'component_name': row[2], **dict(zip(fields, row[3:]))}
+            for row in rows[:limit]
+        ]
+        next_key = (rows[limit - 1][1], rows[limit - 1][0]) if len(rows) > limit else None
+        return page, next_key
+
     def save_component_metrics(
         self,
         run_id: int,
@@ -80,31 +361,183 @@ class AnalysisRunRepository:
         Args:
             run_id: ID of the parent AnalysisRun.
             metrics_matrix: Dict of {node_id: metrics_dict} from MetricCalculator.
+                            Metrics missing from a dict (not in the requested
+                            profile) are stored as NULL.
             node_types: Optional dict of {node_id: type_string} e.g. 'class', 'method'.
         """
         node_types = node_types or {}
-        objects = []
-        for component_name, metrics in metrics_matrix.items():
-            cm = ComponentMetric(
-                run_id=run_id,
-                component_name=component_name,
-                component_type=node_types.get(component_name, "class"),
-                in_degree=metrics.get('in_degree', 0),
-                out_degree=metrics.get('out_degree', 0),
-                weighted_in=metrics.get('weighted_in', 0),
-                weighted_out=metrics.get('weighted_out', 0),
-                betweenness=metrics.get('betweenness', 0.0),
-                closeness=metrics.get('closeness', 0.0),
-                scc_id=metrics.get('scc_id', 0),
-                scc_size=metrics.get('scc_size', 0),
-                blast_radius=metrics.get('blast_radius', 0),
-                fan_in_ratio=metrics.get('fan_in_ratio', 0.0),
-                fan_out_ratio=metrics.get('fan_out_ratio', 0.0),
-                scc_density=metrics.get('scc_density', 0.0),
-                reachability_ratio=metrics.get('reachability_ratio', 0.0)
-            )
-            objects.append(cm)
-            
-        if objects:
-            self.db.bulk_save_objects(objects)
+        rows = (
+            {
+                'run_id': run_id,
+                'component_name': component_name,
+                'component_type': node_types.get(component_name, "class"),
+                **{column: metrics.get(column) for column in METRIC_COLUMNS}
+            }
+            for component_name, metrics in metrics_matrix.items()
+        )
+        if _insert_rows(self.db, ComponentMetric.__table__, rows):
+            self._commit()
+
+    def save_communities(self, run_id: int, partition: CommunityPartition) -> None:
+        """Stores a run's community assignment and per-community weights."""
+        run = self._run(run_id)
+        if run:
+            run.community_method = partition.method
+            run.community_seed = partition.seed
+            run.community_modularity = partition.modularity
+        _insert_rows(self.db, Community.__table__, (
+            {
+                'run_id': run_id, 'community_id': c.community_id, 'size': c.size,
+                'internal_weight': c.internal_weight, 'external_weight': c.external_weight
+            }
+            for c in partition.communities
+        ))
+        _insert_rows(self.db, CommunityMember.__table__, (
+            {'run_id': run_id, 'component_name': name, 'community_id': community_id}
+            for name, community_id in partition.assignment.items()
+        ))
+        self._commit()
+
+    def load_communities(self, run_id: int) -> List[Community]:
+        return self.db.query(Community).filter(Community.run_id == run_id).order_by(Community.community_id).all()
+
+    def community_members(self, run_id: int, community_id: Optional[int] = None) -> Dict[str, int]:
+        """{component_name: community_id} of a run, optionally for one community."""
+        query = self.db.query(CommunityMember.component_name, CommunityMember.community_id).filter(
+            CommunityMember.run_id == run_id
+        )
+        if community_id is not None:
+            query = query.filter(CommunityMember.community_id == community_id)
+        return dict(query.all())
+
+
+class ParseCacheRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load(self, project_id: int) -> Dict[str, ParseCacheEntry]:
+        """All cache entries of a project, keyed by file path.
+
+        Payloads are deferred; fetch them in batches with `payloads()`.
+        """
+        entries = self.db.query(ParseCacheEntry).options(
+            defer(ParseCacheEntry.payload)
+        ).filter(
+            ParseCacheEntry.project_id == project_id
+        ).all()
+        return {e.file_path: e for e in entries}
+
+    def payloads(self, entry_ids: List[int]) -> Dict[int, str]:
+        """Payload text by entry id, without attaching it to the ORM objects."""
+        result: Dict[int, str] = {}
+        for i in range(0, len(entry_ids), 500):
+            rows = self.db.query(ParseCacheEntry.id, ParseCacheEntry.payload).filter(
+                ParseCacheEntry.id.in_(entry_ids[i:i + 500])
+            ).all()
+            result.update(rows)
+        return result
+
+    def upsert(
+        self,
+        existing: Optional[ParseCacheEntry],
+        project_id: int,
+        root_path: str,
+        file_path: str,
+        file_size: int,
+        mtime_ns: int,
+        content_hash: str,
+        parser_version: str,
+        payload: str
+    ) -> ParseCacheEntry:
+        """Stage an insert (existing is None) or in-place update. Call commit()."""
+        entry = existing or ParseCacheEntry(project_id=project_id, file_path=file_path)
+        entry.root_path = root_path
+        entry.file_size = file_size
+        entry.mtime_ns = mtime_ns
+        entry.content_hash = content_hash
+        entry.parser_version = parser_version
+        entry.payload = payload
+        if existing is None:
+            self.db.add(entry)
+        return entry
+
+    def delete_paths(self, project_id: int, file_paths: Iterable[str]) -> None:
+        """Stage removal of entries for files that no longer exist. Call commit()."""
+        paths = list(file_paths)
+        # Chunked to stay under SQLite's bound-parameter limit
+        for i in range(0, len(paths), 500):
+            self.db.query(ParseCacheEntry).filter(
+                ParseCacheEntry.project_id == project_id,
+                ParseCacheEntry.file_path.in_(paths[i:i + 500])
+            ).delete(synchronize_session=False)
+
+    def flush(self, entries: List[ParseCacheEntry]) -> None:
+        """Write staged entries and release their payloads from memory."""
+        self.db.flush()
+        for entry in entries:
+            self.db.expire(entry, ["payload"])
+
+    def commit(self) -> None:
+        self.db.commit()
+
+
+class ExperimentRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, run_id: int, kind: str, trials: int, seed: int, workers: int, params: dict) -> Experiment:
+        experiment = Experiment(
+            run_id=run_id, kind=kind, status="running", trials=trials,
+            completed_trials=0, seed=seed, workers=workers, params=json.dumps(params)
+        )
+        self.db.add(experiment)
+        self.db.commit()
+        self.db.refresh(experiment)
+        return experiment
+
+    def get(self, experiment_id: int) -> Optional[Experiment]:
+        return self.db.query(Experiment).filter(Experiment.id == experiment_id).first()
+
+    def add_trials(self, experiment_id: int, results: List[tuple]) -> None:
+        """Stores a batch of (trial_index, result dict) and advances the progress counter."""
+        self.db.bulk_save_objects([
+            ExperimentTrial(experiment_id=experiment_id, trial_index=i, result=json.dumps(result))
+            for i, result in results
+        ])
+        experiment = self.get(experiment_id)
+        experiment.completed_trials += len(results)
+        self.db.commit()
+
+    def trials(self, experiment_id: int, cursor: int = 0, limit: Optional[int] = None) -> List[tuple]:
+        """(row id, trial_index, result dict) stored after row `cursor`, in storage order.
+
+        Trials finish out of index order, so pollers page by row id: pass the
+        last row id seen to get only what arrived since.
+        """
+        query = self.db.query(ExperimentTrial.id, ExperimentTrial.trial_index, ExperimentTrial.result).filter(
+            ExperimentTrial.experiment_id == experiment_id,
+            ExperimentTrial.id > cursor
+        ).order_by(ExperimentTrial.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return [(row_id, i, json.loads(result)) for row_id, i, result in query]
+
+    def mark_completed(self, experiment_id: int, summary: dict) -> Experiment:
+        experiment = self.get(experiment_id)
+        if experiment:
+            experiment.status = "completed"
+            experiment.summary = json.dumps(summary)
+            experiment.completed_at = datetime.utcnow()
+            self.db.commit()
+            self.db.refresh(experiment)
+        return experiment
+
+    def mark_failed(self, experiment_id: int, error_message: str) -> Experiment:
+        experiment = self.get(experiment_id)
+        if experiment:
+            experiment.status = "failed"
+            experiment.error_message = error_message
+            experiment.completed_at = datetime.utcnow()
             self.db.commit()
+            self.db.refresh(experiment)
+        return experiment
@@ -0,0 +1,181 @@
+"""Single-pass PHP declaration and dependency scanner.
+
+One compiled pattern walks the file left to right. Comments, string
+literals, heredocs and inline HTML are consumed as opaque tokens, so
+nothing inside them is mistaken for code. Brace tokens keep a depth
+counter, which lets every `new`, `X::m()` and trait `use` be attributed to
+the class/interface/trait body that actually encloses it, and every call
+(`X::m()`, `new X`, `$this->m()`) to the method body it appears in.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+_NAME = r'\\?[^\W\d]\w*(?:\\[^\W\d]\w*)*'
+
+_TOKEN_PATTERN = re.compile(r'''
+    (?P<skip>
+        //[^\n]*
+      | \#(?!\[)[^\n]*
+      | /\*[^*]*\*+(?:[^/*][^*]*\*+)*/
+      | '[^'\\]*(?:\\.[^'\\]*)*'
+      | "[^"\\]*(?:\\.[^"\\]*)*"
+      | `[^`\\]*(?:\\.[^`\\]*)*`
+      | <<<[ \t]*(?P<q>["']?)(?P<heredoc>[^\W\d]\w*)(?P=q)\r?\n.*?^[ \t]*(?P=heredoc)\b
+      | \?>.*?(?:<\?(?:php|=)?|\Z)
+    )
+  | \$this\s*->\s*(?P<this_call>[^\W\d]\w*)\s*\(
+  | (?P<open>\{)
+  | (?P<close>\})
+  | (?=[^\W\d]|\\)(?<![\w$\\])(?<!->)(?<!::)(?:
+        (?i:namespace)\s*(?P<ns>''' + _NAME + r''')?\s*(?=[;{])
+      | (?i:use)\s+(?P<use>[^;{(]*)(?:(?<=\\)\{(?P<use_group>[^}]*)\})?
+      | (?P<decl>(?i:class|interface|trait|enum))\s+(?P<decl_name>[^\W\d]\w*)(?P<header>[^{;]*)
+      | (?i:function)\s*&?\s*(?P<fn>[^\W\d]\w*)
+      | (?i:new)\s+(?P<new>''' + _NAME + r''')
+      | (?P<static>''' + _NAME + r''')\s*::\s*(?P<static_call>[^\W\d]\w*)\s*\(
+    )
+''', re.VERBOSE | re.DOTALL | re.MULTILINE)
+
+_EXTENDS_PATTERN = re.compile(r'\bextends\s+(' + _NAME + r'(?:\s*,\s*' + _NAME + r')*)', re.IGNORECASE)
+_IMPLEMENTS_PATTERN = re.compile(r'\bimplements\s+(' + _NAME + r'(?:\s*,\s*' + _NAME + r')*)', re.IGNORECASE)
+_ALIAS_PATTERN = re.compile(r'^(' + _NAME + r')(?:\s+as\s+([^\W\d]\w*))?$', re.IGNORECASE)
+
+# Names that refer to the current class hierarchy, never to another node
+RELATIVE_NAMES = frozenset({'self', 'static', 'parent', 'class'})
+
+# Method a `new X` call runs
+CONSTRUCTOR = '__construct'
+
+
+@dataclass
+class TypeDecl:
+    """A class, interface, trait or enum declaration and what its body references.
+
+    All referenced names are raw (as written); resolve them against
+    `namespace` and `imports` to obtain fully-qualified IDs.
+    """
+    kind: str  # 'class' | 'interface' | 'trait' | 'enum'
+    name: str
+    namespace: Optional[str]
+    imports: Dict[str, str]  # lower-cased alias -> fully-qualified name
+    extends: List[str] = field(default_factory=list)
+    implements: List[str] = field(default_factory=list)
+    traits: List[str] = field(default_factory=list)
+    methods: List[str] = field(default_factory=list)
+    instantiations: List[str] = field(default_factory=list)
+    static_calls: List[str] = field(default_factory=list)
+    # (calling method, raw target class or 'self'/'static'/'parent', called method)
+    calls: List[Tuple[str, str, str]] = field(default_factory=list)
+
+
+def _split_names(raw: str) -> List[str]:
+    return [part.strip() for part in raw.split(',') if part.strip()]
+
+
+def _add_imports(imports: Dict[str, str], prefix: str, items: List[str]) -> None:
+    for item in items:
+        m = _ALIAS_PATTERN.match(item)
+        if not m:
+            continue
+        full = (prefix + m.group(1)).lstrip('\\')
+        alias = m.group(2) or full.rsplit('\\', 1)[-1]
+        imports[alias.lower()] = full
+
+
+def scan_php(content: str) -> List[TypeDecl]:
+    """Scan PHP source once and return its type declarations in source order."""
+    decls: List[TypeDecl] = []
+    namespace: Optional[str] = None
+    imports: Dict[str, str] = {}
+
+    depth = 0
+    stack: List[tuple] = []  # (TypeDecl, body_depth) of open declaration bodies
+    pending: Optional[TypeDecl] = None  # declared, waiting for its opening brace
+    methods: List[tuple] = []  # (TypeDecl, method name, body_depth) of open method bodies
+    pending_method: Optional[tuple] = None  # (TypeDecl, name) waiting for its body
+
+    for m in _TOKEN_PATTERN.finditer(content):
+        kind = m.lastgroup
+        if kind == 'skip':
+            continue
+        if kind == 'open':
+            depth += 1
+            if pending is not None:
+                stack.append((pending, depth))
+                pending = None
+            elif pending_method is not None:
+                # Only a brace straight inside the class body opens the
+                # method; abstract methods have none
+                if stack and stack[-1][0] is pending_method[0] and stack[-1][1] == depth - 1:
+                    methods.append((*pending_method, depth))
+                pending_method = None
+            continue
+        if kind == 'close':
+            if methods and methods[-1][2] == depth:
+                methods.pop()
+            if stack and stack[-1][1] == depth:
+                stack.pop()
+            depth -= 1
+            continue
+
+        current = stack[-1][0] if stack else None
+        at_body_level = current is not None and stack[-1][1] == depth
+        method = methods[-1][1] if methods and methods[-1][0] is current else None
+
+        if kind == 'static_call':
+            name = m.group('static')
+            if current is not None and name.lower() not in RELATIVE_NAMES:
+                current.static_calls.append(name)
+            if method is not None:
+                current.calls.append((method, name, m.group('static_call')))
+        elif kind == 'new':
+            name = m.group('new')
+            if current is not None and name.lower() not in RELATIVE_NAMES:
+                current.instantiations.append(name)
+            if method is not None and name.lower() != 'class':
+                current.calls.append((method, name, CONSTRUCTOR))
+        elif kind == 'this_call':
+            if method is not None:
+                current.calls.append((method, 'self', m.group('this_call')))
+        elif kind == 'fn':
+            if at_body_level:
+                current.methods.append(m.group('fn'))
+                pending_method = (current, m.group('fn'))
+        elif kind == 'header':  # class/interface/trait/enum declaration
+            decl = TypeDecl(
+                kind=m.group('decl').lower(),
+                name=m.group('decl_name'),
+                namespace=namespace,
+                imports=imports
+            )
+            header = m.group('header')
+            ext = _EXTENDS_PATTERN.search(header)
+            if ext:
+                decl.extends = _split_names(ext.group(1))
+            impl = _IMPLEMENTS_PATTERN.search(header)
+            if impl:
+                decl.implements = _split_names(impl.group(1))
+            decls.append(decl)
+            pending = decl
+        elif kind == 'use' or kind == 'use_group':
+            if at_body_level:
+                # Trait use inside a class body
+                current.traits.extend(_split_names(m.group('use')))
+            elif not stack:
+                # Top-level import; function/const imports name no classes
+                raw = m.group('use').strip()
+                head = raw.split(None, 1)[0].lower() if raw else ''
+                if head in ('function', 'const'):
+                    continue
+                group = m.group('use_group')
+                if group is not None:
+                    _add_imports(imports, raw, _split_names(group))
+                else:
+                    _add_imports(imports, '', _split_names(raw))
+        else:  # namespace (group 'ns', or None for `namespace {`)
+            ns = m.group('ns')
+            namespace = ns.lstrip('\\') if ns else None
+            imports = {}  # imports are scoped to their namespace
+
+    return decls
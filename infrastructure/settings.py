@@ -0,0 +1,17 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DOCKER_DATA_DIR = "/data"
+LOCAL_DATA_DIR = "./data"
+
+# Outside Docker /data usually isn't mapped; fall back to ./data for pure
+# local runs (the database URL follows the same rule)
+use_local_data_dir = not os.path.exists(DOCKER_DATA_DIR) and os.path.exists(LOCAL_DATA_DIR)
+
+# Directory for run artifacts: graph JSON / .sgraph files, reachability
+# indexes and the metric cache. DATA_DIR overrides the default.
+DATA_DIR = os.path.abspath(
+    os.getenv("DATA_DIR") or (LOCAL_DATA_DIR if use_local_data_dir else DOCKER_DATA_DIR)
+)
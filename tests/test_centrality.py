@@ -0,0 +1,121 @@
+import os
+import random
+import time
+import networkx as nx
+import pytest
+from domain.algorithms.centrality import CentralityEngine
+from domain.services.metric_calculator import MetricCalculator, BetweennessConfig, CancelToken, MetricCancelled
+
+
+def _indexed(graph):
+    nodes = list(graph.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    return nodes, [[index[t] for t in graph.successors(node)] for node in nodes]
+
+
+def test_engine_matches_networkx():
+    graph = nx.gnm_random_graph(200, 800, seed=3, directed=True)
+    graph.add_node("isolated")
+    nodes, succ = _indexed(graph)
+
+    with CentralityEngine(succ) as engine:
+        betweenness = engine.betweenness()
+        closeness = engine.closeness()
+
+    expected_b = nx.betweenness_centrality(graph, normalized=True)
+    expected_c = nx.closeness_centrality(graph)
+    for i, node in enumerate(nodes):
+        assert abs(betweenness[i] - expected_b[node]) < 1e-12
+        assert closeness[i] == expected_c[node]
+
+
+def test_results_identical_across_worker_counts():
+    graph = nx.gnm_random_graph(400, 1600, seed=4, directed=True)
+    _, succ = _indexed(graph)
+
+    results = []
+    for workers in (1, 2, 3):
+        with CentralityEngine(succ, workers=workers) as engine:
+            results.append((engine.betweenness(), engine.closeness()))
+    assert results[0] == results[1] == results[2]
+
+
+def test_parallel_sampled_betweenness_uses_networkx_pivots():
+    graph = nx.gnm_random_graph(300, 1200, seed=6, directed=True)
+    config = BetweennessConfig(mode="approximate", samples=60, seed=11)
+
+    serial = MetricCalculator(graph, betweenness=config).calculate_all_metrics()
+    parallel = MetricCalculator(graph, betweenness=config, workers=2).calculate_all_metrics()
+    for node in graph.nodes():
+        assert abs(serial[node]['betweenness'] - parallel[node]['betweenness']) < 1e-12
+        assert serial[node]['closeness'] == parallel[node]['closeness']
+
+
+
+def test_calculator_shares_one_engine_across_families(monkeypatch):
+    import domain.algorithms.centrality as centrality
+    import domain.services.metric_calculator as metric_calculator
+    engines, pools = [], []
+
+    class CountingEngine(CentralityEngine):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            engines.append(self)
+
+    class CountingPool(centrality.Pool):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(metric_calculator, "CentralityEngine", CountingEngine)
+    monkeypatch.setattr(centrality, "Pool", CountingPool)
+    graph = nx.gnm_random_graph(300, 1200, seed=6, directed=True)
+    MetricCalculator(graph, workers=2).calculate_all_metrics()
+    assert len(engines) == len(pools) == 1
+    assert engines[0]._pool is None and engines[0]._shm is None  # released after the run
+
+def test_cancel_terminates_pool_workers():
+    graph = nx.gnm_random_graph(2000, 10000, seed=2, directed=True)
+    _, succ = _indexed(graph)
+    token = CancelToken(deadline=time.monotonic() + 0.5)
+
+    engine = CentralityEngine(succ, workers=2)
+    with pytest.raises(MetricCancelled):
+        engine.betweenness(check=token.check)
+    assert engine._pool is None and engine._shm is None
+    engine.close()
+
+
+def _scaling_benchmark(n_nodes, n_edges, worker_counts):
+    rng = random.Random(9)
+    succ = [[] for _ in range(n_nodes)]
+    for _ in range(n_edges):
+        u, v = rng.randrange(n_nodes), rng.randrange(n_nodes)
+        if u != v:
+            succ[u].append(v)
+
+    baseline = None
+    timings = []
+    for workers in worker_counts:
+        with CentralityEngine(succ, workers=workers) as engine:
+            start = time.perf_counter()
+            values = engine.betweenness()
+            elapsed = time.perf_counter() - start
+        if baseline is None:
+            baseline = values
+        assert values == baseline
+        timings.append((workers, elapsed))
+
+    base = timings[0][1]
+    summary = " | ".join(f"{w}w {t:.2f}s ({base / t:.1f}x)" for w, t in timings)
+    print(f"\n[Centrality] {n_nodes} nodes, {n_edges} edges, {os.cpu_count()} CPUs: {summary}")
+
+
+@pytest.mark.benchmark
+def test_parallel_betweenness_scaling_benchmark():
+    """Benchmark: exact betweenness wall time for 1/2/4/8/16 workers (identical values)."""
+    _scaling_benchmark(600, 2400, (1, 2, 4, 8, 16))
+
+
+if __name__ == "__main__":
+    _scaling_benchmark(20_000, 80_000, (1, 2, 4, 8, 16))
@@ -0,0 +1,156 @@
+import random
+import time
+import networkx as nx
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from infrastructure.persistence.models import Base
+from infrastructure.persistence.repositories import ProjectRepository, AnalysisRunRepository
+from domain.algorithms.link_analysis import SparseAdjacency
+from domain.algorithms.community import UndirectedWeights, louvain, modularity
+from domain.services.communities import (
+    CommunityConfig, detect_communities, COMMUNITY_LOUVAIN, COMMUNITY_LABEL_PROPAGATION
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _planted(groups, size, seed, p_in=0.4, p_out=0.01):
+    """Directed graph of `groups` dense blocks with sparse links between them."""
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    nodes = [f"C{i}" for i in range(groups * size)]
+    graph.add_nodes_from(nodes)
+    for i, u in enumerate(nodes):
+        for j, v in enumerate(nodes):
+            if i != j and rng.random() < (p_in if i // size == j // size else p_out):
+                graph.add_edge(u, v, weight=rng.randint(1, 3))
+    return graph
+
+
+def _undirected(graph):
+    und = nx.Graph()
+    und.add_nodes_from(graph)
+    for u, v, data in graph.edges(data=True):
+        w = data.get("weight", 1)
+        und.add_edge(u, v, weight=und[u][v]["weight"] + w if und.has_edge(u, v) else w)
+    return und
+
+
+def _adjacency(graph):
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    return SparseAdjacency(
+        [[index[t] for t in graph.succ[node]] for node in nodes],
+        [[d.get("weight", 1) for d in graph.succ[node].values()] for node in nodes]
+    )
+
+
+def test_modularity_matches_networkx():
+    graph = _planted(4, 12, 1)
+    partition = detect_communities(graph, CommunityConfig(respect_scc=False))
+    groups = {}
+    for node, c in partition.assignment.items():
+        groups.setdefault(c, set()).add(node)
+    und = _undirected(graph)
+    assert partition.modularity == pytest.approx(nx.community.modularity(und, groups.values()))
+    best = nx.community.louvain_communities(und, seed=0)
+    assert partition.modularity >= nx.community.modularity(und, best) - 0.02
+
+
+@pytest.mark.parametrize("method", [COMMUNITY_LOUVAIN, COMMUNITY_LABEL_PROPAGATION])
+def test_planted_communities_are_recovered_deterministically(method):
+    graph = _planted(5, 10, 2, p_in=0.5, p_out=0.005)
+    config = CommunityConfig(method=method, seed=3, respect_scc=False)  # blocks share cycles
+    partition = detect_communities(graph, config)
+    assert partition == detect_communities(graph, config)
+    expected = {node: int(node[1:]) // 10 for node in graph}
+    assert partition.assignment == expected  # ids follow first member
+    sizes = [c.size for c in partition.communities]
+    assert sizes == [10] * 5
+    # Every edge is internal to one community or external to two
+    total = sum(d["weight"] for _, _, d in graph.edges(data=True))
+    internal = sum(c.internal_weight for c in partition.communities)
+    external = sum(c.external_weight for c in partition.communities)
+    assert internal + external / 2 == total
+    assert all(c.cohesion > 0.5 for c in partition.communities)
+
+
+def test_respect_scc_keeps_cycles_whole():
+    # Two dense blocks joined by a cycle a0 -> b0 -> a0 carrying little weight
+    graph = _planted(2, 10, 4, p_in=0.6, p_out=0.0)
+    graph.add_edge("C0", "C10", weight=1)
+    graph.add_edge("C10", "C0", weight=1)
+    split = detect_communities(graph, CommunityConfig(respect_scc=False))
+    assert split.assignment["C0"] != split.assignment["C10"]
+    for method in (COMMUNITY_LOUVAIN, COMMUNITY_LABEL_PROPAGATION):
+        partition = detect_communities(graph, CommunityConfig(method=method))
+        for scc in nx.strongly_connected_components(graph):
+            assert len({partition.assignment[node] for node in scc}) == 1
+    with pytest.raises(ValueError):
+        detect_communities(graph, CommunityConfig(method="leiden"))
+
+
+def test_communities_are_persisted(db):
+    graph = _planted(3, 8, 5)
+    partition = detect_communities(graph)
+    project = ProjectRepository(db).get_or_create("p")
+    repo = AnalysisRunRepository(db)
+    run = repo.create(project.id)
+    repo.save_communities(run.id, partition)
+    run = repo.get(run.id)
+    assert (run.community_method, run.community_seed) == (COMMUNITY_LOUVAIN, 0)
+    assert run.community_modularity == pytest.approx(partition.modularity)
+    stored = repo.load_communities(run.id)
+    assert [(c.community_id, c.size, c.internal_weight, c.external_weight) for c in stored] == [
+        (c.community_id, c.size, c.internal_weight, c.external_weight) for c in partition.communities
+    ]
+    assert repo.community_members(run.id) == partition.assignment
+    assert set(repo.community_members(run.id, community_id=0)) == {
+        node for node, c in partition.assignment.items() if c == 0
+    }
+
+
+@pytest.mark.benchmark
+def test_community_detection_scaling_benchmark():
+    """Benchmark: Louvain and label propagation at 25k and 50k nodes (4 edges per node).
+
+    The random graph is mostly one large SCC, so SCCs are not kept whole here."""
+    timings = {}
+    for n in (25_000, 50_000):
+        rng = random.Random(n)
+        edges = {}
+        while len(edges) < 4 * n:
+            u = rng.randrange(n)
+            v = (u + int(rng.expovariate(1 / 100))) % n if rng.random() < 0.8 else rng.randrange(n)
+            if u != v:
+                edges.setdefault((u, v), rng.randint(1, 5))
+        graph = nx.DiGraph()
+        graph.add_nodes_from(range(n))
+        graph.add_weighted_edges_from((u, v, w) for (u, v), w in edges.items())
+        for method in (COMMUNITY_LOUVAIN, COMMUNITY_LABEL_PROPAGATION):
+            start = time.perf_counter()
+            partition = detect_communities(graph, CommunityConfig(method=method, respect_scc=False))
+            timings[method, n] = time.perf_counter() - start
+            assert 0 < partition.modularity < 1
+    print("\n[Communities] " + " | ".join(f"{m} {n}: {t:.2f}s" for (m, n), t in timings.items()))
+    for method in (COMMUNITY_LOUVAIN, COMMUNITY_LABEL_PROPAGATION):
+        assert timings[method, 50_000] < 3.5 * timings[method, 25_000]
+
+
+def test_louvain_levels_never_lower_modularity():
+    graph = _planted(6, 15, 6, p_in=0.2, p_out=0.02)
+    adj = _adjacency(graph)
+    weights = UndirectedWeights.from_adjacency(adj)
+    singletons = np.arange(adj.n)
+    one_level = louvain(adj, seed=1, max_levels=1)
+    full = louvain(adj, seed=1)
+    assert modularity(weights, singletons) < modularity(weights, one_level) <= modularity(weights, full) + 1e-12
@@ -0,0 +1,148 @@
+import random
+import tracemalloc
+import networkx as nx
+import pytest
+from domain.models.node import Node, NodeType
+from domain.models.edge import Edge, EdgeType
+from domain.models.graph_model import GraphModel, BACKEND_CSR, BACKEND_NETWORKX
+from domain.models.csr_graph import CSRGraph
+from domain.services.metric_calculator import MetricCalculator
+
+
+def _synthetic(n_nodes, n_edges, seed=7):
+    rng = random.Random(seed)
+    kinds = [EdgeType.METHOD_CALL, EdgeType.INSTANTIATION, EdgeType.INHERITS]
+    nodes = [
+        Node(
+            id=f"App\\Module{i % 100}\\Class{i}", name=f"Class{i}",
+            node_type=NodeType.CLASS, file_path=f"/data/src/Module{i % 100}/Class{i}.php",
+            methods=[f"method{m}" for m in range(5)]
+        )
+        for i in range(n_nodes)
+    ]
+    edges = [
+        Edge(
+            source_id=nodes[rng.randrange(n_nodes)].id,
+            target_id=nodes[rng.randrange(n_nodes)].id,
+            edge_type=kinds[rng.randrange(len(kinds))]
+        )
+        for _ in range(n_edges)
+    ]
+    return nodes, edges
+
+
+def _build(backend, nodes, edges):
+    graph = GraphModel(backend=backend)
+    for node in nodes:
+        graph.add_node(node)
+    for edge in edges:
+        graph.add_edge(edge)
+    graph.get_edge_count()  # CSR resolves edges on first read
+    return graph
+
+
+def test_csr_backend_matches_networkx():
+    nodes, edges = _synthetic(300, 1500)
+    edges.append(Edge(source_id=nodes[0].id, target_id="Missing\\Target", edge_type=EdgeType.METHOD_CALL))
+
+    reference = _build(BACKEND_NETWORKX, nodes, edges)
+    compact = _build(BACKEND_CSR, nodes, edges)
+
+    assert compact.get_node_count() == reference.get_node_count()
+    assert compact.get_edge_count() == reference.get_edge_count()
+    assert compact.get_class_count() == reference.get_class_count()
+    assert compact.to_json_dict() == reference.to_json_dict()
+
+    # The materialized DiGraph is usable by MetricCalculator as-is
+    assert MetricCalculator(compact.graph).calculate_all_metrics() == \
+        MetricCalculator(reference.graph).calculate_all_metrics()
+
+
+def test_csr_adjacency_and_duplicate_merging():
+    graph = GraphModel(backend=BACKEND_CSR)
+    for n in ("A", "B", "C"):
+        graph.add_node(Node(id=n, name=n, node_type=NodeType.CLASS))
+    graph.add_edge(Edge(source_id="A", target_id="B", edge_type=EdgeType.INSTANTIATION))
+    graph.add_edge(Edge(source_id="A", target_id="B", edge_type=EdgeType.METHOD_CALL))
+    graph.add_edge(Edge(source_id="A", target_id="C", edge_type=EdgeType.METHOD_CALL))
+    graph.add_edge(Edge(source_id="C", target_id="C", edge_type=EdgeType.METHOD_CALL))
+    graph.add_edge(Edge(source_id="C", target_id="Nope", edge_type=EdgeType.METHOD_CALL))
+    assert graph.resolve_pending_edges() == 1
+
+    csr = graph.csr
+    a, b, c = (csr.index_of(n) for n in ("A", "B", "C"))
+    assert list(csr.successors(a)) == [b, c]
+    assert list(csr.predecessors(c)) == [a]
+    assert (csr.out_degree(a), csr.in_degree(b), csr.out_degree(c)) == (2, 1, 0)
+    assert list(csr.edges()) == [(a, b, "instantiation", 2), (a, c, "method_call", 1)]
+
+    # Growing a frozen graph thaws it without losing merged weights
+    graph.add_edge(Edge(source_id="A", target_id="B", edge_type=EdgeType.METHOD_CALL))
+    assert graph.graph["A"]["B"] == {"type": "instantiation", "weight": 3}
+
+
+def test_from_networkx_round_trip():
+    reference = _build(BACKEND_NETWORKX, *_synthetic(200, 800))
+    round_trip = CSRGraph.from_networkx(reference.graph).to_networkx()
+    assert nx.utils.graphs_equal(round_trip, reference.graph)
+
+
+def test_networkx_backend_keeps_its_csr_copy_until_changed():
+    graph = GraphModel()
+    for n in ("A", "B", "C"):
+        graph.add_node(Node(id=n, name=n, node_type=NodeType.CLASS))
+    graph.add_edge(Edge(source_id="A", target_id="B", edge_type=EdgeType.METHOD_CALL))
+    csr = graph.csr
+    methods = graph.method_graph()
+    assert graph.csr is csr and graph.method_graph() is methods
+
+    graph.add_edge(Edge(source_id="A", target_id="B", edge_type=EdgeType.METHOD_CALL))
+    assert graph.csr is not csr and list(graph.csr.edges())[0][3] == 2
+    assert graph.method_graph() is not methods
+
+    csr = graph.csr
+    graph.stream_edge(Edge(source_id="C", target_id="D", edge_type=EdgeType.METHOD_CALL))
+    assert graph.csr is csr  # only buffered
+    graph.add_nodes_bulk(["D"], ["D"], [NodeType.CLASS.value])
+    assert graph.csr.num_nodes == 4
+    csr = graph.csr
+    graph.resolve_pending_edges()
+    assert graph.csr is not csr and graph.csr.num_edges == 2
+    csr = graph.csr
+    graph.add_edges_bulk(["B"], ["C"], [EdgeType.INHERITS.value])
+    assert graph.csr is not csr and graph.csr.num_edges == 3
+
+
+def _traced_build(backend, nodes, edges):
+    tracemalloc.start()
+    graph = _build(backend, nodes, edges)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return graph, current, peak
+
+
+@pytest.mark.benchmark
+def test_memory_benchmark_against_networkx():
+    """Benchmark: retained and peak traced memory, NetworkX dict-of-dicts vs CSR arrays.
+
+    Node/Edge inputs are created before tracing starts; the NetworkX backend
+    keeps references to the input `methods` lists, so its figure is a lower
+    bound on what it costs when those lists come straight from the parser.
+    """
+    nodes, edges = _synthetic(20_000, 100_000)
+    results = {}
+    for backend in (BACKEND_NETWORKX, BACKEND_CSR):
+        graph, current, peak = _traced_build(backend, nodes, edges)
+        results[backend] = current
+        print(
+            f"\n[Memory] {backend:>8}: {graph.get_node_count()} nodes, "
+            f"{graph.get_edge_count()} edges, retained {current / 2**20:7.2f} MiB, "
+            f"peak {peak / 2**20:7.2f} MiB"
+        )
+        del graph
+
+    assert results[BACKEND_CSR] * 3 < results[BACKEND_NETWORKX]
+
+
+if __name__ == "__main__":
+    test_memory_benchmark_against_networkx()
@@ -19,3 +19,212 @@ def test_schema_creation(test_engine):
     assert "project" in tables
     assert "analysis_run" in tables
     assert "schema_version" in tables
+
+
+def _file_engine(path, tuned):
+    from sqlalchemy.orm import sessionmaker
+    from infrastructure.persistence.database import apply_sqlite_pragmas
+    engine = create_engine(f"sqlite:///{path}")
+    if tuned:
+        apply_sqlite_pragmas(engine)
+    Base.metadata.create_all(engine)
+    return engine, sessionmaker(bind=engine)()
+
+
+def test_tuned_pragmas_apply_on_connect(tmp_path):
+    from sqlalchemy import text
+    engine, db = _file_engine(tmp_path / "tuned.db", tuned=True)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -64_000
+    db.close()
+
+
+def test_run_writes_commit_together_or_not_at_all(tmp_path):
+    from infrastructure.persistence.models import ComponentMetric
+    from infrastructure.persistence.repositories import AnalysisRunRepository
+    _, db = _file_engine(tmp_path / "runs.db", tuned=True)
+    repo = AnalysisRunRepository(db)
+    run_id = repo.create(project_id=1).id
+
+    with pytest.raises(RuntimeError):
+        with repo.transaction():
+            repo.save_component_metrics(run_id, {"A": {"in_degree": 1}, "B": {}})
+            repo.mark_completed(run_id)
+            raise RuntimeError("metrics failed")
+    assert db.query(ComponentMetric).count() == 0
+    assert repo.get(run_id).status == "started"
+
+    with repo.transaction():
+        repo.save_component_metrics(run_id, {"A": {"in_degree": 1}, "B": {}})
+        repo.mark_completed(run_id)
+    db.close()
+    _, other = _file_engine(tmp_path / "runs.db", tuned=True)
+    rows = dict(other.query(ComponentMetric.component_name, ComponentMetric.in_degree))
+    assert rows == {"A": 1, "B": None}  # metrics outside the profile stay NULL
+    assert AnalysisRunRepository(other).get(run_id).status == "completed"
+
+
+def test_metric_rows_insert_in_chunks(tmp_path):
+    from infrastructure.persistence.models import ComponentMetric
+    from infrastructure.persistence.repositories import _insert_rows
+    _, db = _file_engine(tmp_path / "chunks.db", tuned=True)
+    rows = [
+        {"run_id": 1, "component_name": f"C{i}", "component_type": "class", "in_degree": i}
+        for i in range(10)
+    ]
+    assert _insert_rows(db, ComponentMetric.__table__, iter(rows), chunk_rows=4) == 10
+    db.commit()
+    assert [r.in_degree for r in db.query(ComponentMetric).order_by(ComponentMetric.id)] == list(range(10))
+    db.close()
+
+
+def test_failed_persist_leaves_no_run_files(tmp_path, monkeypatch):
+    from infrastructure import settings
+    from infrastructure.metric_cache import MetricCache
+    from application.services.analysis_service import AnalysisService
+    monkeypatch.setattr(settings, "DATA_DIR", str(tmp_path / "data"))
+    project = tmp_path / "src"
+    project.mkdir()
+    (project / "A.php").write_text("<?php\nclass A { function f() { new B(); } }\nclass B {}\n")
+    _, db = _file_engine(tmp_path / "runs.db", tuned=True)
+    service = AnalysisService(db, metric_cache=MetricCache(str(tmp_path / "cache")))
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(service.repo, "save_component_metrics", fail)
+    with pytest.raises(RuntimeError):
+        service.run_analysis(1, str(project), export_json=True)
+    assert os.listdir(settings.DATA_DIR) == []
+    assert service.repo.get(1).status == "failed"
+
+    run_id = AnalysisService(db, metric_cache=MetricCache(str(tmp_path / "cache"))).run_analysis(
+        1, str(project), export_json=True
+    )["run_id"]
+    assert sorted(os.listdir(settings.DATA_DIR)) == [
+        f"graph_{run_id}.json", f"graph_{run_id}.sgraph", f"reach_{run_id}.sreach"
+    ]
+    db.close()
+
+
+@pytest.mark.benchmark
+def test_metric_write_benchmark(tmp_path):
+    """Benchmark: one run's 200k component_metrics rows, SQLite defaults vs tuned."""
+    import time
+    from infrastructure.persistence.models import ComponentMetric
+    from infrastructure.persistence.repositories import AnalysisRunRepository, METRIC_COLUMNS
+    n = 200_000
+    matrix = {
+        f"App\\Module{i % 100}\\Class{i}": {column: i % 97 for column in METRIC_COLUMNS}
+        for i in range(n)
+    }
+    report = []
+    for tuned in (False, True):
+        _, db = _file_engine(tmp_path / f"bench_{tuned}.db", tuned)
+        repo = AnalysisRunRepository(db)
+        run_id = repo.create(project_id=1).id
+        start = time.perf_counter()
+        with repo.transaction():
+            repo.save_component_metrics(run_id, matrix)
+            repo.update_metrics(run_id, n, n, 0)
+            repo.mark_completed(run_id)
+        elapsed = time.perf_counter() - start
+        assert db.query(ComponentMetric).filter(ComponentMetric.run_id == run_id).count() == n
+        db.close()
+        report.append(f"{'tuned' if tuned else 'defaults'} {elapsed:.2f}s ({n / elapsed / 1000:.0f}k rows/s)")
+    print(f"\n[Metric writes, {n} rows] " + " | ".join(report))
+
+
+# Tables as created by the first release (schema_version 0.1)
+BASELINE_SCHEMA = (
+    "CREATE TABLE project (id INTEGER NOT NULL, name VARCHAR NOT NULL, created_at DATETIME NOT NULL, "
+    "PRIMARY KEY (id))",
+    "CREATE TABLE schema_version (id INTEGER NOT NULL, version VARCHAR NOT NULL, applied_at DATETIME NOT NULL, "
+    "PRIMARY KEY (id), UNIQUE (version))",
+    "CREATE TABLE analysis_run (id INTEGER NOT NULL, project_id INTEGER NOT NULL, started_at DATETIME NOT NULL, "
+    "completed_at DATETIME, status VARCHAR NOT NULL, total_files INTEGER, total_classes INTEGER, "
+    "total_edges INTEGER, error_message VARCHAR, PRIMARY KEY (id), FOREIGN KEY(project_id) REFERENCES project (id))",
+    "CREATE TABLE component_metrics (id INTEGER NOT NULL, run_id INTEGER NOT NULL, component_name VARCHAR NOT NULL, "
+    "component_type VARCHAR NOT NULL, in_degree INTEGER, out_degree INTEGER, weighted_in INTEGER, "
+    "weighted_out INTEGER, betweenness FLOAT, closeness FLOAT, scc_id INTEGER, scc_size INTEGER, "
+    "blast_radius INTEGER, fan_in_ratio FLOAT, fan_out_ratio FLOAT, scc_density FLOAT, reachability_ratio FLOAT, "
+    "created_at DATETIME NOT NULL, PRIMARY KEY (id), FOREIGN KEY(run_id) REFERENCES analysis_run (id))",
+    "INSERT INTO schema_version (version, applied_at) VALUES ('0.1', '2024-01-01 00:00:00')",
+    "INSERT INTO project (name, created_at) VALUES ('legacy', '2024-01-01 00:00:00')",
+    "INSERT INTO analysis_run (project_id, started_at, status, total_classes) "
+    "VALUES (1, '2024-01-01 00:00:00', 'completed', 1)",
+    "INSERT INTO component_metrics (run_id, component_name, component_type, in_degree, created_at) "
+    "VALUES (1, 'App\\Legacy', 'class', 3, '2024-01-01 00:00:00')",
+)
+
+
+def _baseline_engine(path):
+    from sqlalchemy import text
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.execute(text(statement))
+    return engine
+
+
+def test_upgrade_adds_columns_to_baseline_database(tmp_path):
+    from sqlalchemy import text
+    from infrastructure.persistence.migrations import SCHEMA_VERSION, upgrade
+    engine = _baseline_engine(tmp_path / "old.db")
+    assert upgrade(engine)[-1] == SCHEMA_VERSION
+    assert upgrade(engine) == []  # recorded, nothing left to apply
+
+    columns = {c["name"] for c in inspect(engine).get_columns("analysis_run")}
+    assert {
+        "cache_hits", "cache_misses",
+        "betweenness_mode", "betweenness_samples", "betweenness_seed",
+        "incomplete_metrics",
+        "metric_profile",
+        "stale_metrics", "baseline_run_id",
+        "graph_fingerprint", "metric_cache_key", "metrics_run_id",
+        "community_method", "community_seed", "community_modularity",
+    } <= columns
+    foreign_keys = {
+        (fk["constrained_columns"][0], fk["referred_table"]) for fk in inspect(engine).get_foreign_keys("analysis_run")
+    }
+    assert ("baseline_run_id", "analysis_run") in foreign_keys
+    columns = {c["name"] for c in inspect(engine).get_columns("component_metrics")}
+    assert {"pagerank", "hub_score", "authority_score", "katz"} <= columns
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE analysis_run SET cache_hits = 4, cache_misses = 1 WHERE id = 1"))
+        assert conn.execute(text("SELECT status, total_classes, cache_hits FROM analysis_run")).all() == [
+            ("completed", 1, 4)
+        ]
+        versions = conn.execute(text("SELECT version FROM schema_version ORDER BY id")).scalars().all()
+    assert versions[0] == "0.1" and versions[-1] == SCHEMA_VERSION
+
+
+def test_init_db_upgrades_baseline_database_to_current_models(tmp_path):
+    from sqlalchemy.orm import sessionmaker
+    from infrastructure.persistence.database import init_db
+    from infrastructure.persistence.migrations import SCHEMA_VERSION
+    from infrastructure.persistence.models import SchemaVersion
+    from infrastructure.persistence.repositories import AnalysisRunRepository
+    engine = _baseline_engine(tmp_path / "old.db")
+    init_db(engine)
+    init_db(engine)  # second startup is a no-op
+
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        assert {c["name"] for c in inspector.get_columns(table.name)} == set(table.c.keys()), table.name
+        assert {i["name"] for i in inspector.get_indexes(table.name)} >= {i.name for i in table.indexes}
+
+    db = sessionmaker(bind=engine)()
+    repo = AnalysisRunRepository(db)
+    assert repo.get(1).status == "completed" and repo.get(1).cache_hits is None
+    run_id = repo.create(project_id=1).id
+    with repo.transaction():
+        repo.update_cache_stats(run_id, 2, 1)
+        repo.save_component_metrics(run_id, {"App\\New": {"in_degree": 1, "pagerank": 0.5}})
+        repo.mark_completed(run_id)
+    rows, _ = repo.page_component_metrics(run_id, ["pagerank"], sort_by="pagerank", descending=True)
+    assert rows == [{"component_name": "App\\New", "pagerank": 0.5}]
+    assert repo.load_component_metrics(1, ["in_degree"]) == {"App\\Legacy": {"in_degree": 3}}
+    assert db.query(SchemaVersion.version).order_by(SchemaVersion.id.desc()).first()[0] == SCHEMA_VERSION
+    db.close()
@@ -0,0 +1,90 @@
+import time
+import networkx as nx
+import numpy as np
+import pytest
+from domain.services.metric_calculator import MetricCalculator
+from domain.services.experiments import (
+    ExperimentContext, ExperimentRunner, spearman, summarize, experiment_params, CONTEXT_METRICS,
+    EXPERIMENT_KINDS, EXPERIMENT_WEIGHT_SENSITIVITY, EXPERIMENT_EDGE_PERTURBATION, EXPERIMENT_NODE_REMOVAL
+)
+
+
+def _context(n, m, seed, fields=CONTEXT_METRICS):
+    graph = nx.gnm_random_graph(n, m, seed=seed, directed=True)
+    graph = nx.relabel_nodes(graph, lambda i: f"C{i}")
+    rng = np.random.default_rng(seed)
+    for u, v in graph.edges():
+        graph[u][v]['weight'] = int(rng.integers(1, 4))
+    metrics = MetricCalculator(graph).calculate(fields)
+    start = time.perf_counter()
+    ctx = ExperimentContext.build(graph, metrics)
+    ctx.build_seconds = time.perf_counter() - start
+    return graph, ctx
+
+
+def _run(ctx, kind, trials, seed=3, workers=1, **params):
+    results = [r for batch in ExperimentRunner(ctx, workers).run(kind, trials, seed, params) for r in batch]
+    return sorted(results, key=lambda item: item[0])
+
+
+def test_spearman_matches_rank_definition():
+    assert spearman(np.array([1.0, 2, 3, 4]), np.array([10.0, 20, 30, 40])) == 1.0
+    assert spearman(np.array([1.0, 2, 3, 4]), np.array([4.0, 3, 2, 1])) == -1.0
+    # Ties share average ranks: [1.5, 1.5, 3, 4] vs [1, 2, 3, 4]
+    assert abs(spearman(np.array([5.0, 5, 6, 7]), np.array([1.0, 2, 3, 4])) - 0.9486832980505138) < 1e-12
+    assert spearman(np.zeros(3), np.zeros(3)) == 1.0
+
+
+def test_results_are_seeded_and_worker_independent():
+    _, ctx = _context(300, 900, 1)
+    for kind in EXPERIMENT_KINDS:
+        serial = _run(ctx, kind, 40)
+        assert serial == _run(ctx, kind, 40)
+        assert serial == _run(ctx, kind, 40, workers=2)
+        assert [i for i, _ in serial] == list(range(40))
+        assert serial != _run(ctx, kind, 40, seed=4)
+
+
+def test_node_removal_matches_networkx():
+    graph, ctx = _context(200, 500, 2)
+    for _, result in _run(ctx, EXPERIMENT_NODE_REMOVAL, 30, removal_count=3):
+        remaining = graph.subgraph(set(graph) - set(result["removed"]))
+        expected = max(len(c) for c in nx.strongly_connected_components(remaining))
+        assert result["largest_scc_before"] == max(len(c) for c in nx.strongly_connected_components(graph))
+        assert result["largest_scc_after"] == expected
+        assert result["impact"] == result["largest_scc_before"] - expected
+
+
+def test_zero_perturbation_leaves_ranking_unchanged():
+    _, ctx = _context(150, 450, 5)
+    for _, result in _run(ctx, EXPERIMENT_WEIGHT_SENSITIVITY, 5, jitter=0.0):
+        assert result["spearman"] == pytest.approx(1.0) and result["top_k_overlap"] == 1.0
+    for _, result in _run(ctx, EXPERIMENT_EDGE_PERTURBATION, 5, edge_fraction=0.0):
+        assert result["spearman"] == pytest.approx(1.0) and result["max_rank_shift"] == 0
+    summary = summarize([r for _, r in _run(ctx, EXPERIMENT_EDGE_PERTURBATION, 10)])
+    assert summary["removed_edges"]["mean"] == round(450 * 0.05)
+    assert 0 < summary["spearman"]["mean"] < 1
+
+
+def test_params_are_validated():
+    assert experiment_params(EXPERIMENT_NODE_REMOVAL, {"removal_count": 2.0}) == {"removal_count": 2}
+    with pytest.raises(ValueError):
+        experiment_params(EXPERIMENT_EDGE_PERTURBATION, {"jitter": 0.1})
+    with pytest.raises(ValueError):
+        experiment_params(EXPERIMENT_WEIGHT_SENSITIVITY, {"jitter": 1.5})
+    with pytest.raises(ValueError):
+        experiment_params("monte_carlo")
+
+
+@pytest.mark.benchmark
+def test_experiment_benchmark_20k_nodes():
+    """Benchmark: 200 trials of each experiment on a 20k-node, 80k-edge graph."""
+    # Exact betweenness is not what is being measured here
+    _, ctx = _context(20_000, 80_000, 9, fields=('weighted_in', 'weighted_out'))
+    timings = [f"context {ctx.build_seconds:.2f}s"]
+    for kind in EXPERIMENT_KINDS:
+        start = time.perf_counter()
+        results = _run(ctx, kind, 200)
+        timings.append(f"{kind} {time.perf_counter() - start:.2f}s")
+        assert len(results) == 200
+    print(f"\n[Experiments] 20000 nodes, 200 trials each: " + " | ".join(timings))
@@ -0,0 +1,93 @@
+import os
+from infrastructure.file_scanner import FileScanner, ScanOptions, IgnoreRules
+
+
+def _tree(root, files):
+    for rel, size in files.items():
+        full = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, "w") as f:
+            f.write("x" * size)
+
+
+def _rel(root, entries):
+    return [os.path.relpath(e.path, root).replace(os.sep, "/") for e in entries]
+
+
+def test_default_options_keep_everything_but_vcs_and_caches(tmp_path):
+    root = str(tmp_path)
+    _tree(root, {
+        "src/A.php": 10,
+        "src/Big.php": 2 * 1024 * 1024,
+        "src/ATest.php": 10,
+        "tests/C.php": 10,
+        "vendor/lib/D.php": 10,
+        ".git/F.php": 10,
+        "var/cache/prod/G.php": 10,
+    })
+    with open(os.path.join(root, ".gitignore"), "w") as f:
+        f.write("vendor/\n")
+
+    assert _rel(root, FileScanner.scan_entries(root)) == [
+        "src/A.php", "src/ATest.php", "src/Big.php", "tests/C.php", "vendor/lib/D.php",
+    ]
+
+
+def test_analysis_options_skip_vendor_tests_caches_and_large_files(tmp_path):
+    root = str(tmp_path)
+    _tree(root, {
+        "src/A.php": 10,
+        "src/sub/B.php": 10,
+        "src/Spec/Rule.php": 10,
+        "src/Big.php": 2 * 1024 * 1024,
+        "src/ATest.php": 10,
+        "tests/C.php": 10,
+        "spec/H.php": 10,
+        "vendor/lib/D.php": 10,
+        "node_modules/E.php": 10,
+        ".git/F.php": 10,
+        "var/cache/prod/G.php": 10,
+        "README.md": 10,
+    })
+
+    entries = FileScanner.scan_entries(root, options=ScanOptions.for_analysis())
+
+    assert _rel(root, entries) == ["src/A.php", "src/Spec/Rule.php", "src/sub/B.php"]
+    st = os.stat(entries[0].path)
+    assert (entries[0].size, entries[0].mtime_ns, entries[0].inode) == (10, st.st_mtime_ns, st.st_ino)
+
+
+def test_gitignore_and_excludes_with_threaded_walk(tmp_path):
+    root = str(tmp_path)
+    _tree(root, {
+        "src/A.php": 1,
+        "src/generated/B.php": 1,
+        "src/legacy/C.php": 1,
+        "src/legacy/Keep.php": 1,
+        "lib/D.php": 1,
+        "tests/E.php": 1,
+        "vendor/F.php": 1,
+    })
+    with open(os.path.join(root, ".gitignore"), "w") as f:
+        f.write("generated/\n")
+    with open(os.path.join(root, "src", "legacy", ".gitignore"), "w") as f:
+        f.write("*.php\n!Keep.php\n")
+
+    opts = ScanOptions(exclude=["/lib/"], respect_gitignore=True)
+    serial = FileScanner.scan(root, options=opts)
+    threaded = FileScanner.scan(root, options=ScanOptions(**{**opts.__dict__, "threads": 4}))
+
+    assert [os.path.relpath(p, root).replace(os.sep, "/") for p in serial] == [
+        "src/A.php", "src/legacy/Keep.php", "tests/E.php", "vendor/F.php",
+    ]
+    assert threaded == serial
+
+
+def test_ignore_rule_semantics():
+    rules = IgnoreRules("", ["*.log", "/build/", "docs/**/*.php", "!keep.log"])
+    assert rules.match("a/b/x.log", False) is True
+    assert rules.match("keep.log", False) is False
+    assert rules.match("build", True) is True
+    assert rules.match("src/build", True) is None
+    assert rules.match("build", False) is None
+    assert rules.match("docs/x/y/z.php", False) is True
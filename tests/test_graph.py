@@ -24,3 +24,73 @@ def test_graph_model_creation():
     assert "links" in json_data
     assert len(json_data["nodes"]) == 2
     assert len(json_data["links"]) == 1
+
+
+def test_streaming_ingest_matches_batch_build():
+    """Edges arriving before their target node are buffered and resolved at the end."""
+    nodes = [
+        Node(id=n, name=n, node_type=NodeType.CLASS) for n in ("A", "B", "C")
+    ]
+    edges = [
+        Edge(source_id="A", target_id="B", edge_type=EdgeType.INSTANTIATION),
+        Edge(source_id="A", target_id="B", edge_type=EdgeType.METHOD_CALL),
+        Edge(source_id="B", target_id="C", edge_type=EdgeType.METHOD_CALL),
+        Edge(source_id="C", target_id="Missing", edge_type=EdgeType.METHOD_CALL),
+        Edge(source_id="C", target_id="C", edge_type=EdgeType.METHOD_CALL),
+    ]
+
+    batch = GraphModel()
+    for node in nodes:
+        batch.add_node(node)
+    for edge in edges:
+        batch.add_edge(edge)
+
+    # Interleave as if each node's file arrived one at a time
+    streamed = GraphModel()
+    streamed.add_node(nodes[0])
+    streamed.stream_edge(edges[0])
+    streamed.add_node(nodes[1])
+    streamed.stream_edge(edges[1])
+    streamed.stream_edge(edges[2])
+    streamed.add_node(nodes[2])
+    streamed.stream_edge(edges[3])
+    streamed.stream_edge(edges[4])
+    assert streamed.resolve_pending_edges() == 1  # C -> Missing
+
+    assert streamed.to_json_dict() == batch.to_json_dict()
+    assert streamed.graph["A"]["B"] == {"type": "instantiation", "weight": 2}
+
+
+def test_bulk_ingest_matches_per_object_build():
+    """Columnar add_nodes_bulk / add_edges_bulk apply the same rules as add_node / add_edge."""
+    ids = ["A", "B", "C", "A"]
+    names = ["A", "B", "C", "Redefined"]
+    types = [NodeType.CLASS.value] * 4
+    sources = ["A", "A", "B", "C", "C", "B", "A"]
+    targets = ["B", "B", "C", "Missing", "C", "C", "B"]
+    kinds = ["instantiation", "method_call", "method_call", "method_call", "method_call", "inherits", "method_call"]
+
+    expected = GraphModel()
+    for i, name, t in zip(ids, names, types):
+        expected.add_node(Node(id=i, name=name, node_type=NodeType(t)))
+    for s, t, k in zip(sources, targets, kinds):
+        expected.add_edge(Edge(source_id=s, target_id=t, edge_type=EdgeType(k)))
+
+    for backend in ("networkx", "csr"):
+        bulk = GraphModel(backend=backend)
+        # Split across calls: duplicates must also merge against existing edges
+        bulk.add_nodes_bulk(ids, names, types)
+        bulk.add_edges_bulk(sources[:4], targets[:4], kinds[:4])
+        bulk.add_edges_bulk(sources[4:], targets[4:], kinds[4:])
+        assert bulk.to_json_dict() == expected.to_json_dict()
+        assert bulk.graph["A"]["B"] == {"type": "instantiation", "weight": 3}
+
+    streamed = GraphModel()
+    streamed.add_nodes_bulk(ids[:1], names[:1], types[:1])
+    streamed.stream_edges_bulk(sources, targets, kinds)
+    streamed.add_nodes_bulk(ids[1:], names[1:], types[1:])
+    assert streamed.resolve_pending_edges() == 1
+    assert streamed.to_json_dict() == expected.to_json_dict()
+    # Nodes added without methods each get their own list
+    streamed.graph.nodes["B"]["methods"].append("handle")
+    assert streamed.graph.nodes["C"]["methods"] == []
@@ -0,0 +1,133 @@
+import json
+import random
+import time
+import pytest
+from domain.models.graph_model import GraphModel
+from infrastructure.persistence.graph_artifact import (
+    GraphArtifact, ArtifactFormatError, write_artifact
+)
+
+
+def _synthetic_graph(n_nodes, n_edges, seed=3, shuffle=False):
+    rng = random.Random(seed)
+    ids = [f"App\\Module{i % 50}\\Class{i}" for i in range(n_nodes)]
+    # One kind per pair, so shuffling cannot change which kind is seen first
+    edges = [
+        (ids[s], ids[t], "inherits" if (s + t) % 5 == 0 else "method_call")
+        for s, t in ((rng.randrange(n_nodes), rng.randrange(n_nodes)) for _ in range(n_edges))
+    ]
+    order = list(range(n_nodes))
+    if shuffle:
+        random.Random(seed + 1).shuffle(order)
+        random.Random(seed + 2).shuffle(edges)
+    graph = GraphModel()
+    graph.add_nodes_bulk(
+        [ids[i] for i in order],
+        [f"Class{i}" for i in order],
+        ["class"] * n_nodes,
+        [f"/src/Module{i % 50}/Class{i}.php" if i % 7 else None for i in order],
+        [[f"m{i % 3}", "handle"] for i in order]
+    )
+    graph.add_edges_bulk(*zip(*edges))
+    return graph
+
+
+def test_round_trip_and_lazy_lookups(tmp_path):
+    graph = _synthetic_graph(500, 3000)
+    path = str(tmp_path / "g.sgraph")
+    # Tiny blocks so values straddle block boundaries
+    write_artifact(graph.csr, path, block_size=96)
+
+    with GraphArtifact(path) as artifact:
+        assert (artifact.num_nodes, artifact.num_edges) == (500, graph.get_edge_count())
+        assert artifact.to_json_dict() == graph.to_json_dict()
+
+        node = "App\\Module3\\Class53"
+        hood = artifact.neighbourhood(node)
+        assert hood["name"] == "Class53"
+        assert hood["methods"] == ["m2", "handle"]
+        assert {(e["target"], e["type"], e["weight"]) for e in hood["out"]} == {
+            (t, d["type"], d["weight"]) for t, d in graph.graph[node].items()
+        }
+        assert {e["source"] for e in hood["in"]} == set(graph.graph.predecessors(node))
+        assert artifact.attribute("App\\Module0\\Class0", "file_path") is None
+        assert artifact.attribute("App\\Module1\\Class1", "file_path") == "/src/Module1/Class1.php"
+        assert artifact.neighbourhood("Not\\There") is None
+
+
+def test_artifact_bytes_are_independent_of_ingest_order(tmp_path):
+    a, b = str(tmp_path / "a.sgraph"), str(tmp_path / "b.sgraph")
+    write_artifact(_synthetic_graph(300, 1200).csr, a)
+    write_artifact(_synthetic_graph(300, 1200, shuffle=True).csr, b)
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        assert fa.read() == fb.read()
+
+
+def test_rejects_foreign_and_future_files(tmp_path):
+    bogus = tmp_path / "bogus.sgraph"
+    bogus.write_bytes(b"{\"nodes\": []}" + b"\0" * 64)
+    with pytest.raises(ArtifactFormatError):
+        GraphArtifact(str(bogus))
+
+    path = str(tmp_path / "g.sgraph")
+    write_artifact(_synthetic_graph(10, 20).csr, path)
+    with open(path, "r+b") as f:
+        f.seek(8)
+        f.write((99).to_bytes(2, "little"))
+    with pytest.raises(ArtifactFormatError, match="version 99"):
+        GraphArtifact(path)
+
+
+
+def test_repository_artifacts_live_in_the_configured_data_dir(tmp_path, monkeypatch):
+    from infrastructure import settings
+    from infrastructure.persistence.repositories import AnalysisRunRepository
+    monkeypatch.setattr(settings, "DATA_DIR", str(tmp_path / "data"))
+    repo = AnalysisRunRepository(db=None)
+    graph = _synthetic_graph(50, 120)
+    assert repo.save_graph_artifact(7, graph.csr) == str(tmp_path / "data" / "graph_7.sgraph")
+    assert repo.serialize_graph(7, graph.to_json_dict()) == str(tmp_path / "data" / "graph_7.json")
+    assert repo.load_graph_artifact(7).to_json_dict() == graph.to_json_dict()
+    assert repo.load_graph_artifact(8) is None
+
+@pytest.mark.benchmark
+def test_artifact_vs_json_benchmark(tmp_path):
+    """Benchmark: write time, file size and single-node lookup, binary artifact vs indent=2 JSON."""
+    graph = _synthetic_graph(20_000, 100_000)
+    csr = graph.csr
+
+    start = time.perf_counter()
+    json_path = tmp_path / "g.json"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(graph.to_json_dict(), f, indent=2)
+    json_write = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bin_path = str(tmp_path / "g.sgraph")
+    write_artifact(csr, bin_path)
+    bin_write = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with open(json_path, encoding="utf-8") as f:
+        json.load(f)
+    json_read = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with GraphArtifact(bin_path) as artifact:
+        hood = artifact.neighbourhood("App\\Module7\\Class1007")
+    bin_lookup = time.perf_counter() - start
+
+    json_size = json_path.stat().st_size
+    bin_size = (tmp_path / "g.sgraph").stat().st_size
+    print(
+        f"\n[Artifact] JSON  : {json_size / 2**20:7.2f} MiB, write {json_write:.2f}s, full read {json_read:.2f}s"
+        f"\n[Artifact] binary: {bin_size / 2**20:7.2f} MiB, write {bin_write:.2f}s, open+neighbourhood {bin_lookup * 1000:.1f}ms"
+    )
+    assert hood is not None
+    assert bin_size * 5 < json_size
+
+
+if __name__ == "__main__":
+    import pathlib, tempfile
+    with tempfile.TemporaryDirectory() as d:
+        test_artifact_vs_json_benchmark(pathlib.Path(d))
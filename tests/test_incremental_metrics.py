@@ -0,0 +1,146 @@
+import random
+import time
+import networkx as nx
+import pytest
+from domain.services.metric_calculator import MetricCalculator, METRIC_PROFILES, INCOMPLETE
+from domain.services.incremental_metrics import (
+    IncrementalMetricEngine, GraphDelta, MODE_INCREMENTAL, MODE_FULL
+)
+
+
+def _graph(n, m, seed):
+    graph = nx.gnm_random_graph(n, m, seed=seed, directed=True)
+    graph = nx.relabel_nodes(graph, lambda i: f"C{i}")
+    for u, v in graph.edges():
+        graph[u][v].update(type="method_call", weight=1)
+    return graph
+
+
+def _layered_graph(n, m, seed, cycle_every=50):
+    """Mostly-forward dependency-like graph with small SCCs."""
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(f"C{i}" for i in range(n))
+    for _ in range(m):
+        u = rng.randrange(n - 1)
+        graph.add_edge(f"C{u}", f"C{rng.randrange(u + 1, min(n, u + 200))}", type="method_call", weight=1)
+    for u in range(cycle_every, n, cycle_every):
+        graph.add_edge(f"C{u}", f"C{u - rng.randrange(1, cycle_every)}", type="method_call", weight=1)
+    return graph
+
+
+def _random_delta(graph, rng, n_changes):
+    delta = GraphDelta()
+    nodes = list(graph.nodes())
+    edges = list(graph.edges())
+    for _ in range(n_changes):
+        kind = rng.random()
+        if kind < 0.4:
+            delta.removed_edges.add(rng.choice(edges))
+        elif kind < 0.8:
+            u, v = rng.sample(nodes, 2)
+            delta.added_edges[(u, v)] = {"type": "method_call", "weight": rng.randint(1, 3)}
+        elif kind < 0.9:
+            new = f"new_{len(delta.added_nodes)}"
+            delta.added_nodes[new] = {"type": "class"}
+            delta.added_edges[(new, rng.choice(nodes))] = {"type": "method_call", "weight": 1}
+            delta.added_edges[(rng.choice(nodes), new)] = {"type": "method_call", "weight": 1}
+        else:
+            delta.removed_nodes.add(rng.choice(nodes))
+    delta.added_edges = {
+        (u, v): d for (u, v), d in delta.added_edges.items()
+        if u not in delta.removed_nodes and v not in delta.removed_nodes
+    }
+    return delta
+
+
+def test_incremental_update_matches_full_recompute():
+    rng = random.Random(1)
+    engine = IncrementalMetricEngine(max_delta_fraction=1.0, verify=True)
+    for seed in range(8):
+        graph = _graph(150, 300 + 40 * seed, seed)
+        metrics = MetricCalculator(graph).calculate_all_metrics()
+        result = engine.apply(graph, metrics, _random_delta(graph, rng, 12))
+
+        assert result.mode == MODE_INCREMENTAL
+        assert result.verified
+        assert result.stale_metrics == ["betweenness", "closeness", "pagerank", "hits", "katz"]
+        for node, row in result.metrics.items():
+            if node in metrics:
+                assert row['betweenness'] == metrics[node]['betweenness']
+            else:
+                assert row['betweenness'] == INCOMPLETE
+
+
+def test_delta_between_graph_versions():
+    old = _graph(60, 150, 3)
+    new = old.copy()
+    new.remove_node("C5")
+    new.remove_edge(*next(iter(new.edges())))
+    new.add_edge("C1", "C2", type="method_call", weight=4)
+    new.add_edge("fresh", "C7", type="inherits", weight=1)
+
+    delta = GraphDelta.between(old, new)
+    assert delta.removed_nodes == {"C5"}
+    assert set(delta.added_nodes) == {"fresh"}
+    assert ("fresh", "C7") in delta.added_edges
+
+    result = IncrementalMetricEngine(max_delta_fraction=1.0, verify=True).apply(
+        old, MetricCalculator(old).calculate_all_metrics(), delta
+    )
+    assert nx.utils.graphs_equal(result.graph, new)
+
+
+def test_large_delta_falls_back_to_full_recompute():
+    graph = _graph(100, 200, 4)
+    metrics = MetricCalculator(graph).calculate(METRIC_PROFILES['quick'])
+    delta = _random_delta(graph, random.Random(2), 40)
+
+    result = IncrementalMetricEngine(max_delta_fraction=0.05).apply(graph, metrics, delta)
+    assert result.mode == MODE_FULL
+    assert result.stale_metrics == []
+    assert result.metrics == MetricCalculator(result.graph).calculate(METRIC_PROFILES['quick'])
+
+
+def test_verify_mode_reports_divergence():
+    graph = _graph(50, 120, 6)
+    metrics = MetricCalculator(graph).calculate(METRIC_PROFILES['quick'])
+    metrics['C0']['blast_radius'] += 1  # a corrupt baseline the delta does not touch
+    delta = GraphDelta(added_nodes={"x": {}})
+    with pytest.raises(RuntimeError, match="diverge"):
+        IncrementalMetricEngine(verify=True).apply(graph, metrics, delta)
+
+
+@pytest.mark.benchmark
+def test_incremental_benchmark_small_commit():
+    """Benchmark: a 30-edge commit on a 20k-node graph vs recomputing the quick profile.
+
+    The commit touches classes near the top of the dependency order
+    (controllers rather than shared models), which is where reachability
+    stays local: every ancestor of a changed edge's source is re-swept.
+    """
+    n_nodes, n_edges = 20_000, 80_000
+    graph = _layered_graph(n_nodes, n_edges, 7)
+    metrics = MetricCalculator(graph).calculate(METRIC_PROFILES['quick'])
+    rng = random.Random(3)
+    top = [(u, v) for u, v in graph.edges() if int(u[1:]) < n_nodes // 10]
+    delta = GraphDelta(removed_edges=set(rng.sample(top, 10)))
+    for _ in range(20):
+        u = rng.randrange(n_nodes // 10)
+        delta.added_edges[(f"C{u}", f"C{u + rng.randrange(1, 200)}")] = {"type": "method_call", "weight": 1}
+    engine = IncrementalMetricEngine()
+
+    start = time.perf_counter()
+    result = engine.apply(graph, metrics, delta, in_place=True)
+    incremental = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = MetricCalculator(result.graph).calculate(METRIC_PROFILES['quick'])
+    full = time.perf_counter() - start
+
+    assert result.mode == MODE_INCREMENTAL
+    assert result.metrics == expected
+    print(
+        f"\n[Incremental] {n_nodes} nodes, {n_edges} edges, {delta.size()} changes: "
+        f"incremental {incremental:.2f}s ({result.affected_nodes} nodes re-swept) | full {full:.2f}s"
+    )
@@ -0,0 +1,99 @@
+import random
+import time
+import networkx as nx
+import numpy as np
+import pytest
+from networkx.algorithms.link_analysis.pagerank_alg import _pagerank_python
+from networkx.algorithms.link_analysis.hits_alg import _hits_python
+from domain.algorithms.link_analysis import SparseAdjacency, pagerank, hits, katz, ConvergenceError
+from domain.services.metric_calculator import MetricCalculator, LinkAnalysisConfig, INCOMPLETE
+
+
+def _weighted_graph(n, m, seed):
+    graph = nx.gnm_random_graph(n, m, seed=seed, directed=True)
+    graph = nx.relabel_nodes(graph, lambda i: f"C{i}")
+    rng = random.Random(seed)
+    for u, v in graph.edges():
+        graph[u][v]['weight'] = rng.randint(1, 5)
+    return graph
+
+
+def test_scores_match_networkx_reference():
+    graph = _weighted_graph(300, 1200, 3)
+    graph.add_node("isolated")
+    calculator = MetricCalculator(graph, link_analysis=LinkAnalysisConfig(katz_alpha=0.01, tol=1e-9))
+    metrics = calculator.calculate(['pagerank', 'hub_score', 'authority_score', 'katz'])
+
+    expected_pr = _pagerank_python(graph, tol=1e-9)
+    expected_hubs, expected_auth = _hits_python(graph, tol=1e-10, max_iter=1000)
+    expected_katz = nx.katz_centrality(graph, alpha=0.01, tol=1e-9, weight='weight')
+    for node in graph:
+        assert abs(metrics[node]['pagerank'] - expected_pr[node]) < 1e-9
+        assert abs(metrics[node]['hub_score'] - expected_hubs[node]) < 1e-6
+        assert abs(metrics[node]['authority_score'] - expected_auth[node]) < 1e-6
+        assert abs(metrics[node]['katz'] - expected_katz[node]) < 1e-9
+
+
+def test_default_katz_alpha_converges_on_cyclic_weighted_graph():
+    graph = nx.complete_graph(20, create_using=nx.DiGraph)
+    for u, v in graph.edges():
+        graph[u][v]['weight'] = 10
+    metrics = MetricCalculator(graph).calculate(['katz'])
+    values = [metrics[n]['katz'] for n in graph]
+    assert np.allclose(values, 1 / np.sqrt(20))
+
+
+def test_seeded_output_is_deterministic():
+    graph = _weighted_graph(200, 300, 8)  # sparse: several components, repeated HITS eigenvalues
+    config = LinkAnalysisConfig(seed=5)
+    fields = ['pagerank', 'hub_score', 'authority_score', 'katz']
+    first = MetricCalculator(graph, link_analysis=config).calculate(fields)
+    second = MetricCalculator(graph, link_analysis=config).calculate(fields)
+    assert first == second
+    assert abs(sum(row['pagerank'] for row in first.values()) - 1) < 1e-9
+
+
+def test_non_convergence_marks_family_incomplete():
+    graph = _weighted_graph(100, 400, 1)
+    calculator = MetricCalculator(graph, link_analysis=LinkAnalysisConfig(max_iter=2, tol=1e-12))
+    metrics = calculator.calculate(['pagerank', 'in_degree'])
+    assert calculator.incomplete_metrics == ['pagerank']
+    assert all(row['pagerank'] == INCOMPLETE for row in metrics.values())
+
+    adj = SparseAdjacency([[1], [0]], [[1.0], [1.0]])
+    try:
+        katz(adj, alpha=2.0, max_iter=50)
+    except ConvergenceError as e:
+        assert e.algorithm == "katz"
+    else:
+        raise AssertionError("divergent Katz series should not converge")
+
+
+def test_edgeless_and_empty_graphs():
+    adj = SparseAdjacency([[], [], []])
+    assert np.allclose(pagerank(adj), 1 / 3)
+    hubs, authorities = hits(adj)
+    assert not hubs.any() and not authorities.any()
+    assert np.allclose(katz(adj), 1 / np.sqrt(3))
+    assert MetricCalculator(nx.DiGraph()).calculate(['pagerank', 'hub_score', 'katz']) == {}
+
+
+@pytest.mark.benchmark
+def test_link_analysis_scaling_benchmark():
+    """Benchmark: PageRank/HITS/Katz wall time grows linearly with graph size."""
+    timings = []
+    for n in (20_000, 80_000):
+        rng = np.random.default_rng(n)
+        sources = rng.integers(0, n, 5 * n)
+        targets = rng.integers(0, n, 5 * n)
+        succ = [[] for _ in range(n)]
+        for u, v in zip(sources.tolist(), targets.tolist()):
+            succ[u].append(v)
+        adj = SparseAdjacency(succ)
+        start = time.perf_counter()
+        pagerank(adj)
+        hits(adj)
+        katz(adj)
+        timings.append((n, time.perf_counter() - start))
+    summary = " | ".join(f"{n} nodes {t:.2f}s" for n, t in timings)
+    print(f"\n[LinkAnalysis] 5 edges/node: {summary}")
@@ -0,0 +1,21 @@
+import sys
+import pytest
+from infrastructure.memory_probe import StageMemoryProbe
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="VmHWM is Linux-only")
+def test_overlapping_runs_do_not_report_each_others_peaks():
+    first, second = StageMemoryProbe(), StageMemoryProbe()
+    with first.stage("parse"):
+        pass
+    assert first.peaks_kb["parse"] > 0
+
+    # Another run's stage starting mid-stage resets the shared high-water mark
+    with first.stage("metrics"):
+        with second.stage("scan"):
+            pass
+    assert first.peaks_kb["metrics"] is None and second.peaks_kb["scan"] is None
+
+    with second.stage("persist"):
+        pass
+    assert second.peaks_kb["persist"] > 0
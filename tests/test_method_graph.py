@@ -0,0 +1,168 @@
+import random
+import time
+import networkx as nx
+import numpy as np
+import pytest
+from domain.models.graph_model import GraphModel, BACKEND_CSR
+from domain.services.method_metrics import calculate_method_metrics, roll_up_metrics
+from infrastructure.parser_bridge import ParserBridge
+from infrastructure.persistence.graph_artifact import GraphArtifact, write_artifact
+
+SOURCE = """<?php
+namespace App;
+use Lib\\Log;
+
+abstract class Base {
+    public function save() { $this->validate(); Log::write(); }
+    abstract protected function validate();
+}
+
+trait Audits {
+    public function audit() {}
+}
+
+class User extends Base {
+    use Audits;
+    public function __construct() { parent::save(); }
+    protected function validate() { $this->audit(); self::check(); static::check(); }
+    public static function check() { $this->check(); }
+}
+
+class Controller {
+    public function store() { $user = new User(); $user->save(); User::check(); User::save(); }
+    public function show() { return "User::check()"; }
+}
+"""
+
+
+def _graph(tmp_path):
+    src = tmp_path / "App.php"
+    src.write_text(SOURCE)
+    nodes, edges = ParserBridge().parse_columnar([str(src)], root_path=str(tmp_path))
+    graph = GraphModel(backend=BACKEND_CSR)
+    graph.add_nodes_bulk(*nodes)
+    graph.add_edges_bulk(*edges)
+    return graph
+
+
+def test_calls_are_attributed_to_methods(tmp_path):
+    graph = _graph(tmp_path)
+    csr = graph.csr
+    # Traits are not class nodes, so the trait call stays unresolved
+    assert csr.calls_of(csr.index_of("App\\User")) == [
+        ("__construct", "App\\Base", "save"),
+        ("validate", "App\\User", "audit"),
+        ("validate", "App\\User", "check"),
+        ("validate", "App\\User", "check"),
+        ("check", "App\\User", "check"),
+    ]
+    assert csr.calls_of(csr.index_of("App\\Controller")) == [
+        ("store", "App\\User", "__construct"),
+        ("store", "App\\User", "check"),
+        ("store", "App\\User", "save"),
+    ]
+
+    methods = graph.method_graph()
+    assert methods is graph.method_graph()
+    adj = methods.adjacency()
+    edges = {
+        (methods.method_id(u), methods.method_id(v)): w
+        for u, v, w in zip(adj.sources.tolist(), adj.targets.tolist(), adj.weights.tolist())
+    }
+    assert edges == {
+        ("App\\Base::save", "App\\Base::validate"): 1.0,  # the abstract declaration
+        ("App\\User::__construct", "App\\Base::save"): 1.0,
+        ("App\\User::validate", "App\\User::check"): 2.0,
+        ("App\\Controller::store", "App\\User::__construct"): 1.0,
+        ("App\\Controller::store", "App\\User::check"): 1.0,
+        ("App\\Controller::store", "App\\Base::save"): 1.0,  # inherited
+    }
+    # Log::write (external) and $this->audit (trait, no node); the recursive call is dropped
+    assert methods.unresolved_calls == 2
+
+
+def test_roll_up_matches_hand_computed_aggregates(tmp_path):
+    methods = _graph(tmp_path).method_graph()
+    metrics = calculate_method_metrics(methods)
+    rolled = roll_up_metrics(methods, metrics)
+    csr = methods.csr
+
+    for i in range(csr.num_nodes):
+        slots = list(methods.methods_of(i))
+        assert rolled['method_count'][i] == len(slots)
+        assert rolled['method_weighted_in'][i] == sum(metrics['weighted_in'][s] for s in slots)
+        assert rolled['max_method_blast_radius'][i] == max((metrics['blast_radius'][s] for s in slots), default=0)
+    assert rolled['method_pagerank'].sum() == pytest.approx(1.0)
+
+    g = methods.to_networkx()
+    assert g is methods.to_networkx()
+    for slot in range(methods.num_methods):
+        node = methods.method_id(slot)
+        assert metrics['blast_radius'][slot] == len(nx.descendants(g, node))
+        assert metrics['weighted_in'][slot] == g.in_degree(node, weight='weight')
+
+    # Method calls rolled up to class pairs
+    sources, targets, weights = methods.roll_up_edges()
+    assert {(csr.id_of(u), csr.id_of(v)): w for u, v, w in zip(sources, targets, weights)} == {
+        ("App\\User", "App\\Base"): 1.0,
+        ("App\\Controller", "App\\User"): 2.0,
+        ("App\\Controller", "App\\Base"): 1.0,
+    }
+    with pytest.raises(ValueError):
+        methods.roll_up(np.zeros(methods.num_methods + 1))
+
+
+def test_calls_survive_artifact_and_networkx_round_trips(tmp_path):
+    graph = _graph(tmp_path)
+    path = write_artifact(graph.csr, str(tmp_path / "g.sgraph"))
+    with GraphArtifact(path) as artifact:
+        assert artifact.attribute("App\\Controller", "calls") == graph.csr.calls_of(graph.csr.index_of("App\\Controller"))
+        loaded = artifact.to_csr()
+    assert loaded.to_json_dict() == graph.to_json_dict()
+
+    nx_graph = GraphModel()
+    src = tmp_path / "App.php"
+    nx_graph.add_nodes_bulk(*ParserBridge().parse_columnar([str(src)], root_path=str(tmp_path))[0])
+    assert nx_graph.to_json_dict()["nodes"] == graph.to_json_dict()["nodes"]
+
+
+def _many_methods_graph(n_classes, per_class, seed=7):
+    rng = random.Random(seed)
+    ids = [f"App\\C{i}" for i in range(n_classes)]
+    graph = GraphModel(backend=BACKEND_CSR)
+    graph.add_nodes_bulk(
+        ids, [f"C{i}" for i in range(n_classes)], ["class"] * n_classes, None,
+        [[f"m{k}" for k in range(per_class)]] * n_classes,
+        [
+            [(f"m{rng.randrange(per_class)}", ids[rng.randrange(n_classes)], f"m{rng.randrange(per_class)}")
+             for _ in range(4 * per_class)]
+            for _ in range(n_classes)
+        ]
+    )
+    return graph
+
+
+def test_bulk_method_graph_stays_columnar():
+    methods = _many_methods_graph(50, 5).method_graph()
+    rolled = roll_up_metrics(methods, calculate_method_metrics(methods))
+    assert methods.num_methods == 250
+    assert methods._nx is None  # no method-level NetworkX graph unless asked for
+    assert rolled['method_count'].sum() == methods.num_methods
+
+
+@pytest.mark.benchmark
+def test_method_level_scales_to_many_methods():
+    """Benchmark: 10k classes x 20 methods (200k method nodes), 4 calls per method."""
+    n_classes, per_class = 10_000, 20
+    graph = _many_methods_graph(n_classes, per_class)
+    start = time.perf_counter()
+    methods = graph.method_graph()
+    metrics = calculate_method_metrics(methods)
+    rolled = roll_up_metrics(methods, metrics)
+    elapsed = time.perf_counter() - start
+
+    assert methods.num_methods == n_classes * per_class
+    assert methods._nx is None  # no method-level NetworkX graph unless asked for
+    assert rolled['method_count'].sum() == methods.num_methods
+    print(f"\n[Method level] {methods.num_methods} methods, {len(methods.adjacency().sources)} call edges: "
+          f"metrics + roll-up {elapsed:.2f}s")
@@ -0,0 +1,103 @@
+import os
+import random
+import networkx as nx
+from domain.services.graph_fingerprint import graph_fingerprint, metric_cache_key
+from domain.services.metric_calculator import (
+    MetricCalculator, BetweennessConfig, LinkAnalysisConfig, METRIC_PROFILES
+)
+from infrastructure.metric_cache import MetricCache, CachedMetrics
+
+
+def _graph(n, m, seed, order_seed=None):
+    rng = random.Random(seed)
+    nodes = [f"C{i}" for i in range(n)]
+    edges = {}
+    while len(edges) < m:
+        u, v = rng.sample(nodes, 2)
+        edges[(u, v)] = {"type": rng.choice(["method_call", "inherits"]), "weight": rng.randint(1, 3)}
+    if order_seed is not None:
+        shuffle = random.Random(order_seed)
+        nodes = shuffle.sample(nodes, n)
+        edges = dict(shuffle.sample(list(edges.items()), m))
+    graph = nx.DiGraph()
+    graph.add_nodes_from((node, {"type": "class"}) for node in nodes)
+    graph.add_edges_from((u, v, data) for (u, v), data in edges.items())
+    return graph
+
+
+def test_fingerprint_is_order_independent_and_content_sensitive():
+    base = _graph(200, 600, 1)
+    shuffled = _graph(200, 600, 1, order_seed=7)
+    assert list(base.nodes()) != list(shuffled.nodes())
+    assert graph_fingerprint(base) == graph_fingerprint(shuffled)
+
+    reweighted = base.copy()
+    u, v = next(iter(reweighted.edges()))
+    reweighted[u][v]["weight"] += 1
+    retyped = base.copy()
+    retyped.nodes["C0"]["type"] = "interface"
+    isolated = base.copy()
+    isolated.add_node("C_new", type="class")
+    digests = {graph_fingerprint(g) for g in (base, reweighted, retyped, isolated)}
+    assert len(digests) == 4
+
+
+def test_cache_key_covers_metric_settings():
+    fingerprint = graph_fingerprint(_graph(20, 40, 2))
+    full = METRIC_PROFILES["full"]
+    key = metric_cache_key(fingerprint, full, betweenness=BetweennessConfig(), link_analysis=LinkAnalysisConfig())
+    assert key == metric_cache_key(
+        fingerprint, reversed(full), betweenness=BetweennessConfig(), link_analysis=LinkAnalysisConfig()
+    )
+    assert key != metric_cache_key(
+        fingerprint, METRIC_PROFILES["quick"], betweenness=BetweennessConfig(), link_analysis=LinkAnalysisConfig()
+    )
+    assert key != metric_cache_key(
+        fingerprint, full, betweenness=BetweennessConfig(seed=1), link_analysis=LinkAnalysisConfig()
+    )
+
+
+def test_cached_matrix_round_trips(tmp_path):
+    graph = _graph(100, 300, 3)
+    metrics = MetricCalculator(graph).calculate_all_metrics()
+    cache = MetricCache(str(tmp_path))
+    key = metric_cache_key(graph_fingerprint(graph), METRIC_PROFILES["full"])
+    assert cache.get(key) is None
+
+    cache.put(key, CachedMetrics(7, metrics, "full", {"mode": "exact", "samples": 100, "seed": None}))
+    entry = cache.get(key)
+    assert entry.run_id == 7 and entry.metric_profile == "full"
+    assert entry.metrics == metrics
+    assert entry.betweenness_info["mode"] == "exact"
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = MetricCache(str(tmp_path), max_bytes=10**9)
+    payload = {f"C{i}": {"in_degree": random.Random(i).random()} for i in range(2000)}
+    for i, key in enumerate(("a", "b", "c")):
+        path = cache.put(key, CachedMetrics(i, payload, "quick"))
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+    entry_size = cache.size_bytes() // 3
+
+    assert cache.get("a") is not None  # "a" becomes the most recently used
+    cache.max_bytes = 3 * entry_size + entry_size // 2
+    cache.put("d", CachedMetrics(3, payload, "quick"))
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+    assert cache.size_bytes() <= cache.max_bytes
+
+
+def test_default_directory_follows_data_dir_and_bad_entries_are_logged(tmp_path, monkeypatch, caplog):
+    from infrastructure import settings
+    monkeypatch.setattr(settings, "DATA_DIR", str(tmp_path))
+    cache = MetricCache()
+    assert cache.directory == str(tmp_path / "metric_cache")
+    path = cache.put("k", CachedMetrics(1, {"A": {"in_degree": 1}}, "quick"))
+    assert path.startswith(str(tmp_path / "metric_cache"))
+
+    with open(path, "wb") as f:
+        f.write(b"not gzip")
+    with caplog.at_level("WARNING"):
+        assert cache.get("k") is None
+    assert "unreadable" in caplog.text
@@ -1,6 +1,7 @@
 import pytest
 import networkx as nx
-from domain.services.metric_calculator import MetricCalculator
+from unittest.mock import patch
+from domain.services.metric_calculator import MetricCalculator, METRIC_PROFILES
 
 def test_metric_calculator_basic_star_topology():
     graph = nx.DiGraph()
@@ -42,3 +43,32 @@ def test_metric_calculator_basic_star_topology():
     # Ensure Betweenness is calculated and deterministic [0,1]
     assert 0 <= metrics['A']['betweenness'] <= 1.0
     assert 0 <= metrics['B']['betweenness'] <= 1.0
+
+
+def test_plan_includes_dependencies_in_order():
+    calculator = MetricCalculator(nx.DiGraph([('A', 'B')]))
+    assert calculator.plan(['blast_radius']) == ['scc', 'reachability']
+    assert calculator.plan(['scc_density', 'in_degree']) == ['degree', 'scc']
+    assert calculator.plan(METRIC_PROFILES['quick']) == ['degree', 'scc', 'reachability']
+    with pytest.raises(ValueError):
+        calculator.plan(['eigenvector'])
+
+
+def test_selected_metrics_are_computed_lazily_and_memoized():
+    graph = nx.gnm_random_graph(120, 400, seed=5, directed=True)
+    full = MetricCalculator(graph).calculate_all_metrics()
+
+    calculator = MetricCalculator(graph)
+    quick = calculator.calculate(METRIC_PROFILES['quick'])
+    for node in graph:
+        assert set(quick[node]) == set(METRIC_PROFILES['quick'])
+        assert quick[node] == {k: full[node][k] for k in quick[node]}
+
+    # SCCs are memoized; a later request only runs the new family
+    assert calculator.plan(['scc_size', 'closeness']) == ['closeness']
+    with patch.object(MetricCalculator, '_FAMILY_COMPUTE', {
+        **MetricCalculator._FAMILY_COMPUTE,
+        'scc': lambda *a: pytest.fail("SCCs recomputed"),
+    }):
+        again = calculator.calculate(['scc_size', 'closeness'])
+    assert all(again[n]['closeness'] == full[n]['closeness'] for n in graph)
@@ -0,0 +1,136 @@
+import random
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from api.main import app
+from infrastructure.persistence.database import get_db
+from infrastructure.persistence.models import Base
+from infrastructure.persistence.repositories import AnalysisRunRepository, decode_cursor
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    repo = AnalysisRunRepository(session)
+    rng = random.Random(5)
+    for _ in range(2):
+        run_id = repo.create(project_id=1).id
+        matrix = {
+            f"App\\{'Http' if i % 3 else 'Models'}\\C{i:04d}": {
+                "blast_radius": rng.randrange(20),  # many ties
+                "betweenness": rng.random() if i % 10 else None,  # not computed for some
+                "in_degree": i % 7,
+            }
+            for i in range(600)
+        }
+        types = {name: "method" if i % 4 == 0 else "class" for i, name in enumerate(matrix)}
+        repo.save_component_metrics(run_id, matrix, types)
+    yield session
+    session.close()
+
+
+def _all_pages(repo, run_id, limit, **kwargs):
+    rows, key = repo.page_component_metrics(run_id, ["blast_radius", "betweenness"], limit=limit, **kwargs)
+    pages = [rows]
+    while key is not None:
+        rows, key = repo.page_component_metrics(
+            run_id, ["blast_radius", "betweenness"], limit=limit, after=key, **kwargs
+        )
+        pages.append(rows)
+    return pages
+
+
+def test_keyset_pages_match_full_sort(db):
+    repo = AnalysisRunRepository(db)
+    everything = repo.load_component_metrics(2, ["blast_radius", "betweenness", "component_type"])
+    names = sorted(everything)
+    inserted = lambda name: int(name[-4:])  # row ids follow insertion order, C0000 first
+
+    pages = _all_pages(repo, 2, 70, sort_by="blast_radius", descending=True)
+    assert all(len(p) == 70 for p in pages[:-1])
+    got = [row["component_name"] for page in pages for row in page]
+    assert got == sorted(names, key=lambda n: (-everything[n]["blast_radius"], -inserted(n)))
+
+    got = [row["component_name"] for page in _all_pages(repo, 2, 50, sort_by="betweenness") for row in page]
+    with_value = [n for n in names if everything[n]["betweenness"] is not None]
+    assert got == sorted(with_value, key=lambda n: (everything[n]["betweenness"], inserted(n)))
+
+    got = [
+        row["component_name"]
+        for page in _all_pages(repo, 2, 40, component_type="class", name_prefix="App\\Models\\")
+        for row in page
+    ]
+    assert got == [
+        n for n in names if n.startswith("App\\Models\\") and everything[n]["component_type"] == "class"
+    ]
+
+    with pytest.raises(ValueError):
+        repo.page_component_metrics(2, ["in_degree"], sort_by="created_at")
+    with pytest.raises(ValueError):
+        repo.page_component_metrics(2, ["nope"])
+
+
+def test_name_prefix_at_the_end_of_the_code_point_range(db):
+    repo = AnalysisRunRepository(db)
+    top, below_surrogates = chr(0x10FFFF), chr(0xD7FF)
+    names = ["App\\" + top, "App\\" + top + "x", "App" + top, top + top, below_surrogates + "a", "\ue000"]
+    run_id = repo.create(project_id=1).id
+    repo.save_component_metrics(run_id, {n: {"in_degree": 1} for n in names}, {n: "class" for n in names})
+
+    def matching(prefix):
+        rows, _ = repo.page_component_metrics(run_id, ["in_degree"], name_prefix=prefix)
+        return [row["component_name"] for row in rows]
+    assert matching("App\\" + top) == ["App\\" + top, "App\\" + top + "x"]
+    assert matching(top) == [top + top]
+    assert matching(top + top) == [top + top]
+    assert matching(below_surrogates) == [below_surrogates + "a"]
+
+
+def test_pages_use_composite_indexes(db):
+    plan = " ".join(row[-1] for row in db.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM component_metrics WHERE run_id = 2 AND blast_radius IS NOT NULL "
+        "AND (blast_radius, id) < (5, 900) ORDER BY blast_radius DESC, id DESC LIMIT 51"
+    )))
+    assert "ix_component_metrics_run_blast_radius" in plan and "TEMP B-TREE" not in plan
+
+    plan = " ".join(row[-1] for row in db.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM component_metrics WHERE run_id = 2 "
+        "AND component_name >= 'App\\Http\\' AND component_name < 'App\\Http]' ORDER BY component_name, id"
+    )))
+    assert "ix_component_metrics_run_name" in plan and "TEMP B-TREE" not in plan
+
+
+def test_metrics_endpoint_pages_and_projects_fields(db):
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        client = TestClient(app)
+        params = {"sort_by": "blast_radius", "order": "desc", "limit": 250, "fields": "blast_radius,type"}
+        first = client.get("/metrics/1", params=params).json()
+        assert [set(c) for c in first["components"]] == [{"name", "type", "blast_radius"}] * 250
+        values = [c["blast_radius"] for c in first["components"]]
+        assert values == sorted(values, reverse=True)
+
+        seen = [c["name"] for c in first["components"]]
+        cursor = first["next_cursor"]
+        while cursor:
+            page = client.get("/metrics/1", params={**params, "cursor": cursor}).json()
+            seen += [c["name"] for c in page["components"]]
+            cursor = page["next_cursor"]
+        assert len(seen) == len(set(seen)) == 600
+        assert decode_cursor(first["next_cursor"])[0] == values[-1]
+
+        default = client.get("/metrics/1", params={"type": "method", "name_prefix": "App\\Models\\"}).json()
+        assert default["components"] and all(c["type"] == "method" for c in default["components"])
+        assert "katz" in default["components"][0]
+
+        assert client.get("/metrics/1", params={"sort_by": "type"}).status_code == 400
+        assert client.get("/metrics/1", params={"fields": "name,secret"}).status_code == 400
+        assert client.get("/metrics/1", params={"cursor": "not-a-cursor"}).status_code == 400
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,52 @@
+import os
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from infrastructure.persistence.models import Base
+from infrastructure.persistence.repositories import ProjectRepository, ParseCacheRepository
+from infrastructure.parser_bridge import ParserBridge
+from infrastructure.file_scanner import FileScanner
+from infrastructure.parse_cache import IncrementalParser
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _write(path, body):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(body)
+
+
+def test_incremental_parse_only_reparses_changed_files(db, tmp_path):
+    root = str(tmp_path)
+    _write(os.path.join(root, "A.php"), "<?php\nclass A { function f() { new B(); } }\n")
+    _write(os.path.join(root, "B.php"), "<?php\nclass B {}\n")
+    project = ProjectRepository(db).get_or_create("cache_test")
+    cached = IncrementalParser(ParserBridge(), ParseCacheRepository(db))
+
+    files = FileScanner.scan(root)
+    first = cached.parse_files(project.id, files, root_path=root)
+    assert (cached.hits, cached.misses) == (0, 2)
+
+    second = cached.parse_files(project.id, files, root_path=root)
+    assert (cached.hits, cached.misses) == (2, 0)
+    assert [n.id for n in second[0]] == [n.id for n in first[0]]
+    assert [e.model_dump() for e in second[1]] == [e.model_dump() for e in first[1]]
+
+    # Change one file, add one, delete one
+    _write(os.path.join(root, "A.php"), "<?php\nclass A { function f() { new C(); } }\n")
+    _write(os.path.join(root, "C.php"), "<?php\nclass C {}\n")
+    os.remove(os.path.join(root, "B.php"))
+
+    files = FileScanner.scan(root)
+    nodes, edges = cached.parse_files(project.id, files, root_path=root)
+    assert (cached.hits, cached.misses) == (0, 2)
+    assert sorted(n.id for n in nodes) == ["A", "C"]
+    assert [(e.source_id, e.target_id) for e in edges] == [("A", "C")]
+    assert set(ParseCacheRepository(db).load(project.id)) == set(files)
@@ -0,0 +1,74 @@
+import os
+from infrastructure.parser_bridge import ParserBridge
+from infrastructure.file_scanner import FileScanner
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+PROJECT_2 = os.path.join(DATA_DIR, "test_project_2")
+
+
+def _dump(nodes, edges):
+    return (
+        [n.model_dump_json() for n in nodes],
+        [e.model_dump_json() for e in edges],
+    )
+
+
+def test_parse_files_extracts_classes_and_instantiations():
+    files = FileScanner.scan(PROJECT_2)
+    nodes, edges = ParserBridge().parse_files(files, root_path=PROJECT_2)
+
+    assert sorted(n.id for n in nodes) == ["Database", "Helper", "UserController", "UserView"]
+    pairs = {(e.source_id, e.target_id) for e in edges}
+    assert ("UserController", "Database") in pairs
+    assert ("UserController", "UserView") in pairs
+
+
+def test_parallel_parse_matches_serial_output():
+    """Multi-process parsing must be byte-identical to the serial path."""
+    files = FileScanner.scan(DATA_DIR)
+    parser = ParserBridge()
+
+    serial = parser.parse_files(files, root_path=DATA_DIR, workers=1)
+    parallel = parser.parse_files(files, root_path=DATA_DIR, workers=3)
+
+    assert _dump(*serial) == _dump(*parallel)
+
+
+def test_import_aliases_resolve_to_fully_qualified_ids(tmp_path):
+    src = tmp_path / "Controller.php"
+    src.write_text(
+        "<?php\nnamespace App\\Http;\nuse App\\Models\\User as Account;\n"
+        "class Controller { function f() { new Account(); \\Lib\\Log::write(); } }\n"
+    )
+    nodes, edges = ParserBridge().parse_files([str(src)], root_path=str(tmp_path))
+
+    assert [n.id for n in nodes] == ["App\\Http\\Controller"]
+    assert [(e.target_id, e.edge_type.value) for e in edges] == [
+        ("App\\Models\\User", "instantiation"),
+        ("Lib\\Log", "method_call"),
+    ]
+
+
+def test_iter_parse_streams_same_results_as_parse_files():
+    files = FileScanner.scan(DATA_DIR)
+    parser = ParserBridge()
+    expected = parser.parse_each(files, DATA_DIR, workers=1)
+
+    for workers in (1, 2):
+        streamed = list(parser.iter_parse(files, root_path=DATA_DIR, workers=workers))
+        assert [p for p, _, _ in streamed] == files
+        assert [_dump(n, e) for _, n, e in streamed] == [_dump(n, e) for _, n, e in expected]
+
+
+def test_parse_columnar_matches_object_output():
+    files = FileScanner.scan(DATA_DIR)
+    parser = ParserBridge()
+    nodes, edges = parser.parse_files(files, root_path=DATA_DIR)
+
+    for workers in (1, 2):
+        node_batch, edge_batch = parser.parse_columnar(files, root_path=DATA_DIR, workers=workers)
+        assert list(node_batch.ids) == [n.id for n in nodes]
+        assert list(node_batch.methods) == [n.methods for n in nodes]
+        assert list(zip(*edge_batch)) == [
+            (e.source_id, e.target_id, e.edge_type.value) for e in edges
+        ]
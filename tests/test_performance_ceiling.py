@@ -1,7 +1,10 @@
 import time
 import pytest
 import networkx as nx
-from domain.services.metric_calculator import MetricCalculator, MAX_NODES_FOR_BETWEENNESS
+import threading
+from domain.services.metric_calculator import (
+    MetricCalculator, BetweennessConfig, MAX_NODES_FOR_BETWEENNESS, CANCEL_GRACE_SECONDS, INCOMPLETE
+)
 
 def test_performance_ceiling_200_nodes():
     """Phase E: Prove that MetricCalculator completes within 5 seconds
@@ -49,16 +52,87 @@ def test_timeout_guard_triggers():
             calculator.calculate_all_metrics(timeout=1)
 
 
-def test_betweenness_skipped_for_large_graph():
-    """Graph exceeding MAX_NODES_FOR_BETWEENNESS should get -1.0 betweenness."""
-    # Build a graph with MAX + 1 nodes but minimal edges
+def test_betweenness_sampled_for_large_graph():
+    """Graph exceeding MAX_NODES_FOR_BETWEENNESS gets seeded, sampled betweenness."""
     n = MAX_NODES_FOR_BETWEENNESS + 1
     G = nx.path_graph(n, create_using=nx.DiGraph())
-    calculator = MetricCalculator(G)
+    calculator = MetricCalculator(G, betweenness=BetweennessConfig(samples=200, seed=7))
     results = calculator._compute()
 
-    # All betweenness values should be -1.0 (skipped)
+    assert calculator.betweenness_info == {"mode": "approximate", "samples": 200, "seed": 7}
+    assert all(m['betweenness'] >= 0.0 for m in results.values())
+    assert any(m['betweenness'] > 0.0 for m in results.values())
+
+    # Same seed, same values
+    again = MetricCalculator(G, betweenness=BetweennessConfig(samples=200, seed=7))._compute()
+    assert [m['betweenness'] for m in again.values()] == [m['betweenness'] for m in results.values()]
+
+
+def test_betweenness_skip_mode_keeps_sentinel():
+    n = MAX_NODES_FOR_BETWEENNESS + 1
+    G = nx.path_graph(n, create_using=nx.DiGraph())
+    calculator = MetricCalculator(G, betweenness=BetweennessConfig(mode="skip"))
+    results = calculator._compute()
+
+    assert calculator.betweenness_info["mode"] == "skip"
     for node_id, metrics in results.items():
         assert metrics['betweenness'] == -1.0, (
-            f"Expected -1.0 betweenness for oversized graph, got {metrics['betweenness']}"
+            f"Expected -1.0 betweenness in skip mode, got {metrics['betweenness']}"
         )
+
+
+def test_approximate_betweenness_within_error_bound():
+    G = nx.gnm_random_graph(400, 2000, seed=11, directed=True)
+    exact = nx.betweenness_centrality(G, normalized=True)
+    config = BetweennessConfig(mode="approximate", epsilon=0.05, seed=3)
+    k = config.sample_size(400)
+    assert k == 400  # the bound asks for more pivots than nodes: exact
+
+    config = BetweennessConfig(mode="approximate", samples=150, seed=3)
+    calculator = MetricCalculator(G, betweenness=config)
+    results = calculator._compute()
+    assert calculator.betweenness_info["samples"] == 150
+    assert max(abs(results[v]['betweenness'] - exact[v]) for v in G) < 0.05
+
+
+def test_spent_family_budget_keeps_other_metrics():
+    G = nx.gnm_random_graph(300, 1200, seed=2, directed=True)
+    full = MetricCalculator(G).calculate_all_metrics()
+
+    calculator = MetricCalculator(G)
+    partial = calculator.calculate_all_metrics(budgets={"betweenness": 0})
+    assert calculator.incomplete_metrics == ["betweenness"]
+    for node in G:
+        assert partial[node]['betweenness'] == INCOMPLETE
+        assert {k: v for k, v in partial[node].items() if k != 'betweenness'} == \
+            {k: v for k, v in full[node].items() if k != 'betweenness'}
+
+    # Reachability needs the SCCs, so it is incomplete with them
+    calculator = MetricCalculator(G)
+    partial = calculator.calculate_all_metrics(budgets={"scc": 0})
+    assert calculator.incomplete_metrics == ["scc", "reachability"]
+    assert all(partial[node]['blast_radius'] == INCOMPLETE for node in G)
+    assert all(partial[node]['closeness'] == full[node]['closeness'] for node in G)
+
+
+def test_timeout_stops_computation_and_returns_partial_results():
+    G = nx.gnm_random_graph(3000, 15000, seed=8, directed=True)
+    calculator = MetricCalculator(G, betweenness=BetweennessConfig(mode="exact"))
+    threads_before = threading.active_count()
+
+    start = time.monotonic()
+    results = calculator.calculate_all_metrics(timeout=1)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 1 + CANCEL_GRACE_SECONDS
+    assert "betweenness" in calculator.incomplete_metrics
+    assert all(m['betweenness'] == INCOMPLETE for m in results.values())
+    assert all(m['in_degree'] >= 0 for m in results.values())
+    # No computation thread left running
+    time.sleep(0.2)
+    assert threading.active_count() == threads_before
+
+
+def test_unknown_budget_family_rejected():
+    with pytest.raises(ValueError):
+        MetricCalculator(nx.DiGraph()).calculate_all_metrics(budgets={"eigenvector": 1})
@@ -0,0 +1,129 @@
+import re
+import time
+import pytest
+from infrastructure.php_scanner import scan_php
+
+# ── Legacy multi-pass extraction, kept only as the benchmark baseline ─────
+_LEGACY_PATTERNS = [
+    re.compile(r'^\s*namespace\s+([\w\\]+)\s*;', re.MULTILINE),
+    re.compile(r'\binterface\s+([A-Za-z0-9_]+)'),
+    re.compile(r'\btrait\s+([A-Za-z0-9_]+)'),
+    re.compile(r'^\s*use\s+([\w,\s\\]+?);', re.MULTILINE),
+    re.compile(r'\bfunction\s+([A-Za-z0-9_]+)'),
+]
+_LEGACY_CLASS = re.compile(
+    r'\bclass\s+([A-Za-z0-9_]+)'
+    r'(?:\s+extends\s+([A-Za-z0-9_\\]+))?'
+    r'(?:\s+implements\s+([\w,\s\\]+?))?'
+    r'\s*\{'
+)
+_LEGACY_NEW = re.compile(r'\bnew\s+([\w\\]+)\s*\(')
+_LEGACY_STATIC = re.compile(r'\b([\w\\]+)::[\w]+\s*\(')
+
+
+def _legacy_scan(content):
+    for pattern in _LEGACY_PATTERNS:
+        pattern.findall(content)
+    refs = 0
+    for _ in _LEGACY_CLASS.finditer(content):
+        # Re-scans the whole file once per class
+        refs += len(_LEGACY_NEW.findall(content))
+        refs += len(_LEGACY_STATIC.findall(content))
+    return refs
+
+
+def _synthetic_php(n_classes, calls_per_method=4, methods_per_class=5):
+    out = ["<?php\nnamespace App\\Bench;\n\nuse App\\Models\\User;\n"]
+    for c in range(n_classes):
+        out.append(f"/** Docblock for Service{c} with new Fake() inside */\n")
+        out.append(f"class Service{c} extends Base implements Contract{c % 7}\n{{\n")
+        out.append("    use Loggable;\n")
+        for m in range(methods_per_class):
+            out.append(f"    public function method{m}($arg)\n    {{\n")
+            for k in range(calls_per_method):
+                out.append(f"        $x{k} = new Dep{(c + k) % 50}($arg, 'str {{ not a brace');\n")
+                out.append(f"        Util{k}::helper($x{k}); // call Util{k}::other()\n")
+            out.append("        return $this->value;\n    }\n")
+        out.append("}\n\n")
+    return "".join(out)
+
+
+def _throughput(fn, content, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(content)
+        best = min(best, time.perf_counter() - start)
+    return len(content.encode("utf-8")) / (1024 * 1024) / best
+
+
+def test_references_are_attributed_to_enclosing_class():
+    src = r'''<?php
+namespace App;
+use Lib\Mailer as Mail;
+
+class First extends Base
+{
+    use Audits;
+    public function run() { $a = new Alpha(); Mail::send(); }
+}
+
+class Second
+{
+    // new Commented();
+    private $s = "new InString()";
+    public function go() { return new \Vendor\Beta; }
+}
+'''
+    first, second = scan_php(src)
+
+    assert (first.name, first.extends, first.traits) == ("First", ["Base"], ["Audits"])
+    assert first.methods == ["run"]
+    assert first.instantiations == ["Alpha"]
+    assert first.static_calls == ["Mail"]
+    assert first.imports == {"mail": "Lib\\Mailer"}
+
+    # Second must not inherit First's edges, nor see comments/strings
+    assert second.methods == ["go"]
+    assert second.instantiations == ["\\Vendor\\Beta"]
+    assert second.static_calls == []
+
+
+def test_closures_and_anonymous_classes_stay_with_outer_class():
+    src = '''<?php
+class Outer {
+    public function f() {
+        $cb = function () use ($x) { return new FromClosure(); };
+        $o = new class() extends Anon { public function inner() { new FromAnon(); } };
+        $k = Other::class;
+    }
+}
+'''
+    (outer,) = scan_php(src)
+    assert outer.methods == ["f"]
+    assert outer.traits == []
+    assert outer.instantiations == ["FromClosure", "FromAnon"]
+    assert outer.static_calls == []
+
+
+def test_each_class_keeps_its_own_references_in_a_large_file():
+    decls = scan_php(_synthetic_php(50))
+    assert len(decls) == 50
+    assert all(len(d.instantiations) == 20 for d in decls)
+
+
+@pytest.mark.benchmark
+def test_scanner_throughput_benchmark():
+    """Microbenchmark: single-pass scanner vs legacy per-class regex passes (MB/s)."""
+    for n_classes in (1, 10, 50):
+        content = _synthetic_php(n_classes)
+        new_mbs = _throughput(scan_php, content)
+        old_mbs = _throughput(_legacy_scan, content)
+        print(
+            f"\n[Scanner] {n_classes:>4} classes, {len(content) / 1024:8.1f} KiB: "
+            f"single-pass {new_mbs:8.2f} MB/s | legacy {old_mbs:8.2f} MB/s"
+        )
+
+
+if __name__ == "__main__":
+    test_scanner_throughput_benchmark()
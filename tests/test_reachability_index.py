@@ -0,0 +1,102 @@
+import os
+import random
+import time
+import networkx as nx
+import pytest
+from domain.algorithms.reachability_index import ReachabilityIndex
+from domain.services.dependency_queries import DependencyQueries, DIRECTION_DEPENDENCIES
+from infrastructure.persistence.graph_artifact import ArtifactFormatError
+from infrastructure.persistence.reachability_artifact import write_reachability_index, read_reachability_index
+
+
+def _graph(n, p, seed):
+    graph = nx.gnp_random_graph(n, p, directed=True, seed=seed)
+    return nx.relabel_nodes(graph, lambda i: f"C{i:03d}")
+
+
+def test_index_matches_transitive_closure():
+    rng = random.Random(0)
+    for seed in range(30):
+        n = rng.randint(1, 80)
+        graph = nx.gnp_random_graph(n, rng.choice([0.02, 0.05, 0.1]), directed=True, seed=seed)
+        index = ReachabilityIndex.build([list(graph.succ[i]) for i in range(n)])
+        for u in range(n):
+            closure = nx.descendants(graph, u) | {u}
+            assert [index.reaches(u, v) for v in range(n)] == [v in closure for v in range(n)]
+
+
+def test_paths_and_hops_match_networkx():
+    graph = _graph(120, 0.03, 1)
+    queries = DependencyQueries(graph)
+    nodes = sorted(graph)
+    for source in nodes[:30]:
+        lengths = nx.single_source_shortest_path_length(graph, source)
+        for target in nodes:
+            path = queries.shortest_path(source, target)
+            assert queries.depends_on(source, target) == (target in lengths)
+            if target not in lengths:
+                assert path is None
+                continue
+            assert path[0] == source and path[-1] == target and len(path) - 1 == lengths[target]
+            assert all(graph.has_edge(u, v) for u, v in zip(path, path[1:]))
+
+        for hops in (1, 2, 3):
+            upstream = nx.single_source_shortest_path_length(graph.reverse(copy=False), source, cutoff=hops)
+            expected = sorted(((n, d) for n, d in upstream.items() if d), key=lambda item: (item[1], item[0]))
+            assert queries.within_hops(source, hops) == expected
+        downstream = queries.within_hops(source, 2, DIRECTION_DEPENDENCIES, limit=3)
+        assert downstream == sorted(
+            ((n, d) for n, d in nx.single_source_shortest_path_length(graph, source, cutoff=2).items() if d),
+            key=lambda item: (item[1], item[0])
+        )[:3]
+
+    with pytest.raises(KeyError):
+        queries.depends_on("C000", "missing")
+    with pytest.raises(ValueError):
+        DependencyQueries(_graph(10, 0.1, 2), queries.index)
+
+
+def test_index_file_round_trips(tmp_path):
+    graph = _graph(300, 0.01, 3)
+    queries = DependencyQueries(graph)
+    path = write_reachability_index(queries.index, str(tmp_path / "reach_1.sreach"))
+    loaded = read_reachability_index(path)
+    assert loaded.arrays() == queries.index.arrays()
+    reloaded = DependencyQueries(graph, loaded)
+    assert all(
+        reloaded.depends_on(u, v) == nx.has_path(graph, u, v)
+        for u in sorted(graph)[:20] for v in sorted(graph)[::7]
+    )
+    with open(path, "r+b") as f:
+        f.write(b"NOTREACH")
+    with pytest.raises(ArtifactFormatError):
+        read_reachability_index(path)
+
+
+@pytest.mark.benchmark
+def test_reachability_index_benchmark(tmp_path):
+    """Benchmark: index build time and size on 50k/100k-node graphs (4 edges per node)."""
+    report = []
+    for n in (50_000, 100_000):
+        rng = random.Random(n)
+        succ = [set() for _ in range(n)]
+        for _ in range(4 * n):
+            u, v = rng.randrange(n), rng.randrange(n)
+            if u < v or rng.random() < 0.05:
+                succ[u].add(v)
+        succ = [sorted(row) for row in succ]
+        start = time.perf_counter()
+        index = ReachabilityIndex.build(succ)
+        build = time.perf_counter() - start
+        path = write_reachability_index(index, str(tmp_path / f"reach_{n}.sreach"))
+        pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(50_000)]
+        start = time.perf_counter()
+        for u, v in pairs:
+            index.reaches(u, v)
+        per_query = (time.perf_counter() - start) / len(pairs)
+        report.append(
+            f"{n} nodes: build {build:.2f}s, {index.label_entries / index.n_comp:.1f} labels/SCC, "
+            f"{os.path.getsize(path) / 1024:.0f} KiB, {per_query * 1e6:.1f}us/query"
+        )
+        assert per_query < 1e-4
+    print("\n[Reachability index] " + " | ".join(report))
@@ -0,0 +1,139 @@
+import time
+import numpy as np
+import networkx as nx
+import pytest
+from domain.services.metric_calculator import MetricCalculator
+from domain.scoring.metric_columns import ScoringColumns, min_max
+from domain.scoring.risk_calculator import (
+    RiskWeights, risk_scores, risk_score_sweep, risk_bands, band_sizes, BAND_HIGH, BAND_MEDIUM, BAND_LOW
+)
+from domain.scoring.extraction_calculator import (
+    ExtractionWeights, extraction_scores, extraction_score_sweep, core_nodes, extraction_ranking
+)
+
+
+def _norm(values):
+    low, high = min(values.values()), max(values.values())
+    return {k: 0.0 if high == low else (v - low) / (high - low) for k, v in values.items()}
+
+
+def test_min_max_handles_constant_columns():
+    assert list(min_max(np.array([3.0, 3.0]))) == [0.0, 0.0]
+    assert list(min_max(np.array([1.0, 3.0, 2.0]))) == [0.0, 1.0, 0.5]
+
+
+def test_scores_match_per_node_formulas():
+    graph = nx.gnm_random_graph(80, 240, seed=4, directed=True)
+    graph = nx.relabel_nodes(graph, lambda i: f"C{i}")
+    metrics = MetricCalculator(graph).calculate_all_metrics()
+    rng = np.random.default_rng(1)
+    writes = {n: float(rng.integers(0, 5)) for n in metrics}
+    loc = {n: float(rng.integers(10, 500)) for n in metrics}
+    columns = ScoringColumns.from_metrics(metrics, extra={"db_write_count": writes, "loc": loc})
+
+    field = lambda m: {n: metrics[n][m] for n in metrics}
+    w_in, w_out, btw = _norm(field('weighted_in')), _norm(field('weighted_out')), _norm(field('betweenness'))
+    max_writes = max(writes.values())
+    weights = RiskWeights()
+    expected_risk = [
+        weights.alpha * w_in[n] + weights.beta * w_out[n] + weights.gamma * btw[n]
+        + weights.epsilon * min(1, writes[n] / max_writes)
+        for n in columns.names
+    ]
+    assert np.allclose(risk_scores(columns), expected_risk, rtol=0, atol=1e-12)
+
+    n_in, n_out, reach, n_loc = (
+        _norm(field('in_degree')), _norm(field('out_degree')), _norm(field('reachability_ratio')), _norm(loc)
+    )
+    ew = ExtractionWeights()
+    expected_extraction = [
+        ew.a1 * (1 - n_in[n]) + ew.a2 / (1 + n_out[n]) + ew.a3 * (1 - reach[n]) + ew.a4 + ew.a5 * (1 - n_loc[n])
+        for n in columns.names
+    ]
+    assert np.allclose(extraction_scores(columns), expected_extraction, rtol=0, atol=1e-12)
+
+
+def test_sentinels_and_missing_metrics_count_as_zero():
+    metrics = {"A": {"betweenness": -1.0, "in_degree": 2}, "B": {"betweenness": -1.0, "in_degree": None}}
+    columns = ScoringColumns.from_metrics(metrics)
+    assert list(columns.raw('betweenness')) == [0.0, 0.0]
+    assert list(columns.raw('in_degree')) == [2.0, 0.0]
+    assert list(columns.raw('loc')) == [0.0, 0.0]
+
+
+def test_percentile_bands_are_exact_and_deterministic():
+    scores = np.array([0.5] * 7 + [0.9, 0.1, 0.3])
+    bands = risk_bands(scores)
+    assert band_sizes(10) == (3, 5, 2)
+    assert list(bands).count(BAND_HIGH) == 2 and list(bands).count(BAND_LOW) == 3
+    assert bands[7] == BAND_HIGH and bands[0] == BAND_HIGH  # first of the tied 0.5s
+    assert bands[8] == BAND_LOW and bands[9] == BAND_LOW
+    assert list(risk_bands(scores)) == list(bands)
+
+    random_scores = np.random.default_rng(0).random(1001)
+    bands = risk_bands(random_scores)
+    order = np.argsort(random_scores)
+    n_low, n_medium, n_high = band_sizes(1001)
+    assert (bands[order[:n_low]] == BAND_LOW).all()
+    assert (bands[order[n_low:n_low + n_medium]] == BAND_MEDIUM).all()
+    assert (bands[order[-n_high:]] == BAND_HIGH).all()
+
+
+def test_core_nodes_excluded_from_ranking():
+    columns = ScoringColumns(["a", "b", "c"], {"reachability_ratio": [0.9, 0.2, 0.7]})
+    risk = np.array([0.85, 0.95, 0.5])
+    core = core_nodes(columns, risk)
+    assert list(core) == [True, False, False]
+    assert list(extraction_ranking(np.array([0.9, 0.1, 0.5]), exclude=core)) == [2, 1]
+
+
+def _random_columns(n, seed=3):
+    rng = np.random.default_rng(seed)
+    return ScoringColumns([f"C{i}" for i in range(n)], {
+        "weighted_in": rng.integers(0, 200, n), "weighted_out": rng.integers(0, 50, n),
+        "betweenness": rng.random(n), "in_degree": rng.integers(0, 100, n),
+        "out_degree": rng.integers(0, 30, n), "reachability_ratio": rng.random(n),
+    })
+
+
+def test_weight_sweeps_match_single_weight_sets():
+    columns = _random_columns(500)
+    risk_sets = [RiskWeights(alpha=0.30 * (0.9 + 0.02 * i)) for i in range(10)]
+    extraction_sets = [ExtractionWeights(a1=0.30 * (0.9 + 0.02 * i)) for i in range(10)]
+    risk_matrix = risk_score_sweep(columns, risk_sets)
+    extraction_matrix = extraction_score_sweep(columns, extraction_sets)
+    for i in (0, 7):
+        assert np.array_equal(risk_matrix[i], risk_scores(columns, risk_sets[i]))
+        assert np.allclose(extraction_matrix[i], extraction_scores(columns, extraction_sets[i]))
+
+
+@pytest.mark.benchmark
+def test_weight_sweep_benchmark_100k_components():
+    """Benchmark: 100 risk and extraction weight sets over 100k components."""
+    n = 100_000
+    columns = _random_columns(n)
+    risk_sets = [RiskWeights(alpha=0.30 * (0.9 + 0.002 * i)) for i in range(100)]
+    extraction_sets = [ExtractionWeights(a1=0.30 * (0.9 + 0.002 * i)) for i in range(100)]
+
+    start = time.perf_counter()
+    risk_scores(columns)
+    extraction_scores(columns)
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    risk_matrix = risk_score_sweep(columns, risk_sets)
+    extraction_matrix = extraction_score_sweep(columns, extraction_sets)
+    sweep = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bands = risk_bands(risk_matrix[0])
+    banding = time.perf_counter() - start
+
+    assert np.array_equal(risk_matrix[17], risk_scores(columns, risk_sets[17]))
+    assert np.allclose(extraction_matrix[42], extraction_scores(columns, extraction_sets[42]))
+    assert bands.shape == (n,)
+    print(
+        f"\n[Scoring] {n} components: normalize+first scores {first * 1000:.1f}ms | "
+        f"200 weight sets {sweep * 1000:.1f}ms ({sweep / 200 * 1000:.2f}ms each) | "
+        f"banding {banding * 1000:.1f}ms"
+    )
@@ -0,0 +1,109 @@
+import random
+import time
+import networkx as nx
+import pytest
+from domain.services.what_if import WhatIfSession
+
+
+def _expected(graph, nodes=(), edges=()):
+    reduced = graph.copy()
+    reduced.remove_nodes_from(nodes)
+    reduced.remove_edges_from(edges)
+    largest = max((len(c) for c in nx.strongly_connected_components(reduced)), default=0)
+    return largest, {v: len(nx.descendants(reduced, v)) for v in reduced}
+
+
+def _check(graph, nodes=(), edges=()):
+    session = WhatIfSession(graph)
+    impact = session.remove(nodes, edges, limit=len(graph))
+    largest, blast = _expected(graph, nodes, edges)
+    assert impact.largest_scc_before == max(len(c) for c in nx.strongly_connected_components(graph))
+    assert impact.largest_scc_after == largest
+    before = {name: session.blast_radius[i] for i, name in enumerate(session.names)}
+    after = {c["name"]: c["after"] for c in impact.blast_radius_changes}
+    assert {v: after.get(v, before[v]) for v in blast} == blast
+    assert impact.changed_nodes == len(impact.blast_radius_changes)
+    assert impact.blast_radius_reduction == sum(before[v] - blast[v] for v in blast)
+    return impact
+
+
+def test_removals_match_networkx_recompute():
+    rng = random.Random(1)
+    for seed in range(40):
+        graph = nx.gnp_random_graph(rng.randint(5, 60), rng.choice([0.03, 0.06, 0.12]), directed=True, seed=seed)
+        graph = nx.relabel_nodes(graph, lambda i: f"C{i}")
+        nodes = rng.sample(list(graph), rng.randint(0, 3))
+        edges = [
+            e for e in rng.sample(list(graph.edges), min(3, graph.number_of_edges()))
+            if e[0] not in nodes and e[1] not in nodes
+        ]
+        _check(graph, nodes, edges)
+
+
+def test_cycle_split_and_ancestors_only():
+    # A -> B <-> C -> D, E -> D; removing C splits {B, C} and only A, B lose reach
+    graph = nx.DiGraph([("A", "B"), ("B", "C"), ("C", "B"), ("C", "D"), ("E", "D")])
+    impact = _check(graph, nodes=["C"])
+    assert impact.split_components == [{"component": "B", "size": 2, "pieces": [1]}]
+    assert impact.ancestor_nodes == 2  # A and B; D and E are never revisited
+    assert impact.blast_radius_changes == [
+        {"name": "A", "before": 3, "after": 1},
+        {"name": "B", "before": 2, "after": 0},
+    ]
+    impact = _check(graph, edges=[("B", "C")])
+    assert impact.largest_scc_after == 1 and impact.split_components[0]["pieces"] == [1, 1]
+
+
+def test_session_is_not_modified_and_input_is_validated():
+    graph = nx.DiGraph([("A", "B"), ("B", "A"), ("B", "C")])
+    session = WhatIfSession(graph)
+    first = session.remove(["A"])
+    assert session.remove(["A"]).blast_radius_changes == first.blast_radius_changes
+    assert session.remove().blast_radius_changes == []
+    with pytest.raises(ValueError):
+        session.remove(["Z"])
+    with pytest.raises(ValueError):
+        session.remove(edges=[("C", "A")])
+
+
+
+def test_run_cache_builds_once_and_drops_least_recently_used():
+    from application.services.run_cache import RunCache
+    cache, built = RunCache(), []
+    build = lambda run_id: built.append(run_id) or f"session {run_id}"
+    assert cache.get(1, build, 2) == "session 1"
+    cache.get(2, build, 2)
+    cache.get(1, build, 2)  # hit; run 2 is now the least recently used
+    cache.get(3, build, 2)
+    assert built == [1, 2, 3] and 1 in cache and 2 not in cache
+    cache.evict(1)
+    cache.get(1, build, 2)
+    assert built == [1, 2, 3, 1]
+
+
+@pytest.mark.benchmark
+def test_what_if_latency_benchmark_50k_nodes():
+    """Benchmark: removal queries on a 50k-node, ~100k-edge graph with one large SCC."""
+    rng = random.Random(7)
+    n = 50_000
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(n))
+    for _ in range(200_000):
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u < v or rng.random() < 0.05:
+            graph.add_edge(u, v)
+    start = time.perf_counter()
+    session = WhatIfSession(graph)
+    build = time.perf_counter() - start
+    core = session.members[session.by_size[0]]
+    queries = {
+        "core node": {"nodes": [core[0]]},
+        "five core nodes": {"nodes": core[:5]},
+        "core edges": {"edges": list(graph.edges(core[0]))[:3]},
+        "leaf": {"nodes": [n - 1]},
+    }
+    timings = [f"load {build:.2f}s"]
+    for label, query in queries.items():
+        impact = session.remove(**query)
+        timings.append(f"{label} {impact.elapsed_ms:.0f}ms")
+    print(f"\n[What-if] {n} nodes, largest SCC {session.largest_scc}: " + " | ".join(timings))